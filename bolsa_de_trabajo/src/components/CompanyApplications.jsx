@@ -2,9 +2,15 @@ import React, { useState, useEffect } from 'react';
 import { API_ENDPOINTS } from '../config/api';
 import './CompanyApplications.css';
 
+// Postulaciones por página; el perfil completo del candidato se pide al abrir sus detalles
+const APPLICATIONS_PAGE_SIZE = 20;
+
 const CompanyApplications = ({ companyId }) => {
   const [applications, setApplications] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [candidateDetails, setCandidateDetails] = useState({});
   const [error, setError] = useState('');
   const [selectedApplication, setSelectedApplication] = useState(null);
   const [showModal, setShowModal] = useState(false);
@@ -12,22 +18,45 @@ const CompanyApplications = ({ companyId }) => {
 
   useEffect(() => {
     fetchApplications();
-  }, [companyId]);
+  }, [companyId, filterStatus]);
 
-  const fetchApplications = async () => {
+  // Sin cursor se reemplaza la lista; con cursor se agrega la página siguiente
+  const fetchApplications = async (cursor = null) => {
+    const params = { limite: APPLICATIONS_PAGE_SIZE };
+    if (filterStatus !== 'Todos') params.estado = filterStatus;
+    if (cursor) params.cursor = cursor;
     try {
-      setLoading(true);
-      const response = await fetch(API_ENDPOINTS.getCompanyApplications(companyId));
+      cursor ? setLoadingMore(true) : setLoading(true);
+      const response = await fetch(API_ENDPOINTS.getCompanyApplicationsPage(companyId, params));
       if (response.ok) {
         const data = await response.json();
-        setApplications(data);
+        setApplications(previous => cursor ? [...previous, ...data.postulaciones] : data.postulaciones);
+        setNextCursor(data.siguienteCursor);
       } else {
         setError('Error al cargar las postulaciones');
       }
     } catch (err) {
       setError('Error de conexión');
     } finally {
-      setLoading(false);
+      cursor ? setLoadingMore(false) : setLoading(false);
+    }
+  };
+
+  const fetchCandidateDetails = async (candidatoId) => {
+    if (candidateDetails[candidatoId]) return;
+    try {
+      const response = await fetch(API_ENDPOINTS.getCompanyCandidates(companyId, [candidatoId]));
+      if (response.ok) {
+        const data = await response.json();
+        setCandidateDetails(previous => ({
+          ...previous,
+          ...Object.fromEntries(data.candidatos.map(candidato => [candidato.id, candidato]))
+        }));
+      } else {
+        setError('Error al cargar el perfil del candidato');
+      }
+    } catch (err) {
+      setError('Error de conexión');
     }
   };
 
@@ -42,12 +71,14 @@ const CompanyApplications = ({ companyId }) => {
       });
 
       if (response.ok) {
-        // Actualizar la lista de postulaciones
-        setApplications(applications.map(app => 
-          app.id === applicationId 
-            ? { ...app, estado: newStatus }
-            : app
-        ));
+        // Actualizar la lista de postulaciones (con filtro, la postulación sale de la lista)
+        setApplications(applications
+          .map(app => 
+            app.id === applicationId 
+              ? { ...app, estado: newStatus }
+              : app
+          )
+          .filter(app => filterStatus === 'Todos' || app.estado === filterStatus));
         setShowModal(false);
         setSelectedApplication(null);
       } else {
@@ -61,6 +92,7 @@ const CompanyApplications = ({ companyId }) => {
   const openApplicationModal = (application) => {
     setSelectedApplication(application);
     setShowModal(true);
+    fetchCandidateDetails(application.candidato.id);
   };
 
   const formatDate = (dateString) => {
@@ -86,9 +118,8 @@ const CompanyApplications = ({ companyId }) => {
     }
   };
 
-  const filteredApplications = applications.filter(app => 
-    filterStatus === 'Todos' || app.estado === filterStatus
-  );
+  // Perfil completo del candidato seleccionado (null mientras llega)
+  const selectedCandidate = selectedApplication && candidateDetails[selectedApplication.candidato.id];
 
   if (loading) {
     return (
@@ -124,7 +155,7 @@ const CompanyApplications = ({ companyId }) => {
         </div>
       )}
 
-      {filteredApplications.length === 0 ? (
+      {applications.length === 0 ? (
         <div className="no-applications">
           <div className="no-applications-icon">📋</div>
           <h3>No hay postulaciones</h3>
@@ -132,7 +163,7 @@ const CompanyApplications = ({ companyId }) => {
         </div>
       ) : (
         <div className="applications-grid">
-          {filteredApplications.map((application) => (
+          {applications.map((application) => (
             <div key={application.id} className="application-card">
               <div className="application-header">
                 <div className="candidate-info">
@@ -188,6 +219,18 @@ const CompanyApplications = ({ companyId }) => {
         </div>
       )}
 
+      {nextCursor && (
+        <div className="applications-load-more">
+          <button 
+            className="btn-load-more"
+            onClick={() => fetchApplications(nextCursor)}
+            disabled={loadingMore}
+          >
+            {loadingMore ? 'Cargando...' : 'Cargar más'}
+          </button>
+        </div>
+      )}
+
       {/* Modal de detalles */}
       {showModal && selectedApplication && (
         <div className="modal-overlay" onClick={() => setShowModal(false)}>
@@ -220,27 +263,39 @@ const CompanyApplications = ({ companyId }) => {
                   <div className="profile-info">
                     <h3>{selectedApplication.candidato.nombreUsuario}</h3>
                     <p>{selectedApplication.candidato.correo}</p>
-                    <p>{selectedApplication.candidato.telefono}</p>
-                    <p>{selectedApplication.candidato.direccion}</p>
+                    {selectedCandidate && (
+                      <>
+                        <p>{selectedCandidate.telefono}</p>
+                        <p>{selectedCandidate.direccion}</p>
+                      </>
+                    )}
                   </div>
                 </div>
 
                 <div className="profile-sections">
-                  <div className="profile-section">
-                    <h4>Educación</h4>
-                    <p>{selectedApplication.candidato.educacion || 'No especificada'}</p>
-                  </div>
+                  {!selectedCandidate ? (
+                    <div className="profile-section">
+                      <p>Cargando perfil...</p>
+                    </div>
+                  ) : (
+                    <>
+                      <div className="profile-section">
+                        <h4>Educación</h4>
+                        <p>{selectedCandidate.educacion || 'No especificada'}</p>
+                      </div>
 
-                  <div className="profile-section">
-                    <h4>Experiencia Laboral</h4>
-                    <p>{selectedApplication.candidato.experienciaLaboral || 'No especificada'}</p>
-                  </div>
+                      <div className="profile-section">
+                        <h4>Experiencia Laboral</h4>
+                        <p>{selectedCandidate.experienciaLaboral || 'No especificada'}</p>
+                      </div>
+                    </>
+                  )}
 
-                  {selectedApplication.candidato.cv && (
+                  {selectedCandidate?.cv && (
                     <div className="profile-section">
                       <h4>Currículum Vitae</h4>
                       <a 
-                        href={`http://localhost:5000/${selectedApplication.candidato.cv}`}
+                        href={`http://localhost:5000/${selectedCandidate.cv}`}
                         target="_blank"
                         rel="noopener noreferrer"
                         className="cv-link"
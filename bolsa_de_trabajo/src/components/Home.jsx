@@ -27,11 +27,10 @@ const Home = ({ jobs }) => {
   const loadFeaturedJobs = async () => {
     try {
       setLoading(true);
-      const response = await fetch('http://127.0.0.1:5000/api/vacantes');
+      // El servidor devuelve solo las vacantes destacadas (máximo 3)
+      const response = await fetch(API_ENDPOINTS.getVacantesDestacadas);
       if (response.ok) {
-        const allJobs = await response.json();
-        // Filtrar solo las vacantes destacadas
-        const featured = allJobs.filter(job => job.destacada).slice(0, 3);
+        const featured = await response.json();
         setFeaturedJobs(featured);
       }
     } catch (error) {
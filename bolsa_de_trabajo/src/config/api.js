@@ -48,6 +48,7 @@ export const API_ENDPOINTS = {
   
   // Vacantes
   getAllVacantes: `${API_BASE_URL}/api/vacantes`,
+  getVacantesDestacadas: `${API_BASE_URL}/api/vacantes/destacadas`,
   getCompanyVacantes: (userId) => `${API_BASE_URL}/api/empresa/${userId}/vacantes`,
   createVacante: (userId) => `${API_BASE_URL}/api/empresa/${userId}/vacantes`,
   getVacante: (userId, vacanteId) => `${API_BASE_URL}/api/empresa/${userId}/vacantes/${vacanteId}`,
@@ -59,6 +60,11 @@ export const API_ENDPOINTS = {
   
   // Postulaciones
   getCompanyApplications: (userId) => `${API_BASE_URL}/api/empresa/${userId}/postulaciones`,
+  // Página del listado: { limite, cursor, estado, vacante, desde, hasta }
+  getCompanyApplicationsPage: (userId, params) =>
+    `${API_BASE_URL}/api/empresa/${userId}/postulaciones?${new URLSearchParams(params)}`,
+  getCompanyCandidates: (userId, candidatoIds) =>
+    `${API_BASE_URL}/api/empresa/${userId}/candidatos?ids=${candidatoIds.join(',')}`,
   updateApplicationStatus: (applicationId) => `${API_BASE_URL}/api/postulaciones/${applicationId}`,
   
   // Endpoints de Administración
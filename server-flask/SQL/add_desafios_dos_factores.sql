@@ -0,0 +1,39 @@
+-- Script para agregar la tabla de desafíos de 2FA compartida entre workers
+-- Con WEB_CONCURRENCY > 1 y sin DOSFA_REDIS_URL el login de un worker guarda aquí el
+-- código y el perfil, y /api/verify-2fa los lee aunque llegue a otro worker
+-- (src/dos_factores.py, AlmacenDesafiosBD). Cada usuario tiene a lo sumo un desafío.
+
+USE [Bolsa_de_Trabajo];
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'Desafios_Dos_Factores')
+BEGIN
+    CREATE TABLE Desafios_Dos_Factores (
+        ID_Usuario INT PRIMARY KEY,
+        Codigo VARCHAR(6) NOT NULL,
+        Intentos INT NOT NULL DEFAULT 0,
+        Perfil NVARCHAR(MAX) NOT NULL,
+        Expira DATETIME NOT NULL
+    );
+
+    PRINT 'Tabla Desafios_Dos_Factores creada exitosamente';
+END
+ELSE
+BEGIN
+    PRINT 'La tabla Desafios_Dos_Factores ya existe';
+END
+GO
+
+-- Purga de desafíos vencidos al crear uno nuevo
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE object_id = OBJECT_ID('Desafios_Dos_Factores') AND name = 'IX_Desafios_Dos_Factores_Expira')
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_Desafios_Dos_Factores_Expira
+    ON Desafios_Dos_Factores (Expira);
+
+    PRINT 'Índice IX_Desafios_Dos_Factores_Expira creado exitosamente';
+END
+ELSE
+BEGIN
+    PRINT 'El índice IX_Desafios_Dos_Factores_Expira ya existe';
+END
+GO
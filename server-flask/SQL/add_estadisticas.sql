@@ -0,0 +1,197 @@
+-- Script para agregar las estadísticas del panel de administración
+-- Los triggers mantienen los contadores y los conteos por día y por mes en la misma
+-- transacción que cada escritura, así que GET /api/admin/estadisticas lee unas pocas filas
+-- en lugar de contar Vacantes, Candidatos, Empresa y Postulaciones completas.
+-- src/estadisticas.py los reconcilia periódicamente contra las tablas.
+--
+-- Estadisticas_Contadores: vacantesActivas (Abierta y no eliminada), candidatosRegistrados
+--   y empresasActivas (con el usuario no eliminado)
+-- Estadisticas_Periodos: postulaciones y vacantes (no eliminadas) por Fecha_Publicacion,
+--   Granularidad 'D' (un día) o 'M' (Inicio = día 1 del mes)
+
+USE [Bolsa_de_Trabajo];
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'Estadisticas_Contadores')
+BEGIN
+    CREATE TABLE Estadisticas_Contadores (
+        Metrica VARCHAR(50) PRIMARY KEY,
+        Valor INT NOT NULL DEFAULT 0,
+        Fecha_Reconciliacion DATETIME NULL
+    );
+
+    INSERT INTO Estadisticas_Contadores (Metrica, Valor, Fecha_Reconciliacion)
+    SELECT 'vacantesActivas', COUNT(*), GETDATE() FROM Vacantes WHERE Estado = 'Abierta' AND eliminado = 0;
+    INSERT INTO Estadisticas_Contadores (Metrica, Valor, Fecha_Reconciliacion)
+    SELECT 'candidatosRegistrados', COUNT(*), GETDATE()
+    FROM Candidatos C JOIN Usuario U ON U.ID = C.ID_Usuario WHERE U.eliminado = 0;
+    INSERT INTO Estadisticas_Contadores (Metrica, Valor, Fecha_Reconciliacion)
+    SELECT 'empresasActivas', COUNT(*), GETDATE()
+    FROM Empresa E JOIN Usuario U ON U.ID = E.ID_Usuario WHERE U.eliminado = 0;
+
+    PRINT 'Tabla Estadisticas_Contadores creada exitosamente';
+END
+ELSE
+BEGIN
+    PRINT 'La tabla Estadisticas_Contadores ya existe';
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'Estadisticas_Periodos')
+BEGIN
+    CREATE TABLE Estadisticas_Periodos (
+        Metrica VARCHAR(50) NOT NULL,
+        Granularidad CHAR(1) NOT NULL,
+        Inicio DATE NOT NULL,
+        Cantidad INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (Metrica, Granularidad, Inicio)
+    );
+
+    INSERT INTO Estadisticas_Periodos (Metrica, Granularidad, Inicio, Cantidad)
+    SELECT 'postulaciones', 'D', Fecha_Publicacion, COUNT(*)
+    FROM Postulaciones WHERE Fecha_Publicacion IS NOT NULL GROUP BY Fecha_Publicacion;
+    INSERT INTO Estadisticas_Periodos (Metrica, Granularidad, Inicio, Cantidad)
+    SELECT 'vacantes', 'D', Fecha_Publicacion, COUNT(*)
+    FROM Vacantes WHERE eliminado = 0 AND Fecha_Publicacion IS NOT NULL GROUP BY Fecha_Publicacion;
+    INSERT INTO Estadisticas_Periodos (Metrica, Granularidad, Inicio, Cantidad)
+    SELECT Metrica, 'M', DATEFROMPARTS(YEAR(Inicio), MONTH(Inicio), 1), SUM(Cantidad)
+    FROM Estadisticas_Periodos WHERE Granularidad = 'D'
+    GROUP BY Metrica, DATEFROMPARTS(YEAR(Inicio), MONTH(Inicio), 1);
+
+    PRINT 'Tabla Estadisticas_Periodos creada exitosamente';
+END
+ELSE
+BEGIN
+    PRINT 'La tabla Estadisticas_Periodos ya existe';
+END
+GO
+
+-- Vacantes: activas y publicadas por periodo. Las actualizaciones que no tocan Estado,
+-- eliminado ni Fecha_Publicacion (p. ej. CantidadPostulaciones) no hacen nada.
+CREATE OR ALTER TRIGGER TR_Estadisticas_Vacantes
+ON Vacantes
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    IF EXISTS (SELECT 1 FROM inserted) AND EXISTS (SELECT 1 FROM deleted)
+       AND NOT (UPDATE(Estado) OR UPDATE(eliminado) OR UPDATE(Fecha_Publicacion))
+        RETURN;
+
+    UPDATE Estadisticas_Contadores
+    SET Valor = Valor
+        + (SELECT COUNT(*) FROM inserted WHERE Estado = 'Abierta' AND eliminado = 0)
+        - (SELECT COUNT(*) FROM deleted WHERE Estado = 'Abierta' AND eliminado = 0)
+    WHERE Metrica = 'vacantesActivas';
+
+    WITH Cambios AS (
+        SELECT Fecha_Publicacion AS Fecha, 1 AS Delta FROM inserted
+        WHERE eliminado = 0 AND Fecha_Publicacion IS NOT NULL
+        UNION ALL
+        SELECT Fecha_Publicacion, -1 FROM deleted
+        WHERE eliminado = 0 AND Fecha_Publicacion IS NOT NULL
+    ), Periodos AS (
+        SELECT 'D' AS Granularidad, Fecha AS Inicio, Delta FROM Cambios
+        UNION ALL
+        SELECT 'M', DATEFROMPARTS(YEAR(Fecha), MONTH(Fecha), 1), Delta FROM Cambios
+    )
+    MERGE Estadisticas_Periodos WITH (HOLDLOCK) AS E
+    USING (
+        SELECT Granularidad, Inicio, SUM(Delta) AS Delta FROM Periodos
+        GROUP BY Granularidad, Inicio HAVING SUM(Delta) <> 0
+    ) AS C
+    ON E.Metrica = 'vacantes' AND E.Granularidad = C.Granularidad AND E.Inicio = C.Inicio
+    WHEN MATCHED THEN UPDATE SET Cantidad = E.Cantidad + C.Delta
+    WHEN NOT MATCHED THEN INSERT (Metrica, Granularidad, Inicio, Cantidad)
+        VALUES ('vacantes', C.Granularidad, C.Inicio, C.Delta);
+END;
+GO
+
+-- Postulaciones por periodo. Los cambios de Estado no hacen nada.
+CREATE OR ALTER TRIGGER TR_Estadisticas_Postulaciones
+ON Postulaciones
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    IF EXISTS (SELECT 1 FROM inserted) AND EXISTS (SELECT 1 FROM deleted) AND NOT UPDATE(Fecha_Publicacion)
+        RETURN;
+
+    WITH Cambios AS (
+        SELECT Fecha_Publicacion AS Fecha, 1 AS Delta FROM inserted WHERE Fecha_Publicacion IS NOT NULL
+        UNION ALL
+        SELECT Fecha_Publicacion, -1 FROM deleted WHERE Fecha_Publicacion IS NOT NULL
+    ), Periodos AS (
+        SELECT 'D' AS Granularidad, Fecha AS Inicio, Delta FROM Cambios
+        UNION ALL
+        SELECT 'M', DATEFROMPARTS(YEAR(Fecha), MONTH(Fecha), 1), Delta FROM Cambios
+    )
+    MERGE Estadisticas_Periodos WITH (HOLDLOCK) AS E
+    USING (
+        SELECT Granularidad, Inicio, SUM(Delta) AS Delta FROM Periodos
+        GROUP BY Granularidad, Inicio HAVING SUM(Delta) <> 0
+    ) AS C
+    ON E.Metrica = 'postulaciones' AND E.Granularidad = C.Granularidad AND E.Inicio = C.Inicio
+    WHEN MATCHED THEN UPDATE SET Cantidad = E.Cantidad + C.Delta
+    WHEN NOT MATCHED THEN INSERT (Metrica, Granularidad, Inicio, Cantidad)
+        VALUES ('postulaciones', C.Granularidad, C.Inicio, C.Delta);
+END;
+GO
+
+-- Candidatos y empresas cuentan solo si su usuario no está eliminado. Al borrar el perfil y
+-- el usuario, en cualquier orden, solo uno de los dos triggers encuentra al otro y descuenta.
+CREATE OR ALTER TRIGGER TR_Estadisticas_Candidatos
+ON Candidatos
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    IF EXISTS (SELECT 1 FROM inserted) AND EXISTS (SELECT 1 FROM deleted) AND NOT UPDATE(ID_Usuario)
+        RETURN;
+
+    UPDATE Estadisticas_Contadores
+    SET Valor = Valor
+        + (SELECT COUNT(*) FROM inserted I JOIN Usuario U ON U.ID = I.ID_Usuario WHERE U.eliminado = 0)
+        - (SELECT COUNT(*) FROM deleted D JOIN Usuario U ON U.ID = D.ID_Usuario WHERE U.eliminado = 0)
+    WHERE Metrica = 'candidatosRegistrados';
+END;
+GO
+
+CREATE OR ALTER TRIGGER TR_Estadisticas_Empresa
+ON Empresa
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    IF EXISTS (SELECT 1 FROM inserted) AND EXISTS (SELECT 1 FROM deleted) AND NOT UPDATE(ID_Usuario)
+        RETURN;
+
+    UPDATE Estadisticas_Contadores
+    SET Valor = Valor
+        + (SELECT COUNT(*) FROM inserted I JOIN Usuario U ON U.ID = I.ID_Usuario WHERE U.eliminado = 0)
+        - (SELECT COUNT(*) FROM deleted D JOIN Usuario U ON U.ID = D.ID_Usuario WHERE U.eliminado = 0)
+    WHERE Metrica = 'empresasActivas';
+END;
+GO
+
+CREATE OR ALTER TRIGGER TR_Estadisticas_Usuario
+ON Usuario
+AFTER UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    IF EXISTS (SELECT 1 FROM inserted) AND NOT UPDATE(eliminado)
+        RETURN;
+
+    UPDATE Estadisticas_Contadores
+    SET Valor = Valor + CASE Metrica
+        WHEN 'candidatosRegistrados' THEN
+            (SELECT COUNT(*) FROM inserted I JOIN Candidatos C ON C.ID_Usuario = I.ID WHERE I.eliminado = 0)
+          - (SELECT COUNT(*) FROM deleted D JOIN Candidatos C ON C.ID_Usuario = D.ID WHERE D.eliminado = 0)
+        ELSE
+            (SELECT COUNT(*) FROM inserted I JOIN Empresa E ON E.ID_Usuario = I.ID WHERE I.eliminado = 0)
+          - (SELECT COUNT(*) FROM deleted D JOIN Empresa E ON E.ID_Usuario = D.ID WHERE D.eliminado = 0)
+        END
+    WHERE Metrica IN ('candidatosRegistrados', 'empresasActivas');
+END;
+GO
@@ -0,0 +1,71 @@
+-- Script para agregar índices de soporte al listado público de vacantes
+-- Permiten la paginación por clave (Fecha_Publicacion DESC, ID DESC) y los filtros
+-- por ubicación, tipo de contrato y rango de salario de GET /api/vacantes
+
+USE [Bolsa_de_Trabajo];
+GO
+
+-- Índice filtrado para el orden del listado público (solo vacantes abiertas y activas)
+-- Incluye las columnas cortas para que las vistas de lista no lean las columnas TEXT
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE object_id = OBJECT_ID('Vacantes') AND name = 'IX_Vacantes_Publicas_Fecha')
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_Vacantes_Publicas_Fecha
+    ON Vacantes (Fecha_Publicacion DESC, ID DESC)
+    INCLUDE (ID_Empresa, Titulo_puesto, Salario, Tipo_Contrato, Ubicacion, Fecha_Cierre, CantidadPostulaciones, Destacada)
+    WHERE Estado = 'Abierta' AND eliminado = 0;
+
+    PRINT 'Índice IX_Vacantes_Publicas_Fecha creado exitosamente';
+END
+ELSE
+BEGIN
+    PRINT 'El índice IX_Vacantes_Publicas_Fecha ya existe';
+END
+GO
+
+-- Índice para el filtro por ubicación conservando el orden del listado
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE object_id = OBJECT_ID('Vacantes') AND name = 'IX_Vacantes_Publicas_Ubicacion')
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_Vacantes_Publicas_Ubicacion
+    ON Vacantes (Ubicacion, Fecha_Publicacion DESC, ID DESC)
+    INCLUDE (Tipo_Contrato, Salario)
+    WHERE Estado = 'Abierta' AND eliminado = 0;
+
+    PRINT 'Índice IX_Vacantes_Publicas_Ubicacion creado exitosamente';
+END
+ELSE
+BEGIN
+    PRINT 'El índice IX_Vacantes_Publicas_Ubicacion ya existe';
+END
+GO
+
+-- Índice para el filtro por tipo de contrato conservando el orden del listado
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE object_id = OBJECT_ID('Vacantes') AND name = 'IX_Vacantes_Publicas_TipoContrato')
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_Vacantes_Publicas_TipoContrato
+    ON Vacantes (Tipo_Contrato, Fecha_Publicacion DESC, ID DESC)
+    INCLUDE (Ubicacion, Salario)
+    WHERE Estado = 'Abierta' AND eliminado = 0;
+
+    PRINT 'Índice IX_Vacantes_Publicas_TipoContrato creado exitosamente';
+END
+ELSE
+BEGIN
+    PRINT 'El índice IX_Vacantes_Publicas_TipoContrato ya existe';
+END
+GO
+
+-- Índice para el rango de salario
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE object_id = OBJECT_ID('Vacantes') AND name = 'IX_Vacantes_Publicas_Salario')
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_Vacantes_Publicas_Salario
+    ON Vacantes (Salario)
+    INCLUDE (Fecha_Publicacion, Ubicacion, Tipo_Contrato)
+    WHERE Estado = 'Abierta' AND eliminado = 0;
+
+    PRINT 'Índice IX_Vacantes_Publicas_Salario creado exitosamente';
+END
+ELSE
+BEGIN
+    PRINT 'El índice IX_Vacantes_Publicas_Salario ya existe';
+END
+GO
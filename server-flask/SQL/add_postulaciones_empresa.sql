@@ -0,0 +1,95 @@
+-- Script para agregar la empresa a cada postulación y los índices del listado paginado
+-- GET /api/empresa/<id>/postulaciones?limite=... recorre IX_Postulaciones_Empresa en el orden
+-- del listado (Fecha_Publicacion DESC, ID DESC) y se detiene en la página pedida; sin la
+-- columna ID_Empresa tendría que leer y ordenar todas las postulaciones de todas las vacantes
+-- de la empresa para devolver las primeras 20.
+--
+-- TR_Postulaciones_Empresa copia Vacantes.ID_Empresa al insertar la postulación o cambiar
+-- su vacante (las vacantes no cambian de empresa).
+
+USE [Bolsa_de_Trabajo];
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID('Postulaciones') AND name = 'ID_Empresa')
+BEGIN
+    ALTER TABLE Postulaciones
+    ADD ID_Empresa INT NULL;
+
+    PRINT 'Columna ID_Empresa agregada exitosamente a la tabla Postulaciones';
+END
+ELSE
+BEGIN
+    PRINT 'La columna ID_Empresa ya existe en la tabla Postulaciones';
+END
+GO
+
+-- Llenar la columna en las postulaciones existentes
+UPDATE P
+SET ID_Empresa = V.ID_Empresa
+FROM Postulaciones P
+JOIN Vacantes V ON V.ID = P.ID_Vacante
+WHERE P.ID_Empresa IS NULL;
+GO
+
+CREATE OR ALTER TRIGGER TR_Postulaciones_Empresa
+ON Postulaciones
+AFTER INSERT, UPDATE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    IF NOT UPDATE(ID_Vacante)
+        RETURN;
+
+    UPDATE P
+    SET ID_Empresa = V.ID_Empresa
+    FROM Postulaciones P
+    JOIN inserted I ON I.ID = P.ID
+    LEFT JOIN Vacantes V ON V.ID = I.ID_Vacante;
+END;
+GO
+
+-- Listado de la empresa: una página es un tramo contiguo del índice
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE object_id = OBJECT_ID('Postulaciones') AND name = 'IX_Postulaciones_Empresa')
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_Postulaciones_Empresa
+    ON Postulaciones (ID_Empresa, Fecha_Publicacion DESC, ID DESC)
+    INCLUDE (ID_Vacante, ID_Candidato, Estado);
+
+    PRINT 'Índice IX_Postulaciones_Empresa creado exitosamente';
+END
+ELSE
+BEGIN
+    PRINT 'El índice IX_Postulaciones_Empresa ya existe';
+END
+GO
+
+-- Filtro por vacante (?vacante=<id>) conservando el orden del listado
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE object_id = OBJECT_ID('Postulaciones') AND name = 'IX_Postulaciones_Vacante')
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_Postulaciones_Vacante
+    ON Postulaciones (ID_Vacante, Fecha_Publicacion DESC, ID DESC)
+    INCLUDE (ID_Candidato, Estado);
+
+    PRINT 'Índice IX_Postulaciones_Vacante creado exitosamente';
+END
+ELSE
+BEGIN
+    PRINT 'El índice IX_Postulaciones_Vacante ya existe';
+END
+GO
+
+-- Detalle de candidatos (GET /api/empresa/<id>/candidatos?ids=...): comprobar que cada
+-- candidato se postuló a la empresa sin recorrer sus postulaciones
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE object_id = OBJECT_ID('Postulaciones') AND name = 'IX_Postulaciones_Candidato')
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_Postulaciones_Candidato
+    ON Postulaciones (ID_Candidato, ID_Empresa)
+    INCLUDE (ID_Vacante);
+
+    PRINT 'Índice IX_Postulaciones_Candidato creado exitosamente';
+END
+ELSE
+BEGIN
+    PRINT 'El índice IX_Postulaciones_Candidato ya existe';
+END
+GO
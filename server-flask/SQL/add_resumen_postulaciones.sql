@@ -0,0 +1,165 @@
+-- Script para agregar los resúmenes de postulaciones por empresa y por vacante
+-- El trigger TR_Resumen_Postulaciones los mantiene en la misma transacción que cada
+-- postulación creada (sp_CrearPostulacion), cambio de estado o borrado, así que
+-- GET /api/empresa/<id>/postulaciones/estadisticas lee a lo sumo una fila por día y estado
+-- en lugar de recorrer todas las postulaciones de la empresa.
+-- src/estadisticas_empresa.py los reconcilia contra Postulaciones.
+--
+-- Resumen_Postulaciones_Empresa: postulaciones por empresa, Fecha_Publicacion y Estado
+-- Resumen_Postulaciones_Vacante: postulaciones por vacante, Fecha_Publicacion y Estado
+-- Resumen_Estados_Vacante: postulaciones por vacante y Estado (sin fecha)
+-- Cuentan todas las postulaciones recibidas, también las de vacantes eliminadas después;
+-- las filas que llegan a 0 se borran.
+
+USE [Bolsa_de_Trabajo];
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'Resumen_Postulaciones_Empresa')
+BEGIN
+    CREATE TABLE Resumen_Postulaciones_Empresa (
+        ID_Empresa INT NOT NULL,
+        Fecha DATE NOT NULL,
+        Estado VARCHAR(50) NOT NULL,
+        Cantidad INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (ID_Empresa, Fecha, Estado)
+    );
+
+    INSERT INTO Resumen_Postulaciones_Empresa (ID_Empresa, Fecha, Estado, Cantidad)
+    SELECT V.ID_Empresa, P.Fecha_Publicacion, COALESCE(P.Estado, 'Pendiente'), COUNT(*)
+    FROM Postulaciones P JOIN Vacantes V ON V.ID = P.ID_Vacante
+    WHERE P.Fecha_Publicacion IS NOT NULL AND V.ID_Empresa IS NOT NULL
+    GROUP BY V.ID_Empresa, P.Fecha_Publicacion, COALESCE(P.Estado, 'Pendiente');
+
+    PRINT 'Tabla Resumen_Postulaciones_Empresa creada exitosamente';
+END
+ELSE
+BEGIN
+    PRINT 'La tabla Resumen_Postulaciones_Empresa ya existe';
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'Resumen_Postulaciones_Vacante')
+BEGIN
+    CREATE TABLE Resumen_Postulaciones_Vacante (
+        ID_Vacante INT NOT NULL,
+        Fecha DATE NOT NULL,
+        Estado VARCHAR(50) NOT NULL,
+        Cantidad INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (ID_Vacante, Fecha, Estado)
+    );
+
+    INSERT INTO Resumen_Postulaciones_Vacante (ID_Vacante, Fecha, Estado, Cantidad)
+    SELECT ID_Vacante, Fecha_Publicacion, COALESCE(Estado, 'Pendiente'), COUNT(*)
+    FROM Postulaciones
+    WHERE Fecha_Publicacion IS NOT NULL AND ID_Vacante IS NOT NULL
+    GROUP BY ID_Vacante, Fecha_Publicacion, COALESCE(Estado, 'Pendiente');
+
+    PRINT 'Tabla Resumen_Postulaciones_Vacante creada exitosamente';
+END
+ELSE
+BEGIN
+    PRINT 'La tabla Resumen_Postulaciones_Vacante ya existe';
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'Resumen_Estados_Vacante')
+BEGIN
+    CREATE TABLE Resumen_Estados_Vacante (
+        ID_Vacante INT NOT NULL,
+        Estado VARCHAR(50) NOT NULL,
+        Cantidad INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (ID_Vacante, Estado)
+    );
+
+    INSERT INTO Resumen_Estados_Vacante (ID_Vacante, Estado, Cantidad)
+    SELECT ID_Vacante, COALESCE(Estado, 'Pendiente'), COUNT(*)
+    FROM Postulaciones
+    WHERE ID_Vacante IS NOT NULL
+    GROUP BY ID_Vacante, COALESCE(Estado, 'Pendiente');
+
+    PRINT 'Tabla Resumen_Estados_Vacante creada exitosamente';
+END
+ELSE
+BEGIN
+    PRINT 'La tabla Resumen_Estados_Vacante ya existe';
+END
+GO
+
+-- Vacantes de cada empresa en el orden del desglose por vacante (las de más postulaciones
+-- primero): TOP (n) lee n filas del índice sin ordenar todas las vacantes de la empresa
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE object_id = OBJECT_ID('Vacantes') AND name = 'IX_Vacantes_Empresa')
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_Vacantes_Empresa
+    ON Vacantes (ID_Empresa, CantidadPostulaciones DESC, ID DESC)
+    INCLUDE (Titulo_puesto, Estado)
+    WHERE eliminado = 0;
+
+    PRINT 'Índice IX_Vacantes_Empresa creado exitosamente';
+END
+ELSE
+BEGIN
+    PRINT 'El índice IX_Vacantes_Empresa ya existe';
+END
+GO
+
+-- Un cambio de estado resta 1 en (fecha, estado anterior) y suma 1 en (fecha, estado nuevo).
+-- Las actualizaciones que no tocan Estado, Fecha_Publicacion ni ID_Vacante no hacen nada.
+CREATE OR ALTER TRIGGER TR_Resumen_Postulaciones
+ON Postulaciones
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    IF EXISTS (SELECT 1 FROM inserted) AND EXISTS (SELECT 1 FROM deleted)
+       AND NOT (UPDATE(Estado) OR UPDATE(Fecha_Publicacion) OR UPDATE(ID_Vacante))
+        RETURN;
+
+    DECLARE @Cambios TABLE (ID_Vacante INT, Fecha DATE NULL, Estado VARCHAR(50), Delta INT);
+    INSERT INTO @Cambios (ID_Vacante, Fecha, Estado, Delta)
+    SELECT ID_Vacante, Fecha, Estado, SUM(Delta)
+    FROM (
+        SELECT ID_Vacante, Fecha_Publicacion AS Fecha, COALESCE(Estado, 'Pendiente') AS Estado, 1 AS Delta
+        FROM inserted
+        UNION ALL
+        SELECT ID_Vacante, Fecha_Publicacion, COALESCE(Estado, 'Pendiente'), -1 FROM deleted
+    ) C
+    WHERE ID_Vacante IS NOT NULL
+    GROUP BY ID_Vacante, Fecha, Estado
+    HAVING SUM(Delta) <> 0;
+
+    IF NOT EXISTS (SELECT 1 FROM @Cambios)
+        RETURN;
+
+    MERGE Resumen_Postulaciones_Vacante WITH (HOLDLOCK) AS R
+    USING (SELECT ID_Vacante, Fecha, Estado, Delta FROM @Cambios WHERE Fecha IS NOT NULL) AS C
+    ON R.ID_Vacante = C.ID_Vacante AND R.Fecha = C.Fecha AND R.Estado = C.Estado
+    WHEN MATCHED AND R.Cantidad + C.Delta = 0 THEN DELETE
+    WHEN MATCHED THEN UPDATE SET Cantidad = R.Cantidad + C.Delta
+    WHEN NOT MATCHED THEN INSERT (ID_Vacante, Fecha, Estado, Cantidad)
+        VALUES (C.ID_Vacante, C.Fecha, C.Estado, C.Delta);
+
+    MERGE Resumen_Estados_Vacante WITH (HOLDLOCK) AS R
+    USING (
+        SELECT ID_Vacante, Estado, SUM(Delta) AS Delta FROM @Cambios
+        GROUP BY ID_Vacante, Estado HAVING SUM(Delta) <> 0
+    ) AS C
+    ON R.ID_Vacante = C.ID_Vacante AND R.Estado = C.Estado
+    WHEN MATCHED AND R.Cantidad + C.Delta = 0 THEN DELETE
+    WHEN MATCHED THEN UPDATE SET Cantidad = R.Cantidad + C.Delta
+    WHEN NOT MATCHED THEN INSERT (ID_Vacante, Estado, Cantidad)
+        VALUES (C.ID_Vacante, C.Estado, C.Delta);
+
+    MERGE Resumen_Postulaciones_Empresa WITH (HOLDLOCK) AS R
+    USING (
+        SELECT V.ID_Empresa, C.Fecha, C.Estado, SUM(C.Delta) AS Delta
+        FROM @Cambios C JOIN Vacantes V ON V.ID = C.ID_Vacante
+        WHERE C.Fecha IS NOT NULL AND V.ID_Empresa IS NOT NULL
+        GROUP BY V.ID_Empresa, C.Fecha, C.Estado HAVING SUM(C.Delta) <> 0
+    ) AS C
+    ON R.ID_Empresa = C.ID_Empresa AND R.Fecha = C.Fecha AND R.Estado = C.Estado
+    WHEN MATCHED AND R.Cantidad + C.Delta = 0 THEN DELETE
+    WHEN MATCHED THEN UPDATE SET Cantidad = R.Cantidad + C.Delta
+    WHEN NOT MATCHED THEN INSERT (ID_Empresa, Fecha, Estado, Cantidad)
+        VALUES (C.ID_Empresa, C.Fecha, C.Estado, C.Delta);
+END;
+GO
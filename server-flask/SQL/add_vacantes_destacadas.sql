@@ -0,0 +1,46 @@
+-- Script para materializar la selección de vacantes destacadas
+-- POST /api/actualizar-destacadas calcula el ranking y guarda aquí las vacantes
+-- seleccionadas; GET /api/vacantes/destacadas lee esta tabla (pocas filas) en lugar
+-- de recorrer Vacantes. El indicador Vacantes.Destacada se mantiene sincronizado
+-- actualizando solo las filas que cambian.
+
+USE [Bolsa_de_Trabajo];
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'Vacantes_Destacadas')
+BEGIN
+    CREATE TABLE Vacantes_Destacadas (
+        Posicion INT PRIMARY KEY,
+        ID_Vacante INT NOT NULL FOREIGN KEY REFERENCES Vacantes(ID),
+        Puntaje FLOAT,
+        Fecha_Calculo DATETIME NOT NULL DEFAULT GETDATE()
+    );
+
+    -- Conservar las vacantes que ya estaban marcadas como destacadas
+    INSERT INTO Vacantes_Destacadas (Posicion, ID_Vacante, Puntaje)
+    SELECT ROW_NUMBER() OVER (ORDER BY Fecha_Publicacion DESC, ID DESC), ID, NULL
+    FROM Vacantes
+    WHERE Destacada = 1;
+
+    PRINT 'Tabla Vacantes_Destacadas creada exitosamente';
+END
+ELSE
+BEGIN
+    PRINT 'La tabla Vacantes_Destacadas ya existe';
+END
+GO
+
+-- Índice filtrado: quitar el indicador solo recorre las vacantes destacadas actuales
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE object_id = OBJECT_ID('Vacantes') AND name = 'IX_Vacantes_Destacada')
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_Vacantes_Destacada
+    ON Vacantes (ID)
+    WHERE Destacada = 1;
+
+    PRINT 'Índice IX_Vacantes_Destacada creado exitosamente';
+END
+ELSE
+BEGIN
+    PRINT 'El índice IX_Vacantes_Destacada ya existe';
+END
+GO
@@ -0,0 +1,28 @@
+-- Script para agregar contadores de versión por recurso
+-- Cada escritura incrementa la versión del recurso afectado dentro de su transacción.
+-- Los listados de lectura frecuente calculan su ETag a partir de estas versiones
+-- y responden 304 Not Modified sin ejecutar la consulta completa.
+
+USE [Bolsa_de_Trabajo];
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'Versiones_Recurso')
+BEGIN
+    CREATE TABLE Versiones_Recurso (
+        Recurso VARCHAR(50) PRIMARY KEY,
+        Version BIGINT NOT NULL DEFAULT 0,
+        Fecha_Modificacion DATETIME NOT NULL DEFAULT GETDATE()
+    );
+
+    INSERT INTO Versiones_Recurso (Recurso) VALUES ('vacantes');
+    INSERT INTO Versiones_Recurso (Recurso) VALUES ('empresas');
+    INSERT INTO Versiones_Recurso (Recurso) VALUES ('usuarios');
+    INSERT INTO Versiones_Recurso (Recurso) VALUES ('candidatos');
+
+    PRINT 'Tabla Versiones_Recurso creada exitosamente';
+END
+ELSE
+BEGIN
+    PRINT 'La tabla Versiones_Recurso ya existe';
+END
+GO
@@ -0,0 +1,93 @@
+-- Procedimiento Almacenado para crear una postulación en un solo viaje a la base de datos
+-- Reemplaza las cuatro consultas previas de POST /api/postulaciones (rol del usuario,
+-- perfil de candidato, postulación duplicada y estado de la vacante) y el INSERT.
+-- No abre su propia transacción: la aplicación hace commit después de leer el resultado.
+-- Devuelve una fila (Resultado, PostulacionID); Resultado = 'OK' si se insertó.
+
+USE [Bolsa_de_Trabajo];
+GO
+
+CREATE OR ALTER PROCEDURE sp_CrearPostulacion
+    @ID_Usuario INT,
+    @ID_Vacante INT
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+
+    DECLARE @Rol VARCHAR(50);
+    DECLARE @UsuarioExiste BIT = 0;
+    DECLARE @CandidatoID INT;
+    DECLARE @VacanteExiste BIT = 0;
+    DECLARE @Estado VARCHAR(50);
+    DECLARE @FechaCierre DATE;
+    DECLARE @PostulacionID INT;
+
+    SELECT @UsuarioExiste = 1, @Rol = ROL FROM Usuario WHERE ID = @ID_Usuario;
+
+    IF @UsuarioExiste = 0
+    BEGIN
+        SELECT 'USUARIO_NO_ENCONTRADO' AS Resultado, NULL AS PostulacionID;
+        RETURN;
+    END;
+
+    IF @Rol IS NULL OR @Rol <> 'CANDIDATO'
+    BEGIN
+        SELECT 'NO_ES_CANDIDATO' AS Resultado, NULL AS PostulacionID;
+        RETURN;
+    END;
+
+    SELECT TOP (1) @CandidatoID = ID FROM Candidatos WHERE ID_Usuario = @ID_Usuario ORDER BY ID;
+
+    IF @CandidatoID IS NULL
+    BEGIN
+        SELECT 'SIN_PERFIL' AS Resultado, NULL AS PostulacionID;
+        RETURN;
+    END;
+
+    -- UPDLOCK/HOLDLOCK evita que dos peticiones simultáneas inserten la misma postulación
+    IF EXISTS (
+        SELECT 1 FROM Postulaciones WITH (UPDLOCK, HOLDLOCK)
+        WHERE ID_Candidato = @CandidatoID AND ID_Vacante = @ID_Vacante
+    )
+    BEGIN
+        SELECT 'DUPLICADA' AS Resultado, NULL AS PostulacionID;
+        RETURN;
+    END;
+
+    SELECT @VacanteExiste = 1, @Estado = Estado, @FechaCierre = Fecha_Cierre
+    FROM Vacantes
+    WHERE ID = @ID_Vacante AND eliminado = 0;
+
+    IF @VacanteExiste = 0
+    BEGIN
+        SELECT 'VACANTE_NO_EXISTE' AS Resultado, NULL AS PostulacionID;
+        RETURN;
+    END;
+
+    IF @Estado = 'Cerrada'
+    BEGIN
+        SELECT 'VACANTE_CERRADA' AS Resultado, NULL AS PostulacionID;
+        RETURN;
+    END;
+
+    IF @FechaCierre IS NOT NULL AND @FechaCierre < CAST(GETDATE() AS DATE)
+    BEGIN
+        SELECT 'VACANTE_CERRADA_POR_FECHA' AS Resultado, NULL AS PostulacionID;
+        RETURN;
+    END;
+
+    INSERT INTO Postulaciones (ID_Candidato, ID_Vacante, Fecha_Publicacion, Estado)
+    VALUES (@CandidatoID, @ID_Vacante, GETDATE(), 'Pendiente');
+
+    SET @PostulacionID = SCOPE_IDENTITY();
+
+    -- Igual que incrementar_version(conn, 'vacantes') en src/versiones.py
+    -- (CantidadPostulaciones cambia por el trigger TR_AfterInsert_Postulacion)
+    UPDATE Versiones_Recurso
+    SET Version = Version + 1, Fecha_Modificacion = GETDATE()
+    WHERE Recurso = 'vacantes';
+
+    SELECT 'OK' AS Resultado, @PostulacionID AS PostulacionID;
+END;
+GO
@@ -0,0 +1,101 @@
+"""Espacio en disco y archivos por carpeta con nombres por contenido, liberación y recolección.
+
+1. Un candidato sube --repeticiones veces el mismo CV (y la misma imagen): con nombres por
+   contenido la carpeta debe quedar con un solo archivo (antes quedaban --repeticiones).
+2. Subir un CV distinto libera el anterior en cuanto ninguna fila lo referencia.
+3. Recolección: con un huérfano de los nombres con uuid anteriores, un temporal abandonado
+   y un archivo de ejemplo, debe borrar solo los dos primeros (y nada en modo simulado).
+
+Se ejecuta con ARCHIVOS_GRACIA=0 para que la liberación sea inmediata. Sale con código 1
+si alguna comprobación falla.
+
+Uso (desde server-flask/; los archivos se escriben en un directorio temporal):
+    python -m benchmarks.bench_almacen_archivos --mb 2 --repeticiones 20
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_subidas import MB, preparar_base, escribir_cuerpo, enviar
+
+
+def uso_carpeta(carpeta):
+    archivos = [e for e in os.scandir(carpeta) if e.is_file()]
+    return len(archivos), sum(e.stat().st_size for e in archivos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mb', type=int, default=2, help="tamaño de cada CV")
+    parser.add_argument('--repeticiones', type=int, default=20)
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp(prefix='bench_almacen_')
+    ruta_bd = os.path.join(directorio, 'bolsa.db')
+    candidato = preparar_base(ruta_bd)
+    os.environ.update({'DB_URL': f"sqlite:///{ruta_bd}", 'ARCHIVOS_GRACIA': '0'})
+
+    from main import app
+    from src.almacen_archivos import almacen_archivos, CARPETA_CV, CARPETA_IMAGENES
+
+    os.chdir(directorio)
+    cliente = app.test_client()
+    fallas = []
+
+    cv_a, cv_b, imagen = (os.path.join(directorio, n) for n in ('a.bin', 'b.bin', 'imagen.bin'))
+    boundary_a, _ = escribir_cuerpo(cv_a, 'cv', 'cv.pdf', args.mb)
+    boundary_b, _ = escribir_cuerpo(cv_b, 'cv', 'otro.pdf', args.mb)
+    boundary_imagen, _ = escribir_cuerpo(imagen, 'image', 'foto.png', 1)
+
+    nombres = set()
+    for _ in range(args.repeticiones):
+        respuesta, _ = enviar(cliente, f'/api/candidato/upload-cv/{candidato}', cv_a, boundary_a)
+        nombres.add(respuesta.get_json().get('filename'))
+        enviar(cliente, f'/api/usuario/upload-image/{candidato}', imagen, boundary_imagen)
+    archivos_cv, bytes_cv = uso_carpeta(CARPETA_CV)
+    archivos_imagen, _ = uso_carpeta(os.path.join(CARPETA_IMAGENES, 'candidato'))
+    print(f"{args.repeticiones} subidas del mismo CV de {args.mb} MB y de la misma imagen:")
+    print(f"  antes (nombre uuid):  {args.repeticiones} archivos, {args.repeticiones * args.mb} MB por carpeta")
+    print(f"  por contenido:        CV {archivos_cv} archivo(s), {bytes_cv / MB:.0f} MB; imágenes {archivos_imagen}")
+    print(f"  {almacen_archivos.estado()['reutilizados']} subidas reutilizaron un archivo existente")
+    if len(nombres) != 1 or archivos_cv != 1 or archivos_imagen != 1:
+        fallas.append(f"se esperaba un archivo por carpeta: CV {archivos_cv}, imágenes {archivos_imagen}")
+
+    respuesta, _ = enviar(cliente, f'/api/candidato/upload-cv/{candidato}', cv_b, boundary_b)
+    restantes = os.listdir(CARPETA_CV)
+    print(f"\nCV distinto: quedan {restantes} (liberados {almacen_archivos.estado()['liberados']})")
+    if restantes != [respuesta.get_json()['filename']]:
+        fallas.append("el CV anterior sin referencias no se liberó")
+
+    # Huérfano con el nombre anterior, temporal de una subida interrumpida y archivo de ejemplo
+    viejo = time.time() - 86400
+    for nombre in ('cv_1_0123abcd.pdf', '.subida-abandonada', 'cv_ejemplo_1.pdf'):
+        ruta = os.path.join(CARPETA_CV, nombre)
+        with open(ruta, 'wb') as f:
+            f.write(os.urandom(1024))
+        os.utime(ruta, (viejo, viejo))
+
+    simulado = cliente.post('/api/admin/archivos/recolectar', json={"simular": True}).get_json()
+    inicio = time.perf_counter()
+    real = cliente.post('/api/admin/archivos/recolectar').get_json()
+    milisegundos = (time.perf_counter() - inicio) * 1000
+    restantes = sorted(os.listdir(CARPETA_CV))
+    print(f"\nrecolección simulada: {simulado['huerfanos']} huérfanos, {simulado['temporales']} temporales")
+    print(f"recolección ({milisegundos:.1f} ms): {real['revisados']} revisados, {real['referenciados']} referenciados, "
+          f"{real['huerfanos']} huérfanos y {real['temporales']} temporales borrados ({real['bytes']} bytes)")
+    print(f"quedan: {restantes}")
+    if (simulado['huerfanos'], simulado['temporales'], real['huerfanos'], real['temporales']) != (1, 1, 1, 1):
+        fallas.append("la recolección no encontró exactamente un huérfano y un temporal")
+    if 'cv_ejemplo_1.pdf' not in restantes or len(restantes) != 2:
+        fallas.append("la recolección borró archivos que debía conservar")
+
+    for falla in fallas:
+        print(f"FALLA: {falla}")
+    if fallas:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""Recorrido de la API sobre la base local (SQLite) y costo de traducir el T-SQL.
+
+1. Crea el esquema desde SQL/ en un archivo temporal (DB_MOTOR=sqlite) y recorre las rutas
+   principales: registro de empresa y candidato (sp_RegisterUser), login, vacantes (alta,
+   edición, listado paginado, búsqueda, destacadas), postulación (sp_CrearPostulacion y el
+   trigger de CantidadPostulaciones), cambio de estado, perfiles, habilidades y los listados y
+   estadísticas de administración. Ninguna ruta debe responder 500 y los resultados deben ser
+   los de SQL Server (paginación sin repetidos con vacantes del mismo día, conteos, 304).
+2. Mediana de cada GET con --repeticiones peticiones.
+3. Costo de traducir() para las consultas ejecutadas en el recorrido: primera vez y con caché.
+
+Sale con código 1 si alguna comprobación falla.
+
+Uso (desde server-flask/):
+    python -m benchmarks.bench_bd_local --vacantes 30 --repeticiones 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+
+def mediana_us(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1e6)
+    return statistics.median(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--vacantes', type=int, default=30)
+    parser.add_argument('--repeticiones', type=int, default=200)
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp(prefix='bench_bd_local_')
+    os.environ.update({'DB_MOTOR': 'sqlite', 'DB_URL': f"sqlite:///{os.path.join(directorio, 'bolsa.db')}",
+                       'BCRYPT_RONDAS': '4'})
+
+    inicio = time.perf_counter()
+    from sqlalchemy import event
+    from sqlalchemy.sql.elements import TextClause
+    from main import app
+    from src.bd_local import traducir
+    from src.conexion import engine
+    segundos_importar = time.perf_counter() - inicio
+
+    consultas = set()
+    event.listen(engine, 'before_execute',
+                 lambda conn, clausula, *_: consultas.add(clausula.text) if isinstance(clausula, TextClause) else None)
+    cliente = app.test_client()
+    fallas = []
+
+    def pedir(metodo, url, esperado=None, **kwargs):
+        respuesta = cliente.open(url, method=metodo, **kwargs)
+        if respuesta.status_code >= 500 or (esperado and respuesta.status_code != esperado):
+            fallas.append(f"{metodo} {url}: {respuesta.status_code} {respuesta.get_data(as_text=True)[:200]}")
+        return respuesta
+
+    print(f"import de main con creación del esquema: {segundos_importar * 1000:.0f} ms")
+
+    empresa = pedir('POST', '/api/register', 201, json={
+        "nombreUsuario": "empresa", "correo": "empresa@example.com", "contrasena": "secreta123",
+        "userType": "recruiter", "nombreEmpresa": "Empresa", "telefonoEmpresa": "4420000000"
+    }).get_json().get('userId')
+    candidato = pedir('POST', '/api/register', 201, json={
+        "nombreUsuario": "candidato", "correo": "candidato@example.com", "contrasena": "secreta123",
+        "nombreCandidato": "Ana", "apellidoCandidato": "López", "telefonoCandidato": "4421111111"
+    }).get_json().get('userId')
+    pedir('POST', '/api/register', 400, json={
+        "nombreUsuario": "candidato", "correo": "otro@example.com", "contrasena": "secreta123",
+        "nombreCandidato": "Ana", "apellidoCandidato": "López", "telefonoCandidato": "4421111111"
+    })
+    login = pedir('POST', '/api/login', 200, json={"usuario": "candidato", "contrasena": "secreta123"}).get_json()
+    if login.get('rol') != 'user':
+        fallas.append(f"login: rol {login.get('rol')}")
+
+    vacantes = []
+    for i in range(args.vacantes):
+        respuesta = pedir('POST', f'/api/empresa/{empresa}/vacantes', 201, json={
+            "titulo": f"Desarrollador Python {i}", "descripcion": "Backend con Flask y SQL",
+            "requisitos": "Python, SQL", "salario": 10000 + i * 500, "tipoContrato": "Tiempo completo",
+            "ubicacion": "Querétaro" if i % 2 else "CDMX", "fechaCierre": "2099-12-31"
+        })
+        vacantes.append(respuesta.get_json().get('id'))
+    pedir('PUT', f'/api/empresa/{empresa}/vacantes/{vacantes[0]}', 200, json={
+        "titulo": "Desarrollador Python Sr.", "descripcion": "Backend", "requisitos": "Python",
+        "salario": 30000, "tipoContrato": "Tiempo completo", "ubicacion": "CDMX", "fechaCierre": "2099-12-31"
+    })
+
+    # Todas las vacantes son del mismo día: el cursor (fecha, ID) no debe repetir ni saltar filas
+    vistas, cursor = [], None
+    while True:
+        url = '/api/vacantes?limite=7' + (f'&cursor={cursor}' if cursor else '')
+        pagina = pedir('GET', url, 200).get_json()
+        vistas += [v['id'] for v in pagina['vacantes']]
+        cursor = pagina['siguienteCursor']
+        if not cursor:
+            break
+    if sorted(vistas) != sorted(vacantes) or len(vistas) != len(set(vistas)):
+        fallas.append(f"paginación: {len(vistas)} vacantes vistas de {len(vacantes)}")
+
+    pedir('POST', '/api/postulaciones', 201, json={"userId": candidato, "vacanteId": vacantes[1]})
+    pedir('POST', '/api/postulaciones', 400, json={"userId": candidato, "vacanteId": vacantes[1]})
+    pedir('POST', '/api/postulaciones', 403, json={"userId": empresa, "vacanteId": vacantes[1]})
+    postulaciones = pedir('GET', f'/api/candidato/{candidato}/postulaciones', 200).get_json()
+    de_empresa = {v['id']: v for v in pedir('GET', f'/api/empresa/{empresa}/vacantes', 200).get_json()}
+    if de_empresa.get(vacantes[1], {}).get('cantidadPostulaciones') != 1:
+        fallas.append("TR_AfterInsert_Postulacion: CantidadPostulaciones no es 1")
+    estadisticas = pedir('GET', '/api/admin/estadisticas', 200).get_json()
+    if estadisticas.get('postulacionesMes') != 1 or estadisticas.get('vacantesActivas') != args.vacantes:
+        fallas.append(f"estadísticas: {estadisticas}")
+
+    etag = pedir('GET', '/api/vacantes', 200).headers.get('ETag')
+    if etag and pedir('GET', '/api/vacantes', headers={'If-None-Match': etag}).status_code != 304:
+        fallas.append("GET /api/vacantes con If-None-Match no respondió 304")
+
+    pedir('PUT', f'/api/candidato/{candidato}/habilidades', json={"habilidades": ["Python", "SQL"]})
+    pedir('POST', '/api/actualizar-destacadas', 200, json={})
+    empresa_postulaciones = pedir('GET', f'/api/empresa/{empresa}/postulaciones', 200).get_json()
+    postulacion_id = (empresa_postulaciones[0] if isinstance(empresa_postulaciones, list)
+                      else empresa_postulaciones['postulaciones'][0])['id']
+    pedir('PUT', f'/api/postulaciones/{postulacion_id}', 200, json={"estado": "Aceptado"})
+    detalle = pedir('GET', f'/api/empresa/{empresa}/vacantes/{vacantes[1]}', 200).get_json()
+    if detalle.get('estado') != 'Cerrada' or detalle.get('fechaCierre') != time.strftime('%Y-%m-%d'):
+        fallas.append(f"vacante aceptada: estado {detalle.get('estado')}, cierre {detalle.get('fechaCierre')}")
+
+    consultas_get = [
+        '/api/vacantes', '/api/vacantes?limite=10', '/api/vacantes/search?q=python', '/api/vacantes/destacadas',
+        f'/api/empresa/{empresa}/vacantes', f'/api/empresa/{empresa}/postulaciones',
+        f'/api/empresa/profile/{empresa}', f'/api/candidato/profile/{candidato}',
+        f'/api/candidato/{candidato}/postulaciones', f'/api/candidato/{candidato}/habilidades',
+        f'/api/candidato/{candidato}/vacantes-recomendadas',
+        f'/api/empresa/{empresa}/vacantes/{vacantes[2]}/candidatos-recomendados',
+        '/api/usuarios', '/api/empresas', '/api/admin/usuarios', '/api/admin/vacantes', '/api/admin/candidatos',
+        '/api/admin/empresas', '/api/admin/postulaciones', '/api/admin/estadisticas'
+    ]
+    print(f"\nmediana de {args.repeticiones} GET por ruta ({args.vacantes} vacantes):")
+    for url in consultas_get:
+        if pedir('GET', url).status_code >= 400:
+            fallas.append(f"GET {url}: {cliente.get(url).status_code}")
+            continue
+        print(f"  {url:<62}{mediana_us(lambda: cliente.get(url), args.repeticiones):>8.0f} µs")
+
+    primera = [mediana_us(lambda: traducir.__wrapped__(sql), 50) for sql in consultas]
+    con_cache = [mediana_us(lambda: traducir(sql), 50) for sql in consultas]
+    print(f"\ntraducir() en {len(consultas)} consultas distintas: "
+          f"primera vez {statistics.median(primera):.1f} µs (máx. {max(primera):.1f}), "
+          f"con caché {statistics.median(con_cache):.2f} µs")
+
+    for falla in fallas:
+        print(f"FALLA: {falla}")
+    if fallas:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
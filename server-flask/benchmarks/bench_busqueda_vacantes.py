@@ -0,0 +1,73 @@
+"""Benchmark del índice de búsqueda de vacantes: construcción y latencia de consulta.
+
+No requiere base de datos: genera vacantes sintéticas en memoria.
+
+Uso (desde server-flask/):
+    python -m benchmarks.bench_busqueda_vacantes --tamanos 10000 100000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from src.busqueda import IndiceInvertido
+
+PUESTOS = ['Desarrollador', 'Programador', 'Analista', 'Diseñador', 'Contador', 'Ingeniero',
+           'Administrador', 'Vendedor', 'Técnico', 'Gerente', 'Auxiliar', 'Soporte']
+AREAS = ['Python', 'Java', 'React', 'SQL Server', 'redes', 'ventas', 'contabilidad', 'logística',
+         'recursos humanos', 'mantenimiento', 'producción', 'calidad', 'diseño gráfico', 'nube']
+PALABRAS = ('experiencia trabajo equipo atención cliente desarrollo aplicaciones web móviles '
+            'bases datos análisis reportes gestión proyectos comunicación inglés liderazgo '
+            'documentación pruebas automatización seguridad sistemas operación planeación').split()
+CONSULTAS = ['python', 'desarrollador web', 'progra', 'diseño', 'diseno grafico', 'sql server reportes',
+             'ingeniero calidad produccion', 'ventas atencion cliente', 'java', 'contab']
+
+
+def generar(cantidad, semilla=7):
+    aleatorio = random.Random(semilla)
+    for i in range(cantidad):
+        area = aleatorio.choice(AREAS)
+        yield i + 1, {
+            "titulo": f"{aleatorio.choice(PUESTOS)} de {area}",
+            "descripcion": ' '.join(aleatorio.choices(PALABRAS, k=40)) + f" {area}",
+            "requisitos": ', '.join(aleatorio.sample(AREAS, 3))
+        }
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tamanos', nargs='+', type=int, default=[10000, 100000])
+    parser.add_argument('--repeticiones', type=int, default=20)
+    args = parser.parse_args()
+
+    for tamano in args.tamanos:
+        indice = IndiceInvertido()
+        inicio = time.perf_counter()
+        indice.reemplazar(generar(tamano))
+        construccion = time.perf_counter() - inicio
+        indice.buscar('calentamiento')
+
+        tiempos = []
+        for _ in range(args.repeticiones):
+            for consulta in CONSULTAS:
+                inicio = time.perf_counter()
+                indice.buscar(consulta, 20)
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+
+        inicio = time.perf_counter()
+        indice.agregar(tamano + 1, {"titulo": "Vacante nueva", "descripcion": "texto", "requisitos": "Python"})
+        indice.eliminar(tamano + 1)
+        incremental = (time.perf_counter() - inicio) * 1000
+
+        print(f"{tamano:>8} vacantes: construcción {construccion:6.2f}s | consulta p50 "
+              f"{statistics.median(tiempos):7.2f}ms p99 {percentil(tiempos, 0.99):7.2f}ms | "
+              f"alta+baja incremental {incremental:.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Benchmark de GET /api/vacantes con y sin la caché en memoria.
+
+Uso (desde server-flask/, con la base de datos configurada):
+    python -m benchmarks.bench_cache_vacantes --peticiones 500
+"""
+import argparse
+import time
+
+from main import app
+from src.cache import cache_vacantes
+
+
+def medir(cliente, ruta, peticiones):
+    """Ejecutar 'peticiones' GET secuenciales y devolver peticiones por segundo"""
+    inicio = time.perf_counter()
+    for _ in range(peticiones):
+        respuesta = cliente.get(ruta)
+        if respuesta.status_code != 200:
+            raise RuntimeError(f"{ruta} respondió {respuesta.status_code}: {respuesta.get_data(as_text=True)}")
+    return peticiones / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--peticiones', type=int, default=500)
+    parser.add_argument('--rutas', nargs='+', default=[
+        '/api/vacantes',
+        '/api/vacantes?limite=20&fields=id,titulo,salario,ubicacion',
+        '/api/vacantes/destacadas'
+    ])
+    args = parser.parse_args()
+
+    cliente = app.test_client()
+    for ruta in args.rutas:
+        resultados = {}
+        for habilitado in (False, True):
+            cache_vacantes.habilitado = habilitado
+            cache_vacantes.invalidar()
+            cliente.get(ruta)  # calentamiento (pool de conexiones y primera carga)
+            resultados[habilitado] = medir(cliente, ruta, args.peticiones)
+        mejora = resultados[True] / resultados[False] if resultados[False] else 0
+        print(f"{ruta}")
+        print(f"  sin caché: {resultados[False]:10.1f} req/s")
+        print(f"  con caché: {resultados[True]:10.1f} req/s  (x{mejora:.1f})")
+    print(f"Contadores: {cache_vacantes.estadisticas()}")
+
+
+if __name__ == '__main__':
+    main()
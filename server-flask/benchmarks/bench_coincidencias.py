@@ -0,0 +1,73 @@
+"""Benchmark del motor de coincidencias candidato-vacante.
+
+No requiere base de datos: genera habilidades, candidatos y vacantes sintéticos.
+
+Uso (desde server-flask/):
+    python -m benchmarks.bench_coincidencias --candidatos 100000 --vacantes 10000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from src.coincidencias import IndiceCoincidencias
+
+
+def generar(candidatos, vacantes, habilidades, habilidades_por_candidato, semilla=11):
+    aleatorio = random.Random(semilla)
+    catalogo = [(i + 1, f"habilidad{i + 1}") for i in range(habilidades)]
+    # Distribución sesgada: unas pocas habilidades son muy comunes
+    pesos = [1 / (i + 1) ** 0.8 for i in range(habilidades)]
+    pares = []
+    for candidato_id in range(1, candidatos + 1):
+        elegidas = set(aleatorio.choices(range(1, habilidades + 1), weights=pesos, k=habilidades_por_candidato))
+        pares.extend((candidato_id, h) for h in elegidas)
+    lista_vacantes = []
+    for vacante_id in range(1, vacantes + 1):
+        requeridas = aleatorio.choices(catalogo, weights=pesos, k=5)
+        lista_vacantes.append((vacante_id, ', '.join(nombre for _, nombre in requeridas) + ', trabajo en equipo'))
+    return catalogo, pares, lista_vacantes
+
+
+def medir(funcion, argumentos):
+    tiempos = []
+    for argumento in argumentos:
+        inicio = time.perf_counter()
+        funcion(argumento, 10)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+    return statistics.median(tiempos), tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.99))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--candidatos', type=int, default=100000)
+    parser.add_argument('--vacantes', type=int, default=10000)
+    parser.add_argument('--habilidades', type=int, default=500)
+    parser.add_argument('--habilidades-por-candidato', type=int, default=8)
+    parser.add_argument('--consultas', type=int, default=200)
+    args = parser.parse_args()
+
+    catalogo, pares, vacantes = generar(args.candidatos, args.vacantes, args.habilidades,
+                                        args.habilidades_por_candidato)
+    inicio = time.perf_counter()
+    indice = IndiceCoincidencias(catalogo, pares, vacantes)
+    construccion = time.perf_counter() - inicio
+    print(f"{args.candidatos} candidatos, {len(pares)} pares candidato-habilidad, {args.vacantes} vacantes")
+    print(f"construcción del índice: {construccion:.2f}s")
+
+    aleatorio = random.Random(3)
+    requisitos = [indice.catalogo.extraer(texto) for _, texto in aleatorio.sample(vacantes, args.consultas)]
+    p50, p99 = medir(indice.mejores_candidatos, requisitos)
+    print(f"top-10 candidatos por vacante: p50 {p50:.2f}ms p99 {p99:.2f}ms")
+
+    por_candidato = {}
+    for candidato_id, habilidad in pares:
+        por_candidato.setdefault(candidato_id, set()).add(habilidad)
+    perfiles = [por_candidato[c] for c in aleatorio.sample(sorted(por_candidato), args.consultas)]
+    p50, p99 = medir(indice.mejores_vacantes, perfiles)
+    print(f"top-10 vacantes por candidato: p50 {p50:.2f}ms p99 {p99:.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Concurrencia de las rutas públicas de mayor tráfico: worker gthread vs worker gevent.
+
+Levanta gunicorn (un worker) en cada modo con la misma base de datos y envía la misma
+carga a GET /api/vacantes, POST /api/login y POST /api/postulaciones con muchos clientes
+simultáneos. En modo hilos un worker atiende WEB_THREADS peticiones a la vez; en modo
+gevent las peticiones esperan a SQL Server en greenlets y el límite es el pool.
+
+Uso (desde server-flask/, con la base de datos configurada en DB_URL o la de por defecto):
+    python -m benchmarks.bench_concurrencia --usuario juan@example.com --contrasena secreta \\
+        --candidato 1 --vacante 1 --clientes 64 --duracion 20
+POST /api/postulaciones crea como máximo una postulación; las demás responden 400
+(duplicada) después de ejecutar sp_CrearPostulacion completo.
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from benchmarks.carga_rutas import ejecutar, reportar
+
+DIRECTORIO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def puerto_libre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def esperar_servidor(puerto, proceso, limite=30):
+    fin = time.monotonic() + limite
+    while time.monotonic() < fin:
+        if proceso.poll() is not None:
+            raise RuntimeError("gunicorn terminó al iniciar; revisa la salida anterior")
+        try:
+            socket.create_connection(('127.0.0.1', puerto), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"gunicorn no respondió en {limite}s")
+
+
+def levantar(modo, puerto, hilos, tamano_pool):
+    entorno = dict(os.environ, WEB_MODO=modo, WEB_CONCURRENCY='1', WEB_THREADS=str(hilos),
+                   DB_POOL_TAMANO=str(tamano_pool), DB_POOL_DESBORDAMIENTO='0')
+    comando = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+               '--bind', f'127.0.0.1:{puerto}', '--access-logfile', '', 'wsgi:app']
+    proceso = subprocess.Popen(comando, cwd=DIRECTORIO, env=entorno)
+    esperar_servidor(puerto, proceso)
+    return proceso
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--usuario', required=True, help="usuario o correo para /api/login")
+    parser.add_argument('--contrasena', required=True)
+    parser.add_argument('--candidato', type=int, required=True, help="ID de usuario candidato")
+    parser.add_argument('--vacante', type=int, required=True)
+    parser.add_argument('--clientes', type=int, default=64)
+    parser.add_argument('--duracion', type=float, default=20.0)
+    parser.add_argument('--hilos', type=int, default=8, help="WEB_THREADS del modo hilos")
+    parser.add_argument('--pool', type=int, default=20, help="DB_POOL_TAMANO de ambos modos")
+    parser.add_argument('--modos', nargs='+', default=['hilos', 'gevent'])
+    args = parser.parse_args()
+
+    rutas = [
+        ('GET', '/api/vacantes', 6, None),
+        ('POST', '/api/login', 2, {"usuario": args.usuario, "contrasena": args.contrasena}),
+        ('POST', '/api/postulaciones', 2, {"userId": args.candidato, "vacanteId": args.vacante})
+    ]
+    for modo in args.modos:
+        puerto = puerto_libre()
+        proceso = levantar(modo, puerto, args.hilos, args.pool)
+        try:
+            base = f"http://127.0.0.1:{puerto}"
+            ejecutar(base, rutas, args.clientes, 2, 0, 30)  # calentamiento
+            print(f"\nmodo {modo}: {args.clientes} clientes, {args.duracion:g}s, "
+                  f"{args.hilos if modo == 'hilos' else 'sin límite de'} hilos, pool {args.pool}")
+            tiempos, estados = ejecutar(base, rutas, args.clientes, args.duracion, 1, 30)
+            reportar(tiempos, estados, args.duracion)
+        finally:
+            proceso.terminate()
+            proceso.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""Consultas por endpoint y latencia de los flujos que antes hacían varias consultas secuenciales.
+
+Verifica que cada endpoint haga exactamente las consultas de CONSULTAS_ESPERADAS (sale con
+código 1 si alguno no coincide) y compara la latencia de las consultas anteriores
+(búsqueda de Empresa/Candidatos seguida de la consulta principal) con la consulta única.
+
+Uso (desde server-flask/, con la base de datos configurada y SQL/create_postulacion_sp.sql aplicado):
+    python -m benchmarks.bench_consultas_por_endpoint --candidato 1 --empresa 2 --vacante 1
+Con --escrituras también se verifican POST /api/postulaciones (crea como máximo una
+postulación del candidato a la vacante) y POST /api/empresa/<id>/vacantes (crea una vacante).
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from sqlalchemy import text
+
+from main import app
+from src import acceso_datos
+from src.busqueda import indice_vacantes
+from src.conexion import obtener_conexion
+from src.instrumentacion import contar_consultas
+
+# Viajes a la base de datos por petición (antes entre paréntesis)
+CONSULTAS_ESPERADAS = {
+    'GET /api/empresa/<id>/vacantes': 1,          # (2)
+    'GET /api/empresa/<id>/postulaciones': 1,     # (2)
+    'GET /api/candidato/<id>/postulaciones': 1,   # (3)
+    'POST /api/postulaciones': 1,                 # (6: 4 SELECT + INSERT + versión)
+    'POST /api/empresa/<id>/vacantes': 2          # (3: SELECT Empresa + INSERT + versión)
+}
+
+# Secuencias de consultas que hacían los endpoints antes de acceso_datos
+_empresa = text("SELECT ID FROM Empresa WHERE ID_Usuario = :user_id")
+_usuario = text("SELECT ROL FROM Usuario WHERE ID = :user_id AND eliminado = 0")
+_candidato = text("SELECT ID FROM Candidatos WHERE ID_Usuario = :user_id")
+_vacantes = text("""
+    SELECT ID, Titulo_puesto, Descripcion, Requisitos, Salario, Tipo_Contrato, Ubicacion,
+           Fecha_Publicacion, Fecha_Cierre, Estado, CantidadPostulaciones
+    FROM Vacantes WHERE ID_Empresa = :empresa_id AND eliminado = 0
+    ORDER BY Fecha_Publicacion DESC
+""")
+_postulaciones_candidato = text("""
+    SELECT P.ID, P.Fecha_Publicacion, P.Estado, V.ID, V.Titulo_puesto, V.Descripcion, V.Salario,
+           V.Ubicacion, V.Tipo_Contrato, V.Fecha_publicacion, V.Fecha_cierre, E.ID, E.Nombre, E.Descripcion
+    FROM Postulaciones P
+    JOIN Vacantes V ON P.ID_Vacante = V.ID
+    JOIN Empresa E ON V.ID_Empresa = E.ID
+    WHERE P.ID_Candidato = :candidato_id AND V.eliminado = 0
+    ORDER BY P.Fecha_Publicacion DESC
+""")
+_duplicada = text("SELECT 1 FROM Postulaciones WHERE ID_Candidato = :candidato_id AND ID_Vacante = :vacante_id")
+_vacante = text("SELECT ID, Fecha_Cierre, Estado FROM Vacantes WHERE ID = :vacante_id AND eliminado = 0")
+
+
+def vacantes_antes(conn, args):
+    empresa = conn.execute(_empresa, {"user_id": args.empresa}).fetchone()
+    return conn.execute(_vacantes, {"empresa_id": empresa.ID}).fetchall()
+
+
+def postulaciones_candidato_antes(conn, args):
+    conn.execute(_usuario, {"user_id": args.candidato}).fetchone()
+    candidato = conn.execute(_candidato, {"user_id": args.candidato}).fetchone()
+    return conn.execute(_postulaciones_candidato, {"candidato_id": candidato.ID}).fetchall()
+
+
+def validar_postulacion_antes(conn, args):
+    conn.execute(_usuario, {"user_id": args.candidato}).fetchone()
+    candidato = conn.execute(_candidato, {"user_id": args.candidato}).fetchone()
+    parametros = {"candidato_id": candidato.ID, "vacante_id": args.vacante}
+    conn.execute(_duplicada, parametros).fetchone()
+    return conn.execute(_vacante, parametros).fetchone()
+
+
+FLUJOS = {
+    'vacantes de empresa': (vacantes_antes, lambda conn, args: acceso_datos.vacantes_de_empresa(conn, args.empresa)),
+    'postulaciones de candidato': (
+        postulaciones_candidato_antes,
+        lambda conn, args: acceso_datos.postulaciones_de_candidato(conn, args.candidato)
+    ),
+    # El procedimiento inserta si la postulación es válida; se revierte en cada repetición
+    'crear postulación': (
+        validar_postulacion_antes,
+        lambda conn, args: acceso_datos.crear_postulacion(conn, args.candidato, args.vacante)
+    )
+}
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+def verificar_consultas(cliente, args):
+    """Ejecutar cada endpoint dentro de contar_consultas(). Devuelve la lista de discrepancias"""
+    peticiones = [
+        ('GET /api/empresa/<id>/vacantes', lambda: cliente.get(f'/api/empresa/{args.empresa}/vacantes')),
+        ('GET /api/empresa/<id>/postulaciones', lambda: cliente.get(f'/api/empresa/{args.empresa}/postulaciones')),
+        ('GET /api/candidato/<id>/postulaciones', lambda: cliente.get(f'/api/candidato/{args.candidato}/postulaciones'))
+    ]
+    if args.escrituras:
+        # Sin índice de búsqueda construido vacantes_modificadas no consulta la base de datos
+        indice_vacantes.invalidar()
+        peticiones += [
+            ('POST /api/postulaciones', lambda: cliente.post('/api/postulaciones', json={
+                "userId": args.candidato, "vacanteId": args.vacante
+            })),
+            ('POST /api/empresa/<id>/vacantes', lambda: cliente.post(f'/api/empresa/{args.empresa}/vacantes', json={
+                "titulo": "Vacante de benchmark", "descripcion": "Creada por bench_consultas_por_endpoint",
+                "requisitos": "Python", "salario": 10000, "tipoContrato": "Tiempo completo", "ubicacion": "Querétaro"
+            }))
+        ]
+
+    discrepancias = []
+    for nombre, peticion in peticiones:
+        with contar_consultas() as contador:
+            respuesta = peticion()
+        esperadas = CONSULTAS_ESPERADAS[nombre]
+        estado = 'ok' if contador.total == esperadas else 'ERROR'
+        print(f"{nombre:<42}{respuesta.status_code:>5}{contador.total:>6} consultas (esperadas {esperadas}) {estado}")
+        if contador.total != esperadas:
+            discrepancias.append(nombre)
+            for sentencia in contador.sentencias:
+                print(f"    {' '.join(sentencia.split())[:100]}")
+    return discrepancias
+
+
+def medir_flujos(args):
+    conn = obtener_conexion()
+    try:
+        print(f"\n{'flujo':<30}{'antes p50':>12}{'p99':>10}{'después p50':>14}{'p99':>10}")
+        for nombre, (antes, despues) in FLUJOS.items():
+            tiempos = {}
+            for etiqueta, flujo in (('antes', antes), ('despues', despues)):
+                flujo(conn, args)  # calentamiento (planes de ejecución en caché)
+                conn.rollback()
+                muestras = []
+                for _ in range(args.repeticiones):
+                    inicio = time.perf_counter()
+                    flujo(conn, args)
+                    muestras.append((time.perf_counter() - inicio) * 1000)
+                    conn.rollback()
+                tiempos[etiqueta] = muestras
+            print(f"{nombre:<30}{statistics.median(tiempos['antes']):>10.2f}ms{percentil(tiempos['antes'], 0.99):>8.2f}ms"
+                  f"{statistics.median(tiempos['despues']):>12.2f}ms{percentil(tiempos['despues'], 0.99):>8.2f}ms")
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--candidato', type=int, required=True, help="ID de usuario con rol CANDIDATO y perfil")
+    parser.add_argument('--empresa', type=int, required=True, help="ID de usuario con empresa")
+    parser.add_argument('--vacante', type=int, required=True, help="ID de una vacante abierta")
+    parser.add_argument('--repeticiones', type=int, default=200)
+    parser.add_argument('--escrituras', action='store_true')
+    args = parser.parse_args()
+
+    discrepancias = verificar_consultas(app.test_client(), args)
+    medir_flujos(args)
+    if discrepancias:
+        print(f"\nConsultas distintas a las esperadas en: {', '.join(discrepancias)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""Almacén de desafíos 2FA bajo logins concurrentes y POST /api/verify-2fa sin consultas.
+
+1. Operaciones del almacén en memoria desde --hilos hilos (crear + un código incorrecto
+   + el correcto por login) y el costo de purgar --desafios desafíos vencidos de una vez.
+2. Login + verificación completos por el test client de Flask contra SQLite: verifica que
+   /api/verify-2fa no haga ninguna consulta (sale con código 1 si hace alguna) y mide ambas rutas.
+
+Uso (desde server-flask/):
+    python -m benchmarks.bench_dos_factores --hilos 16 --duracion 5 --usuarios 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import bcrypt
+
+# Un solo worker: src.dos_factores crea al importarse el almacén en memoria que se mide aquí
+# (con WEB_CONCURRENCY > 1 usaría la tabla Desafios_Dos_Factores)
+os.environ['WEB_CONCURRENCY'] = '1'
+
+from src.dos_factores import AlmacenDesafios, VALIDO, INVALIDO
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))] if ordenados else 0.0
+
+
+def medir_almacen(hilos, duracion):
+    almacen = AlmacenDesafios(ttl=300, intentos_max=5)
+    tiempos, errores = [], [0]
+    lock = threading.Lock()
+    fin = time.monotonic() + duracion
+
+    def trabajador(numero):
+        usuario, propios = numero * 1_000_000, []
+        while time.monotonic() < fin:
+            usuario += 1
+            inicio = time.perf_counter()
+            codigo = almacen.crear(usuario, {"id": usuario})
+            incorrecto = almacen.verificar(usuario, '000000' if codigo != '000000' else '111111')[0]
+            correcto = almacen.verificar(usuario, codigo)[0]
+            propios.append((time.perf_counter() - inicio) * 1e6)
+            if (incorrecto, correcto) != (INVALIDO, VALIDO):
+                errores[0] += 1
+        with lock:
+            tiempos.extend(propios)
+
+    trabajadores = [threading.Thread(target=trabajador, args=(i,)) for i in range(hilos)]
+    for t in trabajadores:
+        t.start()
+    for t in trabajadores:
+        t.join()
+    return len(tiempos) / duracion, statistics.median(tiempos), percentil(tiempos, 0.99), errores[0]
+
+
+def medir_purga(desafios):
+    """Segundos del crear() que encuentra 'desafios' desafíos vencidos"""
+    almacen = AlmacenDesafios(ttl=0.05, max_desafios=desafios + 1)
+    for usuario in range(desafios):
+        almacen.crear(usuario, {"id": usuario})
+    time.sleep(0.06)
+    inicio = time.perf_counter()
+    almacen.crear(-1, {"id": -1})
+    return time.perf_counter() - inicio, almacen.estado()["desafios"]
+
+
+def preparar_base(ruta, usuarios):
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(f"sqlite:///{ruta}")
+    hash_prueba = bcrypt.hashpw(b'clave', bcrypt.gensalt(4)).decode('utf-8')
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE Usuario (ID INTEGER PRIMARY KEY, NombreUsuario TEXT, Correo TEXT,
+                                  Contrasena TEXT, ROL TEXT, RutaImagen TEXT, eliminado INTEGER)
+        """))
+        conn.execute(text("""
+            INSERT INTO Usuario (ID, NombreUsuario, Correo, Contrasena, ROL, eliminado)
+            VALUES (:id, :usuario, :correo, :hash, 'CANDIDATO', 0)
+        """), [{"id": i, "usuario": f"usuario{i}", "correo": f"usuario{i}@example.com", "hash": hash_prueba}
+               for i in range(1, usuarios + 1)])
+    engine.dispose()
+
+
+def medir_rutas(hilos, duracion, usuarios):
+    from main import app
+    from src.instrumentacion import contar_consultas
+
+    tiempos = {"login": [], "verify-2fa": []}
+    consultas_verificacion, fallos = [], [0]
+    lock = threading.Lock()
+    fin = time.monotonic() + duracion
+
+    def trabajador(numero):
+        cliente = app.test_client()
+        # Cada hilo usa sus propios usuarios: un login nuevo reemplaza el desafío anterior
+        propios = [u for u in range(1, usuarios + 1) if u % hilos == numero]
+        i = 0
+        while time.monotonic() < fin:
+            usuario = propios[i % len(propios)]
+            i += 1
+            inicio = time.perf_counter()
+            r = cliente.post('/api/login', json={"usuario": f"usuario{usuario}", "contrasena": "clave"})
+            medio = time.perf_counter()
+            if r.status_code != 200:
+                with lock:
+                    fallos[0] += 1
+                continue
+            with contar_consultas() as contador:
+                v = cliente.post('/api/verify-2fa', json={"usuario_id": usuario,
+                                                          "codigo": r.get_json()["codigo_desarrollo"]})
+            final = time.perf_counter()
+            with lock:
+                tiempos["login"].append((medio - inicio) * 1000)
+                tiempos["verify-2fa"].append((final - medio) * 1000)
+                consultas_verificacion.append(contador.total)
+                if v.status_code != 200 or v.get_json()["usuario"]["id"] != usuario:
+                    fallos[0] += 1
+
+    trabajadores = [threading.Thread(target=trabajador, args=(i,)) for i in range(hilos)]
+    for t in trabajadores:
+        t.start()
+    for t in trabajadores:
+        t.join()
+    return tiempos, consultas_verificacion, fallos[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--hilos', type=int, default=16)
+    parser.add_argument('--duracion', type=float, default=5.0, help="segundos por medición")
+    parser.add_argument('--desafios', type=int, default=100000)
+    parser.add_argument('--usuarios', type=int, default=200)
+    args = parser.parse_args()
+
+    logins, p50, p99, errores = medir_almacen(args.hilos, args.duracion)
+    print(f"almacén, {args.hilos} hilos: {logins:.0f} logins/s (crear + 2 verificaciones), "
+          f"p50 {p50:.1f}µs, p99 {p99:.1f}µs, resultados inesperados {errores}")
+    segundos, restantes = medir_purga(args.desafios)
+    print(f"purga de {args.desafios} desafíos vencidos en un crear(): {segundos * 1000:.1f}ms "
+          f"(quedan {restantes})")
+
+    ruta = os.path.join(tempfile.mkdtemp(prefix='bench_2fa_'), 'bolsa.db')
+    preparar_base(ruta, max(args.usuarios, args.hilos))
+    # Cola de hashing para todos los hilos y sin límite por IP (todas las peticiones vienen de
+    # 127.0.0.1): aquí se mide la 2FA, no el 429 del login
+    os.environ.update({'DB_URL': f"sqlite:///{ruta}", 'DOSFA_MOSTRAR_CODIGO': '1',
+                       'HASH_COLA_MAX': str(args.hilos),
+                       'LIMITE_LOGIN_IP': '1000000/60', 'LIMITE_2FA_IP': '1000000/60'})
+    tiempos, consultas, fallos = medir_rutas(args.hilos, args.duracion, max(args.usuarios, args.hilos))
+
+    from src.contrasenas import servicio_contrasenas
+    servicio_contrasenas.cerrar()
+    print(f"\n{'ruta':<22}{'peticiones':>11}{'p50':>10}{'p99':>10}")
+    for nombre, muestras in tiempos.items():
+        print(f"POST /api/{nombre:<12}{len(muestras):>11}{statistics.median(muestras):>8.2f}ms"
+              f"{percentil(muestras, 0.99):>8.2f}ms")
+    print(f"consultas por verificación: máx {max(consultas)}; logins o verificaciones fallidos: {fallos}")
+    if max(consultas) != 0 or fallos or errores:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+"""Estadísticas de administración: cuatro COUNT(*) por carga del panel vs contadores por triggers.
+
+1. Genera --postulaciones postulaciones en una base SQLite nueva (benchmarks.datos_sinteticos)
+   y mide la mediana de la consulta anterior de GET /api/admin/estadisticas contra la lectura
+   de Estadisticas_Contadores / Estadisticas_Periodos y la ruta completa.
+2. Hace escrituras por la API (registro, postulaciones, cierre y borrado lógico de vacantes,
+   borrado de usuarios, cambio de rol) y comprueba que el panel coincide con los conteos
+   reales (sin eliminados) y que reconciliar no encuentra diferencias.
+3. Compara /api/admin/estadisticas/periodo con COUNT(*) por rango de fechas en --rangos
+   rangos al azar, por mes y por día.
+4. Descuadra un contador y un periodo a mano y comprueba que reconciliar los corrige.
+
+Sale con código 1 si alguna comprobación falla.
+
+Uso (desde server-flask/):
+    python -m benchmarks.bench_estadisticas_admin --postulaciones 100000 --repeticiones 50
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+CONSULTA_ANTERIOR = """
+    SELECT
+        (SELECT COUNT(*) FROM Vacantes WHERE Estado = 'Abierta') as VacantesActivas,
+        (SELECT COUNT(*) FROM Candidatos) as CandidatosRegistrados,
+        (SELECT COUNT(*) FROM Empresa) as EmpresasActivas,
+        (SELECT COUNT(*) FROM Postulaciones WHERE MONTH(Fecha_Publicacion) = MONTH(GETDATE()) AND YEAR(Fecha_Publicacion) = YEAR(GETDATE())) as PostulacionesMes
+"""
+CONSULTA_REAL = """
+    SELECT
+        (SELECT COUNT(*) FROM Vacantes WHERE Estado = 'Abierta' AND eliminado = 0) AS vacantesActivas,
+        (SELECT COUNT(*) FROM Candidatos C JOIN Usuario U ON U.ID = C.ID_Usuario WHERE U.eliminado = 0) AS candidatosRegistrados,
+        (SELECT COUNT(*) FROM Empresa E JOIN Usuario U ON U.ID = E.ID_Usuario WHERE U.eliminado = 0) AS empresasActivas,
+        (SELECT COUNT(*) FROM Postulaciones WHERE Fecha_Publicacion >= :mes) AS postulacionesMes
+"""
+
+
+def mediana_ms(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--postulaciones', type=int, default=100000)
+    parser.add_argument('--repeticiones', type=int, default=50)
+    parser.add_argument('--rangos', type=int, default=30)
+    parser.add_argument('--semilla', type=int, default=1)
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp(prefix='bench_estadisticas_')
+    os.environ.update({'DB_MOTOR': 'sqlite', 'DB_URL': f"sqlite:///{os.path.join(directorio, 'bolsa.db')}",
+                       'BCRYPT_RONDAS': '4', 'ESTADISTICAS_RECONCILIAR': '0'})
+    from sqlalchemy import text
+    from benchmarks.datos_sinteticos import generar
+    from main import app
+    from src.conexion import engine
+    from src.estadisticas import estadisticas_admin
+
+    print(f"generando {args.postulaciones} postulaciones en {directorio}")
+    muestra = generar(engine, args.postulaciones, semilla=args.semilla, rondas=4)
+    cliente = app.test_client()
+    aleatorio = random.Random(args.semilla)
+    fallas = []
+
+    def pedir(metodo, url, esperado=200, **kwargs):
+        respuesta = cliente.open(url, method=metodo, **kwargs)
+        if respuesta.status_code != esperado:
+            fallas.append(f"{metodo} {url}: {respuesta.status_code} {respuesta.get_data(as_text=True)[:200]}")
+        return respuesta
+
+    def reales():
+        with engine.connect() as conn:
+            return dict(conn.execute(text(CONSULTA_REAL), {"mes": date.today().replace(day=1)}).fetchone()._mapping)
+
+    def comparar_panel(momento):
+        panel = pedir('GET', '/api/admin/estadisticas').get_json()
+        esperado = reales()
+        if panel != esperado:
+            fallas.append(f"{momento}: panel {panel} != conteo real {esperado}")
+
+    # La primera lectura crea los contadores (base recién creada)
+    pedir('GET', '/api/admin/estadisticas')
+    with engine.connect() as conn:
+        anterior = mediana_ms(lambda: conn.execute(text(CONSULTA_ANTERIOR)).fetchone(), args.repeticiones)
+        contadores = mediana_ms(lambda: estadisticas_admin.panel(conn), args.repeticiones)
+    ruta = mediana_ms(lambda: cliente.get('/api/admin/estadisticas'), args.repeticiones)
+    print(f"mediana de {args.repeticiones}: consulta anterior {anterior:.2f} ms, contadores {contadores:.3f} ms, "
+          f"ruta completa {ruta:.2f} ms ({anterior / contadores:.0f}x en la consulta)")
+    comparar_panel("después de la carga")
+
+    # Escrituras por la API que mueven los contadores
+    empresa = muestra['empresa']['usuario']
+    for i in range(5):
+        pedir('POST', '/api/register', 201, json={
+            "nombreUsuario": f"bench_estadisticas{i}", "correo": f"bench_estadisticas{i}@example.com",
+            "contrasena": "secreta123", "nombreCandidato": "Ana", "apellidoCandidato": "López",
+            "telefonoCandidato": "4421111111"
+        })
+    pedir('POST', '/api/register', 201, json={
+        "nombreUsuario": "bench_estadisticas_empresa", "correo": "bench_estadisticas_empresa@example.com",
+        "contrasena": "secreta123", "userType": "recruiter", "nombreEmpresa": "Empresa",
+        "telefonoEmpresa": "4420000000"
+    })
+    for candidato in aleatorio.sample(muestra['candidatos'], 20):
+        respuesta = cliente.post('/api/postulaciones', json={"userId": candidato['usuario'],
+                                                              "vacanteId": aleatorio.choice(muestra['vacantesAbiertas'])})
+        if respuesta.status_code not in (201, 400):
+            fallas.append(f"POST /api/postulaciones: {respuesta.status_code}")
+    vacantes = aleatorio.sample(muestra['vacantesEmpresa'], 6)
+    for vacante in vacantes[:2]:
+        pedir('DELETE', f'/api/empresa/{empresa}/vacantes/{vacante}')
+    for vacante in vacantes[2:4]:
+        pedir('DELETE', f'/api/admin/vacantes/{vacante}')
+    pedir('PUT', f'/api/empresa/{empresa}/vacantes/{vacantes[4]}', json={
+        "titulo": "Cerrada", "descripcion": "Cerrada", "requisitos": "Python", "salario": 20000,
+        "tipoContrato": "Tiempo completo", "ubicacion": "CDMX", "fechaCierre": "2099-12-31", "estado": "Cerrada"
+    })
+    for candidato in aleatorio.sample(muestra['candidatos'], 3):
+        pedir('DELETE', f"/api/admin/usuarios/{candidato['usuario']}")
+    # Cambio de rol de un candidato recién registrado (sin postulaciones que lo referencien)
+    with engine.connect() as conn:
+        registrado = conn.execute(text("SELECT ID FROM Usuario WHERE NombreUsuario = 'bench_estadisticas0'")).scalar()
+    pedir('PUT', f"/api/admin/usuarios/{registrado}", json={
+        "nombreUsuario": "bench_estadisticas0", "correo": "bench_estadisticas0@example.com", "rol": "EMPRESA"
+    })
+    pedir('PUT', f"/api/postulaciones/{muestra['postulacionesEmpresa'][0]}", json={"estado": "Aceptado"})
+    comparar_panel("después de las escrituras")
+    with engine.connect() as conn:
+        resultado = estadisticas_admin.reconciliar(conn)
+        conn.commit()
+    if resultado['contadores'] or resultado['periodosCorregidos']:
+        fallas.append(f"reconciliar encontró diferencias que los triggers no mantuvieron: {resultado}")
+    print(f"reconciliación completa: {resultado['segundos'] * 1000:.0f} ms")
+
+    # Rangos al azar contra COUNT(*) directo
+    hoy = date.today()
+    tiempos = []
+    with engine.connect() as conn:
+        for _ in range(args.rangos):
+            desde = hoy - timedelta(days=aleatorio.randint(0, 400))
+            hasta = min(hoy, desde + timedelta(days=aleatorio.randint(0, 200)))
+            esperado = {
+                "postulaciones": conn.execute(text(
+                    "SELECT COUNT(*) FROM Postulaciones WHERE Fecha_Publicacion BETWEEN :desde AND :hasta"
+                ), {"desde": desde, "hasta": hasta}).scalar(),
+                "vacantes": conn.execute(text(
+                    "SELECT COUNT(*) FROM Vacantes WHERE eliminado = 0 AND Fecha_Publicacion BETWEEN :desde AND :hasta"
+                ), {"desde": desde, "hasta": hasta}).scalar()
+            }
+            for agrupar in ('mes', 'dia'):
+                url = f'/api/admin/estadisticas/periodo?desde={desde}&hasta={hasta}&agrupar={agrupar}'
+                inicio = time.perf_counter()
+                respuesta = pedir('GET', url).get_json()
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+                if respuesta['totales'] != esperado:
+                    fallas.append(f"{url}: {respuesta['totales']} != {esperado}")
+                if sum(punto['postulaciones'] for punto in respuesta['serie']) != esperado['postulaciones']:
+                    fallas.append(f"{url}: la serie no suma el total")
+    pedir('GET', '/api/admin/estadisticas/periodo?desde=2025-02-01&hasta=2025-01-01', 400)
+    pedir('GET', '/api/admin/estadisticas/periodo?agrupar=semana', 400)
+    print(f"periodo: mediana {statistics.median(tiempos):.2f} ms en {len(tiempos)} rangos")
+
+    # Descuadre manual: reconciliar debe corregirlo
+    with engine.connect() as conn:
+        conn.execute(text("UPDATE Estadisticas_Contadores SET Valor = Valor + 7 WHERE Metrica = 'empresasActivas'"))
+        conn.execute(text("DELETE FROM Estadisticas_Periodos WHERE Metrica = 'postulaciones' AND Granularidad = 'M' "
+                          "AND Inicio = :mes"), {"mes": hoy.replace(day=1)})
+        conn.commit()
+    resultado = pedir('POST', '/api/admin/estadisticas/reconciliar').get_json()
+    if resultado['contadores'] != {'empresasActivas': -7} or resultado['periodosCorregidos'] != 1:
+        fallas.append(f"reconciliar tras el descuadre: {resultado}")
+    comparar_panel("después de reconciliar")
+
+    for falla in fallas:
+        print(f"FALLA: {falla}")
+    if fallas:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+"""Estadísticas de postulaciones por empresa: listado completo agregado en el cliente vs resúmenes.
+
+1. Genera --postulaciones postulaciones en una base SQLite nueva (benchmarks.datos_sinteticos);
+   la empresa con más postulaciones recibe alrededor de una de cada cinco.
+2. Mide la mediana de GET /api/empresa/<id>/postulaciones más la agregación por día y estado
+   que hoy hace el navegador, contra GET /api/empresa/<id>/postulaciones/estadisticas por día
+   (30 días), por semana (un año) y para una vacante.
+3. Crea postulaciones, cambia estados (empresa y administración) y borra una postulación por
+   la API, y compara --rangos rangos al azar con COUNT(*) sobre Postulaciones.
+4. Comprueba que reconciliar no encuentra diferencias y que corrige un resumen descuadrado a mano.
+
+Sale con código 1 si alguna comprobación falla.
+
+Uso (desde server-flask/):
+    python -m benchmarks.bench_estadisticas_empresa --postulaciones 500000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+CONTEO_REAL = """
+    SELECT P.Fecha_Publicacion AS Fecha, COALESCE(P.Estado, 'Pendiente') AS Estado, COUNT(*) AS Cantidad
+    FROM Postulaciones P JOIN Vacantes V ON V.ID = P.ID_Vacante
+    WHERE V.ID_Empresa = :empresa_id AND P.Fecha_Publicacion BETWEEN :desde AND :hasta {filtro}
+    GROUP BY P.Fecha_Publicacion, COALESCE(P.Estado, 'Pendiente')
+"""
+ESTADOS_REALES = """
+    SELECT COALESCE(Estado, 'Pendiente') AS Estado, COUNT(*) AS Cantidad FROM Postulaciones
+    WHERE ID_Vacante = :vacante_id GROUP BY COALESCE(Estado, 'Pendiente')
+"""
+
+
+def mediana_ms(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--postulaciones', type=int, default=500000)
+    parser.add_argument('--repeticiones', type=int, default=20)
+    parser.add_argument('--rangos', type=int, default=30)
+    parser.add_argument('--semilla', type=int, default=1)
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp(prefix='bench_estadisticas_empresa_')
+    os.environ.update({'DB_MOTOR': 'sqlite', 'DB_URL': f"sqlite:///{os.path.join(directorio, 'bolsa.db')}",
+                       'BCRYPT_RONDAS': '4'})
+    from sqlalchemy import text
+    from benchmarks.datos_sinteticos import generar
+    from main import app
+    from src.conexion import engine
+    from src.estadisticas_empresa import reconciliar_resumenes
+
+    print(f"generando {args.postulaciones} postulaciones en {directorio}")
+    muestra = generar(engine, args.postulaciones, semilla=args.semilla, rondas=4)
+    cliente = app.test_client()
+    aleatorio = random.Random(args.semilla)
+    fallas = []
+    usuario = muestra['empresa']['usuario']
+    with engine.connect() as conn:
+        empresa_id = conn.execute(text("SELECT MIN(ID) FROM Empresa WHERE ID_Usuario = :usuario"),
+                                  {"usuario": usuario}).scalar()
+    base = f'/api/empresa/{usuario}/postulaciones/estadisticas'
+    print(f"empresa: usuario {usuario}, {muestra['empresa']['postulaciones']} postulaciones")
+
+    def pedir(metodo, url, esperado=200, **kwargs):
+        respuesta = cliente.open(url, method=metodo, **kwargs)
+        if respuesta.status_code != esperado:
+            fallas.append(f"{metodo} {url}: {respuesta.status_code} {respuesta.get_data(as_text=True)[:200]}")
+        return respuesta
+
+    # Antes: el navegador descarga todas las postulaciones y las agrupa
+    def agregar_en_cliente():
+        conteo = Counter()
+        for postulacion in cliente.get(f'/api/empresa/{usuario}/postulaciones').get_json():
+            conteo[(postulacion['fechaPostulacion'], postulacion['estado'])] += 1
+        return conteo
+
+    hoy = date.today()
+    vacante = muestra['vacantesEmpresa'][0]
+    mediciones = {
+        "listado completo + agregación": (agregar_en_cliente, max(3, args.repeticiones // 5)),
+        "estadísticas por día (30 días)": (lambda: pedir('GET', base), args.repeticiones),
+        "estadísticas por semana (1 año)": (
+            lambda: pedir('GET', f'{base}?agrupar=semana&desde={hoy - timedelta(days=364)}'), args.repeticiones),
+        "estadísticas de una vacante (1 año)": (
+            lambda: pedir('GET', f'{base}?vacante={vacante}&desde={hoy - timedelta(days=364)}'), args.repeticiones)
+    }
+    for nombre, (funcion, repeticiones) in mediciones.items():
+        print(f"{nombre:40} {mediana_ms(funcion, repeticiones):10.2f} ms (mediana de {repeticiones})")
+
+    # Escrituras por la API que mueven los resúmenes
+    creadas = 0
+    for candidato in aleatorio.sample(muestra['candidatos'], 30):
+        respuesta = cliente.post('/api/postulaciones', json={
+            "userId": candidato['usuario'], "vacanteId": aleatorio.choice(muestra['vacantesEmpresa'])})
+        if respuesta.status_code == 201:
+            creadas += 1
+        elif respuesta.status_code != 400:
+            fallas.append(f"POST /api/postulaciones: {respuesta.status_code}")
+    postulaciones = aleatorio.sample(muestra['postulacionesEmpresa'], 12)
+    for postulacion in postulaciones[:5]:
+        pedir('PUT', f'/api/postulaciones/{postulacion}', json={"estado": "En Revisión"})
+    for postulacion in postulaciones[5:9]:
+        pedir('PUT', f'/api/admin/postulaciones/{postulacion}', json={"estado": "Rechazado"})
+    pedir('PUT', f'/api/postulaciones/{postulaciones[9]}', json={"estado": "Aceptado"})
+    for postulacion in postulaciones[10:]:
+        pedir('DELETE', f'/api/admin/postulaciones/{postulacion}')
+    print(f"escrituras: {creadas} postulaciones nuevas, 10 cambios de estado, 2 borradas")
+
+    # Rangos al azar contra COUNT(*) directo
+    tiempos = []
+    with engine.connect() as conn:
+        for i in range(args.rangos):
+            desde = hoy - timedelta(days=aleatorio.randint(0, 400))
+            hasta = min(hoy, desde + timedelta(days=aleatorio.randint(0, 200)))
+            agrupar = aleatorio.choice(('dia', 'semana'))
+            vacante_id = aleatorio.choice(muestra['vacantesEmpresa']) if i % 2 else None
+            filtro = "AND P.ID_Vacante = :vacante_id" if vacante_id else ""
+            esperado = Counter()
+            for fila in conn.execute(text(CONTEO_REAL.format(filtro=filtro)), {
+                    "empresa_id": empresa_id, "desde": desde, "hasta": hasta, "vacante_id": vacante_id}):
+                esperado[fila.Estado] += fila.Cantidad
+            url = f'{base}?desde={desde}&hasta={hasta}&agrupar={agrupar}' + (f'&vacante={vacante_id}' if vacante_id else '')
+            inicio = time.perf_counter()
+            respuesta = pedir('GET', url).get_json()
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+            obtenido = Counter({estado: cantidad for estado, cantidad in respuesta['totales']['porEstado'].items()
+                                if cantidad})
+            if obtenido != esperado or respuesta['totales']['postulaciones'] != sum(esperado.values()):
+                fallas.append(f"{url}: {dict(obtenido)} != {dict(esperado)}")
+            if sum(punto['postulaciones'] for punto in respuesta['serie']) != sum(esperado.values()):
+                fallas.append(f"{url}: la serie no suma el total")
+        for detalle in pedir('GET', f'{base}?limite=50').get_json()['vacantes']:
+            esperado = {fila.Estado: fila.Cantidad for fila in conn.execute(text(ESTADOS_REALES),
+                                                                             {"vacante_id": detalle['id']})}
+            obtenido = {estado: cantidad for estado, cantidad in detalle['porEstado'].items() if cantidad}
+            if obtenido != esperado:
+                fallas.append(f"vacante {detalle['id']}: {obtenido} != {esperado}")
+    pedir('GET', f'{base}?agrupar=mes', 400)
+    pedir('GET', f'{base}?vacante=abc', 400)
+    pedir('GET', f'{base}?vacante=0', 404)
+    print(f"rangos: mediana {statistics.median(tiempos):.2f} ms en {len(tiempos)} consultas")
+
+    with engine.connect() as conn:
+        resultado = reconciliar_resumenes(conn)
+        conn.commit()
+    if resultado['filasCorregidas']:
+        fallas.append(f"reconciliar encontró diferencias que el trigger no mantuvo: {resultado}")
+    print(f"reconciliación completa: {resultado['segundos'] * 1000:.0f} ms")
+
+    # Descuadre manual: reconciliar debe corregirlo
+    with engine.connect() as conn:
+        conn.execute(text("UPDATE Resumen_Postulaciones_Empresa SET Cantidad = Cantidad + 5 WHERE ID_Empresa = :empresa_id "
+                          "AND Fecha = (SELECT MAX(Fecha) FROM Resumen_Postulaciones_Empresa WHERE ID_Empresa = :empresa_id)"),
+                     {"empresa_id": empresa_id})
+        conn.execute(text("DELETE FROM Resumen_Estados_Vacante WHERE ID_Vacante = :vacante_id"), {"vacante_id": vacante})
+        conn.commit()
+    resultado = pedir('POST', '/api/admin/estadisticas/reconciliar').get_json()['resumenesPostulaciones']
+    if 'Resumen_Postulaciones_Empresa' not in resultado['filasCorregidas'] \
+            or 'Resumen_Estados_Vacante' not in resultado['filasCorregidas']:
+        fallas.append(f"reconciliar tras el descuadre: {resultado}")
+    with engine.connect() as conn:
+        resultado = reconciliar_resumenes(conn)
+    if resultado['filasCorregidas']:
+        fallas.append(f"quedaron diferencias tras reconciliar: {resultado}")
+
+    for falla in fallas:
+        print(f"FALLA: {falla}")
+    if fallas:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
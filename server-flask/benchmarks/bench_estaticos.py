@@ -0,0 +1,109 @@
+"""Tiempo de worker por respuesta de /static y encabezados de caché, Range y descarga delegada.
+
+Compara send_static_file de Flask (la entrega anterior, montada en la misma aplicación para
+incluir los mismos hooks) con src/estaticos.py en modo python y x-accel para un PDF de
+--mb MB: descarga completa, revalidación (If-None-Match -> 304) y
+un bloque de 64 KB (Range -> 206). El tiempo incluye leer todo el cuerpo en el worker, como
+hace el servidor de desarrollo; gunicorn usa sendfile() para la descarga completa en modo
+python, pero no para Range ni para el servidor de desarrollo.
+
+Verifica además: una sola regla para /static, immutable y ETag = hash en los nombres por
+contenido, 304 y 206 correctos, y que en x-accel el cuerpo esté vacío. Sale con código 1
+si alguna comprobación falla.
+
+Uso (desde server-flask/):
+    python -m benchmarks.bench_estaticos --mb 2 --repeticiones 300
+"""
+import argparse
+import hashlib
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+MB = 1024 * 1024
+BLOQUE = 64 * 1024
+
+
+def medir(cliente, url, repeticiones, headers=None):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        respuesta = cliente.get(url, headers=headers)
+        respuesta.get_data()
+        tiempos.append((time.perf_counter() - inicio) * 1e6)
+    return statistics.median(tiempos), respuesta
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mb', type=int, default=2)
+    parser.add_argument('--repeticiones', type=int, default=300)
+    args = parser.parse_args()
+
+    carpeta = tempfile.mkdtemp(prefix='bench_estaticos_')
+    os.makedirs(os.path.join(carpeta, 'files', 'cv'))
+    contenido = os.urandom(args.mb * MB)
+    sha256 = hashlib.sha256(contenido).hexdigest()
+    with open(os.path.join(carpeta, 'files', 'cv', f'{sha256}.pdf'), 'wb') as f:
+        f.write(contenido)
+    url = f'/static/files/cv/{sha256}.pdf'
+    # Ninguna ruta de este benchmark consulta la base de datos
+    os.environ.update({'ESTATICOS_CARPETA': carpeta, 'DB_URL': f"sqlite:///{os.path.join(carpeta, 'bolsa.db')}"})
+
+    from flask import send_from_directory
+    from main import app
+    from src import estaticos
+
+    # Lo que hacía app.send_static_file: sin max_age (no-cache) y ETag por mtime/tamaño
+    app.add_url_rule('/anterior/<path:filename>', 'estaticos_anterior',
+                     lambda filename: send_from_directory(carpeta, filename))
+    cliente = app.test_client()
+    casos = [("send_static_file (anterior)", url.replace('/static/', '/anterior/', 1), None),
+             ("estaticos, python", url, 'python'),
+             ("estaticos, x-accel", url, 'x-accel')]
+    fallas = []
+
+    reglas = [r.rule for r in app.url_map.iter_rules() if r.rule.startswith('/static')]
+    if reglas != ['/static/<path:filename>']:
+        fallas.append(f"reglas de /static: {reglas}")
+
+    print(f"PDF de {args.mb} MB, mediana de {args.repeticiones} peticiones (µs de worker)")
+    print(f"  {'':<30}{'completo':>10}{'304':>8}{'Range 64 KB':>13}  Cache-Control")
+    for nombre, ruta, descarga in casos:
+        if descarga:
+            estaticos.ESTATICOS_DESCARGA = descarga
+        completo, respuesta = medir(cliente, ruta, args.repeticiones)
+        etag = respuesta.headers['ETag']
+        revalidacion, no_modificado = medir(cliente, ruta, args.repeticiones, {'If-None-Match': etag})
+        rango, parcial = medir(cliente, ruta, args.repeticiones, {'Range': f'bytes=0-{BLOQUE - 1}'})
+        print(f"  {nombre:<30}{completo:>10.0f}{revalidacion:>8.0f}{rango:>13.0f}  "
+              f"{respuesta.headers.get('Cache-Control')}")
+
+        if no_modificado.status_code != 304:
+            fallas.append(f"{nombre}: If-None-Match respondió {no_modificado.status_code}")
+        if descarga is None:
+            continue
+        if 'immutable' not in respuesta.headers.get('Cache-Control', '') or etag != f'"{sha256}"':
+            fallas.append(f"{nombre}: falta immutable o el ETag no es el hash ({etag})")
+        if descarga == 'python':
+            if respuesta.data != contenido:
+                fallas.append(f"{nombre}: el cuerpo no coincide con el archivo")
+            if parcial.status_code != 206 or parcial.data != contenido[:BLOQUE]:
+                fallas.append(f"{nombre}: Range respondió {parcial.status_code}")
+        else:
+            esperado = f"{estaticos.ESTATICOS_ACCEL_PREFIJO}files/cv/{sha256}.pdf"
+            if respuesta.data or respuesta.headers.get('X-Accel-Redirect') != esperado:
+                fallas.append(f"{nombre}: se esperaba cuerpo vacío y X-Accel-Redirect {esperado}")
+            if parcial.status_code != 200:
+                fallas.append(f"{nombre}: el Range debe atenderlo el servidor web ({parcial.status_code})")
+
+    for falla in fallas:
+        print(f"FALLA: {falla}")
+    if fallas:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark de memoria y latencia de los listados de administración: lista completa vs streaming.
+
+Uso (desde server-flask/, con la base de datos configurada):
+    python -m benchmarks.bench_exportaciones_admin
+"""
+import argparse
+import time
+import tracemalloc
+
+from main import app
+
+RUTAS = ['/api/admin/postulaciones', '/api/admin/usuarios', '/api/admin/candidatos']
+
+
+def medir(cliente, url):
+    """Devolver (primer byte en s, total en s, bytes, pico de memoria Python en bytes)"""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    respuesta = cliente.get(url, buffered=False)
+    primer_byte = None
+    total_bytes = 0
+    for bloque in respuesta.response:
+        if primer_byte is None:
+            primer_byte = time.perf_counter() - inicio
+        total_bytes += len(bloque)
+    respuesta.close()
+    total = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if respuesta.status_code != 200:
+        raise RuntimeError(f"{url} respondió {respuesta.status_code}")
+    return primer_byte or total, total, total_bytes, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rutas', nargs='+', default=RUTAS)
+    args = parser.parse_args()
+
+    cliente = app.test_client()
+    print(f"{'ruta':<40}{'modo':<10}{'1er byte':>10}{'total':>10}{'MB':>9}{'pico MB':>10}")
+    for ruta in args.rutas:
+        cliente.get(ruta)  # calentamiento del pool de conexiones
+        for modo, url in (('lista', ruta), ('json', f'{ruta}?stream=json'), ('ndjson', f'{ruta}?stream=ndjson')):
+            primer_byte, total, total_bytes, pico = medir(cliente, url)
+            print(f"{ruta:<40}{modo:<10}{primer_byte * 1000:>8.1f}ms{total * 1000:>8.1f}ms"
+                  f"{total_bytes / 1e6:>9.2f}{pico / 1e6:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
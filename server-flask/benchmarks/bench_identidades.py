@@ -0,0 +1,124 @@
+"""Consultas ahorradas por la caché de identidades en las rutas de candidato y empresa.
+
+1. Para cada ruta que resolvía el rol, el candidato o la empresa con su propia consulta
+   cuenta las consultas con la caché fría y caliente (sale con código 1 si la caliente
+   no ahorra exactamente una). Las peticiones se detienen en la validación del archivo,
+   así que no escriben nada.
+2. Latencia de obtener_identidad() con acierto contra la consulta indexada que reemplaza.
+
+Uso (desde server-flask/; por defecto crea un archivo SQLite temporal con un candidato y una empresa):
+    python -m benchmarks.bench_identidades --repeticiones 2000
+    python -m benchmarks.bench_identidades --url "mssql+pyodbc://..." --candidato 5 --empresa 7
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+
+def preparar_base(ruta):
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(f"sqlite:///{ruta}")
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE Usuario (ID INTEGER PRIMARY KEY, NombreUsuario TEXT, Correo TEXT, Contrasena TEXT,
+                                  ROL TEXT, RutaImagen TEXT, eliminado INTEGER DEFAULT 0)
+        """))
+        conn.execute(text("CREATE TABLE Candidatos (ID INTEGER PRIMARY KEY, ID_Usuario INTEGER, CV TEXT)"))
+        conn.execute(text("CREATE TABLE Empresa (ID INTEGER PRIMARY KEY, ID_Usuario INTEGER, Nombre TEXT)"))
+        conn.execute(text("CREATE INDEX IX_Candidatos_Usuario ON Candidatos (ID_Usuario)"))
+        conn.execute(text("CREATE INDEX IX_Empresa_Usuario ON Empresa (ID_Usuario)"))
+        conn.execute(text("""
+            INSERT INTO Usuario (ID, NombreUsuario, ROL) VALUES (1, 'candidato', 'CANDIDATO'), (2, 'empresa', 'EMPRESA')
+        """))
+        conn.execute(text("INSERT INTO Candidatos (ID, ID_Usuario) VALUES (10, 1)"))
+        conn.execute(text("INSERT INTO Empresa (ID, ID_Usuario, Nombre) VALUES (20, 2, 'Empresa')"))
+    engine.dispose()
+    return 1, 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help="base de datos existente (por defecto SQLite temporal)")
+    parser.add_argument('--candidato', type=int, help="ID de usuario candidato (con --url)")
+    parser.add_argument('--empresa', type=int, help="ID de usuario empresa (con --url)")
+    parser.add_argument('--repeticiones', type=int, default=2000)
+    args = parser.parse_args()
+
+    if args.url:
+        if args.candidato is None or args.empresa is None:
+            parser.error("--url requiere --candidato y --empresa")
+        os.environ['DB_URL'] = args.url
+        candidato, empresa = args.candidato, args.empresa
+    else:
+        ruta = os.path.join(tempfile.mkdtemp(prefix='bench_identidades_'), 'bolsa.db')
+        candidato, empresa = preparar_base(ruta)
+        os.environ['DB_URL'] = f"sqlite:///{ruta}"
+
+    from sqlalchemy import text
+    from main import app
+    from src.conexion import obtener_conexion
+    from src.identidades import cache_identidades, obtener_identidad
+    from src.instrumentacion import contar_consultas
+
+    cliente = app.test_client()
+    # (ruta, consultas antes de la caché, petición)
+    rutas = [
+        ("POST /api/usuario/upload-image/<id>", 1,
+         lambda: cliente.post(f'/api/usuario/upload-image/{candidato}', data={})),
+        ("POST /api/candidato/upload-cv/<id>", 1,
+         lambda: cliente.post(f'/api/candidato/upload-cv/{candidato}', data={})),
+        ("POST /api/empresa/<id>/vacantes/importar", 1,
+         lambda: cliente.post(f'/api/empresa/{empresa}/vacantes/importar', data=io.BytesIO(b"titulo\n"),
+                              content_type='text/csv'))
+    ]
+
+    fallas = 0
+    print(f"{'ruta':<44}{'antes':>6}{'fría':>6}{'caliente':>10}  estado")
+    for nombre, antes, peticion in rutas:
+        cache_identidades.invalidar()
+        with contar_consultas() as fria:
+            peticion()
+        with contar_consultas() as caliente:
+            respuesta = peticion()
+        ok = caliente.total == antes - 1
+        fallas += not ok
+        print(f"{nombre:<44}{antes:>6}{fria.total:>6}{caliente.total:>10}  {respuesta.status_code}"
+              f"{'' if ok else '  <- se esperaba ' + str(antes - 1)}")
+
+    consulta_rol = text("SELECT ROL FROM Usuario WHERE ID = :user_id AND eliminado = 0")
+    conn = obtener_conexion()
+    try:
+        tiempos_consulta = []
+        for _ in range(args.repeticiones):
+            inicio = time.perf_counter()
+            conn.execute(consulta_rol, {"user_id": candidato}).fetchone()
+            tiempos_consulta.append((time.perf_counter() - inicio) * 1e6)
+    finally:
+        conn.close()
+    tiempos_checkout = []
+    for _ in range(args.repeticiones):
+        inicio = time.perf_counter()
+        obtener_conexion().close()
+        tiempos_checkout.append((time.perf_counter() - inicio) * 1e6)
+    obtener_identidad(candidato)
+    tiempos_cache = []
+    for _ in range(args.repeticiones):
+        inicio = time.perf_counter()
+        obtener_identidad(candidato)
+        tiempos_cache.append((time.perf_counter() - inicio) * 1e6)
+
+    print(f"\nconsulta de rol (conexión ya prestada): mediana {statistics.median(tiempos_consulta):.1f}µs")
+    print(f"checkout + devolución de conexión:      mediana {statistics.median(tiempos_checkout):.1f}µs")
+    print(f"obtener_identidad() con acierto:        mediana {statistics.median(tiempos_cache):.1f}µs")
+    print(f"caché: {cache_identidades.estadisticas()}")
+    if fallas:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
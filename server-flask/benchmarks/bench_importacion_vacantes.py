@@ -0,0 +1,74 @@
+"""Benchmark de alta de vacantes: una petición por vacante vs importación masiva NDJSON/CSV.
+
+Inserta vacantes reales en la base de datos configurada para la empresa indicada.
+
+Uso (desde server-flask/):
+    python -m benchmarks.bench_importacion_vacantes --usuario-empresa 2 --vacantes 500
+"""
+import argparse
+import csv
+import io
+import json
+import time
+
+from main import app
+
+
+def generar_vacantes(cantidad):
+    return [{
+        "titulo": f"Vacante de prueba {i}",
+        "descripcion": "Descripción generada para el benchmark de importación",
+        "requisitos": "Python, SQL",
+        "salario": 10000 + (i % 50) * 500,
+        "tipoContrato": "Tiempo completo",
+        "ubicacion": "Querétaro",
+        "fechaCierre": None,
+        "estado": "Abierta"
+    } for i in range(cantidad)]
+
+
+def como_ndjson(vacantes):
+    return ''.join(json.dumps(v) + '\n' for v in vacantes).encode('utf-8')
+
+
+def como_csv(vacantes):
+    salida = io.StringIO()
+    escritor = csv.DictWriter(salida, fieldnames=list(vacantes[0]))
+    escritor.writeheader()
+    escritor.writerows(vacantes)
+    return salida.getvalue().encode('utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--usuario-empresa', type=int, required=True,
+                        help='ID de Usuario con rol EMPRESA')
+    parser.add_argument('--vacantes', type=int, default=500)
+    args = parser.parse_args()
+
+    cliente = app.test_client()
+    vacantes = generar_vacantes(args.vacantes)
+    ruta = f'/api/empresa/{args.usuario_empresa}/vacantes'
+
+    inicio = time.perf_counter()
+    for vacante in vacantes:
+        respuesta = cliente.post(ruta, json=vacante)
+        if respuesta.status_code != 201:
+            raise RuntimeError(f"{ruta} respondió {respuesta.status_code}: {respuesta.get_data(as_text=True)}")
+    individual = time.perf_counter() - inicio
+    print(f"individual: {args.vacantes / individual:10.1f} vacantes/s ({individual:.2f}s)")
+
+    for formato, cuerpo, tipo in (('ndjson', como_ndjson(vacantes), 'application/x-ndjson'),
+                                  ('csv', como_csv(vacantes), 'text/csv')):
+        inicio = time.perf_counter()
+        respuesta = cliente.post(f'{ruta}/importar', data=cuerpo, content_type=tipo)
+        duracion = time.perf_counter() - inicio
+        resultado = respuesta.get_json()
+        if resultado.get('totalErrores'):
+            raise RuntimeError(f"Importación {formato} con errores: {resultado['errores'][:5]}")
+        print(f"{formato + ':':<11} {args.vacantes / duracion:10.1f} vacantes/s ({duracion:.2f}s, "
+              f"x{individual / duracion:.1f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""Costo del limitador de intentos y rechazo sin trabajo en la base de datos ni bcrypt.
+
+1. permitir() desde --hilos hilos sobre --ips IPs distintas y memoria por clave del anillo.
+2. Ataque simulado por el test client contra SQLite: --atacantes IPs prueban contraseñas
+   incorrectas sobre --usuarios cuentas. Cada 429 debe responderse sin consultas (sale con
+   código 1 si alguno las hizo) y un usuario legítimo desde otra IP debe poder entrar.
+
+Uso (desde server-flask/):
+    python -m benchmarks.bench_limite_peticiones --hilos 8 --duracion 3 --atacantes 4 --intentos 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from src.limite_peticiones import Limitador, VentanasMemoria
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))] if ordenados else 0.0
+
+
+def medir_permitir(hilos, duracion, ips):
+    limitador = Limitador('bench', 20, 60, VentanasMemoria(10, 6.0, max_claves=ips))
+    tiempos = []
+    lock = threading.Lock()
+    fin = time.monotonic() + duracion
+
+    def trabajador(numero):
+        propios, i = [], numero
+        while time.monotonic() < fin:
+            ip = f"10.0.{i % ips // 256}.{i % 256}"
+            i += hilos
+            inicio = time.perf_counter()
+            limitador.permitir(ip)
+            propios.append((time.perf_counter() - inicio) * 1e6)
+        with lock:
+            tiempos.extend(propios)
+
+    trabajadores = [threading.Thread(target=trabajador, args=(n,)) for n in range(hilos)]
+    for t in trabajadores:
+        t.start()
+    for t in trabajadores:
+        t.join()
+    return len(tiempos) / duracion, statistics.median(tiempos), percentil(tiempos, 0.99), limitador.estado()
+
+
+def medir_memoria(claves):
+    ventanas = VentanasMemoria(10, 6.0, max_claves=claves)
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    for i in range(claves):
+        ventanas.sumar(f"10.{i // 65536}.{i // 256 % 256}.{i % 256}")
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (despues - antes) / claves
+
+
+def simular_ataque(atacantes, intentos, usuarios):
+    from main import app
+    from src.contrasenas import servicio_contrasenas
+    from src.instrumentacion import contar_consultas
+
+    resultados = {}
+    sin_trabajo = [0]
+    lock = threading.Lock()
+
+    def atacante(numero):
+        cliente = app.test_client()
+        ip = f"203.0.113.{numero + 1}"
+        for i in range(intentos):
+            usuario = f"usuario{(numero * intentos + i) % usuarios + 1}"
+            with contar_consultas() as contador:
+                r = cliente.post('/api/login', json={"usuario": usuario, "contrasena": "incorrecta"},
+                                 environ_base={'REMOTE_ADDR': ip})
+            with lock:
+                resultados[r.status_code] = resultados.get(r.status_code, 0) + 1
+                # Otros hilos pueden sumar hashes a la vez: solo se exige cero consultas
+                if r.status_code == 429 and contador.total:
+                    sin_trabajo[0] += 1
+
+    inicio = time.perf_counter()
+    hilos = [threading.Thread(target=atacante, args=(n,)) for n in range(atacantes)]
+    for t in hilos:
+        t.start()
+    for t in hilos:
+        t.join()
+    segundos = time.perf_counter() - inicio
+
+    # Cuenta no atacada desde una IP distinta
+    legitimo = app.test_client().post('/api/login', json={"usuario": f"usuario{usuarios + 1}", "contrasena": "clave"},
+                                      environ_base={'REMOTE_ADDR': '198.51.100.7'})
+    return resultados, sin_trabajo[0], segundos, legitimo.status_code
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--hilos', type=int, default=8)
+    parser.add_argument('--duracion', type=float, default=3.0)
+    parser.add_argument('--ips', type=int, default=100000)
+    parser.add_argument('--atacantes', type=int, default=4)
+    parser.add_argument('--intentos', type=int, default=200, help="logins por IP atacante")
+    parser.add_argument('--usuarios', type=int, default=50)
+    args = parser.parse_args()
+
+    por_segundo, p50, p99, estado = medir_permitir(args.hilos, args.duracion, args.ips)
+    print(f"permitir(), {args.hilos} hilos, {args.ips} IPs: {por_segundo:.0f}/s, p50 {p50:.1f}µs, "
+          f"p99 {p99:.1f}µs ({estado['aceptadas']} aceptadas, {estado['rechazadas']} rechazadas)")
+    print(f"memoria por clave (anillo de 10 cubetas): {medir_memoria(args.ips):.0f} bytes")
+
+    from benchmarks.bench_dos_factores import preparar_base
+    ruta = os.path.join(tempfile.mkdtemp(prefix='bench_limite_'), 'bolsa.db')
+    preparar_base(ruta, args.usuarios + 1)
+    os.environ.update({'DB_URL': f"sqlite:///{ruta}", 'HASH_COLA_MAX': str(args.atacantes)})
+    resultados, con_trabajo, segundos, legitimo = simular_ataque(args.atacantes, args.intentos, args.usuarios)
+
+    from src.contrasenas import servicio_contrasenas
+    from src.limite_peticiones import estado_limites
+    servicio_contrasenas.cerrar()
+    total = sum(resultados.values())
+    print(f"\nataque: {total} logins de {args.atacantes} IPs en {segundos:.2f}s -> "
+          + ' '.join(f"{codigo}:{cantidad}" for codigo, cantidad in sorted(resultados.items())))
+    print(f"hashes calculados: {servicio_contrasenas.estado()['hashes']} (sin limitador: {total + 1})")
+    for nombre, estado in estado_limites().items():
+        print(f"  {nombre:<14}aceptadas {estado['aceptadas']:>6}  rechazadas {estado['rechazadas']:>6}")
+    print(f"429 con consultas: {con_trabajo}; login legítimo desde otra IP: {legitimo}")
+    if con_trabajo or legitimo != 200:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""Costo de bcrypt por factor de trabajo y rendimiento de POST /api/login con el pool de hashing.
+
+1. Milisegundos por hash para cada valor de --rondas (elegir BCRYPT_RONDAS con esto).
+2. Con --clientes hilos haciendo login contra un pool pequeño se compara el flujo anterior
+   (bcrypt dentro de la petición con la conexión prestada) con POST /api/login actual
+   (la conexión se devuelve antes del hash, que corre en el pool de procesos). Un hilo
+   sonda toma conexiones mientras tanto: su espera es lo que verían las demás rutas.
+   Con la cola llena /api/login responde 429 en lugar de acumular peticiones.
+
+Uso (desde server-flask/; usa un archivo SQLite temporal con un usuario de prueba):
+    python -m benchmarks.bench_login --rondas 10 11 12 13 --clientes 16 --duracion 10
+    python -m benchmarks.bench_login --rondas-login 12 --procesos 4 --cola 8 --pool 4
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+import bcrypt
+
+USUARIO, CONTRASENA = 'bench_login', 'contrasena-de-prueba'
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))] if ordenados else 0.0
+
+
+def medir_rondas(rondas, repeticiones):
+    """Mediana en ms de un hash con 'rondas'"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        bcrypt.hashpw(CONTRASENA.encode('utf-8'), bcrypt.gensalt(rondas))
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def preparar_base(ruta, rondas):
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(f"sqlite:///{ruta}")
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE Usuario (ID INTEGER PRIMARY KEY, NombreUsuario TEXT, Correo TEXT,
+                                  Contrasena TEXT, ROL TEXT, RutaImagen TEXT, eliminado INTEGER)
+        """))
+        conn.execute(text("""
+            INSERT INTO Usuario (NombreUsuario, Correo, Contrasena, ROL, eliminado)
+            VALUES (:usuario, :correo, :hash, 'CANDIDATO', 0)
+        """), {"usuario": USUARIO, "correo": f"{USUARIO}@example.com",
+               "hash": bcrypt.hashpw(CONTRASENA.encode('utf-8'), bcrypt.gensalt(rondas)).decode('utf-8')})
+    engine.dispose()
+
+
+# Pausa de un cliente tras un 429 (sin ella los clientes rechazados compiten por CPU con bcrypt)
+PAUSA_429 = 0.05
+
+
+def correr(login, clientes, duracion):
+    """Ejecutar login() desde 'clientes' hilos con un hilo sonda midiendo la espera del pool"""
+    from sqlalchemy import text
+    from src.conexion import obtener_conexion
+
+    tiempos, estados, esperas = [], {}, []
+    lock = threading.Lock()
+    fin = time.monotonic() + duracion
+
+    def cliente():
+        while time.monotonic() < fin:
+            inicio = time.perf_counter()
+            estado = login()
+            transcurrido = (time.perf_counter() - inicio) * 1000
+            with lock:
+                tiempos.append(transcurrido)
+                estados[estado] = estados.get(estado, 0) + 1
+            if estado == 429:
+                time.sleep(PAUSA_429)
+
+    def sonda():
+        while time.monotonic() < fin:
+            inicio = time.perf_counter()
+            conn = obtener_conexion()
+            esperas.append((time.perf_counter() - inicio) * 1000)
+            try:
+                conn.execute(text("SELECT 1")).fetchall()
+            finally:
+                conn.close()
+            time.sleep(0.01)
+
+    hilos = [threading.Thread(target=cliente) for _ in range(clientes)] + [threading.Thread(target=sonda)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    exitosos = estados.get(200, 0)
+    return {
+        "logins/s": exitosos / duracion,
+        "p50": statistics.median(tiempos) if tiempos else 0.0,
+        "p99": percentil(tiempos, 0.99),
+        "estados": ' '.join(f"{codigo}:{cantidad}" for codigo, cantidad in sorted(estados.items())),
+        "espera_p99": percentil(esperas, 0.99),
+        "espera_max": max(esperas, default=0.0)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rondas', type=int, nargs='+', default=[10, 11, 12, 13])
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--rondas-login', type=int, default=12)
+    parser.add_argument('--clientes', type=int, default=16)
+    parser.add_argument('--duracion', type=float, default=10.0, help="segundos por flujo")
+    parser.add_argument('--pool', type=int, default=4, help="DB_POOL_TAMANO (sin desbordamiento)")
+    parser.add_argument('--procesos', type=int, default=os.cpu_count() or 1, help="HASH_PROCESOS")
+    parser.add_argument('--cola', type=int, default=None, help="HASH_COLA_MAX")
+    args = parser.parse_args()
+
+    print(f"{'rondas':>6}{'ms por hash':>14}{'hashes/s por CPU':>19}")
+    for rondas in args.rondas:
+        ms = medir_rondas(rondas, args.repeticiones)
+        print(f"{rondas:>6}{ms:>12.1f}ms{1000 / ms:>19.1f}")
+
+    directorio = tempfile.mkdtemp(prefix='bench_login_')
+    ruta = os.path.join(directorio, 'bolsa.db')
+    preparar_base(ruta, args.rondas_login)
+    os.environ.update({
+        'DB_URL': f"sqlite:///{ruta}", 'DB_POOL_TAMANO': str(args.pool), 'DB_POOL_DESBORDAMIENTO': '0',
+        'DB_POOL_TIMEOUT': '30', 'BCRYPT_RONDAS': str(args.rondas_login),
+        'HASH_PROCESOS': str(args.procesos), 'HASH_COLA_MAX': str(args.cola if args.cola is not None else 4 * args.procesos)
+    })
+    from sqlalchemy import text
+    from main import app
+    from src.conexion import obtener_conexion
+    from src.contrasenas import servicio_contrasenas
+
+    consulta = text("""
+        SELECT ID, NombreUsuario, Correo, Contrasena, ROL, RutaImagen
+        FROM Usuario
+        WHERE (NombreUsuario = :usuario OR Correo = :usuario) AND eliminado = 0
+    """)
+
+    def login_anterior():
+        # bcrypt en el hilo de la petición con la conexión todavía prestada
+        conn = obtener_conexion()
+        try:
+            fila = conn.execute(consulta, {"usuario": USUARIO}).fetchone()
+            valido = bcrypt.checkpw(CONTRASENA.encode('utf-8'), fila.Contrasena.encode('utf-8'))
+            return 200 if valido else 401
+        finally:
+            conn.close()
+
+    locales = threading.local()
+
+    def login_actual():
+        if not hasattr(locales, 'cliente'):
+            locales.cliente = app.test_client()
+        return locales.cliente.post('/api/login', json={"usuario": USUARIO, "contrasena": CONTRASENA}).status_code
+
+    servicio_contrasenas.verificar(bcrypt.hashpw(b'x', bcrypt.gensalt(4)), 'x')  # arrancar los procesos
+    print(f"\nlogin con {args.clientes} clientes, {args.duracion:g}s, rondas {args.rondas_login}, "
+          f"pool {args.pool}, {args.procesos} procesos, cola {os.environ['HASH_COLA_MAX']}")
+    print(f"{'flujo':<28}{'logins/s':>9}{'p50':>10}{'p99':>10}{'espera pool p99':>17}{'máx':>10}  estados")
+    try:
+        for nombre, login in (("anterior (hash en el hilo)", login_anterior), ("actual (pool de procesos)", login_actual)):
+            r = correr(login, args.clientes, args.duracion)
+            print(f"{nombre:<28}{r['logins/s']:>9.1f}{r['p50']:>8.1f}ms{r['p99']:>8.1f}ms"
+                  f"{r['espera_p99']:>15.1f}ms{r['espera_max']:>8.1f}ms  {r['estados']}")
+    finally:
+        servicio_contrasenas.cerrar()
+
+
+if __name__ == '__main__':
+    main()
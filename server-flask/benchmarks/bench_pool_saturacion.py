@@ -0,0 +1,104 @@
+"""Prueba de carga del pool de conexiones: espera de checkout y agotamiento al aumentar los hilos.
+
+Cada hilo toma una conexión, ejecuta SELECT 1, la retiene --retencion-ms (simula la
+duración de una petición) y la devuelve. Cuando los hilos superan tamaño + desbordamiento
+la espera crece en proporción a la cola y, pasado --timeout, el checkout falla.
+
+Uso (desde server-flask/; por defecto usa un archivo SQLite temporal):
+    python -m benchmarks.bench_pool_saturacion --tamano 5 --desbordamiento 5 --hilos 5 10 20 40
+    python -m benchmarks.bench_pool_saturacion --url "mssql+pyodbc://..." --desconexion pre_ping
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolAgotado
+
+from src.conexion import crear_engine, EstadisticasPool
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+def ejecutar(estadisticas, hilos, operaciones, retencion):
+    """Devolver (operaciones/s, esperas en ms, agotamientos, máximo en uso, máximo desbordamiento)"""
+    esperas, agotamientos = [], [0]
+    maximos = {"en_uso": 0, "desbordamiento": 0}
+    lock = threading.Lock()
+    pool = estadisticas.engine.pool
+
+    def trabajador():
+        for _ in range(operaciones):
+            inicio = time.perf_counter()
+            try:
+                conn = estadisticas.conectar()
+            except PoolAgotado:
+                with lock:
+                    agotamientos[0] += 1
+                continue
+            espera = time.perf_counter() - inicio
+            try:
+                conn.execute(text("SELECT 1")).fetchall()
+                with lock:
+                    esperas.append(espera * 1000)
+                    maximos["en_uso"] = max(maximos["en_uso"], pool.checkedout())
+                    maximos["desbordamiento"] = max(maximos["desbordamiento"], pool.overflow())
+                time.sleep(retencion)
+            finally:
+                conn.close()
+
+    trabajadores = [threading.Thread(target=trabajador) for _ in range(hilos)]
+    inicio = time.perf_counter()
+    for t in trabajadores:
+        t.start()
+    for t in trabajadores:
+        t.join()
+    total = time.perf_counter() - inicio
+    return len(esperas) / total, esperas, agotamientos[0], maximos["en_uso"], maximos["desbordamiento"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default=None)
+    parser.add_argument('--tamano', type=int, default=5)
+    parser.add_argument('--desbordamiento', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=2.0)
+    parser.add_argument('--desconexion', choices=('optimista', 'pre_ping'), default='optimista')
+    parser.add_argument('--hilos', nargs='+', type=int, default=[5, 10, 20, 40])
+    parser.add_argument('--operaciones', type=int, default=50, help="checkouts por hilo")
+    parser.add_argument('--retencion-ms', type=float, default=20.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        url = args.url or f"sqlite:///{os.path.join(directorio, 'pool.db')}"
+        config = {
+            "motor": 'sqlite' if url.startswith('sqlite') else 'sqlserver', "url": url, "tamano": args.tamano, "desbordamiento": args.desbordamiento,
+            "timeout": args.timeout, "reciclar": -1, "desconexion": args.desconexion
+        }
+        print(f"pool: tamaño {args.tamano} + desbordamiento {args.desbordamiento}, timeout {args.timeout}s, "
+              f"{args.desconexion}, retención {args.retencion_ms} ms")
+        print(f"{'hilos':>6}{'ops/s':>10}{'espera p50':>13}{'p99':>10}{'máx':>10}{'agotados':>10}{'en uso':>8}{'desb.':>7}")
+        for hilos in args.hilos:
+            engine = crear_engine(config)
+            estadisticas = EstadisticasPool(engine, config)
+            try:
+                ops, esperas, agotamientos, en_uso, desbordamiento = ejecutar(
+                    estadisticas, hilos, args.operaciones, args.retencion_ms / 1000
+                )
+            finally:
+                engine.dispose()
+            p50 = statistics.median(esperas) if esperas else 0
+            p99 = percentil(esperas, 0.99) if esperas else 0
+            maxima = max(esperas) if esperas else 0
+            print(f"{hilos:>6}{ops:>10.1f}{p50:>11.2f}ms{p99:>8.1f}ms{maxima:>8.1f}ms"
+                  f"{agotamientos:>10}{en_uso:>8}{max(desbordamiento, 0):>7}")
+
+
+if __name__ == '__main__':
+    main()
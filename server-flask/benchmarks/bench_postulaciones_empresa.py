@@ -0,0 +1,193 @@
+"""Listado de postulaciones de una empresa: arreglo completo vs páginas ligeras con detalle bajo demanda.
+
+1. Genera --postulaciones postulaciones en una base SQLite nueva (benchmarks.datos_sinteticos);
+   la empresa con más postulaciones recibe alrededor de una de cada cinco.
+2. Mide bytes y mediana de GET /api/empresa/<id>/postulaciones (arreglo completo) contra la
+   primera página, una página profunda, páginas filtradas y el detalle de los candidatos de
+   una página (GET /api/empresa/<id>/candidatos?ids=...).
+3. Recorre todas las páginas, sin filtros y con filtros por estado, vacante y fechas, y las
+   compara con el arreglo completo (mismas postulaciones y en el mismo orden), incluidas
+   postulaciones sin fecha.
+4. Comprueba que el detalle coincide con el arreglo completo, que omite candidatos que no se
+   postularon a la empresa y que Postulaciones.ID_Empresa sigue a la vacante.
+
+Sale con código 1 si alguna comprobación falla.
+
+Uso (desde server-flask/):
+    python -m benchmarks.bench_postulaciones_empresa --postulaciones 500000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from urllib.parse import quote
+
+CANDIDATO_AJENO = """
+    SELECT TOP (1) C.ID FROM Candidatos C
+    JOIN Usuario U ON U.ID = C.ID_Usuario AND U.eliminado = 0
+    WHERE NOT EXISTS (SELECT 1 FROM Postulaciones P JOIN Vacantes V ON V.ID = P.ID_Vacante
+                      WHERE P.ID_Candidato = C.ID AND V.ID_Empresa = :empresa_id)
+    ORDER BY C.ID
+"""
+EMPRESA_DESCUADRADA = """
+    SELECT COUNT(*) FROM Postulaciones P JOIN Vacantes V ON V.ID = P.ID_Vacante
+    WHERE P.ID_Empresa IS NULL OR P.ID_Empresa <> V.ID_Empresa
+"""
+
+
+def mediana_ms(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def orden_listado(postulaciones):
+    """Orden del listado paginado: fecha descendente, ID descendente y las que no tienen fecha al final"""
+    por_id = sorted(postulaciones, key=lambda p: p['id'], reverse=True)
+    return sorted(por_id, key=lambda p: (p['fechaPostulacion'] is not None, p['fechaPostulacion'] or ''), reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--postulaciones', type=int, default=500000)
+    parser.add_argument('--repeticiones', type=int, default=20)
+    parser.add_argument('--semilla', type=int, default=1)
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp(prefix='bench_postulaciones_empresa_')
+    os.environ.update({'DB_MOTOR': 'sqlite', 'DB_URL': f"sqlite:///{os.path.join(directorio, 'bolsa.db')}",
+                       'BCRYPT_RONDAS': '4'})
+    from sqlalchemy import text
+    from benchmarks.datos_sinteticos import generar
+    from main import app
+    from src.conexion import engine
+
+    print(f"generando {args.postulaciones} postulaciones en {directorio}")
+    muestra = generar(engine, args.postulaciones, semilla=args.semilla, rondas=4)
+    cliente = app.test_client()
+    aleatorio = random.Random(args.semilla)
+    fallas = []
+    usuario = muestra['empresa']['usuario']
+    empresa_id = muestra['empresa']['id']
+    base = f'/api/empresa/{usuario}/postulaciones'
+    print(f"empresa: usuario {usuario}, {muestra['empresa']['postulaciones']} postulaciones")
+
+    def pedir(url, esperado=200):
+        respuesta = cliente.get(url)
+        if respuesta.status_code != esperado:
+            fallas.append(f"GET {url}: {respuesta.status_code} {respuesta.get_data(as_text=True)[:200]}")
+        return respuesta
+
+    # Postulaciones sin fecha (datos anteriores a sp_CrearPostulacion): van al final del listado
+    with engine.connect() as conn:
+        for candidato in aleatorio.sample(muestra['candidatos'], 3):
+            conn.execute(text("INSERT INTO Postulaciones (ID_Candidato, ID_Vacante, Fecha_Publicacion, Estado) "
+                              "VALUES (:candidato, :vacante, NULL, 'Pendiente')"),
+                         {"candidato": candidato['id'], "vacante": aleatorio.choice(muestra['vacantesEmpresa'])})
+        conn.commit()
+
+    completo = pedir(base).get_json()
+    primera = pedir(f'{base}?limite=20').get_json()
+    profunda = primera
+    for _ in range(50):
+        profunda = pedir(f"{base}?limite=20&cursor={profunda['siguienteCursor']}").get_json()
+    cursor_profundo = profunda['siguienteCursor']
+    ids = ','.join(str(c) for c in dict.fromkeys(p['candidato']['id'] for p in primera['postulaciones']))
+    hoy = date.today()
+    mediciones = {
+        "arreglo completo": (base, max(3, args.repeticiones // 5)),
+        "primera página (20)": (f'{base}?limite=20', args.repeticiones),
+        "página 52 (cursor)": (f'{base}?limite=20&cursor={cursor_profundo}', args.repeticiones),
+        "página filtrada por estado": (f"{base}?limite=20&estado={quote('Aceptado')}", args.repeticiones),
+        "página filtrada por vacante": (f"{base}?limite=20&vacante={muestra['vacantesEmpresa'][0]}",
+                                        args.repeticiones),
+        "página de los últimos 7 días": (f"{base}?limite=20&desde={hoy - timedelta(days=6)}", args.repeticiones),
+        "detalle de los candidatos de la página": (f'/api/empresa/{usuario}/candidatos?ids={ids}', args.repeticiones)
+    }
+    for nombre, (url, repeticiones) in mediciones.items():
+        tamano = len(pedir(url).get_data())
+        print(f"{nombre:40} {mediana_ms(lambda: cliente.get(url), repeticiones):10.2f} ms {tamano:12,} bytes "
+              f"(mediana de {repeticiones})")
+
+    # Todas las páginas contra el arreglo completo, sin filtros y con filtros
+    def recorrer(parametros, limite):
+        url = f"{base}?limite={limite}{parametros}"
+        postulaciones, respuesta = [], pedir(url).get_json()
+        while True:
+            postulaciones += respuesta['postulaciones']
+            if not respuesta['siguienteCursor']:
+                return postulaciones
+            respuesta = pedir(f"{url}&cursor={respuesta['siguienteCursor']}").get_json()
+
+    campos_lista = {'id', 'nombreUsuario', 'correo', 'rutaImagen'}
+    esperado_total = orden_listado(completo)
+    vacante = muestra['vacantesEmpresa'][0]
+    desde, hasta = hoy - timedelta(days=aleatorio.randint(30, 300)), hoy - timedelta(days=aleatorio.randint(0, 29))
+    casos = [
+        ("", 100, lambda p: True),
+        (f"&estado={quote('En Revisión')}", 100, lambda p: p['estado'] == 'En Revisión'),
+        (f"&vacante={vacante}", 7, lambda p: p['vacante']['id'] == vacante),
+        (f"&desde={desde}&hasta={hasta}&estado=Pendiente", 50,
+         lambda p: p['fechaPostulacion'] and str(desde) <= p['fechaPostulacion'] <= str(hasta)
+         and p['estado'] == 'Pendiente'),
+        (f"&hasta={hoy - timedelta(days=200)}", 100,
+         lambda p: p['fechaPostulacion'] and p['fechaPostulacion'] <= str(hoy - timedelta(days=200)))
+    ]
+    inicio = time.perf_counter()
+    paginas = 0
+    for parametros, limite, filtro in casos:
+        obtenidas = recorrer(parametros, limite)
+        paginas += len(obtenidas) // limite + 1
+        esperadas = [p for p in esperado_total if filtro(p)]
+        if [p['id'] for p in obtenidas] != [p['id'] for p in esperadas]:
+            fallas.append(f"páginas{parametros or ' sin filtros'}: {len(obtenidas)} postulaciones, "
+                          f"se esperaban {len(esperadas)} en el orden del arreglo completo")
+        elif any(set(p['candidato']) != campos_lista
+                 or {k: v for k, v in e['candidato'].items() if k in campos_lista} != p['candidato']
+                 or {**p, 'candidato': None} != {**e, 'candidato': None} for p, e in zip(obtenidas, esperadas)):
+            fallas.append(f"páginas{parametros or ' sin filtros'}: las filas no coinciden con el arreglo completo")
+        print(f"recorrido{parametros or ' sin filtros':45} {len(obtenidas):7} postulaciones")
+    print(f"recorridos: {paginas} páginas en {time.perf_counter() - inicio:.1f} s")
+
+    # Detalle: coincide con el arreglo completo y solo incluye candidatos de la empresa
+    with engine.connect() as conn:
+        ajeno = conn.execute(text(CANDIDATO_AJENO), {"empresa_id": empresa_id}).scalar()
+    perfiles = {p['candidato']['id']: p['candidato'] for p in completo}
+    pedidos = aleatorio.sample(sorted(perfiles), min(99, len(perfiles)))
+    detalle = pedir(f"/api/empresa/{usuario}/candidatos?ids={','.join(map(str, pedidos + [ajeno]))}").get_json()
+    if {c['id']: c for c in detalle['candidatos']} != {i: perfiles[i] for i in pedidos}:
+        fallas.append(f"detalle: {len(detalle)} candidatos no coinciden con el arreglo completo (o incluyen al ajeno)")
+    pedir(f"/api/empresa/{usuario}/candidatos?ids={','.join(map(str, range(1, 102)))}", 400)
+    pedir(f"/api/empresa/{usuario}/candidatos?ids=1,a", 400)
+    pedir(f"/api/empresa/{usuario}/candidatos", 400)
+    pedir(f"{base}?estado=Cerrada", 400)
+    pedir(f"{base}?cursor=invalido", 400)
+    pedir(f"{base}?desde=2025-02-01&hasta=2025-01-01", 400)
+
+    # ID_Empresa sigue a la vacante al crear la postulación por la API y al cambiarle la vacante
+    for candidato in aleatorio.sample(muestra['candidatos'], 10):
+        cliente.post('/api/postulaciones', json={"userId": candidato['usuario'],
+                                                 "vacanteId": aleatorio.choice(muestra['vacantesAbiertas'])})
+    with engine.connect() as conn:
+        conn.execute(text("UPDATE Postulaciones SET ID_Vacante = :vacante WHERE ID = :postulacion"),
+                     {"vacante": muestra['vacantesAbiertas'][-1], "postulacion": muestra['postulacionesEmpresa'][0]})
+        conn.commit()
+        descuadradas = conn.execute(text(EMPRESA_DESCUADRADA)).scalar()
+    if descuadradas:
+        fallas.append(f"{descuadradas} postulaciones con ID_Empresa distinto al de su vacante")
+
+    for falla in fallas:
+        print(f"FALLA: {falla}")
+    if fallas:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
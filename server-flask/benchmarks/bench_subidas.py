@@ -0,0 +1,185 @@
+"""Memoria, rendimiento y rechazo temprano de las subidas de CV e imágenes.
+
+1. Sube un CV de --mb MB por el test client contra SQLite y compara el pico de memoria
+   (tracemalloc) y los MB/s con el manejo anterior (request.files + file.save), montado
+   en una aplicación aparte con el mismo cuerpo.
+2. Rechazos: Content-Length mayor al límite (sin leer el cuerpo), extensión no permitida
+   (como mucho un bloque leído) y cuerpo sin Content-Length (chunked) que supera el
+   límite (se corta al alcanzarlo).
+3. Al final no debe quedar ningún temporal '.subida-*' y solo el CV publicado (todas las
+   subidas tienen el mismo contenido, así que comparten archivo).
+
+Sale con código 1 si alguna comprobación falla.
+
+Uso (desde server-flask/; los archivos se escriben en un directorio temporal):
+    python -m benchmarks.bench_subidas --mb 8 --repeticiones 5
+"""
+import argparse
+import hashlib
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+MB = 1024 * 1024
+BLOQUE = 64 * 1024
+
+
+def preparar_base(ruta):
+    from sqlalchemy import create_engine, text
+    from benchmarks.bench_identidades import preparar_base as preparar_usuarios
+
+    candidato, _ = preparar_usuarios(ruta)
+    engine = create_engine(f"sqlite:///{ruta}")
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE Versiones_Recurso (Recurso TEXT PRIMARY KEY, Version INTEGER, Fecha_Modificacion TEXT)
+        """))
+        conn.execute(text("""
+            INSERT INTO Versiones_Recurso VALUES ('vacantes', 1, NULL), ('empresas', 1, NULL),
+                                                 ('usuarios', 1, NULL), ('candidatos', 1, NULL)
+        """))
+    engine.dispose()
+    return candidato
+
+
+def escribir_cuerpo(ruta, campo, nombre, megas):
+    """Cuerpo multipart en disco para que el cliente no lo tenga en memoria. Devuelve (boundary, sha256)"""
+    boundary = uuid.uuid4().hex
+    resumen = hashlib.sha256()
+    bloque = os.urandom(MB)
+    with open(ruta, 'wb') as f:
+        f.write(f'--{boundary}\r\nContent-Disposition: form-data; name="{campo}"; filename="{nombre}"\r\n'
+                f'Content-Type: application/octet-stream\r\n\r\n'.encode())
+        for _ in range(int(megas)):
+            f.write(bloque)
+            resumen.update(bloque)
+        f.write(f'\r\n--{boundary}--\r\n'.encode())
+    return boundary, resumen.hexdigest()
+
+
+def enviar(cliente, url, ruta, boundary, **kwargs):
+    """POST del cuerpo en 'ruta'; devuelve (respuesta, bytes del cuerpo leídos por el servidor)"""
+    with open(ruta, 'rb') as cuerpo:
+        respuesta = cliente.post(url, input_stream=cuerpo,
+                                 content_type=f'multipart/form-data; boundary={boundary}', **kwargs)
+        return respuesta, cuerpo.tell()
+
+
+def aplicacion_anterior(destino):
+    """Ruta equivalente al manejo previo: request.files y file.save"""
+    from flask import Flask, request, jsonify
+
+    anterior = Flask('subidas_anterior')
+
+    @anterior.route('/subir', methods=['POST'])
+    def subir():
+        archivo = request.files['cv']
+        archivo.save(os.path.join(destino, f"cv_{uuid.uuid4().hex[:8]}.pdf"))
+        return jsonify({}), 200
+
+    return anterior
+
+
+def medir(cliente, url, ruta, boundary, repeticiones, megas):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        respuesta, _ = enviar(cliente, url, ruta, boundary)
+        tiempos.append(time.perf_counter() - inicio)
+        if respuesta.status_code != 200:
+            raise RuntimeError(f"{url}: {respuesta.status_code} {respuesta.get_json()}")
+    tracemalloc.start()
+    enviar(cliente, url, ruta, boundary)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return megas / statistics.median(tiempos), pico, respuesta
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mb', type=int, default=8, help="tamaño del CV (menor que SUBIDA_CV_MAX_MB)")
+    parser.add_argument('--repeticiones', type=int, default=5)
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp(prefix='bench_subidas_')
+    ruta_bd = os.path.join(directorio, 'bolsa.db')
+    candidato = preparar_base(ruta_bd)
+    os.environ['DB_URL'] = f"sqlite:///{ruta_bd}"
+
+    from main import app
+    from src.subidas import SUBIDA_CV
+
+    # Las rutas escriben en src/static/... relativo al directorio de trabajo
+    os.chdir(directorio)
+    carpeta_cv = os.path.join('src', 'static', 'files', 'cv')
+    fallas = []
+
+    cuerpo = os.path.join(directorio, 'cuerpo.bin')
+    boundary, sha256 = escribir_cuerpo(cuerpo, 'cv', 'cv.pdf', args.mb)
+    cliente = app.test_client()
+    url = f'/api/candidato/upload-cv/{candidato}'
+    mbs, pico, respuesta = medir(cliente, url, cuerpo, boundary, args.repeticiones, args.mb)
+    datos = respuesta.get_json()
+    if datos['sha256'] != sha256 or datos['tamano'] != args.mb * MB:
+        fallas.append("sha256/tamaño de la respuesta no coinciden con el archivo enviado")
+
+    carpeta_anterior = os.path.join(directorio, 'anterior')
+    os.makedirs(carpeta_anterior)
+    mbs_anterior, pico_anterior, _ = medir(aplicacion_anterior(carpeta_anterior).test_client(), '/subir',
+                                           cuerpo, boundary, args.repeticiones, args.mb)
+
+    print(f"CV de {args.mb} MB, mediana de {args.repeticiones} subidas")
+    print(f"  {'':<28}{'MB/s':>8}{'pico de memoria':>18}")
+    print(f"  {'request.files + save':<28}{mbs_anterior:>8.0f}{pico_anterior / 1024:>15.0f} KB")
+    print(f"  {'ReceptorArchivo':<28}{mbs:>8.0f}{pico / 1024:>15.0f} KB")
+
+    # Rechazos tempranos: (nombre, código esperado, respuesta, bytes leídos)
+    rechazos = []
+    grande = os.path.join(directorio, 'grande.bin')
+    boundary_grande, _ = escribir_cuerpo(grande, 'cv', 'cv.pdf', SUBIDA_CV.max_bytes // MB + 1)
+    rechazos.append(("Content-Length > límite", 413, *enviar(cliente, url, grande, boundary_grande)))
+    exe = os.path.join(directorio, 'exe.bin')
+    boundary_exe, _ = escribir_cuerpo(exe, 'cv', 'cv.exe', args.mb)
+    rechazos.append(("extensión no permitida", 400, *enviar(cliente, url, exe, boundary_exe)))
+
+    from werkzeug.test import EnvironBuilder
+    from werkzeug.wrappers import Request
+    with open(grande, 'rb') as cuerpo_chunked:
+        environ = EnvironBuilder(path=url, method='POST', input_stream=cuerpo_chunked,
+                                 content_type=f'multipart/form-data; boundary={boundary_grande}').get_environ()
+        # Como un servidor que recibe Transfer-Encoding: chunked
+        del environ['CONTENT_LENGTH']
+        environ['wsgi.input_terminated'] = True
+        respuesta = cliente.open(Request(environ))
+        rechazos.append(("chunked > límite", 413, respuesta, cuerpo_chunked.tell()))
+
+    print(f"\n  {'rechazo':<28}{'código':>8}{'leído del cuerpo':>20}")
+    for nombre, esperado, respuesta, leidos in rechazos:
+        print(f"  {nombre:<28}{respuesta.status_code:>8}{leidos / 1024:>17.0f} KB  {respuesta.get_json()['error']}")
+        if respuesta.status_code != esperado:
+            fallas.append(f"{nombre}: {respuesta.status_code}, se esperaba {esperado}")
+        if nombre.startswith("Content-Length") and leidos:
+            fallas.append(f"{nombre}: se leyeron {leidos} bytes antes de rechazar")
+        if esperado == 400 and leidos > 2 * BLOQUE:
+            fallas.append(f"{nombre}: se leyeron {leidos} bytes antes de rechazar")
+
+    temporales = [n for n in os.listdir(carpeta_cv) if n.startswith('.subida-')]
+    publicados = [n for n in os.listdir(carpeta_cv) if not n.startswith('.')]
+    print(f"\ncarpeta de CV: {len(publicados)} publicados, {len(temporales)} temporales")
+    if temporales:
+        fallas.append(f"quedaron temporales: {temporales}")
+    if len(publicados) != 1:
+        fallas.append(f"{len(publicados)} archivos publicados, se esperaba 1")
+
+    for falla in fallas:
+        print(f"FALLA: {falla}")
+    if fallas:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""Prueba de carga HTTP: latencia p50/p99 y errores por ruta con N clientes concurrentes.
+
+Las rutas se eligen con una semilla fija según su peso, así que dos ejecuciones con los
+mismos argumentos envían la misma secuencia de peticiones.
+
+Uso (desde server-flask/):
+    # contra un servidor ya levantado (p. ej. gunicorn -c gunicorn.conf.py wsgi:app)
+    python -m benchmarks.carga_rutas --url http://localhost:5000 --clientes 32 --duracion 30
+    # levantando wsgi:app en este proceso con el servidor con hilos de Werkzeug
+    python -m benchmarks.carga_rutas --en-proceso --clientes 16
+    # rutas propias: "MÉTODO RUTA [PESO]"
+    python -m benchmarks.carga_rutas --ruta "GET /api/vacantes 5" --ruta "GET /api/empresas 1"
+"""
+import argparse
+import json
+import logging
+import random
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+RUTAS_POR_DEFECTO = [
+    "GET /api/vacantes 6",
+    "GET /api/vacantes?limite=20 4",
+    "GET /api/vacantes/destacadas 4",
+    "GET /api/vacantes/search?q=desarrollador 3",
+    "GET /api/empresas 1"
+]
+
+
+def leer_rutas(especificaciones):
+    rutas = []
+    for especificacion in especificaciones:
+        partes = especificacion.split()
+        if len(partes) not in (2, 3):
+            raise SystemExit(f"Ruta inválida (se espera 'MÉTODO RUTA [PESO]'): {especificacion}")
+        peso = float(partes[2]) if len(partes) == 3 else 1.0
+        rutas.append((partes[0].upper(), partes[1], peso, None))
+    return rutas
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+def enviar(base, metodo, ruta, timeout, cuerpo=None):
+    """Devolver el código de estado (0 si falló la conexión). 'cuerpo' se envía como JSON"""
+    datos, cabeceras = None, {}
+    if cuerpo is not None:
+        datos, cabeceras = json.dumps(cuerpo).encode('utf-8'), {'Content-Type': 'application/json'}
+    peticion = urllib.request.Request(base + ruta, data=datos, headers=cabeceras, method=metodo)
+    try:
+        with urllib.request.urlopen(peticion, timeout=timeout) as respuesta:
+            respuesta.read()
+            return respuesta.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        return e.code
+    except (urllib.error.URLError, TimeoutError, ConnectionError):
+        return 0
+
+
+def ejecutar(base, rutas, clientes, duracion, semilla, timeout):
+    """rutas: [(método, ruta, peso, cuerpo JSON o None)]"""
+    tiempos = defaultdict(list)
+    estados = defaultdict(lambda: defaultdict(int))
+    lock = threading.Lock()
+    fin = time.monotonic() + duracion
+    pesos = [ruta[2] for ruta in rutas]
+
+    def cliente(numero):
+        aleatorio = random.Random(semilla + numero)
+        while time.monotonic() < fin:
+            metodo, ruta, _, cuerpo = aleatorio.choices(rutas, weights=pesos)[0]
+            inicio = time.perf_counter()
+            estado = enviar(base, metodo, ruta, timeout, cuerpo)
+            transcurrido = (time.perf_counter() - inicio) * 1000
+            with lock:
+                tiempos[(metodo, ruta)].append(transcurrido)
+                estados[(metodo, ruta)][estado] += 1
+
+    hilos = [threading.Thread(target=cliente, args=(i,)) for i in range(clientes)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    return tiempos, estados
+
+
+def reportar(tiempos, estados, duracion):
+    print(f"{'ruta':<50}{'peticiones':>11}{'req/s':>8}{'p50':>9}{'p99':>10}{'máx':>10}  estados")
+    total = 0
+    for (metodo, ruta), muestras in sorted(tiempos.items()):
+        total += len(muestras)
+        codigos = ' '.join(f"{codigo}:{cantidad}" for codigo, cantidad in sorted(estados[(metodo, ruta)].items()))
+        print(f"{metodo + ' ' + ruta:<50}{len(muestras):>11}{len(muestras) / duracion:>8.1f}"
+              f"{statistics.median(muestras):>7.1f}ms{percentil(muestras, 0.99):>8.1f}ms{max(muestras):>8.1f}ms  {codigos}")
+    print(f"{'total':<50}{total:>11}{total / duracion:>8.1f}")
+
+
+def servir_en_proceso():
+    """Levantar wsgi:app en un hilo con el servidor con hilos de Werkzeug. Devuelve la URL base"""
+    from werkzeug.serving import make_server
+    from wsgi import app
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)  # sin una línea por petición
+    servidor = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{servidor.server_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--en-proceso', action='store_true')
+    parser.add_argument('--ruta', action='append', dest='rutas')
+    parser.add_argument('--clientes', type=int, default=16)
+    parser.add_argument('--duracion', type=float, default=20.0, help="segundos")
+    parser.add_argument('--semilla', type=int, default=1)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    args = parser.parse_args()
+
+    rutas = leer_rutas(args.rutas or RUTAS_POR_DEFECTO)
+    base = servir_en_proceso() if args.en_proceso else args.url.rstrip('/')
+    print(f"{base}: {args.clientes} clientes durante {args.duracion:g}s (semilla {args.semilla})")
+    tiempos, estados = ejecutar(base, rutas, args.clientes, args.duracion, args.semilla, args.timeout)
+    reportar(tiempos, estados, args.duracion)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,355 @@
+"""Generador de datos sintéticos: usuarios, candidatos, empresas, vacantes y postulaciones.
+
+Carga en la base de datos configurada (DB_URL / DB_MOTOR) un volumen proporcional a
+--postulaciones con inserciones por lotes (executemany; fast_executemany en SQL Server):
+
+    candidatos = postulaciones / 5, vacantes = postulaciones / 20, empresas = postulaciones / 200
+
+Las vacantes se reparten entre empresas con una distribución de Zipf (unas pocas empresas
+concentran muchas vacantes y postulaciones, como el "empleador grande" de los escenarios de
+benchmarks.suite_rutas); los textos tienen longitudes parecidas a las reales y las fechas
+cubren los últimos 365 días. Con la misma semilla y una base nueva los datos son los mismos.
+CantidadPostulaciones la mantiene TR_AfterInsert_Postulacion al insertar las postulaciones.
+
+Todos los usuarios generados comparten la contraseña --contrasena. Al terminar escribe en
+--muestra (JSON) los IDs que usan los escenarios: la empresa con más postulaciones, candidatos,
+vacantes abiertas, postulaciones y un administrador.
+
+Uso (desde server-flask/):
+    DB_MOTOR=sqlite DB_URL=sqlite:///bench.db python -m benchmarks.datos_sinteticos --postulaciones 100000
+"""
+import argparse
+import json
+import os
+import random
+import time
+from collections import Counter
+from datetime import date, timedelta
+from itertools import accumulate
+
+import bcrypt
+from sqlalchemy import text
+
+HABILIDADES = (
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'React', 'Angular', 'Vue', 'Node.js', 'Flask',
+    'Django', 'Spring', 'SQL', 'SQL Server', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Docker',
+    'Kubernetes', 'AWS', 'Azure', 'Linux', 'Git', 'C#', '.NET', 'PHP', 'Laravel', 'Go', 'Kotlin',
+    'Swift', 'Excel', 'Power BI', 'Tableau', 'SAP', 'Contabilidad', 'Nóminas', 'Ventas',
+    'Atención al cliente', 'Logística', 'Inventarios', 'Inglés', 'Liderazgo', 'Scrum',
+    'Diseño gráfico', 'Photoshop', 'Figma', 'Marketing digital', 'SEO', 'Redacción', 'AutoCAD'
+)
+PUESTOS = (
+    'Desarrollador', 'Analista', 'Ingeniero de datos', 'Administrador de sistemas', 'Diseñador',
+    'Contador', 'Ejecutivo de ventas', 'Coordinador de logística', 'Auxiliar administrativo',
+    'Gerente de proyecto', 'Soporte técnico', 'Especialista en marketing', 'Tester QA'
+)
+NIVELES = ('Jr.', 'Sr.', 'Semi Sr.', 'Trainee', 'Líder', '')
+UBICACIONES = (
+    'CDMX', 'Querétaro', 'Guadalajara', 'Monterrey', 'Puebla', 'León', 'Mérida', 'Tijuana',
+    'Toluca', 'Aguascalientes', 'San Luis Potosí', 'Remoto'
+)
+TIPOS_CONTRATO = ('Tiempo completo', 'Medio tiempo', 'Por proyecto', 'Prácticas', 'Temporal')
+APELLIDOS = ('López', 'García', 'Martínez', 'Hernández', 'Pérez', 'Sánchez', 'Ramírez', 'Torres',
+             'Flores', 'Rivera', 'Gómez', 'Díaz', 'Cruz', 'Morales', 'Reyes', 'Ortiz')
+FRASES = (
+    "Buscamos una persona proactiva para integrarse a nuestro equipo.",
+    "Ofrecemos prestaciones superiores a las de ley y crecimiento profesional.",
+    "Trabajarás con clientes nacionales e internacionales.",
+    "El puesto incluye capacitación inicial de dos semanas.",
+    "Horario de lunes a viernes con posibilidad de trabajo híbrido.",
+    "Participarás en el diseño, desarrollo y mantenimiento de soluciones.",
+    "Se valorará experiencia previa en proyectos similares.",
+    "Reportarás directamente a la gerencia del área.",
+    "Contamos con programa de bonos por desempeño.",
+    "Ambiente de trabajo colaborativo y orientado a resultados."
+)
+# Estado de las postulaciones y su proporción
+ESTADOS_POSTULACION = (('Pendiente', 55), ('En Revisión', 25), ('Rechazado', 15), ('Aceptado', 5))
+ADMINISTRADORES = 3
+
+
+def volumenes(postulaciones):
+    return {
+        'postulaciones': postulaciones,
+        'candidatos': max(10, postulaciones // 5),
+        'vacantes': max(10, postulaciones // 20),
+        'empresas': max(3, postulaciones // 200),
+        'administradores': ADMINISTRADORES
+    }
+
+
+def texto(aleatorio, minimo, maximo):
+    partes, longitud = [], 0
+    objetivo = aleatorio.randint(minimo, maximo)
+    while longitud < objetivo:
+        frase = aleatorio.choice(FRASES)
+        partes.append(frase)
+        longitud += len(frase) + 1
+    return ' '.join(partes)
+
+
+def insertar_por_lotes(conn, consulta, filas, lote):
+    for inicio in range(0, len(filas), lote):
+        conn.execute(consulta, filas[inicio:inicio + lote])
+
+
+def ids_nuevos(conn, tabla, previo):
+    return [fila.ID for fila in conn.execute(
+        text(f"SELECT ID FROM {tabla} WHERE ID > :previo ORDER BY ID"), {"previo": previo})]
+
+
+def maximo_id(conn, tabla):
+    return conn.execute(text(f"SELECT MAX(ID) FROM {tabla}")).scalar() or 0
+
+
+def cargar_usuarios(conn, aleatorio, etiqueta, rol, cantidad, hash_contrasena, lote):
+    """Insertar 'cantidad' usuarios con rol 'rol'. Devuelve [(ID, NombreUsuario, Correo)]"""
+    previo = maximo_id(conn, 'Usuario')
+    filas = []
+    for i in range(cantidad):
+        nombre = f"{etiqueta}_{rol.lower()}{i}"
+        filas.append({"nombre": nombre, "correo": f"{nombre}@example.com", "contrasena": hash_contrasena,
+                      "rol": rol, "eliminado": 1 if rol == 'CANDIDATO' and aleatorio.random() < 0.01 else 0})
+    insertar_por_lotes(conn, text("""
+        INSERT INTO Usuario (NombreUsuario, Correo, Contrasena, ROL, eliminado)
+        VALUES (:nombre, :correo, :contrasena, :rol, :eliminado)
+    """), filas, lote)
+    return [(id_usuario, fila['nombre'], fila['correo'])
+            for id_usuario, fila in zip(ids_nuevos(conn, 'Usuario', previo), filas)]
+
+
+def cargar_candidatos(conn, aleatorio, usuarios, lote):
+    previo = maximo_id(conn, 'Candidatos')
+    filas = [{
+        "usuario": id_usuario,
+        "telefono": f"442{aleatorio.randrange(10 ** 7):07d}",
+        "direccion": f"Calle {aleatorio.randint(1, 300)}, {aleatorio.choice(UBICACIONES)}",
+        "educacion": texto(aleatorio, 80, 400),
+        "experiencia": texto(aleatorio, 200, 1200)
+    } for id_usuario, _, _ in usuarios]
+    insertar_por_lotes(conn, text("""
+        INSERT INTO Candidatos (ID_Usuario, Telefono, Dirreccion, Educacion, Experiencia_Laboral)
+        VALUES (:usuario, :telefono, :direccion, :educacion, :experiencia)
+    """), filas, lote)
+    return ids_nuevos(conn, 'Candidatos', previo)
+
+
+def cargar_empresas(conn, aleatorio, usuarios, lote):
+    previo = maximo_id(conn, 'Empresa')
+    filas = [{
+        "usuario": id_usuario,
+        "nombre": f"Empresa {nombre}",
+        "rfc": f"EMP{id_usuario:010d}"[:13],
+        "direccion": f"Av. {aleatorio.choice(APELLIDOS)} {aleatorio.randint(1, 2000)}, {aleatorio.choice(UBICACIONES)}",
+        "telefono": f"55{aleatorio.randrange(10 ** 8):08d}",
+        "descripcion": texto(aleatorio, 100, 600)
+    } for id_usuario, nombre, _ in usuarios]
+    insertar_por_lotes(conn, text("""
+        INSERT INTO Empresa (ID_Usuario, Nombre, RFC, Direccion, Telefono, Descripcion)
+        VALUES (:usuario, :nombre, :rfc, :direccion, :telefono, :descripcion)
+    """), filas, lote)
+    return ids_nuevos(conn, 'Empresa', previo)
+
+
+def cargar_habilidades(conn, aleatorio, candidatos, lote):
+    existentes = {fila.Nombre: fila.ID for fila in conn.execute(text("SELECT ID, Nombre FROM Habilidades"))}
+    faltantes = [{"nombre": nombre} for nombre in HABILIDADES if nombre not in existentes]
+    if faltantes:
+        conn.execute(text("INSERT INTO Habilidades (Nombre) VALUES (:nombre)"), faltantes)
+        existentes = {fila.Nombre: fila.ID for fila in conn.execute(text("SELECT ID, Nombre FROM Habilidades"))}
+    catalogo = [existentes[nombre] for nombre in HABILIDADES]
+    filas = [{"candidato": candidato, "habilidad": habilidad}
+             for candidato in candidatos
+             for habilidad in aleatorio.sample(catalogo, aleatorio.randint(2, 8))]
+    insertar_por_lotes(conn, text("""
+        INSERT INTO Candidato_Habilidad (ID_Candidato, ID_Habilidad) VALUES (:candidato, :habilidad)
+    """), filas, lote)
+    return len(filas)
+
+
+def cargar_vacantes(conn, aleatorio, empresas, cantidad, hoy, lote):
+    """Devuelve [(ID, ID_Empresa, Fecha_Publicacion)] en el orden de inserción"""
+    previo = maximo_id(conn, 'Vacantes')
+    pesos = [1 / (posicion + 1) ** 1.1 for posicion in range(len(empresas))]
+    filas = []
+    for empresa in aleatorio.choices(empresas, weights=pesos, k=cantidad):
+        publicacion = hoy - timedelta(days=aleatorio.randint(0, 365))
+        cierre = publicacion + timedelta(days=aleatorio.randint(30, 120))
+        cerrada = aleatorio.random() < 0.15
+        habilidades = aleatorio.sample(HABILIDADES, aleatorio.randint(3, 6))
+        filas.append({
+            "empresa": empresa,
+            "titulo": f"{aleatorio.choice(PUESTOS)} {aleatorio.choice(NIVELES)}".strip(),
+            "descripcion": texto(aleatorio, 300, 1500),
+            "requisitos": f"{', '.join(habilidades)}. {aleatorio.randint(0, 8)} años de experiencia.",
+            "salario": aleatorio.randrange(8000, 60001, 500),
+            "tipo_contrato": aleatorio.choice(TIPOS_CONTRATO),
+            "ubicacion": aleatorio.choice(UBICACIONES),
+            "publicacion": publicacion,
+            "cierre": min(cierre, hoy) if cerrada else cierre,
+            "estado": 'Cerrada' if cerrada else 'Abierta',
+            "eliminado": 1 if aleatorio.random() < 0.02 else 0
+        })
+    insertar_por_lotes(conn, text("""
+        INSERT INTO Vacantes (
+            ID_Empresa, Titulo_puesto, Descripcion, Requisitos, Salario, Tipo_Contrato, Ubicacion,
+            Fecha_Publicacion, Fecha_Cierre, Estado, CantidadPostulaciones, eliminado
+        ) VALUES (
+            :empresa, :titulo, :descripcion, :requisitos, :salario, :tipo_contrato, :ubicacion,
+            :publicacion, :cierre, :estado, 0, :eliminado
+        )
+    """), filas, lote)
+    return [(id_vacante, fila['empresa'], fila['publicacion'])
+            for id_vacante, fila in zip(ids_nuevos(conn, 'Vacantes', previo), filas)]
+
+
+def cargar_postulaciones(conn, aleatorio, candidatos, vacantes, cantidad, hoy, lote):
+    """Pares (candidato, vacante) distintos; las vacantes de las empresas grandes reciben más"""
+    # Cuántas postulaciones hace cada candidato: la mayoría pocas, algunos muchas
+    por_candidato = Counter(aleatorio.choices(candidatos, weights=[aleatorio.paretovariate(1.5) for _ in candidatos],
+                                              k=cantidad))
+    acumulados = list(accumulate(aleatorio.paretovariate(1.2) for _ in vacantes))
+    estados = [estado for estado, _ in ESTADOS_POSTULACION]
+    proporciones = [proporcion for _, proporcion in ESTADOS_POSTULACION]
+    filas = []
+    for candidato, veces in por_candidato.items():
+        elegidas = set()
+        for indice in aleatorio.choices(range(len(vacantes)), cum_weights=acumulados, k=min(veces, len(vacantes))):
+            while indice in elegidas:
+                indice = aleatorio.randrange(len(vacantes))
+            elegidas.add(indice)
+            id_vacante, _, publicacion = vacantes[indice]
+            dias = min((hoy - publicacion).days, 60)
+            filas.append({"candidato": candidato, "vacante": id_vacante,
+                          "fecha": publicacion + timedelta(days=aleatorio.randint(0, dias)),
+                          "estado": aleatorio.choices(estados, weights=proporciones)[0]})
+    filas.sort(key=lambda fila: fila['fecha'])
+    insertar_por_lotes(conn, text("""
+        INSERT INTO Postulaciones (ID_Candidato, ID_Vacante, Fecha_Publicacion, Estado)
+        VALUES (:candidato, :vacante, :fecha, :estado)
+    """), filas, lote)
+    return len(filas)
+
+
+MUESTRA_EMPRESA = text("""
+    SELECT TOP (1) E.ID, E.ID_Usuario, COUNT(*) AS Postulaciones
+    FROM Empresa E
+    JOIN Vacantes V ON V.ID_Empresa = E.ID
+    JOIN Postulaciones P ON P.ID_Vacante = V.ID
+    GROUP BY E.ID, E.ID_Usuario
+    ORDER BY COUNT(*) DESC
+""")
+MUESTRA_CANDIDATOS = text("""
+    SELECT TOP (:limite) C.ID, C.ID_Usuario, U.NombreUsuario, U.Correo
+    FROM Candidatos C
+    JOIN Usuario U ON U.ID = C.ID_Usuario
+    WHERE U.eliminado = 0 AND U.NombreUsuario LIKE :patron
+    ORDER BY C.ID
+""")
+
+
+def elegir_muestra(conn, etiqueta, aleatorio, tamano=500):
+    """IDs de la carga que usan los escenarios de benchmarks.suite_rutas"""
+    empresa = conn.execute(MUESTRA_EMPRESA).fetchone()
+    candidatos = conn.execute(MUESTRA_CANDIDATOS, {"limite": tamano * 10, "patron": f"{etiqueta}_%"}).fetchall()
+    candidatos = aleatorio.sample(candidatos, min(tamano, len(candidatos)))
+    vacantes_empresa = [fila.ID for fila in conn.execute(text("""
+        SELECT TOP (:limite) ID FROM Vacantes WHERE ID_Empresa = :empresa AND eliminado = 0 ORDER BY ID DESC
+    """), {"limite": tamano, "empresa": empresa.ID})]
+    abiertas = [fila.ID for fila in conn.execute(text("""
+        SELECT TOP (:limite) ID FROM Vacantes WHERE Estado = 'Abierta' AND eliminado = 0 ORDER BY ID DESC
+    """), {"limite": tamano * 2})]
+    postulaciones = [fila.ID for fila in conn.execute(text("""
+        SELECT TOP (:limite) P.ID FROM Postulaciones P
+        JOIN Vacantes V ON V.ID = P.ID_Vacante
+        WHERE V.ID_Empresa = :empresa AND P.Estado <> 'Aceptado'
+        ORDER BY P.ID DESC
+    """), {"limite": tamano, "empresa": empresa.ID})]
+    administrador = conn.execute(text("""
+        SELECT TOP (1) ID FROM Usuario WHERE ROL = 'ADMINISTRADOR' AND eliminado = 0 ORDER BY ID DESC
+    """)).scalar()
+    return {
+        "empresa": {"id": empresa.ID, "usuario": empresa.ID_Usuario, "postulaciones": empresa.Postulaciones},
+        "candidatos": [{"id": fila.ID, "usuario": fila.ID_Usuario, "nombreUsuario": fila.NombreUsuario,
+                        "correo": fila.Correo} for fila in candidatos],
+        "vacantesEmpresa": vacantes_empresa,
+        "vacantesAbiertas": abiertas,
+        "postulacionesEmpresa": postulaciones,
+        "administrador": administrador,
+        "habilidades": list(HABILIDADES),
+        "ubicaciones": list(UBICACIONES)
+    }
+
+
+def generar(engine, postulaciones, semilla=1, lote=5000, contrasena='secreta123', rondas=12, informar=print):
+    """Cargar el volumen de volumenes(postulaciones) y devolver la muestra para los escenarios"""
+    from src.destacadas import aplicar_destacadas, calcular_destacadas, leer_configuracion
+    from src.versiones import RECURSOS, incrementar_version
+
+    aleatorio = random.Random(semilla)
+    cantidades = volumenes(postulaciones)
+    hoy = date.today()
+    hash_contrasena = bcrypt.hashpw(contrasena.encode('utf-8'), bcrypt.gensalt(rondas)).decode('utf-8')
+
+    with engine.connect() as conn:
+        # Los nombres de usuario incluyen el último ID para no chocar con una carga anterior
+        etiqueta = f"s{semilla}u{maximo_id(conn, 'Usuario')}"
+        pasos = (
+            ('Usuario (empresas)', lambda: cargar_usuarios(conn, aleatorio, etiqueta, 'EMPRESA',
+                                                           cantidades['empresas'], hash_contrasena, lote)),
+            ('Empresa', lambda: cargar_empresas(conn, aleatorio, resultados['Usuario (empresas)'], lote)),
+            ('Usuario (candidatos)', lambda: cargar_usuarios(conn, aleatorio, etiqueta, 'CANDIDATO',
+                                                             cantidades['candidatos'], hash_contrasena, lote)),
+            ('Candidatos', lambda: cargar_candidatos(conn, aleatorio, resultados['Usuario (candidatos)'], lote)),
+            ('Usuario (administradores)', lambda: cargar_usuarios(conn, aleatorio, etiqueta, 'ADMINISTRADOR',
+                                                                  cantidades['administradores'], hash_contrasena, lote)),
+            ('Candidato_Habilidad', lambda: cargar_habilidades(conn, aleatorio, resultados['Candidatos'], lote)),
+            ('Vacantes', lambda: cargar_vacantes(conn, aleatorio, resultados['Empresa'],
+                                                 cantidades['vacantes'], hoy, lote)),
+            ('Postulaciones', lambda: cargar_postulaciones(conn, aleatorio, resultados['Candidatos'],
+                                                           resultados['Vacantes'], cantidades['postulaciones'],
+                                                           hoy, lote)),
+        )
+        resultados = {}
+        for nombre, paso in pasos:
+            inicio = time.perf_counter()
+            resultados[nombre] = paso()
+            conn.commit()
+            segundos = time.perf_counter() - inicio
+            filas = resultados[nombre] if isinstance(resultados[nombre], int) else len(resultados[nombre])
+            informar(f"  {nombre:<28}{filas:>10} filas{segundos:>8.1f}s{filas / max(segundos, 1e-9):>12.0f} filas/s")
+
+        aplicar_destacadas(conn, calcular_destacadas(conn, *leer_configuracion(None)))
+        incrementar_version(conn, *RECURSOS)
+        conn.commit()
+        muestra = elegir_muestra(conn, etiqueta, aleatorio)
+    muestra["contrasena"] = contrasena
+    return muestra
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--postulaciones', type=int, default=100000)
+    parser.add_argument('--semilla', type=int, default=1)
+    parser.add_argument('--lote', type=int, default=5000, help="filas por executemany")
+    parser.add_argument('--contrasena', default='secreta123')
+    parser.add_argument('--rondas', type=int, default=12, help="rondas de bcrypt del hash compartido")
+    parser.add_argument('--muestra', default=os.path.join('benchmarks', 'resultados', 'muestra.json'))
+    args = parser.parse_args()
+
+    from src.conexion import engine
+
+    print(f"{engine.url.render_as_string(hide_password=True)}: {volumenes(args.postulaciones)}")
+    inicio = time.perf_counter()
+    muestra = generar(engine, args.postulaciones, args.semilla, args.lote, args.contrasena, args.rondas)
+    print(f"total {time.perf_counter() - inicio:.1f}s; empresa con más postulaciones: usuario "
+          f"{muestra['empresa']['usuario']} ({muestra['empresa']['postulaciones']} postulaciones)")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.muestra)), exist_ok=True)
+    with open(args.muestra, 'w', encoding='utf-8') as f:
+        json.dump(muestra, f, ensure_ascii=False, indent=2)
+    print(f"muestra para los escenarios: {args.muestra}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,451 @@
+"""Suite de benchmarks por ruta: req/s, p50/p99, errores y RSS máximo, comparada con una línea base.
+
+Cada escenario es una ruta de main.py con parámetros tomados de la muestra que escribe
+benchmarks.datos_sinteticos (la empresa con más postulaciones, candidatos reales, vacantes
+abiertas...). Los escenarios se ejecutan uno tras otro con --clientes clientes durante
+--duracion segundos cada uno, para que el req/s y la memoria de uno no se mezclen con otro:
+
+    publico    feed de vacantes, búsqueda, destacadas, perfiles, login
+    empresa    panel de la empresa grande: sus vacantes, postulaciones y recomendados
+    candidato  postulaciones, habilidades y vacantes recomendadas
+    admin      listados, estadísticas y estado interno de administración
+    escritura  registro, postulación, cambios de estado, altas y ediciones
+
+El RSS máximo se muestrea de /proc/<pid>/status (el proceso del servidor: este mismo con
+--en-proceso, o --pid). Los resultados se guardan en JSON en benchmarks/resultados/ con la
+fecha, el commit y los parámetros; si existe --linea-base se compara con ella y un escenario
+con menos req/s o más p99 que la tolerancia (--tolerancia, 20 %) cuenta como regresión.
+
+Con --en-proceso se comprueba además que toda ruta de app.url_map tenga un escenario o una
+exclusión con su motivo (EXCLUIDAS). Sale con código 1 si falta alguna ruta, si un escenario
+responde códigos que no espera o si hay regresiones.
+
+Uso (desde server-flask/):
+    # base SQLite nueva con 100k postulaciones y servidor en este proceso
+    python -m benchmarks.suite_rutas --preparar 100000 --clientes 8 --duracion 10 --fijar-linea-base
+    # después de un cambio, misma carga y comparación con la línea base
+    python -m benchmarks.suite_rutas --preparar 100000 --clientes 8 --duracion 10
+    # contra un servidor levantado sobre datos de benchmarks.datos_sinteticos
+    python -m benchmarks.suite_rutas --url http://localhost:5000 --muestra benchmarks/resultados/muestra.json --pid <pid>
+    # solo un grupo o algunos escenarios
+    python -m benchmarks.suite_rutas --preparar 20000 --grupo empresa --escenario login
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict, namedtuple
+from datetime import date, datetime, timedelta
+from urllib.parse import quote
+
+from benchmarks.carga_rutas import enviar, percentil
+
+DIRECTORIO_RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resultados')
+GRUPOS = ('publico', 'empresa', 'candidato', 'admin', 'escritura')
+ACEPTADOS = frozenset((200, 201, 304))
+
+# peticion(muestra, aleatorio) -> (ruta, cuerpo JSON o None)
+Escenario = namedtuple('Escenario', 'nombre grupo metodo regla peticion aceptados')
+
+# Rutas sin escenario y dónde se miden
+EXCLUIDAS = {
+    ('GET', '/static/<path:filename>'): "archivos: benchmarks.bench_estaticos",
+    ('GET', '/files/<path:filename>'): "archivos: benchmarks.bench_estaticos",
+    ('POST', '/api/usuario/upload-image/<int:user_id>'): "subida multipart: benchmarks.bench_subidas",
+    ('POST', '/api/candidato/upload-cv/<int:user_id>'): "subida multipart: benchmarks.bench_subidas",
+    ('POST', '/api/empresa/<int:user_id>/vacantes/importar'): "carga masiva: benchmarks.bench_importacion_vacantes",
+    ('POST', '/api/verify-2fa'): "necesita el código de cada login: benchmarks.bench_dos_factores",
+    ('POST', '/api/empresas'): "una sola empresa por usuario; el alta de empresa se mide en el registro",
+}
+# Todas las rutas DELETE se excluyen: borrarían los datos que usan los demás escenarios
+EXCLUIDOS_METODOS = {'DELETE': "destructiva"}
+
+_registros = itertools.count()
+
+
+def _vacante(aleatorio, extra=None):
+    cuerpo = {
+        "titulo": f"Vacante de benchmark {aleatorio.randrange(10 ** 6)}",
+        "descripcion": "Descripción de la vacante generada por la suite de benchmarks. " * 8,
+        "requisitos": "Python, SQL, Docker. 3 años de experiencia.",
+        "salario": aleatorio.randrange(8000, 60001, 500),
+        "tipoContrato": "Tiempo completo",
+        "ubicacion": "Querétaro",
+        "fechaCierre": "2099-12-31",
+        "estado": "Abierta"
+    }
+    cuerpo.update(extra or {})
+    return cuerpo
+
+
+def _candidato(m, a):
+    return a.choice(m['candidatos'])
+
+
+def _registro(m, a):
+    nombre = f"suite{os.getpid()}_{next(_registros)}"
+    return '/api/register', {
+        "nombreUsuario": nombre, "correo": f"{nombre}@example.com", "contrasena": m['contrasena'],
+        "userType": "user", "nombreCandidato": "Ana", "apellidoCandidato": "López",
+        "telefonoCandidato": "4421111111"
+    }
+
+
+ESCENARIOS = [
+    # publico
+    Escenario('feed', 'publico', 'GET', '/api/vacantes', lambda m, a: ('/api/vacantes', None), ACEPTADOS),
+    Escenario('feed_paginado', 'publico', 'GET', '/api/vacantes',
+              lambda m, a: (f"/api/vacantes?limite=20&ubicacion={quote(a.choice(m['ubicaciones']))}", None), ACEPTADOS),
+    Escenario('busqueda', 'publico', 'GET', '/api/vacantes/search',
+              lambda m, a: (f"/api/vacantes/search?q={quote(a.choice(m['habilidades']))}", None), ACEPTADOS),
+    Escenario('destacadas', 'publico', 'GET', '/api/vacantes/destacadas',
+              lambda m, a: ('/api/vacantes/destacadas', None), ACEPTADOS),
+    Escenario('empresas', 'publico', 'GET', '/api/empresas', lambda m, a: ('/api/empresas', None), ACEPTADOS),
+    Escenario('usuarios', 'publico', 'GET', '/api/usuarios', lambda m, a: ('/api/usuarios', None), ACEPTADOS),
+    Escenario('usuario', 'publico', 'GET', '/api/usuarios/<int:usuario_id>',
+              lambda m, a: (f"/api/usuarios/{_candidato(m, a)['usuario']}", None), ACEPTADOS),
+    Escenario('perfil_empresa', 'publico', 'GET', '/api/empresa/profile/<int:user_id>',
+              lambda m, a: (f"/api/empresa/profile/{m['empresa']['usuario']}", None), ACEPTADOS),
+    Escenario('perfil_candidato', 'publico', 'GET', '/api/candidato/profile/<int:user_id>',
+              lambda m, a: (f"/api/candidato/profile/{_candidato(m, a)['usuario']}", None), ACEPTADOS),
+    Escenario('login', 'publico', 'POST', '/api/login',
+              lambda m, a: ('/api/login', {"usuario": _candidato(m, a)['nombreUsuario'],
+                                           "contrasena": m['contrasena']}), ACEPTADOS),
+    # empresa
+    Escenario('empresa_vacantes', 'empresa', 'GET', '/api/empresa/<int:user_id>/vacantes',
+              lambda m, a: (f"/api/empresa/{m['empresa']['usuario']}/vacantes", None), ACEPTADOS),
+    Escenario('empresa_vacante', 'empresa', 'GET', '/api/empresa/<int:user_id>/vacantes/<int:vacante_id>',
+              lambda m, a: (f"/api/empresa/{m['empresa']['usuario']}/vacantes/{a.choice(m['vacantesEmpresa'])}",
+                            None), ACEPTADOS),
+    Escenario('empresa_postulaciones', 'empresa', 'GET', '/api/empresa/<int:user_id>/postulaciones',
+              lambda m, a: (f"/api/empresa/{m['empresa']['usuario']}/postulaciones", None), ACEPTADOS),
+    Escenario('empresa_postulaciones_pagina', 'empresa', 'GET', '/api/empresa/<int:user_id>/postulaciones',
+              lambda m, a: (f"/api/empresa/{m['empresa']['usuario']}/postulaciones?limite=20"
+                            f"&estado={quote(a.choice(('Pendiente', 'En Revisión', 'Aceptado', 'Rechazado')))}",
+                            None), ACEPTADOS),
+    Escenario('empresa_candidatos', 'empresa', 'GET', '/api/empresa/<int:user_id>/candidatos',
+              lambda m, a: (f"/api/empresa/{m['empresa']['usuario']}/candidatos?ids="
+                            + ','.join(str(c['id']) for c in a.sample(m['candidatos'], 20)), None), ACEPTADOS),
+    Escenario('empresa_estadisticas', 'empresa', 'GET', '/api/empresa/<int:user_id>/postulaciones/estadisticas',
+              lambda m, a: (f"/api/empresa/{m['empresa']['usuario']}/postulaciones/estadisticas"
+                            f"?desde={date.today() - timedelta(days=365)}&agrupar=semana", None), ACEPTADOS),
+    Escenario('empresa_estadisticas_vacante', 'empresa', 'GET',
+              '/api/empresa/<int:user_id>/postulaciones/estadisticas',
+              lambda m, a: (f"/api/empresa/{m['empresa']['usuario']}/postulaciones/estadisticas"
+                            f"?vacante={a.choice(m['vacantesEmpresa'])}", None), ACEPTADOS),
+    Escenario('candidatos_recomendados', 'empresa', 'GET',
+              '/api/empresa/<int:user_id>/vacantes/<int:vacante_id>/candidatos-recomendados',
+              lambda m, a: (f"/api/empresa/{m['empresa']['usuario']}/vacantes/"
+                            f"{a.choice(m['vacantesEmpresa'])}/candidatos-recomendados", None), ACEPTADOS),
+    # candidato
+    Escenario('candidato_postulaciones', 'candidato', 'GET', '/api/candidato/<int:user_id>/postulaciones',
+              lambda m, a: (f"/api/candidato/{_candidato(m, a)['usuario']}/postulaciones", None), ACEPTADOS),
+    Escenario('candidato_habilidades', 'candidato', 'GET', '/api/candidato/<int:user_id>/habilidades',
+              lambda m, a: (f"/api/candidato/{_candidato(m, a)['usuario']}/habilidades", None), ACEPTADOS),
+    Escenario('vacantes_recomendadas', 'candidato', 'GET', '/api/candidato/<int:user_id>/vacantes-recomendadas',
+              lambda m, a: (f"/api/candidato/{_candidato(m, a)['usuario']}/vacantes-recomendadas", None), ACEPTADOS),
+    # admin
+    *[Escenario(f"admin_{recurso.replace('-', '_')}", 'admin', 'GET', f'/api/admin/{recurso}',
+                (lambda ruta: lambda m, a: (ruta, None))(f'/api/admin/{recurso}'), ACEPTADOS)
+      for recurso in ('usuarios', 'vacantes', 'candidatos', 'empresas', 'postulaciones', 'estadisticas',
+                      'cache', 'pool', 'limites', 'dos-factores', 'contrasenas', 'archivos', 'consultas-lentas')],
+    Escenario('admin_estadisticas_periodo', 'admin', 'GET', '/api/admin/estadisticas/periodo',
+              lambda m, a: (f"/api/admin/estadisticas/periodo?desde={date.today() - timedelta(days=365)}"
+                            "&agrupar=mes", None), ACEPTADOS),
+    Escenario('admin_reconciliar', 'admin', 'POST', '/api/admin/estadisticas/reconciliar',
+              lambda m, a: ('/api/admin/estadisticas/reconciliar', {}), ACEPTADOS),
+    Escenario('admin_recolectar_simulado', 'admin', 'POST', '/api/admin/archivos/recolectar',
+              lambda m, a: ('/api/admin/archivos/recolectar', {"simular": True}), ACEPTADOS),
+    Escenario('metricas', 'admin', 'GET', '/metrics', lambda m, a: ('/metrics', None), ACEPTADOS),
+    # escritura
+    Escenario('registro', 'escritura', 'POST', '/api/register', _registro, ACEPTADOS),
+    # Un par candidato/vacante repetido responde 400 (ya postulado)
+    Escenario('postular', 'escritura', 'POST', '/api/postulaciones',
+              lambda m, a: ('/api/postulaciones', {"userId": _candidato(m, a)['usuario'],
+                                                   "vacanteId": a.choice(m['vacantesAbiertas'])}),
+              ACEPTADOS | {400}),
+    Escenario('estado_postulacion', 'escritura', 'PUT', '/api/postulaciones/<int:postulacion_id>',
+              lambda m, a: (f"/api/postulaciones/{a.choice(m['postulacionesEmpresa'])}",
+                            {"estado": "En Revisión"}), ACEPTADOS),
+    Escenario('vacante_alta', 'escritura', 'POST', '/api/empresa/<int:user_id>/vacantes',
+              lambda m, a: (f"/api/empresa/{m['empresa']['usuario']}/vacantes", _vacante(a)), ACEPTADOS),
+    Escenario('vacante_edicion', 'escritura', 'PUT', '/api/empresa/<int:user_id>/vacantes/<int:vacante_id>',
+              lambda m, a: (f"/api/empresa/{m['empresa']['usuario']}/vacantes/{a.choice(m['vacantesEmpresa'])}",
+                            _vacante(a)), ACEPTADOS),
+    Escenario('insertar_vacante', 'escritura', 'POST', '/insertar_vacante',
+              lambda m, a: ('/insertar_vacante', {
+                  "ID_Empresa": m['empresa']['id'], "Titulo_puesto": "Vacante de benchmark",
+                  "Descripcion": "Alta por la ruta anterior", "Requisitos": "Python", "Salario": 15000,
+                  "Tipo_Contrato": "Tiempo completo", "Ubicacion": "CDMX",
+                  "Fecha_Publicacion": datetime.now().strftime('%Y-%m-%d'), "Fecha_Cierre": "2099-12-31"
+              }), ACEPTADOS),
+    Escenario('perfil_candidato_edicion', 'escritura', 'PUT', '/api/candidato/profile/<int:user_id>',
+              lambda m, a: (f"/api/candidato/profile/{_candidato(m, a)['usuario']}", {
+                  "direccion": "Calle 5, Querétaro", "educacion": "Ingeniería en Sistemas",
+                  "experiencia": "Desarrollador backend durante 3 años"
+              }), ACEPTADOS),
+    Escenario('perfil_empresa_edicion', 'escritura', 'PUT', '/api/empresa/profile/<int:user_id>',
+              lambda m, a: (f"/api/empresa/profile/{m['empresa']['usuario']}", {
+                  "nombre": "Empresa grande", "rfc": "EMP0000000001", "direccion": "Av. Principal 100, CDMX",
+                  "telefono": "5500000000", "descripcion": "Empresa con más postulaciones de la carga"
+              }), ACEPTADOS),
+    Escenario('habilidades_edicion', 'escritura', 'PUT', '/api/candidato/<int:user_id>/habilidades',
+              lambda m, a: (f"/api/candidato/{_candidato(m, a)['usuario']}/habilidades",
+                            {"habilidades": a.sample(m['habilidades'], 4)}), ACEPTADOS),
+    Escenario('destacadas_recalculo', 'escritura', 'POST', '/api/actualizar-destacadas',
+              lambda m, a: ('/api/actualizar-destacadas', {}), ACEPTADOS),
+    # Las ediciones de administración reescriben los valores que ya tiene la fila
+    Escenario('admin_usuario_edicion', 'escritura', 'PUT', '/api/admin/usuarios/<int:usuario_id>',
+              lambda m, a: (lambda c: (f"/api/admin/usuarios/{c['usuario']}", {
+                  "nombreUsuario": c['nombreUsuario'], "correo": c['correo'], "rol": "CANDIDATO"
+              }))(_candidato(m, a)), ACEPTADOS),
+    Escenario('admin_vacante_alta', 'escritura', 'POST', '/api/admin/vacantes',
+              lambda m, a: ('/api/admin/vacantes', _vacante(a, {"empresaId": m['empresa']['id']})), ACEPTADOS),
+    Escenario('admin_vacante_edicion', 'escritura', 'PUT', '/api/admin/vacantes/<int:vacante_id>',
+              lambda m, a: (f"/api/admin/vacantes/{a.choice(m['vacantesEmpresa'])}", _vacante(a)), ACEPTADOS),
+    Escenario('admin_candidato_edicion', 'escritura', 'PUT', '/api/admin/candidatos/<int:candidato_id>',
+              lambda m, a: (lambda c: (f"/api/admin/candidatos/{c['id']}", {
+                  "nombreUsuario": c['nombreUsuario'], "eliminado": False, "telefono": "4421111111",
+                  "dirreccion": "Calle 5, Querétaro", "educacion": "Ingeniería en Sistemas",
+                  "experiencia_laboral": "Desarrollador backend durante 3 años"
+              }))(_candidato(m, a)), ACEPTADOS),
+    Escenario('admin_empresa_edicion', 'escritura', 'PUT', '/api/admin/empresas/<int:empresa_id>',
+              lambda m, a: (f"/api/admin/empresas/{m['empresa']['id']}", {
+                  "nombre": "Empresa grande", "direccion": "Av. Principal 100, CDMX", "telefono": "5500000000",
+                  "descripcion": "Empresa con más postulaciones de la carga"
+              }), ACEPTADOS),
+    Escenario('admin_postulacion_edicion', 'escritura', 'PUT', '/api/admin/postulaciones/<int:postulacion_id>',
+              lambda m, a: (f"/api/admin/postulaciones/{a.choice(m['postulacionesEmpresa'])}",
+                            {"estado": "En Revisión"}), ACEPTADOS),
+]
+
+
+def rutas_sin_cubrir(app, escenarios):
+    """(método, regla) de app.url_map sin escenario ni exclusión"""
+    cubiertas = {(e.metodo, e.regla) for e in escenarios}
+    faltantes = []
+    for regla in app.url_map.iter_rules():
+        for metodo in sorted(regla.methods - {'HEAD', 'OPTIONS'}):
+            clave = (metodo, regla.rule)
+            if clave not in cubiertas and clave not in EXCLUIDAS and metodo not in EXCLUIDOS_METODOS:
+                faltantes.append(clave)
+    return faltantes
+
+
+def leer_rss_kb(pid):
+    """RSS actual del proceso (kB); sin /proc, el máximo de este proceso según getrusage"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for linea in f:
+                if linea.startswith('VmRSS:'):
+                    return int(linea.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class MuestreoRss:
+    """Máximo de leer_rss_kb(pid) cada 'intervalo' segundos mientras corre un escenario"""
+
+    def __init__(self, pid, intervalo=0.05):
+        self.pid = pid
+        self.intervalo = intervalo
+        self.maximo = 0
+        self._fin = threading.Event()
+        self._hilo = threading.Thread(target=self._muestrear, daemon=True)
+
+    def _muestrear(self):
+        while True:
+            self.maximo = max(self.maximo, leer_rss_kb(self.pid))
+            if self._fin.wait(self.intervalo):
+                return
+
+    def __enter__(self):
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *_):
+        self._fin.set()
+        self._hilo.join()
+
+
+def ejecutar_escenario(base, escenario, muestra, clientes, duracion, semilla, timeout, pid):
+    tiempos, estados = [], defaultdict(int)
+    lock = threading.Lock()
+
+    def cliente(numero):
+        aleatorio = random.Random(semilla + numero)
+        while time.monotonic() < fin:
+            ruta, cuerpo = escenario.peticion(muestra, aleatorio)
+            inicio = time.perf_counter()
+            estado = enviar(base, escenario.metodo, ruta, timeout, cuerpo)
+            transcurrido = (time.perf_counter() - inicio) * 1000
+            with lock:
+                tiempos.append(transcurrido)
+                estados[estado] += 1
+
+    with MuestreoRss(pid) as rss:
+        inicio = time.monotonic()
+        fin = inicio + duracion
+        hilos = [threading.Thread(target=cliente, args=(i,)) for i in range(clientes)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        segundos = time.monotonic() - inicio
+    return {
+        "grupo": escenario.grupo,
+        "ruta": f"{escenario.metodo} {escenario.regla}",
+        "peticiones": len(tiempos),
+        "reqS": round(len(tiempos) / segundos, 1),
+        "p50Ms": round(statistics.median(tiempos), 2) if tiempos else None,
+        "p99Ms": round(percentil(tiempos, 0.99), 2) if tiempos else None,
+        "errores": sum(n for codigo, n in estados.items() if codigo not in escenario.aceptados),
+        "estados": {str(codigo): n for codigo, n in sorted(estados.items())},
+        "rssMaxMb": round(rss.maximo / 1024, 1)
+    }
+
+
+def comparar(actual, base, tolerancia):
+    """Escenarios con menos req/s o más p99 que la línea base más allá de la tolerancia"""
+    regresiones = []
+    print(f"\n{'escenario':<30}{'req/s':>10}{'base':>10}{'Δ':>8}{'p99':>10}{'base':>10}{'Δ':>8}")
+    for nombre, resultado in actual.items():
+        previo = base.get(nombre)
+        if not previo or not previo.get('reqS') or not previo.get('p99Ms') or not resultado['p99Ms']:
+            continue
+        delta_rps = resultado['reqS'] / previo['reqS'] - 1
+        delta_p99 = resultado['p99Ms'] / previo['p99Ms'] - 1
+        marca = ''
+        if delta_rps < -tolerancia or delta_p99 > tolerancia:
+            regresiones.append(nombre)
+            marca = '  REGRESIÓN'
+        print(f"{nombre:<30}{resultado['reqS']:>10.1f}{previo['reqS']:>10.1f}{delta_rps:>+8.0%}"
+              f"{resultado['p99Ms']:>10.1f}{previo['p99Ms']:>10.1f}{delta_p99:>+8.0%}{marca}")
+    return regresiones
+
+
+def commit_actual():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def preparar_base(postulaciones, rondas):
+    """Base SQLite nueva con datos sintéticos para el servidor en este proceso. Devuelve la muestra"""
+    directorio = tempfile.mkdtemp(prefix='suite_rutas_')
+    os.environ.update({'DB_MOTOR': 'sqlite', 'DB_URL': f"sqlite:///{os.path.join(directorio, 'bolsa.db')}"})
+    from benchmarks.datos_sinteticos import generar, volumenes
+    from src.conexion import engine
+
+    print(f"generando {volumenes(postulaciones)} en {directorio}")
+    return generar(engine, postulaciones, rondas=rondas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--en-proceso', action='store_true')
+    parser.add_argument('--preparar', type=int, metavar='POSTULACIONES',
+                        help="generar una base SQLite nueva con este volumen (implica --en-proceso)")
+    parser.add_argument('--rondas', type=int, default=12, help="rondas de bcrypt de los usuarios generados")
+    parser.add_argument('--muestra', default=os.path.join(DIRECTORIO_RESULTADOS, 'muestra.json'))
+    parser.add_argument('--pid', type=int, help="proceso del servidor para el RSS (por defecto, este)")
+    parser.add_argument('--grupo', action='append', choices=GRUPOS)
+    parser.add_argument('--escenario', action='append')
+    parser.add_argument('--clientes', type=int, default=8)
+    parser.add_argument('--duracion', type=float, default=10.0, help="segundos por escenario")
+    parser.add_argument('--semilla', type=int, default=1)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--linea-base', default=os.path.join(DIRECTORIO_RESULTADOS, 'linea_base.json'))
+    parser.add_argument('--fijar-linea-base', action='store_true', help="guardar esta ejecución como línea base")
+    parser.add_argument('--tolerancia', type=float, default=0.2)
+    args = parser.parse_args()
+
+    escenarios = [e for e in ESCENARIOS
+                  if (not args.grupo or e.grupo in args.grupo) and (not args.escenario or e.nombre in args.escenario)]
+    en_proceso = args.en_proceso or args.preparar is not None
+    if en_proceso:
+        # Todas las peticiones llegan desde 127.0.0.1: sin esto el login respondería 429
+        for variable in ('LIMITE_LOGIN_IP', 'LIMITE_LOGIN_CUENTA', 'LIMITE_2FA_IP', 'LIMITE_2FA_CUENTA'):
+            os.environ.setdefault(variable, '1000000/60')
+    if args.preparar is not None:
+        muestra = preparar_base(args.preparar, args.rondas)
+    else:
+        with open(args.muestra, encoding='utf-8') as f:
+            muestra = json.load(f)
+
+    fallas = []
+    if en_proceso:
+        from benchmarks.carga_rutas import servir_en_proceso
+        from wsgi import app
+
+        faltantes = rutas_sin_cubrir(app, ESCENARIOS)
+        fallas += [f"ruta sin escenario ni exclusión: {metodo} {regla}" for metodo, regla in faltantes]
+        base = servir_en_proceso()
+    else:
+        base = args.url.rstrip('/')
+    pid = args.pid or os.getpid()
+
+    print(f"{base}: {len(escenarios)} escenarios, {args.clientes} clientes, {args.duracion:g}s cada uno; "
+          f"empresa grande: usuario {muestra['empresa']['usuario']} ({muestra['empresa']['postulaciones']} postulaciones)")
+    print(f"{'escenario':<30}{'grupo':<11}{'peticiones':>11}{'req/s':>9}{'p50':>10}{'p99':>10}"
+          f"{'RSS máx':>10}  estados")
+    resultados = {}
+    for escenario in escenarios:
+        resultado = ejecutar_escenario(base, escenario, muestra, args.clientes, args.duracion,
+                                       args.semilla, args.timeout, pid)
+        resultados[escenario.nombre] = resultado
+        estados = ' '.join(f"{codigo}:{n}" for codigo, n in resultado['estados'].items())
+        print(f"{escenario.nombre:<30}{escenario.grupo:<11}{resultado['peticiones']:>11}{resultado['reqS']:>9.1f}"
+              f"{resultado['p50Ms'] or 0:>8.1f}ms{resultado['p99Ms'] or 0:>8.1f}ms{resultado['rssMaxMb']:>8.1f}MB  {estados}")
+        if resultado['errores']:
+            fallas.append(f"{escenario.nombre}: {resultado['errores']} respuestas inesperadas ({estados})")
+
+    ejecucion = {
+        "fecha": datetime.now().isoformat(timespec='seconds'),
+        "commit": commit_actual(),
+        "parametros": {"url": None if en_proceso else base, "preparar": args.preparar, "clientes": args.clientes,
+                       "duracion": args.duracion, "semilla": args.semilla,
+                       "empresaPostulaciones": muestra['empresa']['postulaciones']},
+        "escenarios": resultados
+    }
+    os.makedirs(DIRECTORIO_RESULTADOS, exist_ok=True)
+    destino = os.path.join(DIRECTORIO_RESULTADOS,
+                           f"{datetime.now():%Y%m%d_%H%M%S}_{ejecucion['commit'] or 'sin_commit'}.json")
+    with open(destino, 'w', encoding='utf-8') as f:
+        json.dump(ejecucion, f, ensure_ascii=False, indent=2)
+    print(f"\nresultados: {destino}")
+
+    if args.fijar_linea_base:
+        with open(args.linea_base, 'w', encoding='utf-8') as f:
+            json.dump(ejecucion, f, ensure_ascii=False, indent=2)
+        print(f"línea base: {args.linea_base}")
+    elif os.path.exists(args.linea_base):
+        with open(args.linea_base, encoding='utf-8') as f:
+            linea_base = json.load(f)
+        if linea_base['parametros'] != ejecucion['parametros']:
+            print(f"aviso: parámetros distintos a los de la línea base ({linea_base['parametros']})")
+        print(f"comparación con la línea base del {linea_base['fecha']} (commit {linea_base['commit']}), "
+              f"tolerancia {args.tolerancia:.0%}")
+        fallas += [f"{nombre}: regresión contra la línea base"
+                   for nombre in comparar(resultados, linea_base['escenarios'], args.tolerancia)]
+
+    for falla in fallas:
+        print(f"FALLA: {falla}")
+    if fallas:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
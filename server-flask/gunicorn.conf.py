@@ -0,0 +1,53 @@
+# Configuración de gunicorn para producción:
+#     gunicorn -c gunicorn.conf.py wsgi:app
+#
+# Las peticiones pasan casi todo su tiempo esperando a SQL Server (pyodbc libera el GIL
+# durante la consulta), así que se usan pocos procesos con varios hilos cada uno
+# (worker gthread). Menos procesos también significa menos copias de los índices en
+# memoria (búsqueda, coincidencias) y de las cachés.
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_CONCURRENCY', min(multiprocessing.cpu_count(), 4)))
+threads = int(os.environ.get('WEB_THREADS', 8))
+
+# WEB_MODO=gevent: cada worker atiende hasta WEB_CONEXIONES peticiones en greenlets y las
+# llamadas a pyodbc se ejecutan en un pool de hilos nativos (ver src/concurrencia.py).
+# Las consultas simultáneas quedan limitadas por el pool de SQLAlchemy, no por los hilos.
+modo = os.environ.setdefault('WEB_MODO', 'hilos')
+if modo == 'gevent':
+    worker_class = 'gevent'
+    worker_connections = int(os.environ.get('WEB_CONEXIONES', 1000))
+    os.environ.setdefault('DB_POOL_TAMANO', '20')
+else:
+    worker_class = 'gthread'
+
+# Peticiones largas (importación masiva, exportaciones en streaming)
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+# Al recibir SIGTERM se deja de aceptar conexiones y se esperan las peticiones en curso
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
+
+# El pool de cada worker se dimensiona según los hilos y los workers (ver src/configuracion_bd.py):
+# en modo hilos ningún hilo espera conexión y DB_MAX_CONEXIONES se reparte entre los workers.
+os.environ['WEB_CONCURRENCY'] = str(workers)
+os.environ.setdefault('DB_POOL_TAMANO', str(threads))
+
+
+def post_fork(server, worker):
+    # Con --preload el engine se crea en el maestro: cada worker debe abrir sus propias conexiones
+    from src.conexion import engine
+    engine.dispose(close=False)
+
+
+def worker_exit(server, worker):
+    # Se ejecuta después de terminar las peticiones en curso (graceful_timeout)
+    from src.conexion import cerrar_pool
+    from src.contrasenas import servicio_contrasenas
+    cerrar_pool()
+    servicio_contrasenas.cerrar()
+    worker.log.info("Pool de conexiones y procesos de hashing cerrados")
@@ -1,50 +1,86 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-from src.conexion import obtener_conexion
-from flask_bcrypt import Bcrypt
-from sqlalchemy import text
+from src.conexion import obtener_conexion, estadisticas_pool
+from src.paginacion import (
+    ParametroInvalido, obtener_limite, obtener_numero, obtener_entero, obtener_fecha, obtener_lista_enteros,
+    obtener_campos, codificar_cursor, decodificar_cursor_fecha_id
+)
+from src.cache import cache_vacantes, clave_consulta, invalidar_vacantes
+from src.identidades import cache_identidades, obtener_identidad, invalidar_identidad
+from src.versiones import respuesta_condicional, incrementar_version, versiones_vigentes, cache_versiones
+from src.streaming import respuesta_en_streaming, FORMATOS
+from src.importacion import (
+    FILAS_POR_LOTE, MAX_ERRORES_REPORTADOS, IMPORTACION_MAX_BYTES, detectar_formato, leer_filas, validar_vacante
+)
+from src.destacadas import leer_configuracion, calcular_destacadas, aplicar_destacadas
+from src.busqueda import indice_vacantes
+from src.coincidencias import servicio_coincidencias
+from src.acceso_datos import (
+    vacantes_de_empresa, insertar_vacante_empresa, postulaciones_de_empresa, crear_empresa_por_defecto,
+    pagina_postulaciones_empresa, detalle_candidatos_empresa, postulaciones_de_candidato, crear_postulacion as crear_postulacion_db, ERRORES_POSTULACION
+)
+from src.instrumentacion import instalar as instalar_instrumentacion, registro_metricas
+from src.contrasenas import servicio_contrasenas, ServicioSaturado
+from src.dos_factores import almacen_desafios, MOSTRAR_CODIGO, VALIDO, BLOQUEADO
+from src.limite_peticiones import limitar_intentos, estado_limites, metricas_limites
+from src.subidas import ReceptorArchivo, ArchivoRechazado, SUBIDA_CV, SUBIDA_IMAGEN, MB
+from src.almacen_archivos import almacen_archivos, carpeta_imagen, CARPETA_CV, CARPETA_IMAGENES
+from src.estaticos import enviar_estatico
+from src.estadisticas import estadisticas_admin, AGRUPACIONES
+from src.estadisticas_empresa import (
+    estadisticas_postulaciones, reconciliar_resumenes, AGRUPACIONES_EMPRESA, ESTADOS_POSTULACION
+)
+from sqlalchemy import text, bindparam
 from sqlalchemy.exc import SQLAlchemyError
-from werkzeug.utils import secure_filename
-import secrets
 import time
+from datetime import date, timedelta
 import os
-import uuid
 
-app = Flask(__name__, static_folder='src/static')
-bcrypt = Bcrypt(app)
+# /static lo atiende serve_static_file (src/estaticos.py), no la ruta estática de Flask
+app = Flask(__name__, static_folder=None)
+# Consultas, espera del pool y serialización por petición (ver GET /metrics)
+instalar_instrumentacion(app)
+registro_metricas.agregar_colector(servicio_contrasenas.metricas)
+registro_metricas.agregar_colector(almacen_desafios.metricas)
+registro_metricas.agregar_colector(metricas_limites)
+registro_metricas.agregar_colector(almacen_archivos.metricas)
+registro_metricas.agregar_colector(estadisticas_admin.metricas)
 
 # Configurar la carpeta de uploads
 UPLOAD_FOLDER = os.path.join('src', 'static', 'files')
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+# Tamaño máximo del cuerpo de las peticiones (413 antes de leerlo). Las subidas de CV e
+# imágenes aplican su propio límite (src/subidas.py) y la importación de vacantes el suyo.
+app.config['MAX_CONTENT_LENGTH'] = int(float(os.environ.get('MAX_CONTENIDO_MB', 16)) * MB)
 
 # Configuración de CORS mejorada para permitir conexiones desde múltiples dispositivos
 CORS(app, resources={
     r"/api/*": {
         "origins": ["*"],  # En desarrollo, permitir todos los orígenes
         "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"]
+        "allow_headers": ["Content-Type", "Authorization", "If-None-Match"],
+        "expose_headers": ["ETag"]
     },
     r"/static/*": {
         "origins": ["*"]
     }
 })
 
+@app.errorhandler(413)
+def cuerpo_demasiado_grande(e):
+    """Respuesta JSON cuando el cuerpo supera MAX_CONTENT_LENGTH (o el límite de la ruta)"""
+    return jsonify({"error": "El contenido de la petición es demasiado grande"}), 413
+
 # ========== RUTAS DE ARCHIVOS ESTÁTICOS ==========
 @app.route('/static/<path:filename>')
 def serve_static_file(filename):
-    """Servir archivos estáticos como CVs"""
-    try:
-        return app.send_static_file(filename)
-    except Exception as e:
-        return jsonify({"error": "Archivo no encontrado"}), 404
+    """Servir archivos estáticos como CVs (caché, ETag, Range y X-Sendfile opcional)"""
+    return enviar_estatico(filename)
 
 @app.route('/files/<path:filename>')
 def serve_files(filename):
-    """Servir archivos desde /files/ redirigiendo a /static/files/"""
-    try:
-        return app.send_static_file(f'files/{filename}')
-    except Exception as e:
-        return jsonify({"error": "Archivo no encontrado"}), 404
+    """Servir archivos desde /files/ como /static/files/"""
+    return enviar_estatico(f'files/{filename}')
 
 # ========== RUTAS DE USUARIOS ==========
 @app.route('/api/usuarios', methods=['GET'])
@@ -89,6 +125,7 @@ def obtener_usuario_por_id(usuario_id):
 
 # ========== RUTAS DE EMPRESAS ==========
 @app.route('/api/empresas', methods=['GET'])
+@respuesta_condicional('empresas')
 def obtener_empresas():
     conn = None
     try:
@@ -133,7 +170,9 @@ def insertar_empresa():
             "Telefono": data['telefono'],
             "Descripcion": data['descripcion']
         })
+        incrementar_version(conn, 'empresas')
         conn.commit()
+        invalidar_identidad(int(data['idUsuario']))
         return jsonify({"message": "Empresa registrada correctamente"}), 201
         
     except SQLAlchemyError as e:
@@ -143,49 +182,225 @@ def insertar_empresa():
             conn.close()
 
 # ========== RUTAS DE VACANTES ==========
+def _fecha_iso(valor):
+    return valor.isoformat() if valor else None
+
+# Campos públicos de una vacante: nombre en JSON -> (columna SQL, conversión)
+CAMPOS_VACANTE_PUBLICA = {
+    "id": ("V.ID", None),
+    "titulo": ("V.Titulo_puesto", None),
+    "descripcion": ("V.Descripcion", None),
+    "requisitos": ("V.Requisitos", None),
+    "salario": ("V.Salario", None),
+    "tipoContrato": ("V.Tipo_Contrato", None),
+    "ubicacion": ("V.Ubicacion", None),
+    "fechaPublicacion": ("V.Fecha_Publicacion", _fecha_iso),
+    "fechaCierre": ("V.Fecha_Cierre", _fecha_iso),
+    "estado": ("V.Estado", None),
+    "cantidadPostulaciones": ("V.CantidadPostulaciones", None),
+    "destacada": ("V.Destacada", bool),
+    "nombreEmpresa": ("E.Nombre", None)
+}
+
+def serializar_fila(row, campos, definicion):
+    """Convertir una fila proyectada al diccionario JSON de la respuesta"""
+    datos = row._mapping
+    resultado = {}
+    for campo in campos:
+        conversion = definicion[campo][1]
+        valor = datos[campo]
+        resultado[campo] = conversion(valor) if conversion else valor
+    return resultado
+
+def responder_json_cacheado(clave, datos, generacion):
+    """Serializar la respuesta y guardar el cuerpo en la caché de vacantes"""
+    respuesta = jsonify(datos)
+    cache_vacantes.guardar(clave, respuesta.get_data(), generacion)
+    return respuesta, 200
+
+def respuesta_desde_cache(clave):
+    encontrado, cuerpo = cache_vacantes.obtener(clave)
+    if not encontrado:
+        return None
+    return app.response_class(cuerpo, mimetype='application/json'), 200
+
+def vacantes_modificadas(conn, *vacante_ids, coincidencias=True):
+    """Hooks posteriores al commit de una escritura sobre vacantes: caché, índice de búsqueda y
+    coincidencias. Las postulaciones (coincidencias=False) no cambian Requisitos ni Estado de la
+    vacante, así que no reconstruyen el índice de coincidencias.
+    """
+    invalidar_vacantes()
+    indice_vacantes.reindexar(conn, *vacante_ids)
+    if coincidencias:
+        servicio_coincidencias.invalidar()
+
 # Obtener todas las vacantes (público)
+# Parámetros opcionales:
+#   limite, cursor          -> paginación por clave (Fecha_Publicacion DESC, ID DESC)
+#   ubicacion, tipoContrato -> filtros exactos
+#   salarioMin, salarioMax  -> rango de salario
+#   fields                  -> proyección, p. ej. fields=id,titulo,salario
+# Sin 'limite' ni 'cursor' se conserva la respuesta original (arreglo completo).
 @app.route('/api/vacantes', methods=['GET'])
+@respuesta_condicional('vacantes', 'empresas')
 def obtener_todas_vacantes():
     conn = None
+    clave = clave_consulta(request.path, request.args, versiones_vigentes())
+    cacheada = respuesta_desde_cache(clave)
+    if cacheada:
+        return cacheada
+    generacion = cache_vacantes.generacion
     try:
+        paginado = 'limite' in request.args or 'cursor' in request.args
+        campos = obtener_campos(request.args, CAMPOS_VACANTE_PUBLICA,
+                                obligatorios=('id', 'fechaPublicacion') if paginado else ())
+        filtros = ["V.Estado = 'Abierta'", "V.eliminado = 0"]
+        params = {}
+
+        if request.args.get('ubicacion'):
+            filtros.append("V.Ubicacion = :ubicacion")
+            params["ubicacion"] = request.args['ubicacion']
+        if request.args.get('tipoContrato'):
+            filtros.append("V.Tipo_Contrato = :tipo_contrato")
+            params["tipo_contrato"] = request.args['tipoContrato']
+        salario_min = obtener_numero(request.args, 'salarioMin')
+        if salario_min is not None:
+            filtros.append("V.Salario >= :salario_min")
+            params["salario_min"] = salario_min
+        salario_max = obtener_numero(request.args, 'salarioMax')
+        if salario_max is not None:
+            filtros.append("V.Salario <= :salario_max")
+            params["salario_max"] = salario_max
+
+        top = ""
+        if paginado:
+            limite = obtener_limite(request.args)
+            # Se pide una fila extra para saber si existe una página siguiente
+            top = "TOP (:limite)"
+            params["limite"] = limite + 1
+            if request.args.get('cursor'):
+                fecha_cursor, id_cursor = decodificar_cursor_fecha_id(request.args['cursor'])
+                params["id_cursor"] = id_cursor
+                if fecha_cursor is None:
+                    # Las vacantes sin fecha se ordenan al final
+                    filtros.append("V.Fecha_Publicacion IS NULL AND V.ID < :id_cursor")
+                else:
+                    filtros.append("""(V.Fecha_Publicacion < :fecha_cursor
+                        OR (V.Fecha_Publicacion = :fecha_cursor AND V.ID < :id_cursor)
+                        OR V.Fecha_Publicacion IS NULL)""")
+                    params["fecha_cursor"] = fecha_cursor
+
+        columnas = ",\n                ".join(
+            f"{CAMPOS_VACANTE_PUBLICA[campo][0]} AS {campo}" for campo in campos
+        )
         conn = obtener_conexion()
-        query = text("""
-            SELECT 
-                V.ID,
-                V.Titulo_puesto,
-                V.Descripcion,
-                V.Requisitos,
-                V.Salario,
-                V.Tipo_Contrato,
-                V.Ubicacion,
-                V.Fecha_Publicacion,
-                V.Fecha_Cierre,
-                V.Estado,
-                V.CantidadPostulaciones,
-                V.Destacada,
-                E.Nombre AS NombreEmpresa
+        query = text(f"""
+            SELECT {top}
+                {columnas}
             FROM Vacantes V
             JOIN Empresa E ON V.ID_Empresa = E.ID
+            WHERE {" AND ".join(filtros)}
+            ORDER BY V.Fecha_Publicacion DESC, V.ID DESC
+        """)
+        filas = conn.execute(query, params).fetchall()
+
+        if not paginado:
+            vacantes = [serializar_fila(row, campos, CAMPOS_VACANTE_PUBLICA) for row in filas]
+            return responder_json_cacheado(clave, vacantes, generacion)
+
+        hay_mas = len(filas) > limite
+        filas = filas[:limite]
+        siguiente_cursor = None
+        if hay_mas:
+            ultima = filas[-1]._mapping
+            siguiente_cursor = codificar_cursor(ultima["fechaPublicacion"], ultima["id"])
+        return responder_json_cacheado(clave, {
+            "vacantes": [serializar_fila(row, campos, CAMPOS_VACANTE_PUBLICA) for row in filas],
+            "siguienteCursor": siguiente_cursor
+        }, generacion)
+    except ParametroInvalido as e:
+        return jsonify({"error": str(e)}), 400
+    except SQLAlchemyError as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        if conn:
+            conn.close()
+
+# Búsqueda de texto completo sobre título, descripción y requisitos (público)
+# Parámetros: q (obligatorio), limite, fields. Sin distinción de acentos ni mayúsculas;
+# las palabras de 3 o más letras también coinciden por prefijo ("progra" -> "programador").
+@app.route('/api/vacantes/search', methods=['GET'])
+def buscar_vacantes():
+    conn = None
+    try:
+        consulta = request.args.get('q', '').strip()
+        if not consulta:
+            return jsonify({"error": "El parámetro 'q' es obligatorio"}), 400
+        limite = obtener_limite(request.args)
+        campos = obtener_campos(request.args, CAMPOS_VACANTE_PUBLICA, obligatorios=('id',))
+
+        conn = obtener_conexion()
+        indice_vacantes.asegurar(conn)
+        resultados, total = indice_vacantes.buscar(consulta, limite)
+        if not resultados:
+            return jsonify({"resultados": [], "total": 0}), 200
+
+        columnas = ",\n                ".join(
+            f"{CAMPOS_VACANTE_PUBLICA[campo][0]} AS {campo}" for campo in campos
+        )
+        query = text(f"""
+            SELECT
+                {columnas}
+            FROM Vacantes V
+            JOIN Empresa E ON V.ID_Empresa = E.ID
+            WHERE V.ID IN :ids AND V.Estado = 'Abierta' AND V.eliminado = 0
+        """).bindparams(bindparam('ids', expanding=True))
+        filas = {row._mapping["id"]: row for row in conn.execute(query, {"ids": [i for i, _ in resultados]})}
+
+        vacantes = []
+        for vacante_id, puntaje in resultados:
+            if vacante_id in filas:
+                vacante = serializar_fila(filas[vacante_id], campos, CAMPOS_VACANTE_PUBLICA)
+                vacante["puntaje"] = round(puntaje, 4)
+                vacantes.append(vacante)
+        return jsonify({"resultados": vacantes, "total": total}), 200
+    except ParametroInvalido as e:
+        return jsonify({"error": str(e)}), 400
+    except SQLAlchemyError as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        if conn:
+            conn.close()
+
+# Obtener las vacantes destacadas (público)
+@app.route('/api/vacantes/destacadas', methods=['GET'])
+@respuesta_condicional('vacantes', 'empresas')
+def obtener_vacantes_destacadas():
+    conn = None
+    clave = clave_consulta(request.path, request.args, versiones_vigentes())
+    cacheada = respuesta_desde_cache(clave)
+    if cacheada:
+        return cacheada
+    generacion = cache_vacantes.generacion
+    try:
+        campos = list(CAMPOS_VACANTE_PUBLICA)
+        columnas = ",\n                ".join(
+            f"{CAMPOS_VACANTE_PUBLICA[campo][0]} AS {campo}" for campo in campos
+        )
+        conn = obtener_conexion()
+        # La selección está materializada en Vacantes_Destacadas (ver actualizar_vacantes_destacadas)
+        query = text(f"""
+            SELECT
+                {columnas}
+            FROM Vacantes_Destacadas D
+            JOIN Vacantes V ON D.ID_Vacante = V.ID
+            JOIN Empresa E ON V.ID_Empresa = E.ID
             WHERE V.Estado = 'Abierta' AND V.eliminado = 0
-            ORDER BY V.Fecha_Publicacion DESC
+            ORDER BY D.Posicion
         """)
-        result = conn.execute(query)
-        vacantes = [{
-            "id": row.ID,
-            "titulo": row.Titulo_puesto,
-            "descripcion": row.Descripcion,
-            "requisitos": row.Requisitos,
-            "salario": row.Salario,
-            "tipoContrato": row.Tipo_Contrato,
-            "ubicacion": row.Ubicacion,
-            "fechaPublicacion": row.Fecha_Publicacion.isoformat() if row.Fecha_Publicacion else None,
-            "fechaCierre": row.Fecha_Cierre.isoformat() if row.Fecha_Cierre else None,
-            "estado": row.Estado,
-            "cantidadPostulaciones": row.CantidadPostulaciones,
-            "destacada": bool(row.Destacada),
-            "nombreEmpresa": row.NombreEmpresa
-        } for row in result]
-        return jsonify(vacantes), 200
+        filas = conn.execute(query).fetchall()
+        vacantes = [serializar_fila(row, campos, CAMPOS_VACANTE_PUBLICA) for row in filas]
+        return responder_json_cacheado(clave, vacantes, generacion)
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
     finally:
@@ -198,34 +413,12 @@ def obtener_vacantes_empresa(user_id):
     conn = None
     try:
         conn = obtener_conexion()
-        # Primero obtener el ID de la empresa
-        empresa_query = text("SELECT ID FROM Empresa WHERE ID_Usuario = :user_id")
-        empresa_result = conn.execute(empresa_query, {"user_id": user_id}).fetchone()
+        # Empresa y vacantes (solo las no eliminadas) en una sola consulta
+        result = vacantes_de_empresa(conn, user_id)
         
-        if not empresa_result:
+        if result is None:
             return jsonify({"error": "Empresa no encontrada"}), 404
         
-        empresa_id = empresa_result.ID
-        
-        # Obtener vacantes de la empresa (solo las no eliminadas)
-        query = text("""
-            SELECT 
-                ID,
-                Titulo_puesto,
-                Descripcion,
-                Requisitos,
-                Salario,
-                Tipo_Contrato,
-                Ubicacion,
-                Fecha_Publicacion,
-                Fecha_Cierre,
-                Estado,
-                CantidadPostulaciones
-            FROM Vacantes
-            WHERE ID_Empresa = :empresa_id AND eliminado = 0
-            ORDER BY Fecha_Publicacion DESC
-        """)
-        result = conn.execute(query, {"empresa_id": empresa_id})
         vacantes = [{
             "id": row.ID,
             "titulo": row.Titulo_puesto,
@@ -253,27 +446,8 @@ def crear_vacante(user_id):
     conn = None
     try:
         conn = obtener_conexion()
-        # Verificar que la empresa existe
-        empresa_query = text("SELECT ID FROM Empresa WHERE ID_Usuario = :user_id")
-        empresa_result = conn.execute(empresa_query, {"user_id": user_id}).fetchone()
-        
-        if not empresa_result:
-            return jsonify({"error": "Empresa no encontrada"}), 404
-        
-        empresa_id = empresa_result.ID
-        
-        # Insertar nueva vacante
-        query = text("""
-            INSERT INTO Vacantes (
-                ID_Empresa, Titulo_puesto, Descripcion, Requisitos, Salario,
-                Tipo_Contrato, Ubicacion, Fecha_Publicacion, Fecha_Cierre, Estado, CantidadPostulaciones
-            ) VALUES (
-                :ID_Empresa, :Titulo_puesto, :Descripcion, :Requisitos, :Salario,
-                :Tipo_Contrato, :Ubicacion, GETDATE(), :Fecha_Cierre, :Estado, 0
-            )
-        """)
-        conn.execute(query, {
-            "ID_Empresa": empresa_id,
+        # Insertar nueva vacante para la empresa del usuario (sin consulta previa de Empresa)
+        vacante_id = insertar_vacante_empresa(conn, user_id, {
             "Titulo_puesto": data['titulo'],
             "Descripcion": data['descripcion'],
             "Requisitos": data['requisitos'],
@@ -283,8 +457,110 @@ def crear_vacante(user_id):
             "Fecha_Cierre": data.get('fechaCierre'),
             "Estado": data.get('estado', 'Abierta')
         })
+        
+        if vacante_id is None:
+            return jsonify({"error": "Empresa no encontrada"}), 404
+        
+        incrementar_version(conn, 'vacantes')
         conn.commit()
-        return jsonify({"message": "Vacante creada correctamente"}), 201
+        vacantes_modificadas(conn, vacante_id)
+        return jsonify({"message": "Vacante creada correctamente", "id": vacante_id}), 201
+    except SQLAlchemyError as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        if conn:
+            conn.close()
+
+CONSULTA_INSERTAR_VACANTE = text("""
+    INSERT INTO Vacantes (
+        ID_Empresa, Titulo_puesto, Descripcion, Requisitos, Salario,
+        Tipo_Contrato, Ubicacion, Fecha_Publicacion, Fecha_Cierre, Estado, CantidadPostulaciones
+    ) VALUES (
+        :ID_Empresa, :Titulo_puesto, :Descripcion, :Requisitos, :Salario,
+        :Tipo_Contrato, :Ubicacion, GETDATE(), :Fecha_Cierre, :Estado, 0
+    )
+""")
+
+def insertar_lote_vacantes(conn, lote, errores):
+    """Insertar un lote en una transacción; si falla, reintentar fila por fila para aislar el error"""
+    try:
+        conn.execute(CONSULTA_INSERTAR_VACANTE, [params for _, params in lote])
+        incrementar_version(conn, 'vacantes')
+        conn.commit()
+        return len(lote)
+    except SQLAlchemyError:
+        conn.rollback()
+
+    insertadas = 0
+    for linea, params in lote:
+        try:
+            conn.execute(CONSULTA_INSERTAR_VACANTE, params)
+            incrementar_version(conn, 'vacantes')
+            conn.commit()
+            insertadas += 1
+        except SQLAlchemyError as e:
+            conn.rollback()
+            errores.append({"linea": linea, "error": str(e.orig) if getattr(e, 'orig', None) else str(e)})
+    return insertadas
+
+# Importación masiva de vacantes desde CSV o NDJSON
+# El archivo puede enviarse como cuerpo de la petición (Content-Type text/csv o
+# application/x-ndjson) o como campo 'archivo' de un formulario multipart.
+# Las columnas / llaves son las mismas que en crear_vacante.
+@app.route('/api/empresa/<int:user_id>/vacantes/importar', methods=['POST'])
+def importar_vacantes(user_id):
+    conn = None
+    try:
+        # Los archivos de importación pueden superar el límite general de la aplicación
+        request.max_content_length = IMPORTACION_MAX_BYTES
+        if 'archivo' in request.files:
+            archivo = request.files['archivo']
+            stream = archivo.stream
+            formato = detectar_formato(request.args.get('formato'), archivo.mimetype, archivo.filename)
+        else:
+            stream = request.stream
+            formato = detectar_formato(request.args.get('formato'), request.mimetype)
+        if not formato:
+            return jsonify({"error": "Formato no soportado. Use CSV (text/csv) o NDJSON (application/x-ndjson)"}), 400
+
+        identidad = obtener_identidad(user_id)
+        if identidad is None or identidad.eliminado or identidad.empresa_id is None:
+            return jsonify({"error": "Empresa no encontrada"}), 404
+
+        empresa_id = identidad.empresa_id
+        conn = obtener_conexion()
+        errores = []
+        insertadas = 0
+        procesadas = 0
+        lote = []
+        for linea, datos, error in leer_filas(stream, formato):
+            procesadas += 1
+            if not error:
+                params, error = validar_vacante(datos)
+            if error:
+                errores.append({"linea": linea, "error": error})
+                continue
+            params["ID_Empresa"] = empresa_id
+            lote.append((linea, params))
+            if len(lote) >= FILAS_POR_LOTE:
+                insertadas += insertar_lote_vacantes(conn, lote, errores)
+                lote = []
+        if lote:
+            insertadas += insertar_lote_vacantes(conn, lote, errores)
+
+        if insertadas:
+            invalidar_vacantes()
+            indice_vacantes.invalidar()
+            servicio_coincidencias.invalidar()
+        return jsonify({
+            "message": f"{insertadas} de {procesadas} vacantes importadas",
+            "procesadas": procesadas,
+            "insertadas": insertadas,
+            "totalErrores": len(errores),
+            "errores": errores[:MAX_ERRORES_REPORTADOS]
+        }), 201 if insertadas and not errores else 200
+    except UnicodeDecodeError:
+        return jsonify({"error": "El archivo debe estar codificado en UTF-8"}), 400
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
     finally:
@@ -382,7 +658,9 @@ def actualizar_vacante(user_id, vacante_id):
             "estado": data.get('estado', 'Abierta'),
             "vacante_id": vacante_id
         })
+        incrementar_version(conn, 'vacantes')
         conn.commit()
+        vacantes_modificadas(conn, vacante_id)
         return jsonify({"message": "Vacante actualizada correctamente"}), 200
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
@@ -410,7 +688,9 @@ def eliminar_vacante(user_id, vacante_id):
         # Realizar soft delete - marcar como eliminada
         query = text("UPDATE Vacantes SET eliminado = 1 WHERE ID = :vacante_id")
         conn.execute(query, {"vacante_id": vacante_id})
+        incrementar_version(conn, 'vacantes')
         conn.commit()
+        vacantes_modificadas(conn, vacante_id)
         return jsonify({"message": "Vacante eliminada correctamente"}), 200
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
@@ -429,12 +709,14 @@ def insertar_vacante():
             INSERT INTO Vacantes (
                 ID_Empresa, Titulo_puesto, Descripcion, Requisitos, Salario,
                 Tipo_Contrato, Ubicacion, Fecha_Publicacion, Fecha_Cierre, Estado, CantidadPostulaciones
-            ) VALUES (
+            )
+            OUTPUT INSERTED.ID
+            VALUES (
                 :ID_Empresa, :Titulo_puesto, :Descripcion, :Requisitos, :Salario,
                 :Tipo_Contrato, :Ubicacion, :Fecha_Publicacion, :Fecha_Cierre, :Estado, :CantidadPostulaciones
             )
         """)
-        conn.execute(query, {
+        vacante_id = conn.execute(query, {
             "ID_Empresa": data['ID_Empresa'],
             "Titulo_puesto": data['Titulo_puesto'],
             "Descripcion": data['Descripcion'],
@@ -446,8 +728,10 @@ def insertar_vacante():
             "Fecha_Cierre": data['Fecha_Cierre'],
             "Estado": data.get('Estado', 'Abierta'),
             "CantidadPostulaciones": data.get('CantidadPostulaciones', 0)
-        })
+        }).scalar()
+        incrementar_version(conn, 'vacantes')
         conn.commit()
+        vacantes_modificadas(conn, vacante_id)
         return jsonify({"message": "Vacante insertada correctamente"}), 201
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
@@ -457,6 +741,7 @@ def insertar_vacante():
 
 # ========== AUTENTICACIÓN ==========
 @app.route('/api/login', methods=['POST'])
+@limitar_intentos('login', 'usuario')
 def login():
     data = request.json
     conn = None
@@ -470,12 +755,15 @@ def login():
             WHERE (NombreUsuario = :usuario OR Correo = :usuario) AND eliminado = 0
         """)
         result = conn.execute(query, {"usuario": data['usuario']}).fetchone()
+        # Devolver la conexión al pool antes de calcular el hash
+        conn.close()
+        conn = None
         
         if not result:
             return jsonify({"error": "Usuario no encontrado"}), 401
         
-        # Verificar contraseña (texto plano)
-        if not bcrypt.check_password_hash(result.Contrasena, data['contrasena']):
+        # Verificar contraseña en el pool de procesos de bcrypt
+        if not servicio_contrasenas.verificar(result.Contrasena, data['contrasena']):
             return jsonify({"error": "Contraseña incorrecta"}), 401
         
         # Mapear roles de la base de datos a roles del frontend
@@ -487,20 +775,29 @@ def login():
         
         frontend_role = role_mapping.get(result.ROL, 'user')
         
-        # Generar código 2FA (simulado)
-        codigo_2fa = str(secrets.randbelow(900000) + 100000)  # Código de 6 dígitos
+        # Generar el código 2FA y guardar el perfil para /api/verify-2fa
+        codigo_2fa = almacen_desafios.crear(result.ID, {
+            "id": result.ID,
+            "nombre": result.NombreUsuario,
+            "correo": result.Correo,
+            "role": frontend_role,
+            "rutaImagen": result.RutaImagen
+        })
         
         # En un entorno real, aquí enviarías el código por SMS/email
-        # Para desarrollo, devolvemos el código
-        return jsonify({
+        respuesta = {
             "message": "Código 2FA enviado",
             "requiere2FA": True,
-            "codigo_desarrollo": codigo_2fa,  # Solo para desarrollo
             "usuario_id": result.ID,
             "usuario": result.NombreUsuario,
             "rol": frontend_role
-        }), 200
+        }
+        if MOSTRAR_CODIGO:
+            respuesta["codigo_desarrollo"] = codigo_2fa  # Solo para desarrollo
+        return jsonify(respuesta), 200
         
+    except ServicioSaturado as e:
+        return jsonify({"error": str(e)}), 429, {"Retry-After": "1"}
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
     finally:
@@ -508,55 +805,32 @@ def login():
             conn.close()
 
 @app.route('/api/verify-2fa', methods=['POST'])
+@limitar_intentos('2fa', 'usuario_id')
 def verify_2fa():
     data = request.json
-    conn = None
+    if not data or 'usuario_id' not in data:
+        return jsonify({"error": "Campo requerido: usuario_id"}), 400
     try:
-        conn = obtener_conexion()
-        
-        # Obtener información del usuario
-        query = text("""
-            SELECT ID, NombreUsuario, Correo, ROL, RutaImagen 
-            FROM Usuario 
-            WHERE ID = :usuario_id
-        """)
-        result = conn.execute(query, {"usuario_id": data['usuario_id']}).fetchone()
-        
-        if not result:
-            return jsonify({"error": "Usuario no encontrado"}), 401
-        
-        # En un entorno real, verificarías el código 2FA aquí
-        # Para desarrollo, aceptamos cualquier código de 6 dígitos
-        codigo = data.get('codigo', '')
-        if len(codigo) != 6 or not codigo.isdigit():
-            return jsonify({"error": "Código 2FA inválido"}), 401
-        
-        # Mapear roles de la base de datos a roles del frontend
-        role_mapping = {
-            'ADMINISTRADOR': 'admin',
-            'CANDIDATO': 'user',
-            'EMPRESA': 'recruiter'
-        }
-        
-        frontend_role = role_mapping.get(result.ROL, 'user')
-        
-        # Login exitoso
-        return jsonify({
-            "message": "Login exitoso",
-            "usuario": {
-                "id": result.ID,
-                "nombre": result.NombreUsuario,
-                "correo": result.Correo,
-                "role": frontend_role,
-                "rutaImagen": result.RutaImagen
-            }
-        }), 200
-        
+        usuario_id = int(data['usuario_id'])
+    except (TypeError, ValueError):
+        return jsonify({"error": "usuario_id debe ser un número entero"}), 400
+    
+    # El login guardó el código y el perfil: no se consultan Usuario ni los perfiles
+    # (con varios workers sin Redis el desafío se lee de Desafios_Dos_Factores)
+    try:
+        resultado, perfil = almacen_desafios.verificar(usuario_id, data.get('codigo', ''))
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
-    finally:
-        if conn:
-            conn.close()
+    if resultado == BLOQUEADO:
+        return jsonify({"error": "Demasiados intentos, inicia sesión de nuevo"}), 429
+    if resultado != VALIDO:
+        return jsonify({"error": "Código 2FA inválido o expirado"}), 401
+    
+    # Login exitoso
+    return jsonify({
+        "message": "Login exitoso",
+        "usuario": perfil
+    }), 200
 
 # ========== REGISTRO ==========
 @app.route('/api/register', methods=['POST'])
@@ -571,6 +845,28 @@ def register():
             if field not in data:
                 return jsonify({"error": f"Campo requerido: {field}"}), 400
         
+        # Mapear roles del frontend a la base de datos (opcional)
+        role_mapping = {
+            'user': 'CANDIDATO',
+            'recruiter': 'EMPRESA'
+        }
+        
+        db_role = role_mapping.get(data.get('userType', 'user'), 'CANDIDATO')
+
+        # Validar los campos del rol antes de calcular el hash y de tomar una conexión
+        if db_role == 'EMPRESA':
+            for field in ['nombreEmpresa', 'telefonoEmpresa']:
+                if not data.get(field):
+                    return jsonify({"error": f"Campo requerido para EMPRESA: {field}"}), 400
+        elif db_role == 'CANDIDATO':
+            # Validar campos requeridos para CANDIDATO (ejemplo, ajustar según necesidad)
+            for field in ['nombreCandidato', 'apellidoCandidato', 'telefonoCandidato']:
+                if not data.get(field):
+                    return jsonify({"error": f"Campo requerido para CANDIDATO: {field}"}), 400
+
+        # Hash en el pool de procesos de bcrypt, sin una conexión prestada
+        contrasena_hash = servicio_contrasenas.generar(data['contrasena'])
+        
         conn = obtener_conexion()
         trans = conn.begin()
         
@@ -588,14 +884,6 @@ def register():
             trans.rollback()
             return jsonify({"error": "El nombre de usuario o correo ya está registrado"}), 400
         
-        # Mapear roles del frontend a la base de datos (opcional)
-        role_mapping = {
-            'user': 'CANDIDATO',
-            'recruiter': 'EMPRESA'
-        }
-        
-        db_role = role_mapping.get(data.get('userType', 'user'), 'CANDIDATO')
-        
         # Llamar al procedimiento almacenado sp_RegisterUser
         sp_call = text("""
             EXEC sp_RegisterUser
@@ -619,7 +907,7 @@ def register():
         params = {
             "nombre_usuario": data['nombreUsuario'],
             "correo": data['correo'],
-            "contrasena": bcrypt.generate_password_hash(data['contrasena']).decode('utf-8'),
+            "contrasena": contrasena_hash,
             "rol": db_role,
             "ruta_imagen": data.get('rutaImagen', None),
             "nombre_empresa": None,
@@ -634,26 +922,12 @@ def register():
         }
 
         if db_role == 'EMPRESA':
-            # Validar campos requeridos para EMPRESA
-            required_company_fields = ['nombreEmpresa', 'telefonoEmpresa']
-            for field in required_company_fields:
-                if not data.get(field):
-                    trans.rollback()
-                    return jsonify({"error": f"Campo requerido para EMPRESA: {field}"}), 400
-
             params['nombre_empresa'] = data.get('nombreEmpresa')
             params['rfc'] = data.get('rfc')
             params['direccion_empresa'] = data.get('direccionEmpresa')
             params['telefono_empresa'] = data.get('telefonoEmpresa')
             params['descripcion_empresa'] = data.get('descripcionEmpresa')
         elif db_role == 'CANDIDATO':
-            # Validar campos requeridos para CANDIDATO (ejemplo, ajustar según necesidad)
-            required_candidate_fields = ['nombreCandidato', 'apellidoCandidato', 'telefonoCandidato']
-            for field in required_candidate_fields:
-                if not data.get(field):
-                    trans.rollback()
-                    return jsonify({"error": f"Campo requerido para CANDIDATO: {field}"}), 400
-
             params['telefono_candidato'] = data.get('telefonoCandidato')
             params['direccion_candidato'] = data.get('direccionCandidato')
             params['cv_path'] = data.get('cvPath')
@@ -661,9 +935,14 @@ def register():
         result = conn.execute(sp_call, params)
         new_user_id = result.scalar() # Obtener el ID del nuevo usuario devuelto por el SP
 
+        incrementar_version(conn, 'usuarios', 'candidatos', 'empresas')
         trans.commit()
+        # Una consulta anterior pudo guardar en caché que este ID no existía
+        invalidar_identidad(new_user_id)
         return jsonify({"message": "Usuario registrado correctamente", "userId": new_user_id}), 201
 
+    except ServicioSaturado as e:
+        return jsonify({"error": str(e)}), 429, {"Retry-After": "1"}
     except SQLAlchemyError as e:
         if trans:
             trans.rollback()
@@ -747,6 +1026,7 @@ def update_candidate_profile(user_id):
             "user_id": user_id
         })
 
+        incrementar_version(conn, 'candidatos')
         trans.commit()
         return jsonify({"message": "Perfil de candidato actualizado correctamente"}), 200
 
@@ -764,66 +1044,51 @@ def upload_profile_image(user_id):
     conn = None
     try:
         # Verificar que el usuario existe
-        conn = obtener_conexion()
-        usuario_query = text("SELECT ROL FROM Usuario WHERE ID = :user_id AND eliminado = 0")
-        usuario_result = conn.execute(usuario_query, {"user_id": user_id}).fetchone()
+        identidad = obtener_identidad(user_id)
         
-        if not usuario_result:
+        if identidad is None or identidad.eliminado:
             return jsonify({"error": "Usuario no encontrado"}), 404
         
-        # Verificar que se envió un archivo
-        if 'image' not in request.files:
-            return jsonify({"error": "No se encontró archivo de imagen"}), 400
-        
-        file = request.files['image']
-        if file.filename == '':
-            return jsonify({"error": "No se seleccionó archivo"}), 400
-        
-        # Validar tipo de archivo
-        allowed_extensions = {'jpg', 'jpeg', 'png', 'gif'}
-        if not ('.' in file.filename and file.filename.rsplit('.', 1)[1].lower() in allowed_extensions):
-            return jsonify({"error": "Tipo de archivo no permitido. Solo se permiten JPG, JPEG, PNG y GIF"}), 400
-        
-        # Crear nombre único para el archivo
-        filename = secure_filename(file.filename)
-        file_extension = filename.rsplit('.', 1)[1].lower()
-        unique_filename = f"user_{user_id}_{uuid.uuid4().hex[:8]}.{file_extension}"
-        
         # Determinar directorio según el rol del usuario
-        user_role = usuario_result.ROL
-        if user_role == 'CANDIDATO':
-            folder_name = 'candidato'
-        elif user_role == 'EMPRESA':
-            folder_name = 'empresa'
-        elif user_role == 'ADMINISTRADOR':
-            folder_name = 'administrador'
-        else:
-            folder_name = 'candidato'  # Por defecto
-        
-        # Crear directorio si no existe
-        upload_folder = os.path.join('src', 'static', 'images', folder_name)
-        os.makedirs(upload_folder, exist_ok=True)
-        
-        # Guardar archivo
-        file_path = os.path.join(upload_folder, unique_filename)
-        file.save(file_path)
+        folder_name = carpeta_imagen(identidad.rol)
+        upload_folder = os.path.join(CARPETA_IMAGENES, folder_name)
         
-        # Actualizar la base de datos con el nombre del archivo (solo el nombre, no la ruta completa)
-        update_query = text("""
-            UPDATE Usuario 
-            SET RutaImagen = :image_name 
-            WHERE ID = :user_id
-        """)
+        # Recibir el archivo en bloques directamente a disco (valida tipo y tamaño)
+        with ReceptorArchivo(SUBIDA_IMAGEN, upload_folder) as receptor:
+            archivo = receptor.recibir(request)
+            
+            # El nombre es el hash del contenido: la misma imagen se guarda una sola vez
+            unique_filename = almacen_archivos.publicar(archivo)
+            
+            # Actualizar la base de datos con el nombre del archivo (solo el nombre, no la ruta completa)
+            conn = obtener_conexion()
+            anterior = conn.execute(
+                text("SELECT RutaImagen FROM Usuario WHERE ID = :user_id"), {"user_id": user_id}
+            ).scalar()
+            update_query = text("""
+                UPDATE Usuario 
+                SET RutaImagen = :image_name 
+                WHERE ID = :user_id
+            """)
+            
+            conn.execute(update_query, {"image_name": unique_filename, "user_id": user_id})
+            incrementar_version(conn, 'usuarios')
+            conn.commit()
         
-        conn.execute(update_query, {"image_name": unique_filename, "user_id": user_id})
-        conn.commit()
+        # Borrar la imagen anterior si ya nadie la usa
+        if anterior != unique_filename:
+            almacen_archivos.liberar(conn, 'imagenes', anterior)
         
         return jsonify({
             "message": "Imagen de perfil subida correctamente",
             "filename": unique_filename,
-            "path": f"static/images/{folder_name}/{unique_filename}"
+            "path": f"static/images/{folder_name}/{unique_filename}",
+            "tamano": archivo.tamano,
+            "sha256": archivo.sha256
         }), 200
         
+    except ArchivoRechazado as e:
+        return jsonify({"error": str(e)}), e.codigo
     except Exception as e:
         if conn:
             conn.rollback()
@@ -837,59 +1102,51 @@ def upload_cv(user_id):
     conn = None
     try:
         # Verificar que el usuario existe y es un candidato
-        conn = obtener_conexion()
-        usuario_query = text("SELECT ROL FROM Usuario WHERE ID = :user_id AND eliminado = 0")
-        usuario_result = conn.execute(usuario_query, {"user_id": user_id}).fetchone()
+        identidad = obtener_identidad(user_id)
         
-        if not usuario_result:
+        if identidad is None or identidad.eliminado:
             return jsonify({"error": "Usuario no encontrado"}), 404
         
-        if usuario_result.ROL != 'CANDIDATO':
+        if identidad.rol != 'CANDIDATO':
             return jsonify({"error": "Solo los candidatos pueden subir CV"}), 403
         
-        # Verificar que se envió un archivo
-        if 'cv' not in request.files:
-            return jsonify({"error": "No se encontró archivo CV"}), 400
-        
-        file = request.files['cv']
-        if file.filename == '':
-            return jsonify({"error": "No se seleccionó archivo"}), 400
-        
-        # Validar tipo de archivo
-        allowed_extensions = {'pdf', 'doc', 'docx'}
-        if not ('.' in file.filename and file.filename.rsplit('.', 1)[1].lower() in allowed_extensions):
-            return jsonify({"error": "Tipo de archivo no permitido. Solo se permiten PDF, DOC y DOCX"}), 400
-        
-        # Crear nombre único para el archivo
-        filename = secure_filename(file.filename)
-        file_extension = filename.rsplit('.', 1)[1].lower()
-        unique_filename = f"cv_{user_id}_{uuid.uuid4().hex[:8]}.{file_extension}"
-        
-        # Crear directorio si no existe
-        upload_folder = os.path.join('src', 'static', 'files', 'cv')
-        os.makedirs(upload_folder, exist_ok=True)
-        
-        # Guardar archivo
-        file_path = os.path.join(upload_folder, unique_filename)
-        file.save(file_path)
-        
-        # Actualizar la base de datos con la ruta del CV
-        cv_path = f"/static/files/cv/{unique_filename}"
-        update_query = text("""
-            UPDATE Candidatos 
-            SET CV = :cv_path 
-            WHERE ID_Usuario = :user_id
-        """)
+        # Recibir el archivo en bloques directamente a disco (valida tipo y tamaño)
+        with ReceptorArchivo(SUBIDA_CV, CARPETA_CV) as receptor:
+            archivo = receptor.recibir(request)
+            
+            # El nombre es el hash del contenido: el mismo CV se guarda una sola vez
+            unique_filename = almacen_archivos.publicar(archivo)
+            
+            # Actualizar la base de datos con la ruta del CV
+            cv_path = f"/static/files/cv/{unique_filename}"
+            conn = obtener_conexion()
+            anterior = conn.execute(
+                text("SELECT CV FROM Candidatos WHERE ID_Usuario = :user_id"), {"user_id": user_id}
+            ).scalar()
+            update_query = text("""
+                UPDATE Candidatos 
+                SET CV = :cv_path 
+                WHERE ID_Usuario = :user_id
+            """)
+            
+            conn.execute(update_query, {"cv_path": cv_path, "user_id": user_id})
+            incrementar_version(conn, 'candidatos')
+            conn.commit()
         
-        conn.execute(update_query, {"cv_path": cv_path, "user_id": user_id})
-        conn.commit()
+        # Borrar el CV anterior si ya nadie lo usa
+        if anterior != cv_path:
+            almacen_archivos.liberar(conn, 'cv', anterior)
         
         return jsonify({
             "message": "CV subido correctamente",
             "filename": unique_filename,
-            "path": cv_path
+            "path": cv_path,
+            "tamano": archivo.tamano,
+            "sha256": archivo.sha256
         }), 200
         
+    except ArchivoRechazado as e:
+        return jsonify({"error": str(e)}), e.codigo
     except Exception as e:
         if conn:
             conn.rollback()
@@ -905,73 +1162,218 @@ def get_candidate_applications(user_id):
     try:
         conn = obtener_conexion()
         
-        # Verificar que el usuario existe y es un candidato
-        usuario_query = text("SELECT ROL FROM Usuario WHERE ID = :user_id AND eliminado = 0")
-        usuario_result = conn.execute(usuario_query, {"user_id": user_id}).fetchone()
+        # Usuario, perfil de candidato y postulaciones en una sola consulta
+        candidato = postulaciones_de_candidato(conn, user_id)
         
-        if not usuario_result:
+        if candidato is None:
             return jsonify({"error": "Usuario no encontrado"}), 404
         
-        if usuario_result.ROL != 'CANDIDATO':
-            return jsonify({"error": "Solo los candidatos pueden ver sus postulaciones"}), 403
+        rol, candidato_id, result = candidato
         
-        # Obtener el ID del candidato
-        candidato_query = text("SELECT ID FROM Candidatos WHERE ID_Usuario = :user_id")
-        candidato_result = conn.execute(candidato_query, {"user_id": user_id}).fetchone()
+        if rol != 'CANDIDATO':
+            return jsonify({"error": "Solo los candidatos pueden ver sus postulaciones"}), 403
         
-        if not candidato_result:
+        if candidato_id is None:
             return jsonify({"error": "Perfil de candidato no encontrado"}), 404
         
-        candidato_id = candidato_result.ID
+        postulaciones = [{
+            "id": row.PostulacionID,
+            "fechaPostulacion": row.FechaPostulacion.isoformat() if row.FechaPostulacion else None,
+            "estado": row.EstadoPostulacion,
+            "vacante": {
+                "id": row.VacanteID,
+                "titulo": row.TituloVacante,
+                "descripcion": row.DescripcionVacante,
+                "salario": float(row.Salario) if row.Salario else 0,
+                "ubicacion": row.Ubicacion,
+                "tipoEmpleo": row.TipoEmpleo,
+                "fechaPublicacion": row.FechaPublicacionVacante.isoformat() if row.FechaPublicacionVacante else None,
+                "fechaCierre": row.FechaCierreVacante.isoformat() if row.FechaCierreVacante else None
+            },
+            "empresa": {
+                "id": row.EmpresaID,
+                "nombre": row.NombreEmpresa,
+                "descripcion": row.DescripcionEmpresa
+            }
+        } for row in result]
+        
+        return jsonify(postulaciones), 200
         
-        # Obtener todas las postulaciones del candidato
+    except SQLAlchemyError as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        if conn:
+            conn.close()
+
+# ========== HABILIDADES Y COINCIDENCIAS ==========
+@app.route('/api/candidato/<int:user_id>/habilidades', methods=['GET'])
+def obtener_habilidades_candidato(user_id):
+    conn = None
+    try:
+        conn = obtener_conexion()
         query = text("""
-            SELECT 
-                P.ID as PostulacionID,
-                P.Fecha_Publicacion as FechaPostulacion,
-                P.Estado as EstadoPostulacion,
-                V.ID as VacanteID,
-                V.Titulo_puesto as TituloVacante,
-                V.Descripcion as DescripcionVacante,
-                V.Salario,
-                V.Ubicacion,
-                V.Tipo_Contrato as TipoEmpleo,
-                V.Fecha_publicacion as FechaPublicacionVacante,
-                V.Fecha_cierre as FechaCierreVacante,
-                E.ID as EmpresaID,
-                E.Nombre as NombreEmpresa,
-                E.Descripcion as DescripcionEmpresa
-            FROM Postulaciones P
-            JOIN Vacantes V ON P.ID_Vacante = V.ID
+            SELECT H.ID, H.Nombre
+            FROM Candidatos C
+            JOIN Candidato_Habilidad CH ON CH.ID_Candidato = C.ID
+            JOIN Habilidades H ON CH.ID_Habilidad = H.ID
+            WHERE C.ID_Usuario = :user_id
+            ORDER BY H.Nombre
+        """)
+        result = conn.execute(query, {"user_id": user_id})
+        habilidades = [{"id": row.ID, "nombre": row.Nombre} for row in result]
+        return jsonify(habilidades), 200
+    except SQLAlchemyError as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        if conn:
+            conn.close()
+
+# Reemplaza las habilidades del candidato. Cuerpo: {"habilidades": ["Python", "SQL Server"]}
+# Las habilidades que no existen en el catálogo se agregan.
+@app.route('/api/candidato/<int:user_id>/habilidades', methods=['PUT'])
+def actualizar_habilidades_candidato(user_id):
+    data = request.json
+    conn = None
+    trans = None
+    try:
+        nombres = data.get('habilidades') if isinstance(data, dict) else None
+        if not isinstance(nombres, list) or not all(isinstance(n, str) for n in nombres):
+            return jsonify({"error": "Campo requerido: habilidades (lista de nombres)"}), 400
+        nombres = list(dict.fromkeys(n.strip()[:50] for n in nombres if n.strip()))
+
+        conn = obtener_conexion()
+        trans = conn.begin()
+
+        identidad = obtener_identidad(user_id, conn)
+        if identidad is None or identidad.candidato_id is None:
+            trans.rollback()
+            return jsonify({"error": "Perfil de candidato no encontrado"}), 404
+        candidato_id = identidad.candidato_id
+
+        habilidad_ids = []
+        if nombres:
+            existentes_query = text("SELECT ID, Nombre FROM Habilidades WHERE Nombre IN :nombres").bindparams(
+                bindparam('nombres', expanding=True))
+            existentes = {row.Nombre.lower(): row.ID for row in conn.execute(existentes_query, {"nombres": nombres})}
+            insertar_query = text("INSERT INTO Habilidades (Nombre) OUTPUT INSERTED.ID VALUES (:nombre)")
+            for nombre in nombres:
+                habilidad_id = existentes.get(nombre.lower())
+                if habilidad_id is None:
+                    habilidad_id = conn.execute(insertar_query, {"nombre": nombre}).scalar()
+                    existentes[nombre.lower()] = habilidad_id
+                habilidad_ids.append(habilidad_id)
+            habilidad_ids = list(dict.fromkeys(habilidad_ids))
+
+        conn.execute(text("DELETE FROM Candidato_Habilidad WHERE ID_Candidato = :candidato_id"),
+                     {"candidato_id": candidato_id})
+        if habilidad_ids:
+            conn.execute(text("""
+                INSERT INTO Candidato_Habilidad (ID_Candidato, ID_Habilidad)
+                VALUES (:candidato_id, :habilidad_id)
+            """), [{"candidato_id": candidato_id, "habilidad_id": h} for h in habilidad_ids])
+
+        trans.commit()
+        servicio_coincidencias.invalidar()
+        return jsonify({"message": "Habilidades actualizadas correctamente", "habilidades": nombres}), 200
+    except SQLAlchemyError as e:
+        if trans:
+            trans.rollback()
+        return jsonify({"error": str(e)}), 500
+    finally:
+        if conn:
+            conn.close()
+
+# Candidatos cuyas habilidades cubren mejor los requisitos de una vacante de la empresa
+@app.route('/api/empresa/<int:user_id>/vacantes/<int:vacante_id>/candidatos-recomendados', methods=['GET'])
+def obtener_candidatos_recomendados(user_id, vacante_id):
+    conn = None
+    try:
+        limite = obtener_limite(request.args, defecto=10)
+        conn = obtener_conexion()
+        vacante_query = text("""
+            SELECT V.Requisitos FROM Vacantes V
             JOIN Empresa E ON V.ID_Empresa = E.ID
-            WHERE P.ID_Candidato = :candidato_id AND V.eliminado = 0
-            ORDER BY P.Fecha_Publicacion DESC
+            WHERE V.ID = :vacante_id AND E.ID_Usuario = :user_id AND V.eliminado = 0
+        """)
+        vacante_result = conn.execute(vacante_query, {"vacante_id": vacante_id, "user_id": user_id}).fetchone()
+        if not vacante_result:
+            return jsonify({"error": "Vacante no encontrada o no autorizada"}), 404
+
+        indice = servicio_coincidencias.obtener(conn)
+        requeridas = indice.catalogo.extraer(vacante_result.Requisitos)
+        mejores = indice.mejores_candidatos(requeridas, limite)
+        if not mejores:
+            return jsonify({"habilidadesRequeridas": [], "candidatos": []}), 200
+
+        candidatos_query = text("""
+            SELECT C.ID, U.NombreUsuario, U.Correo, U.RutaImagen, C.CV
+            FROM Candidatos C
+            JOIN Usuario U ON C.ID_Usuario = U.ID
+            WHERE C.ID IN :ids AND U.eliminado = 0
+        """).bindparams(bindparam('ids', expanding=True))
+        filas = {row.ID: row for row in conn.execute(candidatos_query, {"ids": [c for c, _, _ in mejores]})}
+
+        candidatos = [{
+            "candidatoId": candidato_id,
+            "nombreUsuario": filas[candidato_id].NombreUsuario,
+            "correo": filas[candidato_id].Correo,
+            "rutaImagen": filas[candidato_id].RutaImagen,
+            "cv": filas[candidato_id].CV,
+            "puntaje": round(puntaje, 4),
+            "habilidadesCoincidentes": comunes
+        } for candidato_id, puntaje, comunes in mejores if candidato_id in filas]
+        return jsonify({
+            "habilidadesRequeridas": sorted(indice.catalogo.nombres[h] for h in requeridas),
+            "candidatos": candidatos
+        }), 200
+    except ParametroInvalido as e:
+        return jsonify({"error": str(e)}), 400
+    except SQLAlchemyError as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        if conn:
+            conn.close()
+
+# Vacantes abiertas cuyos requisitos cubre mejor el candidato
+@app.route('/api/candidato/<int:user_id>/vacantes-recomendadas', methods=['GET'])
+def obtener_vacantes_recomendadas(user_id):
+    conn = None
+    try:
+        limite = obtener_limite(request.args, defecto=10)
+        campos = obtener_campos(request.args, CAMPOS_VACANTE_PUBLICA, obligatorios=('id',))
+        conn = obtener_conexion()
+        habilidades_query = text("""
+            SELECT CH.ID_Habilidad
+            FROM Candidatos C
+            JOIN Candidato_Habilidad CH ON CH.ID_Candidato = C.ID
+            WHERE C.ID_Usuario = :user_id
         """)
-        
-        result = conn.execute(query, {"candidato_id": candidato_id})
-        postulaciones = [{
-            "id": row.PostulacionID,
-            "fechaPostulacion": row.FechaPostulacion.isoformat() if row.FechaPostulacion else None,
-            "estado": row.EstadoPostulacion,
-            "vacante": {
-                "id": row.VacanteID,
-                "titulo": row.TituloVacante,
-                "descripcion": row.DescripcionVacante,
-                "salario": float(row.Salario) if row.Salario else 0,
-                "ubicacion": row.Ubicacion,
-                "tipoEmpleo": row.TipoEmpleo,
-                "fechaPublicacion": row.FechaPublicacionVacante.isoformat() if row.FechaPublicacionVacante else None,
-                "fechaCierre": row.FechaCierreVacante.isoformat() if row.FechaCierreVacante else None
-            },
-            "empresa": {
-                "id": row.EmpresaID,
-                "nombre": row.NombreEmpresa,
-                "descripcion": row.DescripcionEmpresa
-            }
-        } for row in result]
-        
-        return jsonify(postulaciones), 200
-        
+        habilidades = {row.ID_Habilidad for row in conn.execute(habilidades_query, {"user_id": user_id})}
+        mejores = servicio_coincidencias.obtener(conn).mejores_vacantes(habilidades, limite)
+        if not mejores:
+            return jsonify([]), 200
+
+        columnas = ",\n                ".join(
+            f"{CAMPOS_VACANTE_PUBLICA[campo][0]} AS {campo}" for campo in campos
+        )
+        query = text(f"""
+            SELECT
+                {columnas}
+            FROM Vacantes V
+            JOIN Empresa E ON V.ID_Empresa = E.ID
+            WHERE V.ID IN :ids AND V.Estado = 'Abierta' AND V.eliminado = 0
+        """).bindparams(bindparam('ids', expanding=True))
+        filas = {row._mapping["id"]: row for row in conn.execute(query, {"ids": [v for v, _ in mejores]})}
+
+        vacantes = []
+        for vacante_id, puntaje in mejores:
+            if vacante_id in filas:
+                vacante = serializar_fila(filas[vacante_id], campos, CAMPOS_VACANTE_PUBLICA)
+                vacante["puntaje"] = round(puntaje, 4)
+                vacantes.append(vacante)
+        return jsonify(vacantes), 200
+    except ParametroInvalido as e:
+        return jsonify({"error": str(e)}), 400
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
     finally:
@@ -1056,7 +1458,10 @@ def update_company_profile(user_id):
             "user_id": user_id
         })
 
+        incrementar_version(conn, 'empresas')
         trans.commit()
+        invalidar_vacantes()
+        servicio_coincidencias.invalidar()
         return jsonify({"message": "Perfil de empresa actualizado correctamente"}), 200
 
     except SQLAlchemyError as e:
@@ -1068,47 +1473,33 @@ def update_company_profile(user_id):
             conn.close()
 
 # ========== VACANTES DESTACADAS AUTOMÁTICAS ==========
+# Cuerpo opcional: {"cantidad": 3, "criterios": {"recencia": 1, "salario": 0.5, "postulaciones": 0.2}}
+# Sin cuerpo se destacan las 3 vacantes abiertas más recientes.
 @app.route('/api/actualizar-destacadas', methods=['POST'])
 def actualizar_vacantes_destacadas():
     conn = None
     try:
+        cantidad, pesos = leer_configuracion(request.get_json(silent=True))
         conn = obtener_conexion()
-        
-        # Primero, quitar todas las destacadas actuales
-        conn.execute(text("UPDATE Vacantes SET Destacada = 0"))
-        
-        # Criterio 1: Las 3 vacantes más recientes
-        query_recientes = text("""
-            WITH VacantesRecientes AS (
-                SELECT TOP 3 ID
-                FROM Vacantes
-                WHERE Estado = 'Abierta'
-                ORDER BY Fecha_Publicacion DESC
-            )
-            UPDATE Vacantes
-            SET Destacada = 1
-            WHERE ID IN (SELECT ID FROM VacantesRecientes)
-        """)
-        conn.execute(query_recientes)
-        
-        # Criterio 2: Si hay menos de 3, completar con las de mayor salario
-        query_salario = text("""
-            WITH VacantesAltoSalario AS (
-                SELECT TOP 3 ID
-                FROM Vacantes
-                WHERE Estado = 'Abierta' AND Destacada = 0
-                ORDER BY Salario DESC
-            )
-            UPDATE Vacantes
-            SET Destacada = 1
-            WHERE ID IN (SELECT ID FROM VacantesAltoSalario)
-            AND (SELECT COUNT(*) FROM Vacantes WHERE Destacada = 1) < 3
-        """)
-        conn.execute(query_salario)
-        
+
+        seleccion = calcular_destacadas(conn, cantidad, pesos)
+        activadas, desactivadas, cambio = aplicar_destacadas(conn, seleccion)
+        if cambio:
+            incrementar_version(conn, 'vacantes')
+
         conn.commit()
-        return jsonify({"message": "Vacantes destacadas actualizadas exitosamente"}), 200
+        if cambio:
+            invalidar_vacantes()
+            servicio_coincidencias.invalidar()
+        return jsonify({
+            "message": "Vacantes destacadas actualizadas exitosamente",
+            "destacadas": [id_vacante for id_vacante, _ in seleccion],
+            "activadas": activadas,
+            "desactivadas": desactivadas
+        }), 200
         
+    except ParametroInvalido as e:
+        return jsonify({"error": str(e)}), 400
     except SQLAlchemyError as e:
         if conn:
             conn.rollback()
@@ -1119,61 +1510,36 @@ def actualizar_vacantes_destacadas():
 
 # ========== POSTULACIONES ==========
 # Obtener postulaciones de una empresa
+# Parámetros opcionales:
+#   limite, cursor -> paginación por clave (Fecha_Publicacion DESC, ID DESC)
+#   vacante        -> solo las postulaciones de una vacante de la empresa
+#   estado         -> Pendiente, En Revisión, Aceptado o Rechazado
+#   desde, hasta   -> rango de fecha de postulación (AAAA-MM-DD)
+# Con cualquiera de ellos la respuesta es {"postulaciones": [...], "siguienteCursor": ...} y cada
+# candidato trae solo nombre, correo e imagen (el resto: GET /api/empresa/<id>/candidatos?ids=...).
+# Sin ninguno se conserva la respuesta original (arreglo completo con el perfil del candidato).
+PARAMETROS_POSTULACIONES_EMPRESA = ('limite', 'cursor', 'vacante', 'estado', 'desde', 'hasta')
+
 @app.route('/api/empresa/<int:user_id>/postulaciones', methods=['GET'])
 def obtener_postulaciones_empresa(user_id):
+    if any(parametro in request.args for parametro in PARAMETROS_POSTULACIONES_EMPRESA):
+        return obtener_pagina_postulaciones_empresa(user_id)
     conn = None
     try:
         conn = obtener_conexion()
         print(f"Buscando empresa para usuario ID: {user_id}")
         
-        # Primero obtener el ID de la empresa
-        empresa_query = text("SELECT ID FROM Empresa WHERE ID_Usuario = :user_id")
-        empresa_result = conn.execute(empresa_query, {"user_id": user_id}).fetchone()
+        # Empresa y postulaciones con información del candidato y vacante en una sola consulta
+        result = postulaciones_de_empresa(conn, user_id)
         
-        if not empresa_result:
+        if result is None:
             print(f"No se encontró empresa para usuario {user_id}")
-            # Crear empresa automáticamente si no existe
-            crear_empresa_query = text("""
-                INSERT INTO Empresa (ID_Usuario, Nombre, Descripcion) 
-                VALUES (:user_id, 'Empresa por defecto', 'Empresa creada automáticamente')
-            """)
-            conn.execute(crear_empresa_query, {"user_id": user_id})
+            # Crear empresa automáticamente si no existe (todavía no tiene postulaciones)
+            crear_empresa_por_defecto(conn, user_id)
+            incrementar_version(conn, 'empresas')
             conn.commit()
-            
-            # Obtener el ID de la empresa recién creada
-            empresa_result = conn.execute(empresa_query, {"user_id": user_id}).fetchone()
-            if not empresa_result:
-                return jsonify({"error": "Error al crear empresa"}), 500
-        
-        empresa_id = empresa_result.ID
-        
-        # Obtener postulaciones con información del candidato y vacante
-        query = text("""
-            SELECT 
-                P.ID as PostulacionID,
-                P.Fecha_Publicacion as FechaPostulacion,
-                P.Estado as EstadoPostulacion,
-                V.ID as VacanteID,
-                V.Titulo_puesto as TituloVacante,
-                V.Salario,
-                V.Ubicacion,
-                C.ID as CandidatoID,
-                U.NombreUsuario,
-                U.Correo,
-                U.RutaImagen,
-                C.Telefono,
-                C.Dirreccion,
-                C.CV,
-                C.Educacion,
-                C.Experiencia_Laboral
-            FROM Postulaciones P
-            JOIN Vacantes V ON P.ID_Vacante = V.ID
-            JOIN Candidatos C ON P.ID_Candidato = C.ID
-            JOIN Usuario U ON C.ID_Usuario = U.ID
-            WHERE V.ID_Empresa = :empresa_id AND U.eliminado = 0 AND V.eliminado = 0
-            ORDER BY P.Fecha_Publicacion DESC
-        """)
-        result = conn.execute(query, {"empresa_id": empresa_id})
+            invalidar_identidad(user_id)
+            return jsonify([]), 200
         
         postulaciones = [{
             "id": row.PostulacionID,
@@ -1205,6 +1571,137 @@ def obtener_postulaciones_empresa(user_id):
         if conn:
             conn.close()
 
+def obtener_pagina_postulaciones_empresa(user_id):
+    conn = None
+    try:
+        limite = obtener_limite(request.args)
+        cursor = decodificar_cursor_fecha_id(request.args['cursor']) if request.args.get('cursor') else None
+        vacante_id = obtener_entero(request.args, 'vacante')
+        estado = request.args.get('estado') or None
+        if estado is not None and estado not in ESTADOS_POSTULACION:
+            raise ParametroInvalido(f"El parámetro 'estado' debe ser uno de: {', '.join(ESTADOS_POSTULACION)}")
+        desde = obtener_fecha(request.args, 'desde')
+        hasta = obtener_fecha(request.args, 'hasta')
+        if desde and hasta and desde > hasta:
+            raise ParametroInvalido("'desde' debe ser anterior o igual a 'hasta'")
+
+        identidad = obtener_identidad(user_id)
+        if identidad is None or identidad.eliminado:
+            return jsonify({"error": "Usuario no encontrado"}), 404
+        conn = obtener_conexion()
+        if identidad.empresa_id is None:
+            # Igual que el listado completo: crear la empresa vacía
+            crear_empresa_por_defecto(conn, user_id)
+            incrementar_version(conn, 'empresas')
+            conn.commit()
+            invalidar_identidad(user_id)
+            return jsonify({"postulaciones": [], "siguienteCursor": None}), 200
+
+        # Se pide una fila extra para saber si existe una página siguiente
+        filas = pagina_postulaciones_empresa(conn, identidad.empresa_id, limite + 1, cursor,
+                                             vacante_id, estado, desde, hasta)
+        hay_mas = len(filas) > limite
+        filas = filas[:limite]
+        siguiente_cursor = None
+        if hay_mas:
+            siguiente_cursor = codificar_cursor(filas[-1].FechaPostulacion, filas[-1].PostulacionID)
+        return jsonify({
+            "postulaciones": [{
+                "id": row.PostulacionID,
+                "fechaPostulacion": row.FechaPostulacion.isoformat() if row.FechaPostulacion else None,
+                "estado": row.EstadoPostulacion,
+                "vacante": {
+                    "id": row.VacanteID,
+                    "titulo": row.TituloVacante,
+                    "salario": row.Salario,
+                    "ubicacion": row.Ubicacion
+                },
+                "candidato": {
+                    "id": row.CandidatoID,
+                    "nombreUsuario": row.NombreUsuario,
+                    "correo": row.Correo,
+                    "rutaImagen": row.RutaImagen
+                }
+            } for row in filas],
+            "siguienteCursor": siguiente_cursor
+        }), 200
+    except ParametroInvalido as e:
+        return jsonify({"error": str(e)}), 400
+    except SQLAlchemyError as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        if conn:
+            conn.close()
+
+# Perfil completo de hasta 100 candidatos del listado paginado: ?ids=<id>,<id>,...
+# Solo devuelve candidatos con alguna postulación a las vacantes de la empresa
+@app.route('/api/empresa/<int:user_id>/candidatos', methods=['GET'])
+def obtener_candidatos_postulados_empresa(user_id):
+    conn = None
+    try:
+        candidato_ids = obtener_lista_enteros(request.args, 'ids')
+        identidad = obtener_identidad(user_id)
+        if identidad is None or identidad.eliminado or identidad.empresa_id is None:
+            return jsonify({"error": "Empresa no encontrada"}), 404
+
+        conn = obtener_conexion()
+        filas = detalle_candidatos_empresa(conn, identidad.empresa_id, candidato_ids)
+        return jsonify({
+            "candidatos": [{
+                "id": row.CandidatoID,
+                "nombreUsuario": row.NombreUsuario,
+                "correo": row.Correo,
+                "telefono": row.Telefono,
+                "direccion": row.Dirreccion,
+                "cv": row.CV,
+                "educacion": row.Educacion,
+                "experienciaLaboral": row.Experiencia_Laboral,
+                "rutaImagen": row.RutaImagen
+            } for row in filas]
+        }), 200
+    except ParametroInvalido as e:
+        return jsonify({"error": str(e)}), 400
+    except SQLAlchemyError as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        if conn:
+            conn.close()
+
+# Postulaciones de la empresa por día o semana y estado, desde los resúmenes que mantiene
+# TR_Resumen_Postulaciones (src/estadisticas_empresa.py):
+# ?desde=AAAA-MM-DD&hasta=AAAA-MM-DD&agrupar=dia|semana&vacante=<id>&limite=<vacantes del desglose>
+@app.route('/api/empresa/<int:user_id>/postulaciones/estadisticas', methods=['GET'])
+def obtener_estadisticas_postulaciones_empresa(user_id):
+    conn = None
+    try:
+        agrupar = request.args.get('agrupar', 'dia')
+        if agrupar not in AGRUPACIONES_EMPRESA:
+            raise ParametroInvalido(f"El parámetro 'agrupar' debe ser uno de: {', '.join(AGRUPACIONES_EMPRESA)}")
+        hasta = obtener_fecha(request.args, 'hasta') or date.today()
+        # Por defecto los últimos 30 días o las últimas 12 semanas
+        desde = obtener_fecha(request.args, 'desde') or hasta - timedelta(days=29 if agrupar == 'dia' else 83)
+        if desde > hasta:
+            raise ParametroInvalido("'desde' debe ser anterior o igual a 'hasta'")
+        vacante_id = obtener_entero(request.args, 'vacante')
+        limite = obtener_limite(request.args)
+
+        identidad = obtener_identidad(user_id)
+        if identidad is None or identidad.eliminado or identidad.empresa_id is None:
+            return jsonify({"error": "Empresa no encontrada"}), 404
+
+        conn = obtener_conexion()
+        resultado = estadisticas_postulaciones(conn, identidad.empresa_id, desde, hasta, agrupar, vacante_id, limite)
+        if resultado is None:
+            return jsonify({"error": "Vacante no encontrada o no autorizada"}), 404
+        return jsonify(resultado), 200
+    except ParametroInvalido as e:
+        return jsonify({"error": str(e)}), 400
+    except SQLAlchemyError as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        if conn:
+            conn.close()
+
 # Actualizar estado de postulación
 @app.route('/api/postulaciones/<int:postulacion_id>', methods=['PUT'])
 def actualizar_estado_postulacion(postulacion_id):
@@ -1214,7 +1711,7 @@ def actualizar_estado_postulacion(postulacion_id):
         conn = obtener_conexion()
         
         # Verificar que la postulación existe
-        verificar_query = text("SELECT ID FROM Postulaciones WHERE ID = :postulacion_id")
+        verificar_query = text("SELECT ID, ID_Vacante FROM Postulaciones WHERE ID = :postulacion_id")
         verificar_result = conn.execute(verificar_query, {"postulacion_id": postulacion_id}).fetchone()
         
         if not verificar_result:
@@ -1239,8 +1736,11 @@ def actualizar_estado_postulacion(postulacion_id):
                 WHERE ID = (SELECT ID_Vacante FROM Postulaciones WHERE ID = :postulacion_id)
             """)
             conn.execute(cerrar_vacante_query, {"postulacion_id": postulacion_id})
+            incrementar_version(conn, 'vacantes')
         
         conn.commit()
+        # Aceptar cierra la vacante: sale de las coincidencias
+        vacantes_modificadas(conn, verificar_result.ID_Vacante, coincidencias=data['estado'] == 'Aceptado')
         return jsonify({"message": "Estado de postulación actualizado correctamente"}), 200
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
@@ -1256,92 +1756,19 @@ def crear_postulacion():
     try:
         conn = obtener_conexion()
         
-        # Verificar que el usuario existe y es un candidato
-        usuario_query = text("SELECT ROL FROM Usuario WHERE ID = :user_id")
-        usuario_result = conn.execute(usuario_query, {"user_id": data['userId']}).fetchone()
-        
-        if not usuario_result:
-            return jsonify({"error": "Usuario no encontrado"}), 404
-        
-        if usuario_result.ROL != 'CANDIDATO':
-            return jsonify({"error": "Solo los candidatos registrados pueden aplicar a vacantes"}), 403
-        
-        # Obtener el ID del candidato y verificar que el perfil esté completo
-        candidato_query = text("""
-            SELECT ID, Telefono, Dirreccion, CV, Educacion, Experiencia_Laboral 
-            FROM Candidatos WHERE ID_Usuario = :user_id
-        """)
-        candidato_result = conn.execute(candidato_query, {"user_id": data['userId']}).fetchone()
-        
-        if not candidato_result:
-            return jsonify({"error": "Perfil de candidato no encontrado. Complete su perfil primero."}), 404
-        
-
-        
-        candidato_id = candidato_result.ID
+        # Validaciones (usuario candidato con perfil, postulación duplicada, vacante abierta
+        # y no vencida) e inserción en un solo viaje con sp_CrearPostulacion
+        resultado, postulacion_id = crear_postulacion_db(conn, data['userId'], data['vacanteId'])
         
-        # Verificar si ya existe una postulación
-        check_query = text("""
-            SELECT 1 FROM Postulaciones 
-            WHERE ID_Candidato = :candidato_id AND ID_Vacante = :vacante_id
-        """)
-        existing = conn.execute(check_query, {
-            "candidato_id": candidato_id,
-            "vacante_id": data['vacanteId']
-        }).fetchone()
-        
-        if existing:
-            return jsonify({"error": "Ya te has postulado a esta vacante"}), 400
-        
-        # Verificar si la vacante existe y está activa
-        vacante_query = text("""
-            SELECT ID, Fecha_Cierre, Estado FROM Vacantes 
-            WHERE ID = :vacante_id AND eliminado = 0
-        """)
-        vacante_result = conn.execute(vacante_query, {
-            "vacante_id": data['vacanteId']
-        }).fetchone()
-        
-        # print(f"DEBUG - Vacante ID: {data['vacanteId']}, Fecha_Cierre: {vacante_result.Fecha_Cierre if vacante_result else 'No encontrada'}, Estado: {vacante_result.Estado if vacante_result else 'No encontrada'}")
+        if resultado != 'OK':
+            mensaje, codigo = ERRORES_POSTULACION[resultado]
+            return jsonify({"error": mensaje}), codigo
         
-        if not vacante_result:
-            return jsonify({"error": "La vacante no existe"}), 404
-            
-        # Verificar si la vacante está cerrada por estado o por fecha
-        if vacante_result.Estado == 'Cerrada':
-            return jsonify({"error": "Esta vacante ya está cerrada"}), 400
-            
-        # Verificar si la fecha de cierre ya pasó
-        if vacante_result.Fecha_Cierre is not None:
-            from datetime import datetime
-            fecha_actual = datetime.now()
-            # print(f"DEBUG - Fecha actual: {fecha_actual}")
-            # print(f"DEBUG - Fecha cierre: {vacante_result.Fecha_Cierre}")
-            # print(f"DEBUG - Tipo fecha cierre: {type(vacante_result.Fecha_Cierre)}")
-            
-            # Convertir fecha de cierre a datetime si es necesario
-            fecha_cierre = vacante_result.Fecha_Cierre
-            if hasattr(fecha_cierre, 'date'):
-                # Si es datetime, comparar solo las fechas
-                if fecha_cierre.date() < fecha_actual.date():
-                    return jsonify({"error": "Esta vacante ya está cerrada por fecha"}), 400
-            else:
-                # Si es date, convertir fecha actual a date
-                if fecha_cierre < fecha_actual.date():
-                    return jsonify({"error": "Esta vacante ya está cerrada por fecha"}), 400
-        
-        # Insertar la postulación
-        insert_query = text("""
-            INSERT INTO Postulaciones (ID_Candidato, ID_Vacante, Fecha_Publicacion, Estado)
-            VALUES (:candidato_id, :vacante_id, GETDATE(), 'Pendiente')
-        """)
-        conn.execute(insert_query, {
-            "candidato_id": candidato_id,
-            "vacante_id": data['vacanteId']
-        })
         conn.commit()
+        # sp_CrearPostulacion incrementa la versión 'vacantes' y CantidadPostulaciones
+        vacantes_modificadas(conn, data['vacanteId'], coincidencias=False)
         
-        return jsonify({"message": "Postulación creada correctamente"}), 201
+        return jsonify({"message": "Postulación creada correctamente", "id": postulacion_id}), 201
         
     except SQLAlchemyError as e:
         error_msg = str(e)
@@ -1366,13 +1793,16 @@ def crear_postulacion():
 
 # ========== ENDPOINTS DE ADMINISTRACIÓN ==========
 
+# Con ?stream=json o ?stream=ndjson los listados completos de administración se envían
+# por bloques desde un cursor en streaming, sin construir la lista entera en memoria
+def formato_streaming():
+    formato = request.args.get('stream')
+    if formato and formato not in FORMATOS:
+        raise ParametroInvalido(f"Formato de streaming no válido. Formatos válidos: {', '.join(FORMATOS)}")
+    return formato
+
 # ========== GESTIÓN DE USUARIOS ==========
-@app.route('/api/admin/usuarios', methods=['GET'])
-def admin_obtener_usuarios():
-    conn = None
-    try:
-        conn = obtener_conexion()
-        query = text("""
+CONSULTA_ADMIN_USUARIOS = text("""
             SELECT 
                 U.ID, 
                 U.NombreUsuario, 
@@ -1395,18 +1825,32 @@ def admin_obtener_usuarios():
             LEFT JOIN Empresa E ON U.ID = E.ID_Usuario AND U.ROL = 'EMPRESA'
             ORDER BY U.ID DESC
         """)
-        result = conn.execute(query)
-        usuarios = [{
-            "id": row.ID,
-            "nombreUsuario": row.NombreUsuario,
-            "correo": row.Correo,
-            "rol": row.ROL,
-            "rutaImagen": row.RutaImagen,
-            "telefono": row.Telefono,
-            "direccion": row.Direccion,
-            "activo": row.eliminado == 0
-        } for row in result]
+
+def serializar_usuario_admin(row):
+    return {
+        "id": row.ID,
+        "nombreUsuario": row.NombreUsuario,
+        "correo": row.Correo,
+        "rol": row.ROL,
+        "rutaImagen": row.RutaImagen,
+        "telefono": row.Telefono,
+        "direccion": row.Direccion,
+        "activo": row.eliminado == 0
+    }
+
+@app.route('/api/admin/usuarios', methods=['GET'])
+def admin_obtener_usuarios():
+    conn = None
+    try:
+        formato = formato_streaming()
+        if formato:
+            return respuesta_en_streaming(CONSULTA_ADMIN_USUARIOS, {}, serializar_usuario_admin, formato)
+        conn = obtener_conexion()
+        result = conn.execute(CONSULTA_ADMIN_USUARIOS)
+        usuarios = [serializar_usuario_admin(row) for row in result]
         return jsonify(usuarios), 200
+    except ParametroInvalido as e:
+        return jsonify({"error": str(e)}), 400
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
     finally:
@@ -1511,7 +1955,11 @@ def admin_actualizar_usuario(usuario_id):
                     "usuario_id": usuario_id
                 })
         
+        incrementar_version(conn, 'usuarios', 'candidatos', 'empresas')
         trans.commit()
+        # El perfil guardado en un desafío 2FA pendiente ya no corresponde
+        almacen_desafios.descartar(usuario_id)
+        invalidar_identidad(usuario_id)
         return jsonify({"message": "Usuario actualizado correctamente"}), 200
         
     except SQLAlchemyError as e:
@@ -1538,7 +1986,10 @@ def admin_eliminar_usuario(usuario_id):
         # Realizar soft delete - marcar como eliminado
         soft_delete_query = text("UPDATE Usuario SET eliminado = 1 WHERE ID = :usuario_id")
         conn.execute(soft_delete_query, {"usuario_id": usuario_id})
+        incrementar_version(conn, 'usuarios')
         conn.commit()
+        almacen_desafios.descartar(usuario_id)
+        invalidar_identidad(usuario_id)
         
         return jsonify({"message": "Usuario eliminado correctamente"}), 200
         
@@ -1550,6 +2001,7 @@ def admin_eliminar_usuario(usuario_id):
 
 # ========== GESTIÓN DE VACANTES (ADMIN) ==========
 @app.route('/api/admin/vacantes', methods=['GET'])
+@respuesta_condicional('vacantes', 'empresas')
 def admin_obtener_vacantes():
     conn = None
     try:
@@ -1634,13 +2086,15 @@ def admin_crear_vacante():
             INSERT INTO Vacantes (
                 ID_Empresa, Titulo_puesto, Descripcion, Requisitos, Salario,
                 Tipo_Contrato, Ubicacion, Fecha_Publicacion, Fecha_Cierre, Estado, CantidadPostulaciones
-            ) VALUES (
+            )
+            OUTPUT INSERTED.ID
+            VALUES (
                 :ID_Empresa, :Titulo_puesto, :Descripcion, :Requisitos, :Salario,
                 :Tipo_Contrato, :Ubicacion, GETDATE(), :Fecha_Cierre, :Estado, 0
             )
         """)
         
-        conn.execute(query, {
+        vacante_id = conn.execute(query, {
             "ID_Empresa": data['empresaId'],
             "Titulo_puesto": data['titulo'],
             "Descripcion": data['descripcion'],
@@ -1650,10 +2104,12 @@ def admin_crear_vacante():
             "Ubicacion": data['ubicacion'],
             "Fecha_Cierre": data.get('fechaCierre'),
             "Estado": data.get('estado', 'Abierta')
-        })
+        }).scalar()
         
+        incrementar_version(conn, 'vacantes')
         conn.commit()
-        return jsonify({"message": "Vacante creada correctamente"}), 201
+        vacantes_modificadas(conn, vacante_id)
+        return jsonify({"message": "Vacante creada correctamente", "id": vacante_id}), 201
         
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
@@ -1709,7 +2165,9 @@ def admin_actualizar_vacante(vacante_id):
             "vacante_id": vacante_id
         })
         
+        incrementar_version(conn, 'vacantes')
         conn.commit()
+        vacantes_modificadas(conn, vacante_id)
         return jsonify({"message": "Vacante actualizada correctamente"}), 200
         
     except SQLAlchemyError as e:
@@ -1734,7 +2192,9 @@ def admin_eliminar_vacante(vacante_id):
         # Realizar soft delete - marcar como eliminada
         soft_delete_query = text("UPDATE Vacantes SET eliminado = 1 WHERE ID = :vacante_id")
         conn.execute(soft_delete_query, {"vacante_id": vacante_id})
+        incrementar_version(conn, 'vacantes')
         conn.commit()
+        vacantes_modificadas(conn, vacante_id)
         
         return jsonify({"message": "Vacante eliminada correctamente"}), 200
         
@@ -1745,12 +2205,7 @@ def admin_eliminar_vacante(vacante_id):
             conn.close()
 
 # ========== GESTIÓN DE CANDIDATOS (ADMIN) ==========
-@app.route('/api/admin/candidatos', methods=['GET'])
-def admin_obtener_candidatos():
-    conn = None
-    try:
-        conn = obtener_conexion()
-        query = text("""
+CONSULTA_ADMIN_CANDIDATOS = text("""
             SELECT 
                 C.ID,
                 C.Telefono,
@@ -1767,21 +2222,36 @@ def admin_obtener_candidatos():
             JOIN Usuario U ON C.ID_Usuario = U.ID
             ORDER BY C.ID DESC
         """)
-        result = conn.execute(query)
-        candidatos = [{
-            "id": row.ID,
-            "telefono": row.Telefono,
-            "dirreccion": row.Dirreccion,  # Corregido para coincidir con frontend
-            "cv": row.CV,
-            "educacion": row.Educacion,
-            "experiencia_laboral": row.Experiencia_Laboral,  # Corregido para coincidir con frontend
-            "nombreUsuario": row.NombreUsuario,
-            "correo": row.Correo,
-            "usuarioId": row.UsuarioID,
-            "rutaImagen": row.RutaImagen,
-            "eliminado": row.eliminado  # Cambiado de 'activo' a 'eliminado' para coincidir con frontend
-        } for row in result]
+
+def serializar_candidato_admin(row):
+    return {
+        "id": row.ID,
+        "telefono": row.Telefono,
+        "dirreccion": row.Dirreccion,  # Corregido para coincidir con frontend
+        "cv": row.CV,
+        "educacion": row.Educacion,
+        "experiencia_laboral": row.Experiencia_Laboral,  # Corregido para coincidir con frontend
+        "nombreUsuario": row.NombreUsuario,
+        "correo": row.Correo,
+        "usuarioId": row.UsuarioID,
+        "rutaImagen": row.RutaImagen,
+        "eliminado": row.eliminado  # Cambiado de 'activo' a 'eliminado' para coincidir con frontend
+    }
+
+@app.route('/api/admin/candidatos', methods=['GET'])
+@respuesta_condicional('candidatos', 'usuarios')
+def admin_obtener_candidatos():
+    conn = None
+    try:
+        formato = formato_streaming()
+        if formato:
+            return respuesta_en_streaming(CONSULTA_ADMIN_CANDIDATOS, {}, serializar_candidato_admin, formato)
+        conn = obtener_conexion()
+        result = conn.execute(CONSULTA_ADMIN_CANDIDATOS)
+        candidatos = [serializar_candidato_admin(row) for row in result]
         return jsonify(candidatos), 200
+    except ParametroInvalido as e:
+        return jsonify({"error": str(e)}), 400
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
     finally:
@@ -1836,7 +2306,11 @@ def admin_actualizar_candidato(candidato_id):
             "candidato_id": candidato_id
         })
         
+        incrementar_version(conn, 'usuarios', 'candidatos')
         trans.commit()
+        # Puede haber cambiado 'eliminado' y el nombre del perfil guardado en un desafío 2FA
+        almacen_desafios.descartar(usuario_id)
+        invalidar_identidad(usuario_id)
         return jsonify({"message": "Candidato actualizado correctamente"}), 200
         
     except SQLAlchemyError as e:
@@ -1872,7 +2346,10 @@ def admin_eliminar_candidato(candidato_id):
         """)
         conn.execute(soft_delete_query, {"usuario_id": usuario_id})
         
+        incrementar_version(conn, 'usuarios')
         trans.commit()
+        almacen_desafios.descartar(usuario_id)
+        invalidar_identidad(usuario_id)
         return jsonify({"message": "Candidato eliminado correctamente"}), 200
         
     except SQLAlchemyError as e:
@@ -1885,6 +2362,7 @@ def admin_eliminar_candidato(candidato_id):
 
 # ========== GESTIÓN DE EMPRESAS (ADMIN) ==========
 @app.route('/api/admin/empresas', methods=['GET'])
+@respuesta_condicional('empresas', 'usuarios')
 def admin_obtener_empresas_completas():
     conn = None
     try:
@@ -2012,7 +2490,13 @@ def admin_actualizar_empresa(empresa_id):
             "empresa_id": empresa_id
         })
         
+        incrementar_version(conn, 'usuarios', 'empresas')
         trans.commit()
+        # Puede haber cambiado 'eliminado' y el nombre del perfil guardado en un desafío 2FA
+        almacen_desafios.descartar(usuario_id)
+        invalidar_identidad(usuario_id)
+        invalidar_vacantes()
+        servicio_coincidencias.invalidar()
         return jsonify({"message": "Empresa actualizada correctamente"}), 200
         
     except SQLAlchemyError as e:
@@ -2048,7 +2532,10 @@ def admin_eliminar_empresa(empresa_id):
         """)
         conn.execute(soft_delete_query, {"usuario_id": usuario_id})
         
+        incrementar_version(conn, 'usuarios')
         trans.commit()
+        almacen_desafios.descartar(usuario_id)
+        invalidar_identidad(usuario_id)
         return jsonify({"message": "Empresa eliminada correctamente"}), 200
         
     except SQLAlchemyError as e:
@@ -2060,12 +2547,7 @@ def admin_eliminar_empresa(empresa_id):
             conn.close()
 
 # ========== GESTIÓN DE POSTULACIONES (ADMIN) ==========
-@app.route('/api/admin/postulaciones', methods=['GET'])
-def admin_obtener_postulaciones():
-    conn = None
-    try:
-        conn = obtener_conexion()
-        query = text("""
+CONSULTA_ADMIN_POSTULACIONES = text("""
             SELECT 
                 P.ID as PostulacionID,
                 P.Fecha_Publicacion as FechaPostulacion,
@@ -2088,23 +2570,37 @@ def admin_obtener_postulaciones():
             WHERE U.eliminado = 0 AND V.eliminado = 0
             ORDER BY P.Fecha_Publicacion DESC
         """)
-        result = conn.execute(query)
-        postulaciones = [{
-            "id": row.PostulacionID,
-            "fechaPostulacion": row.FechaPostulacion.isoformat() if row.FechaPostulacion else None,
-            "estado": row.EstadoPostulacion,
-            "vacanteId": row.VacanteID,
-            "tituloVacante": row.TituloVacante,
-            "salario": float(row.Salario) if row.Salario else 0,
-            "ubicacion": row.Ubicacion,
-            "candidatoId": row.CandidatoID,
-            "nombreCandidato": row.NombreUsuario,
-            "correoCandidato": row.Correo,
-            "telefonoCandidato": row.Telefono,
-            "direccionCandidato": row.Dirreccion,
-            "nombreEmpresa": row.NombreEmpresa
-        } for row in result]
+
+def serializar_postulacion_admin(row):
+    return {
+        "id": row.PostulacionID,
+        "fechaPostulacion": row.FechaPostulacion.isoformat() if row.FechaPostulacion else None,
+        "estado": row.EstadoPostulacion,
+        "vacanteId": row.VacanteID,
+        "tituloVacante": row.TituloVacante,
+        "salario": float(row.Salario) if row.Salario else 0,
+        "ubicacion": row.Ubicacion,
+        "candidatoId": row.CandidatoID,
+        "nombreCandidato": row.NombreUsuario,
+        "correoCandidato": row.Correo,
+        "telefonoCandidato": row.Telefono,
+        "direccionCandidato": row.Dirreccion,
+        "nombreEmpresa": row.NombreEmpresa
+    }
+
+@app.route('/api/admin/postulaciones', methods=['GET'])
+def admin_obtener_postulaciones():
+    conn = None
+    try:
+        formato = formato_streaming()
+        if formato:
+            return respuesta_en_streaming(CONSULTA_ADMIN_POSTULACIONES, {}, serializar_postulacion_admin, formato)
+        conn = obtener_conexion()
+        result = conn.execute(CONSULTA_ADMIN_POSTULACIONES)
+        postulaciones = [serializar_postulacion_admin(row) for row in result]
         return jsonify(postulaciones), 200
+    except ParametroInvalido as e:
+        return jsonify({"error": str(e)}), 400
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
     finally:
@@ -2182,37 +2678,111 @@ def admin_obtener_estadisticas():
     conn = None
     try:
         conn = obtener_conexion()
-        
-        # Obtener estadísticas
-        stats_query = text("""
-            SELECT 
-                (SELECT COUNT(*) FROM Vacantes WHERE Estado = 'Abierta') as VacantesActivas,
-                (SELECT COUNT(*) FROM Candidatos) as CandidatosRegistrados,
-                (SELECT COUNT(*) FROM Empresa) as EmpresasActivas,
-                (SELECT COUNT(*) FROM Postulaciones WHERE MONTH(Fecha_Publicacion) = MONTH(GETDATE()) AND YEAR(Fecha_Publicacion) = YEAR(GETDATE())) as PostulacionesMes
-        """)
-        
-        result = conn.execute(stats_query).fetchone()
-        
-        estadisticas = {
-            "vacantesActivas": result.VacantesActivas,
-            "candidatosRegistrados": result.CandidatosRegistrados,
-            "empresasActivas": result.EmpresasActivas,
-            "postulacionesMes": result.PostulacionesMes
-        }
-        
-        return jsonify(estadisticas), 200
-        
+        # Contadores mantenidos por triggers (src/estadisticas.py): sin contar las tablas
+        return jsonify(estadisticas_admin.panel(conn)), 200
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
     finally:
         if conn:
             conn.close()
 
-# ========== ARCHIVOS ESTÁTICOS ==========
-@app.route('/static/<path:filename>')
-def static_files(filename):
-    return app.send_static_file(filename)
+# Postulaciones y vacantes publicadas entre dos fechas: ?desde=AAAA-MM-DD&hasta=AAAA-MM-DD&agrupar=mes|dia
+@app.route('/api/admin/estadisticas/periodo', methods=['GET'])
+def admin_obtener_estadisticas_periodo():
+    conn = None
+    try:
+        hasta = obtener_fecha(request.args, 'hasta') or date.today()
+        desde = obtener_fecha(request.args, 'desde') or hasta.replace(day=1)
+        agrupar = request.args.get('agrupar', 'mes')
+        if agrupar not in AGRUPACIONES:
+            raise ParametroInvalido(f"El parámetro 'agrupar' debe ser uno de: {', '.join(AGRUPACIONES)}")
+        if desde > hasta:
+            raise ParametroInvalido("'desde' debe ser anterior o igual a 'hasta'")
+        conn = obtener_conexion()
+        return jsonify(estadisticas_admin.periodo(conn, desde, hasta, agrupar)), 200
+    except ParametroInvalido as e:
+        return jsonify({"error": str(e)}), 400
+    except SQLAlchemyError as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        if conn:
+            conn.close()
+
+# Recalcular las estadísticas desde las tablas y corregir las diferencias
+@app.route('/api/admin/estadisticas/reconciliar', methods=['POST'])
+def admin_reconciliar_estadisticas():
+    conn = None
+    try:
+        conn = obtener_conexion()
+        resultado = estadisticas_admin.reconciliar(conn)
+        resultado["resumenesPostulaciones"] = reconciliar_resumenes(conn)
+        conn.commit()
+        return jsonify(resultado), 200
+    except SQLAlchemyError as e:
+        if conn:
+            conn.rollback()
+        return jsonify({"error": str(e)}), 500
+    finally:
+        if conn:
+            conn.close()
+
+# Contadores de la caché del listado público de vacantes
+@app.route('/api/admin/cache', methods=['GET'])
+def admin_obtener_estadisticas_cache():
+    return jsonify({
+        "vacantes": cache_vacantes.estadisticas(),
+        "identidades": cache_identidades.estadisticas(),
+        "versiones": cache_versiones.estadisticas()
+    }), 200
+
+@app.route('/api/admin/pool', methods=['GET'])
+def admin_obtener_estado_pool():
+    return jsonify(estadisticas_pool.estado()), 200
+
+@app.route('/api/admin/limites', methods=['GET'])
+def admin_obtener_estado_limites():
+    return jsonify(estado_limites()), 200
+
+@app.route('/api/admin/dos-factores', methods=['GET'])
+def admin_obtener_estado_dos_factores():
+    return jsonify(almacen_desafios.estado()), 200
+
+@app.route('/api/admin/contrasenas', methods=['GET'])
+def admin_obtener_estado_contrasenas():
+    return jsonify(servicio_contrasenas.estado()), 200
+
+# Archivos subidos: reutilizados por contenido, liberados y última recolección
+@app.route('/api/admin/archivos', methods=['GET'])
+def admin_obtener_estado_archivos():
+    return jsonify(almacen_archivos.estado()), 200
+
+# Borrar CV e imágenes que ninguna fila referencia. Cuerpo opcional: {"simular": true}
+@app.route('/api/admin/archivos/recolectar', methods=['POST'])
+def admin_recolectar_archivos():
+    conn = None
+    try:
+        simular = bool((request.get_json(silent=True) or {}).get('simular'))
+        conn = obtener_conexion()
+        return jsonify(almacen_archivos.recolectar(conn, simular=simular)), 200
+    except (SQLAlchemyError, OSError) as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        if conn:
+            conn.close()
+
+@app.route('/api/admin/consultas-lentas', methods=['GET'])
+def admin_obtener_consultas_lentas():
+    return jsonify({
+        "umbralMs": registro_metricas.umbral_lenta * 1000,
+        "total": registro_metricas.total_consultas_lentas,
+        "consultas": registro_metricas.consultas_lentas()
+    }), 200
+
+# ========== MÉTRICAS ==========
+@app.route('/metrics', methods=['GET'])
+def metricas():
+    """Agregados por endpoint en formato de texto de Prometheus"""
+    return app.response_class(registro_metricas.exportar(), mimetype='text/plain; version=0.0.4')
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0')
\ No newline at end of file
@@ -0,0 +1,262 @@
+from sqlalchemy import text, bindparam
+
+# Consultas que resuelven en un solo viaje a la base de datos lo que antes eran varias
+# consultas secuenciales (buscar Empresa.ID o Candidatos.ID a partir de ID_Usuario y
+# luego ejecutar la consulta principal). Las filas de identidad sin datos relacionados
+# llegan con las columnas del LEFT JOIN en NULL.
+
+# Empresa del usuario: se toma la primera si hubiera más de una, como hacía fetchone()
+_EMPRESA_DEL_USUARIO = "(SELECT TOP (1) ID FROM Empresa WHERE ID_Usuario = :user_id ORDER BY ID)"
+
+_consulta_vacantes_empresa = text(f"""
+    SELECT
+        E.ID AS EmpresaID,
+        V.ID,
+        V.Titulo_puesto,
+        V.Descripcion,
+        V.Requisitos,
+        V.Salario,
+        V.Tipo_Contrato,
+        V.Ubicacion,
+        V.Fecha_Publicacion,
+        V.Fecha_Cierre,
+        V.Estado,
+        V.CantidadPostulaciones
+    FROM {_EMPRESA_DEL_USUARIO} E
+    LEFT JOIN Vacantes V ON V.ID_Empresa = E.ID AND V.eliminado = 0
+    ORDER BY V.Fecha_Publicacion DESC
+""")
+
+_insertar_vacante_empresa = text(f"""
+    INSERT INTO Vacantes (
+        ID_Empresa, Titulo_puesto, Descripcion, Requisitos, Salario,
+        Tipo_Contrato, Ubicacion, Fecha_Publicacion, Fecha_Cierre, Estado, CantidadPostulaciones
+    )
+    OUTPUT INSERTED.ID
+    SELECT
+        E.ID, :Titulo_puesto, :Descripcion, :Requisitos, :Salario,
+        :Tipo_Contrato, :Ubicacion, GETDATE(), :Fecha_Cierre, :Estado, 0
+    FROM {_EMPRESA_DEL_USUARIO} E
+""")
+
+_consulta_postulaciones_empresa = text(f"""
+    SELECT
+        E.ID AS EmpresaID,
+        P.ID as PostulacionID,
+        P.Fecha_Publicacion as FechaPostulacion,
+        P.Estado as EstadoPostulacion,
+        V.ID as VacanteID,
+        V.Titulo_puesto as TituloVacante,
+        V.Salario,
+        V.Ubicacion,
+        C.ID as CandidatoID,
+        U.NombreUsuario,
+        U.Correo,
+        U.RutaImagen,
+        C.Telefono,
+        C.Dirreccion,
+        C.CV,
+        C.Educacion,
+        C.Experiencia_Laboral
+    FROM {_EMPRESA_DEL_USUARIO} E
+    LEFT JOIN (
+        Postulaciones P
+        JOIN Vacantes V ON P.ID_Vacante = V.ID AND V.eliminado = 0
+        JOIN Candidatos C ON P.ID_Candidato = C.ID
+        JOIN Usuario U ON C.ID_Usuario = U.ID AND U.eliminado = 0
+    ) ON V.ID_Empresa = E.ID
+    ORDER BY P.Fecha_Publicacion DESC
+""")
+
+# Página del listado de la empresa (SQL/add_postulaciones_empresa.sql): recorre
+# IX_Postulaciones_Empresa (o IX_Postulaciones_Vacante con ?vacante=) en el orden del listado y
+# se detiene tras TOP (:limite) filas. Solo trae las columnas de la tarjeta; el perfil completo
+# del candidato (CV, educación, experiencia) lo devuelve detalle_candidatos_empresa() al abrirlo.
+_pagina_postulaciones_empresa = """
+    SELECT TOP (:limite)
+        P.ID as PostulacionID,
+        P.Fecha_Publicacion as FechaPostulacion,
+        P.Estado as EstadoPostulacion,
+        V.ID as VacanteID,
+        V.Titulo_puesto as TituloVacante,
+        V.Salario,
+        V.Ubicacion,
+        C.ID as CandidatoID,
+        U.NombreUsuario,
+        U.Correo,
+        U.RutaImagen
+    FROM Postulaciones P
+    JOIN Vacantes V ON P.ID_Vacante = V.ID AND V.eliminado = 0
+    JOIN Candidatos C ON P.ID_Candidato = C.ID
+    JOIN Usuario U ON C.ID_Usuario = U.ID AND U.eliminado = 0
+    WHERE P.ID_Empresa = :empresa_id {filtros}
+    ORDER BY P.Fecha_Publicacion DESC, P.ID DESC
+"""
+
+# Solo candidatos con alguna postulación visible en el listado de la empresa (IX_Postulaciones_Candidato)
+_detalle_candidatos_empresa = text("""
+    SELECT
+        C.ID as CandidatoID,
+        U.NombreUsuario,
+        U.Correo,
+        U.RutaImagen,
+        C.Telefono,
+        C.Dirreccion,
+        C.CV,
+        C.Educacion,
+        C.Experiencia_Laboral
+    FROM Candidatos C
+    JOIN Usuario U ON C.ID_Usuario = U.ID AND U.eliminado = 0
+    WHERE C.ID IN :ids
+      AND EXISTS (
+          SELECT 1 FROM Postulaciones P
+          JOIN Vacantes V ON P.ID_Vacante = V.ID AND V.eliminado = 0
+          WHERE P.ID_Candidato = C.ID AND P.ID_Empresa = :empresa_id
+      )
+""").bindparams(bindparam('ids', expanding=True))
+
+_crear_empresa_por_defecto = text("""
+    INSERT INTO Empresa (ID_Usuario, Nombre, Descripcion)
+    OUTPUT INSERTED.ID
+    VALUES (:user_id, 'Empresa por defecto', 'Empresa creada automáticamente')
+""")
+
+_consulta_postulaciones_candidato = text("""
+    SELECT
+        U.ROL,
+        C.ID AS CandidatoID,
+        P.ID as PostulacionID,
+        P.Fecha_Publicacion as FechaPostulacion,
+        P.Estado as EstadoPostulacion,
+        V.ID as VacanteID,
+        V.Titulo_puesto as TituloVacante,
+        V.Descripcion as DescripcionVacante,
+        V.Salario,
+        V.Ubicacion,
+        V.Tipo_Contrato as TipoEmpleo,
+        V.Fecha_publicacion as FechaPublicacionVacante,
+        V.Fecha_cierre as FechaCierreVacante,
+        E.ID as EmpresaID,
+        E.Nombre as NombreEmpresa,
+        E.Descripcion as DescripcionEmpresa
+    FROM Usuario U
+    OUTER APPLY (
+        SELECT TOP (1) ID FROM Candidatos
+        WHERE ID_Usuario = U.ID AND U.ROL = 'CANDIDATO'
+        ORDER BY ID
+    ) C
+    LEFT JOIN (
+        Postulaciones P
+        JOIN Vacantes V ON P.ID_Vacante = V.ID AND V.eliminado = 0
+        JOIN Empresa E ON V.ID_Empresa = E.ID
+    ) ON P.ID_Candidato = C.ID
+    WHERE U.ID = :user_id AND U.eliminado = 0
+    ORDER BY P.Fecha_Publicacion DESC
+""")
+
+# Ver SQL/create_postulacion_sp.sql
+_crear_postulacion = text("EXEC sp_CrearPostulacion @ID_Usuario = :user_id, @ID_Vacante = :vacante_id")
+
+# Resultado de sp_CrearPostulacion -> (mensaje de error, código HTTP)
+ERRORES_POSTULACION = {
+    'USUARIO_NO_ENCONTRADO': ("Usuario no encontrado", 404),
+    'NO_ES_CANDIDATO': ("Solo los candidatos registrados pueden aplicar a vacantes", 403),
+    'SIN_PERFIL': ("Perfil de candidato no encontrado. Complete su perfil primero.", 404),
+    'DUPLICADA': ("Ya te has postulado a esta vacante", 400),
+    'VACANTE_NO_EXISTE': ("La vacante no existe", 404),
+    'VACANTE_CERRADA': ("Esta vacante ya está cerrada", 400),
+    'VACANTE_CERRADA_POR_FECHA': ("Esta vacante ya está cerrada por fecha", 400)
+}
+
+
+def vacantes_de_empresa(conn, user_id):
+    """Vacantes no eliminadas de la empresa del usuario. None si el usuario no tiene empresa"""
+    filas = conn.execute(_consulta_vacantes_empresa, {"user_id": user_id}).fetchall()
+    if not filas:
+        return None
+    return [fila for fila in filas if fila.ID is not None]
+
+
+def insertar_vacante_empresa(conn, user_id, params):
+    """Insertar la vacante para la empresa del usuario. Devuelve el ID nuevo o None si no hay empresa"""
+    return conn.execute(_insertar_vacante_empresa, params | {"user_id": user_id}).scalar()
+
+
+def postulaciones_de_empresa(conn, user_id):
+    """Postulaciones a las vacantes de la empresa del usuario. None si el usuario no tiene empresa"""
+    filas = conn.execute(_consulta_postulaciones_empresa, {"user_id": user_id}).fetchall()
+    if not filas:
+        return None
+    return [fila for fila in filas if fila.PostulacionID is not None]
+
+
+def pagina_postulaciones_empresa(conn, empresa_id, limite, cursor=None, vacante_id=None, estado=None,
+                                 desde=None, hasta=None):
+    """Hasta 'limite' postulaciones de la empresa posteriores a 'cursor' (fecha, ID) en el orden del
+    listado: fecha de postulación descendente y las que no tienen fecha al final.
+    """
+    filtros = []
+    params = {"empresa_id": empresa_id, "limite": limite}
+    if vacante_id is not None:
+        filtros.append("P.ID_Vacante = :vacante_id")
+        params["vacante_id"] = vacante_id
+    if estado is not None:
+        filtros.append("COALESCE(P.Estado, 'Pendiente') = :estado")
+        params["estado"] = estado
+    if desde is not None:
+        filtros.append("P.Fecha_Publicacion >= :desde")
+        params["desde"] = desde
+    if hasta is not None:
+        filtros.append("P.Fecha_Publicacion <= :hasta")
+        params["hasta"] = hasta
+
+    def consultar(*extra):
+        condicion = ''.join(f"\n      AND {filtro}" for filtro in filtros + list(extra))
+        return conn.execute(text(_pagina_postulaciones_empresa.format(filtros=condicion)), params).fetchall()
+
+    if cursor is None:
+        return consultar()
+    fecha_cursor, id_cursor = cursor
+    params["id_cursor"] = id_cursor
+    if fecha_cursor is None:
+        return consultar("P.Fecha_Publicacion IS NULL", "P.ID < :id_cursor")
+    # Condición de rango sobre la fecha para que la búsqueda empiece en el cursor; con
+    # "... OR Fecha_Publicacion IS NULL" el índice se recorrería desde el principio
+    params["fecha_cursor"] = fecha_cursor
+    filas = consultar("P.Fecha_Publicacion <= :fecha_cursor",
+                      "(P.Fecha_Publicacion < :fecha_cursor OR P.ID < :id_cursor)")
+    if len(filas) < limite and desde is None and hasta is None:
+        # Se acabaron las postulaciones con fecha: completar con las que no tienen
+        params["limite"] = limite - len(filas)
+        filas += consultar("P.Fecha_Publicacion IS NULL")
+    return filas
+
+
+def detalle_candidatos_empresa(conn, empresa_id, candidato_ids):
+    """Perfil completo de los candidatos indicados que se postularon a vacantes de la empresa"""
+    return conn.execute(_detalle_candidatos_empresa, {"ids": candidato_ids, "empresa_id": empresa_id}).fetchall()
+
+
+def crear_empresa_por_defecto(conn, user_id):
+    """Crear la empresa vacía de un usuario que aún no la tiene. No hace commit"""
+    return conn.execute(_crear_empresa_por_defecto, {"user_id": user_id}).scalar()
+
+
+def postulaciones_de_candidato(conn, user_id):
+    """Devolver (rol, ID del candidato, postulaciones) o None si el usuario no existe o está eliminado.
+
+    El ID del candidato es None si el usuario no es candidato o no tiene perfil.
+    """
+    filas = conn.execute(_consulta_postulaciones_candidato, {"user_id": user_id}).fetchall()
+    if not filas:
+        return None
+    return filas[0].ROL, filas[0].CandidatoID, [fila for fila in filas if fila.PostulacionID is not None]
+
+
+def crear_postulacion(conn, user_id, vacante_id):
+    """Validar e insertar la postulación con sp_CrearPostulacion. Devuelve (resultado, ID de la postulación).
+
+    Si el resultado es 'OK' falta el commit; cualquier otro valor es una llave de ERRORES_POSTULACION.
+    """
+    fila = conn.execute(_crear_postulacion, {"user_id": user_id, "vacante_id": vacante_id}).fetchone()
+    return fila.Resultado, fila.PostulacionID
@@ -0,0 +1,191 @@
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+# Archivos subidos (CV e imágenes de perfil) con nombre por contenido.
+#
+# Cada archivo se guarda como <sha256>.<extensión>: volver a subir el mismo archivo
+# reutiliza el que ya existe en lugar de crear una copia. Las referencias son
+# Candidatos.CV (ruta /static/files/cv/<nombre>) y Usuario.RutaImagen (solo el nombre):
+#   - liberar() borra el archivo anterior de un usuario cuando ninguna fila lo referencia
+#   - recolectar() recorre las carpetas y borra los huérfanos (también los que dejaron
+#     los nombres con uuid anteriores y los temporales de subidas interrumpidas)
+# Solo se borran nombres generados por las subidas (nunca los archivos de ejemplo) y
+# con más de ARCHIVOS_GRACIA segundos sin modificarse, para no borrar un archivo recién
+# publicado o reutilizado cuya transacción aún no terminó.
+#
+#   variable de entorno   por defecto
+#   ARCHIVOS_GRACIA       3600   segundos
+
+ARCHIVOS_GRACIA = float(os.environ.get('ARCHIVOS_GRACIA', 3600))
+
+CARPETA_CV = os.path.join('src', 'static', 'files', 'cv')
+CARPETA_IMAGENES = os.path.join('src', 'static', 'images')
+# Subcarpeta de imágenes por rol del usuario (candidato por defecto)
+CARPETAS_POR_ROL = {'CANDIDATO': 'candidato', 'EMPRESA': 'empresa', 'ADMINISTRADOR': 'administrador'}
+
+# <sha256>.ext y los nombres anteriores cv_<usuario>_<uuid8>.ext / user_<usuario>_<uuid8>.ext
+_NOMBRE_GENERADO = re.compile(r'^(?:[0-9a-f]{64}|(?:cv|user)_\d+_[0-9a-f]{8})\.[a-z0-9]+$')
+_PREFIJO_TEMPORAL = '.subida-'
+
+# carpetas: dónde viven los archivos; referencias: todos los valores de la columna;
+# contar: filas que referencian un nombre (por valor exacto o terminado en /nombre)
+Coleccion = namedtuple('Coleccion', 'nombre carpetas referencias contar')
+
+COLECCIONES = (
+    Coleccion(
+        nombre='cv',
+        carpetas=(CARPETA_CV,),
+        referencias=text("SELECT CV FROM Candidatos WHERE CV IS NOT NULL"),
+        contar=text("SELECT COUNT(*) FROM Candidatos WHERE CV = :nombre OR CV LIKE :sufijo")
+    ),
+    Coleccion(
+        nombre='imagenes',
+        carpetas=tuple(os.path.join(CARPETA_IMAGENES, carpeta) for carpeta in CARPETAS_POR_ROL.values()),
+        referencias=text("SELECT RutaImagen FROM Usuario WHERE RutaImagen IS NOT NULL"),
+        contar=text("SELECT COUNT(*) FROM Usuario WHERE RutaImagen = :nombre OR RutaImagen LIKE :sufijo")
+    )
+)
+
+
+def nombre_generado(nombre):
+    """True para los nombres creados por las subidas: su contenido no cambia nunca"""
+    return _NOMBRE_GENERADO.match(nombre) is not None
+
+
+def carpeta_imagen(rol):
+    """Nombre de la subcarpeta de imágenes para el rol"""
+    return CARPETAS_POR_ROL.get(rol, 'candidato')
+
+
+class AlmacenArchivos:
+    def __init__(self, colecciones, gracia=3600):
+        self.colecciones = {coleccion.nombre: coleccion for coleccion in colecciones}
+        self.gracia = gracia
+        self._lock = threading.Lock()
+        self.publicados = 0
+        self.reutilizados = 0
+        self.liberados = 0
+        self.bytes_liberados = 0
+        self.ultima_recoleccion = None
+
+    def publicar(self, archivo):
+        """Publicar un ArchivoRecibido con su nombre por contenido; devuelve el nombre"""
+        nombre = f"{archivo.sha256}.{archivo.extension}"
+        nuevo = archivo.publicar(nombre, reutilizar=True)
+        with self._lock:
+            if nuevo:
+                self.publicados += 1
+            else:
+                self.reutilizados += 1
+        return nombre
+
+    def _borrable(self, ruta, ahora):
+        try:
+            return ahora - os.stat(ruta).st_mtime >= self.gracia
+        except FileNotFoundError:
+            return False
+
+    def liberar(self, conn, coleccion, referencia):
+        """Borrar el archivo de 'referencia' (valor anterior de la columna) si ya nadie lo usa.
+
+        Se llama después del commit que reemplazó la referencia, así que no lanza errores:
+        si algo falla el archivo queda para recolectar(). Devuelve los bytes liberados.
+        """
+        nombre = os.path.basename(referencia or '')
+        if not _NOMBRE_GENERADO.match(nombre):
+            return 0
+        coleccion = self.colecciones[coleccion]
+        try:
+            if conn.execute(coleccion.contar, {"nombre": nombre, "sufijo": f"%/{nombre}"}).scalar():
+                return 0
+        except SQLAlchemyError:
+            return 0
+        liberados = 0
+        ahora = time.time()
+        for carpeta in coleccion.carpetas:
+            ruta = os.path.join(carpeta, nombre)
+            if self._borrable(ruta, ahora):
+                liberados += self._borrar(ruta) or 0
+        return liberados
+
+    def _borrar(self, ruta):
+        """Borrar y devolver el tamaño, o None si no se pudo (p. ej. ya no existía)"""
+        try:
+            tamano = os.stat(ruta).st_size
+            os.remove(ruta)
+        except OSError:
+            return None
+        with self._lock:
+            self.liberados += 1
+            self.bytes_liberados += tamano
+        return tamano
+
+    def recolectar(self, conn, simular=False):
+        """Borrar los archivos generados que ninguna fila referencia y los temporales abandonados"""
+        ahora = time.time()
+        resultado = {"simulado": simular, "revisados": 0, "referenciados": 0, "recientes": 0,
+                     "huerfanos": 0, "temporales": 0, "bytes": 0}
+        for coleccion in self.colecciones.values():
+            referenciados = {os.path.basename(valor) for valor in conn.execute(coleccion.referencias).scalars()}
+            for carpeta in coleccion.carpetas:
+                if not os.path.isdir(carpeta):
+                    continue
+                with os.scandir(carpeta) as entradas:
+                    for entrada in entradas:
+                        if not entrada.is_file():
+                            continue
+                        resultado["revisados"] += 1
+                        temporal = entrada.name.startswith(_PREFIJO_TEMPORAL)
+                        if not temporal and not _NOMBRE_GENERADO.match(entrada.name):
+                            continue
+                        if entrada.name in referenciados:
+                            resultado["referenciados"] += 1
+                            continue
+                        estado = entrada.stat()
+                        if ahora - estado.st_mtime < self.gracia:
+                            resultado["recientes"] += 1
+                            continue
+                        if simular or self._borrar(entrada.path) is not None:
+                            resultado["temporales" if temporal else "huerfanos"] += 1
+                            resultado["bytes"] += estado.st_size
+        resultado["fecha"] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        if not simular:
+            with self._lock:
+                self.ultima_recoleccion = resultado
+        return resultado
+
+    def estado(self):
+        with self._lock:
+            return {
+                "graciaSegundos": self.gracia,
+                "publicados": self.publicados,
+                "reutilizados": self.reutilizados,
+                "liberados": self.liberados,
+                "bytesLiberados": self.bytes_liberados,
+                "ultimaRecoleccion": self.ultima_recoleccion
+            }
+
+    def metricas(self):
+        """Líneas de /metrics de los archivos subidos"""
+        estado = self.estado()
+        return [
+            "# HELP bolsa_archivos_subidas_total Archivos subidos por resultado (nuevo o reutilizado por contenido)",
+            "# TYPE bolsa_archivos_subidas_total counter",
+            f'bolsa_archivos_subidas_total{{resultado="nuevo"}} {estado["publicados"]}',
+            f'bolsa_archivos_subidas_total{{resultado="reutilizado"}} {estado["reutilizados"]}',
+            "# HELP bolsa_archivos_liberados_total Archivos sin referencias borrados",
+            "# TYPE bolsa_archivos_liberados_total counter",
+            f"bolsa_archivos_liberados_total {estado['liberados']}",
+            "# HELP bolsa_archivos_bytes_liberados_total Bytes de archivos sin referencias borrados",
+            "# TYPE bolsa_archivos_bytes_liberados_total counter",
+            f"bolsa_archivos_bytes_liberados_total {estado['bytesLiberados']}"
+        ]
+
+
+almacen_archivos = AlmacenArchivos(COLECCIONES, gracia=ARCHIVOS_GRACIA)
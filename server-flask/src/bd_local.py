@@ -0,0 +1,546 @@
+import calendar
+import os
+import re
+import sqlite3
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.sql.elements import TextClause
+
+# Base de datos local (SQLite) en lugar de SQL Server, para ejecutar la API y los
+# benchmarks sin un servidor: DB_MOTOR=sqlite o un DB_URL sqlite:///archivo.db
+# (ver src/configuracion_bd.py).
+#
+# - Esquema: al conectar a un archivo sin tablas se crea a partir de SQL/bolsa de trabajo.sql
+#   y los scripts add_*.sql (tablas, columnas, índices y los datos iniciales de los scripts
+#   add_*; los INSERT de prueba, roles, funciones y procedimientos del script principal se omiten).
+# - Dialecto: el texto T-SQL de cada consulta se traduce antes de compilarla (TOP, OUTPUT
+#   INSERTED, OUTER/CROSS APPLY de una fila, ISNULL, la parte de DATEDIFF/DATEADD) y
+#   GETDATE, MONTH, YEAR, DAY, DATEDIFF y DATEADD se registran como funciones de SQLite.
+# - Procedimientos: EXEC sp_RegisterUser y EXEC sp_CrearPostulacion ejecutan un equivalente
+#   en Python con las mismas sentencias y el mismo resultado que SQL/create_*_sp.sql.
+# - Triggers: TR_AfterInsert_Postulacion, los TR_Estadisticas_* de add_estadisticas.sql,
+#   TR_Resumen_Postulaciones de add_resumen_postulaciones.sql y la conversión implícita de
+#   DATETIME a DATE al guardar en columnas DATE.
+#   TR_ValidarCierreVacante no se emula.
+# - Tipos: las columnas DATE, DATETIME y BIT se leen como date, datetime y bool, igual que
+#   con pyodbc.
+#
+# No reproduce bloqueos, planes ni tiempos de SQL Server: sirve para medir un cambio contra
+# la versión anterior en la misma máquina, no para estimar tiempos de producción.
+
+CARPETA_SQL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'SQL')
+
+# (script, ejecutar también sus INSERT/UPDATE) en el orden en que se aplican
+SCRIPTS_ESQUEMA = (
+    ('bolsa de trabajo.sql', False),  # sus INSERT son datos de prueba
+    ('add_soft_delete_usuario.sql', True),
+    ('add_soft_delete_vacantes.sql', True),
+    ('add_destacada_field.sql', True),
+    ('add_vacantes_destacadas.sql', True),
+    ('add_versiones_recurso.sql', True),
+    ('add_indices_vacantes.sql', True),
+    # Sus triggers se emulan en _triggers_estadisticas(); los contadores los llena la
+    # primera reconciliación de src/estadisticas.py
+    ('add_estadisticas.sql', False),
+    # TR_Resumen_Postulaciones se emula en _triggers_resumen_postulaciones()
+    ('add_resumen_postulaciones.sql', False),
+    # TR_Postulaciones_Empresa está en _TRIGGERS; en una base nueva no hay postulaciones que llenar
+    ('add_postulaciones_empresa.sql', False),
+    ('add_desafios_dos_factores.sql', True)
+)
+
+# Mismo formato que DATETIME de SQL Server (milisegundos)
+_FORMATO_FECHA_HORA = '%Y-%m-%d %H:%M:%S.%f'
+_AHORA_SQLITE = "(strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime'))"
+
+_TRIGGERS = (
+    # TR_AfterInsert_Postulacion de SQL/bolsa de trabajo.sql
+    """
+    CREATE TRIGGER TR_AfterInsert_Postulacion AFTER INSERT ON Postulaciones
+    BEGIN
+        UPDATE Vacantes SET CantidadPostulaciones = CantidadPostulaciones + 1 WHERE ID = NEW.ID_Vacante;
+    END
+    """,
+) + tuple(
+    # TR_Postulaciones_Empresa de SQL/add_postulaciones_empresa.sql
+    f"""
+    CREATE TRIGGER TR_Postulaciones_Empresa_{evento.split()[0]} AFTER {evento} ON Postulaciones
+    BEGIN
+        UPDATE Postulaciones SET ID_Empresa = (SELECT ID_Empresa FROM Vacantes WHERE ID = NEW.ID_Vacante)
+        WHERE ID = NEW.ID;
+    END
+    """
+    for evento in ('INSERT', 'UPDATE OF ID_Vacante')
+)
+
+# ---------- Traducción de consultas ----------
+
+_TOP = re.compile(r'\bSELECT(\s+DISTINCT)?\s+TOP\s*(?:\(\s*([^()]+?)\s*\)|(\d+))\s*', re.I)
+_OUTPUT = re.compile(r'\s+OUTPUT\s+(INSERTED\.\w+(?:\s*,\s*INSERTED\.\w+)*)', re.I)
+_APPLY = re.compile(r'\b(OUTER|CROSS)\s+APPLY\s*\(', re.I)
+_APPLY_UNA_FILA = re.compile(r'^\s*SELECT\s+TOP\s*\(\s*1\s*\)\s+(\w+)\s+FROM\s+(\w+)\s+(.*?)\s*$', re.I | re.S)
+_ALIAS = re.compile(r'\s*(?:AS\s+)?(\w+)', re.I)
+_PARTE_FECHA = re.compile(r'\b(DATEDIFF|DATEADD)\s*\(\s*([A-Za-z]+)\s*,', re.I)
+_ISNULL = re.compile(r'\bISNULL\s*\(', re.I)
+
+_EXEC = re.compile(r'^\s*EXEC\s+(\w+)', re.I)
+_ARGUMENTO = re.compile(r'@(\w+)\s*=\s*\?')
+
+
+def _fin_de_ambito(sql, inicio):
+    """Posición del ')' que cierra el paréntesis abierto antes de 'inicio' (o el final)"""
+    profundidad = 0
+    en_cadena = False
+    for i in range(inicio, len(sql)):
+        caracter = sql[i]
+        if caracter == "'":
+            en_cadena = not en_cadena
+        elif en_cadena:
+            continue
+        elif caracter == '(':
+            profundidad += 1
+        elif caracter == ')':
+            if profundidad == 0:
+                return i
+            profundidad -= 1
+    return len(sql)
+
+
+def _insertar(sql, posicion, clausula):
+    """Agregar 'clausula' al final de la sentencia que termina en 'posicion' (antes del ';')"""
+    antes = sql[:posicion].rstrip()
+    punto_y_coma = ';' if antes.endswith(';') else ''
+    if punto_y_coma:
+        antes = antes[:-1].rstrip()
+    return f"{antes} {clausula}{punto_y_coma}{sql[posicion:]}"
+
+
+def _traducir_apply(sql):
+    # APPLY (SELECT TOP (1) col FROM tabla ...) alias -> JOIN tabla alias ON alias.col = (subconsulta).
+    # 'col' debe identificar la fila (la clave), como en las consultas de src/acceso_datos.py
+    while (encontrado := _APPLY.search(sql)):
+        cierre = _fin_de_ambito(sql, encontrado.end())
+        interna = _APPLY_UNA_FILA.match(sql[encontrado.end():cierre])
+        alias = _ALIAS.match(sql, cierre + 1)
+        if interna is None or alias is None:
+            raise NotImplementedError("APPLY solo se traduce para (SELECT TOP (1) <clave> FROM <tabla> ...) <alias>")
+        columna, tabla, resto = interna.groups()
+        union = 'LEFT JOIN' if encontrado.group(1).upper() == 'OUTER' else 'JOIN'
+        nombre = alias.group(1)
+        sql = (f"{sql[:encontrado.start()]}{union} {tabla} {nombre} ON {nombre}.{columna} = "
+               f"(SELECT TOP (1) {columna} FROM {tabla} {resto}){sql[alias.end():]}")
+    return sql
+
+
+def _traducir_output(sql):
+    # INSERT ... OUTPUT INSERTED.col ... -> INSERT ... RETURNING col
+    encontrado = _OUTPUT.search(sql)
+    if encontrado is None:
+        return sql
+    columnas = re.sub(r'INSERTED\.', '', encontrado.group(1), flags=re.I)
+    sql = sql[:encontrado.start()] + sql[encontrado.end():]
+    return _insertar(sql, len(sql), f"RETURNING {columnas}")
+
+
+def _traducir_top(sql):
+    # SELECT TOP (n) ... -> SELECT ... LIMIT n, al final de la consulta o subconsulta
+    while (encontrado := _TOP.search(sql)):
+        limite = encontrado.group(2) or encontrado.group(3)
+        fin = _fin_de_ambito(sql, encontrado.end())
+        sql = (sql[:encontrado.start()] + f"SELECT{encontrado.group(1) or ''} "
+               + _insertar(sql[encontrado.end():fin], fin - encontrado.end(), f"LIMIT {limite}")
+               + sql[fin:])
+    return sql
+
+
+@lru_cache(maxsize=1024)
+def traducir(sql):
+    """Texto T-SQL de una consulta de la aplicación en el dialecto de SQLite"""
+    sql = _traducir_apply(sql)
+    sql = _traducir_output(sql)
+    sql = _traducir_top(sql)
+    sql = _PARTE_FECHA.sub(lambda m: f"{m.group(1)}('{m.group(2).upper()}',", sql)
+    return _ISNULL.sub('IFNULL(', sql)
+
+
+def _traducir_clausula(conn, clausula, multiparams, params, execution_options):
+    if isinstance(clausula, TextClause):
+        traducido = traducir(clausula.text)
+        if traducido != clausula.text:
+            # Los parámetros no cambian: se conservan los bindparams (expanding, tipos)
+            clausula = text(traducido).bindparams(*clausula._bindparams.values())
+    return clausula, multiparams, params
+
+
+# ---------- Funciones de fecha ----------
+
+def _a_fecha_hora(valor):
+    if valor is None or isinstance(valor, datetime):
+        return valor
+    if isinstance(valor, date):
+        return datetime(valor.year, valor.month, valor.day)
+    try:
+        return datetime.fromisoformat(str(valor))
+    except ValueError:
+        return None
+
+
+def _getdate():
+    return datetime.now().strftime(_FORMATO_FECHA_HORA)[:-3]
+
+
+def _parte(nombre):
+    def funcion(valor):
+        fecha = _a_fecha_hora(valor)
+        return getattr(fecha, nombre) if fecha else None
+    return funcion
+
+
+def _meses(fecha):
+    return fecha.year * 12 + fecha.month - 1
+
+
+# Segundos de cada parte para DATEDIFF/DATEADD; MONTH y YEAR se cuentan por calendario
+_SEGUNDOS_PARTE = {'DAY': 86400, 'WEEK': 7 * 86400, 'HOUR': 3600, 'MINUTE': 60, 'SECOND': 1}
+
+
+def _datediff(parte, inicio, fin):
+    """Límites de 'parte' cruzados entre inicio y fin, como DATEDIFF de SQL Server"""
+    inicio, fin = _a_fecha_hora(inicio), _a_fecha_hora(fin)
+    if inicio is None or fin is None:
+        return None
+    if parte == 'YEAR':
+        return fin.year - inicio.year
+    if parte == 'MONTH':
+        return _meses(fin) - _meses(inicio)
+    if parte == 'DAY':
+        return (fin.date() - inicio.date()).days
+    segundos = _SEGUNDOS_PARTE[parte]
+    return int(fin.timestamp() // segundos - inicio.timestamp() // segundos)
+
+
+def _dateadd(parte, cantidad, valor):
+    fecha = _a_fecha_hora(valor)
+    if fecha is None or cantidad is None:
+        return None
+    if parte in ('MONTH', 'YEAR'):
+        meses = _meses(fecha) + int(cantidad) * (12 if parte == 'YEAR' else 1)
+        anio, mes = divmod(meses, 12)
+        dia = min(fecha.day, calendar.monthrange(anio, mes + 1)[1])
+        fecha = fecha.replace(year=anio, month=mes + 1, day=dia)
+    else:
+        fecha += timedelta(seconds=_SEGUNDOS_PARTE[parte] * cantidad)
+    return fecha.strftime(_FORMATO_FECHA_HORA)[:-3]
+
+
+def _al_conectar(conexion, registro):
+    conexion.create_function('GETDATE', 0, _getdate)
+    for nombre in ('YEAR', 'MONTH', 'DAY'):
+        conexion.create_function(nombre, 1, _parte(nombre.lower()), deterministic=True)
+    conexion.create_function('DATEDIFF', 3, _datediff, deterministic=True)
+    conexion.create_function('DATEADD', 3, _dateadd, deterministic=True)
+    conexion.execute("PRAGMA foreign_keys = ON")
+    conexion.execute("PRAGMA journal_mode = WAL")
+
+
+def _registrar_tipos():
+    sqlite3.register_converter('DATE', lambda valor: date.fromisoformat(valor[:10].decode()))
+    sqlite3.register_converter('DATETIME', lambda valor: datetime.fromisoformat(valor.decode()))
+    sqlite3.register_converter('BIT', lambda valor: int(valor) != 0)
+    sqlite3.register_adapter(date, date.isoformat)
+    sqlite3.register_adapter(datetime, lambda valor: valor.strftime(_FORMATO_FECHA_HORA)[:-3])
+
+
+# ---------- Procedimientos almacenados ----------
+
+def _sp_register_user(cursor, NombreUsuario, Correo, Contrasena, ROL, RutaImagen=None,
+                      NombreEmpresa=None, RFC=None, DireccionEmpresa=None, TelefonoEmpresa=None,
+                      DescripcionEmpresa=None, TelefonoCandidato=None, DireccionCandidato=None, CVPath=None):
+    """SQL/create_register_sp.sql: Usuario y su Empresa o Candidatos; devuelve NewUserID"""
+    cursor.execute(
+        "INSERT INTO Usuario (NombreUsuario, Correo, Contrasena, ROL, RutaImagen) VALUES (?, ?, ?, ?, ?)",
+        (NombreUsuario, Correo, Contrasena, ROL, RutaImagen)
+    )
+    usuario_id = cursor.lastrowid
+    if ROL == 'EMPRESA':
+        cursor.execute(
+            "INSERT INTO Empresa (ID_Usuario, Nombre, RFC, Direccion, Telefono, Descripcion) VALUES (?, ?, ?, ?, ?, ?)",
+            (usuario_id, NombreEmpresa, RFC, DireccionEmpresa, TelefonoEmpresa, DescripcionEmpresa)
+        )
+    elif ROL == 'CANDIDATO':
+        cursor.execute(
+            "INSERT INTO Candidatos (ID_Usuario, Telefono, Dirreccion, CV) VALUES (?, ?, ?, ?)",
+            (usuario_id, TelefonoCandidato, DireccionCandidato, CVPath)
+        )
+    cursor.execute("SELECT ? AS NewUserID", (usuario_id,))
+
+
+def _crear_postulacion(cursor, usuario_id, vacante_id):
+    usuario = cursor.execute("SELECT ROL FROM Usuario WHERE ID = ?", (usuario_id,)).fetchone()
+    if usuario is None:
+        return 'USUARIO_NO_ENCONTRADO', None
+    if usuario[0] != 'CANDIDATO':
+        return 'NO_ES_CANDIDATO', None
+    candidato = cursor.execute(
+        "SELECT ID FROM Candidatos WHERE ID_Usuario = ? ORDER BY ID LIMIT 1", (usuario_id,)
+    ).fetchone()
+    if candidato is None:
+        return 'SIN_PERFIL', None
+    if cursor.execute("SELECT 1 FROM Postulaciones WHERE ID_Candidato = ? AND ID_Vacante = ?",
+                      (candidato[0], vacante_id)).fetchone():
+        return 'DUPLICADA', None
+    vacante = cursor.execute(
+        "SELECT Estado, Fecha_Cierre FROM Vacantes WHERE ID = ? AND eliminado = 0", (vacante_id,)
+    ).fetchone()
+    if vacante is None:
+        return 'VACANTE_NO_EXISTE', None
+    estado, fecha_cierre = vacante[0], _a_fecha_hora(vacante[1])
+    if estado == 'Cerrada':
+        return 'VACANTE_CERRADA', None
+    if fecha_cierre is not None and fecha_cierre.date() < date.today():
+        return 'VACANTE_CERRADA_POR_FECHA', None
+    cursor.execute(
+        "INSERT INTO Postulaciones (ID_Candidato, ID_Vacante, Fecha_Publicacion, Estado) "
+        "VALUES (?, ?, GETDATE(), 'Pendiente')", (candidato[0], vacante_id)
+    )
+    postulacion_id = cursor.lastrowid
+    cursor.execute("UPDATE Versiones_Recurso SET Version = Version + 1, Fecha_Modificacion = GETDATE() "
+                   "WHERE Recurso = 'vacantes'")
+    return 'OK', postulacion_id
+
+
+def _sp_crear_postulacion(cursor, ID_Usuario, ID_Vacante):
+    """SQL/create_postulacion_sp.sql: devuelve (Resultado, PostulacionID)"""
+    cursor.execute("SELECT ? AS Resultado, ? AS PostulacionID", _crear_postulacion(cursor, ID_Usuario, ID_Vacante))
+
+
+PROCEDIMIENTOS = {
+    'sp_registeruser': _sp_register_user,
+    'sp_crearpostulacion': _sp_crear_postulacion
+}
+
+
+def _ejecutar_procedimiento(cursor, statement, parameters, context):
+    # EXEC proc @Nombre = ?, ...: el equivalente deja su resultado en el cursor
+    encontrado = _EXEC.match(statement)
+    if encontrado is None:
+        return False
+    procedimiento = PROCEDIMIENTOS.get(encontrado.group(1).lower())
+    if procedimiento is None:
+        raise NotImplementedError(f"Procedimiento sin equivalente local: {encontrado.group(1)}")
+    procedimiento(cursor, **dict(zip(_ARGUMENTO.findall(statement), parameters)))
+    return True
+
+
+# ---------- Esquema ----------
+
+_COMENTARIO = re.compile(r"('(?:[^']|'')*')|--[^\n]*|/\*.*?\*/", re.S)
+_GO = re.compile(r'^\s*GO\s*$', re.I | re.M)
+_SI_NO_EXISTE = re.compile(r'^\s*IF\s+NOT\s+EXISTS\s*\(.*?\)\s*BEGIN\b(.*?)\bEND\b', re.I | re.S)
+_DDL = re.compile(r'^(CREATE\s+TABLE|ALTER\s+TABLE\s+\w+\s+ADD|CREATE\s+(?:UNIQUE\s+)?(?:(?:NON)?CLUSTERED\s+)?INDEX)\b', re.I)
+_DML = re.compile(r'^(INSERT|UPDATE|DELETE|WITH)\b', re.I)
+
+_IDENTIDAD = re.compile(
+    r'\bINT\s+(?:PRIMARY\s+KEY\s+IDENTITY(?:\s*\(\s*\d+\s*,\s*\d+\s*\))?'
+    r'|IDENTITY(?:\s*\(\s*\d+\s*,\s*\d+\s*\))?\s+PRIMARY\s+KEY)', re.I
+)
+_CLAVE_FORANEA_COLUMNA = re.compile(r'\bFOREIGN\s+KEY\s+(?=REFERENCES\b)', re.I)
+_DEFAULT_GETDATE = re.compile(r'\bDEFAULT\s+GETDATE\s*\(\s*\)', re.I)
+_VARCHAR_MAX = re.compile(r'\bN?VARCHAR\s*\(\s*MAX\s*\)', re.I)
+_COMA_FINAL = re.compile(r',\s*\)\s*$')
+_CORCHETES = re.compile(r'\[(\w+)\]')
+_TIPO_INDICE = re.compile(r'\b(?:NON)?CLUSTERED\s+', re.I)
+_INCLUDE = re.compile(r'\bINCLUDE\s*\([^)]*\)\s*', re.I)
+_AGREGAR_COLUMNA = re.compile(r'^(ALTER\s+TABLE\s+\w+\s+ADD)\s+(?!COLUMN\b)', re.I)
+_TABLA = re.compile(r'^(?:CREATE|ALTER)\s+TABLE\s+(\w+)', re.I)
+_COLUMNA_DATE = re.compile(r'(?:^|[(,]|\bADD\s+COLUMN)\s*(\w+)\s+DATE\b', re.I)
+
+
+def _sentencias(sql, con_datos):
+    """Sentencias de un script T-SQL que se aplican en SQLite, ya traducidas"""
+    sql = _COMENTARIO.sub(lambda m: m.group(1) or '', sql)
+    for lote in _GO.split(sql):
+        si_no_existe = _SI_NO_EXISTE.match(lote)
+        if si_no_existe:
+            # Base nueva: la condición IF NOT EXISTS de los scripts add_* siempre se cumple
+            lote = si_no_existe.group(1)
+        for sentencia in _separar(lote):
+            if _DDL.match(sentencia):
+                yield _traducir_ddl(sentencia)
+            elif con_datos and _DML.match(sentencia):
+                yield traducir(sentencia)
+
+
+def _separar(lote):
+    inicio = 0
+    en_cadena = False
+    profundidad = 0
+    for i, caracter in enumerate(lote):
+        if caracter == "'":
+            en_cadena = not en_cadena
+        elif en_cadena:
+            continue
+        elif caracter == '(':
+            profundidad += 1
+        elif caracter == ')':
+            profundidad -= 1
+        elif caracter == ';' and profundidad == 0:
+            yield lote[inicio:i].strip()
+            inicio = i + 1
+    if lote[inicio:].strip():
+        yield lote[inicio:].strip()
+
+
+def _traducir_ddl(sentencia):
+    sentencia = _CORCHETES.sub(r'"\1"', sentencia)
+    sentencia = _IDENTIDAD.sub('INTEGER PRIMARY KEY AUTOINCREMENT', sentencia)
+    sentencia = _CLAVE_FORANEA_COLUMNA.sub('', sentencia)
+    sentencia = _DEFAULT_GETDATE.sub(f'DEFAULT {_AHORA_SQLITE}', sentencia)
+    sentencia = _VARCHAR_MAX.sub('TEXT', sentencia)
+    sentencia = _COMA_FINAL.sub(')', sentencia)
+    sentencia = _AGREGAR_COLUMNA.sub(r'\1 COLUMN ', sentencia)
+    if re.match(r'^CREATE\b.*?\bINDEX\b', sentencia, re.I | re.S):
+        sentencia = _INCLUDE.sub('', _TIPO_INDICE.sub('', sentencia))
+    return sentencia
+
+
+def _triggers_fecha(tabla, columna):
+    # SQL Server descarta la hora al guardar GETDATE() en una columna DATE
+    return [
+        f"""
+        CREATE TRIGGER TR_Fecha_{tabla}_{columna}_{evento} AFTER {evento}{' OF ' + columna if evento == 'UPDATE' else ''}
+        ON {tabla} WHEN length(NEW.{columna}) > 10
+        BEGIN
+            UPDATE {tabla} SET {columna} = substr(NEW.{columna}, 1, 10) WHERE rowid = NEW.rowid;
+        END
+        """
+        for evento in ('INSERT', 'UPDATE')
+    ]
+
+
+def _sumar_contador(metrica, delta, condicion):
+    return f"UPDATE Estadisticas_Contadores SET Valor = Valor + {delta} WHERE Metrica = '{metrica}' AND {condicion};"
+
+
+def _sumar_periodos(metrica, fila, delta, condicion):
+    return f"""
+        INSERT INTO Estadisticas_Periodos (Metrica, Granularidad, Inicio, Cantidad)
+        SELECT '{metrica}', 'D', date({fila}.Fecha_Publicacion), {delta}
+        WHERE {fila}.Fecha_Publicacion IS NOT NULL AND {condicion}
+        UNION ALL
+        SELECT '{metrica}', 'M', date({fila}.Fecha_Publicacion, 'start of month'), {delta}
+        WHERE {fila}.Fecha_Publicacion IS NOT NULL AND {condicion}
+        ON CONFLICT (Metrica, Granularidad, Inicio) DO UPDATE SET Cantidad = Cantidad + excluded.Cantidad;
+    """
+
+
+def _trigger(nombre, evento, tabla, *sentencias):
+    return f"CREATE TRIGGER {nombre} AFTER {evento} ON {tabla} BEGIN {' '.join(sentencias)} END"
+
+
+def _triggers_estadisticas():
+    # Los triggers TR_Estadisticas_* de SQL/add_estadisticas.sql, fila por fila
+    triggers = []
+    activa = "{f}.Estado = 'Abierta' AND {f}.eliminado = 0"
+    for evento, filas in (('INSERT', ('NEW',)), ('DELETE', ('OLD',)),
+                          ('UPDATE OF Estado, eliminado, Fecha_Publicacion', ('OLD', 'NEW'))):
+        sentencias = []
+        for fila in filas:
+            delta = -1 if fila == 'OLD' else 1
+            sentencias += [_sumar_contador('vacantesActivas', delta, activa.format(f=fila)),
+                           _sumar_periodos('vacantes', fila, delta, f"{fila}.eliminado = 0")]
+        triggers.append(_trigger(f"TR_Estadisticas_Vacantes_{evento.split()[0]}", evento, 'Vacantes', *sentencias))
+    for evento, filas in (('INSERT', ('NEW',)), ('DELETE', ('OLD',)), ('UPDATE OF Fecha_Publicacion', ('OLD', 'NEW'))):
+        sentencias = [_sumar_periodos('postulaciones', fila, -1 if fila == 'OLD' else 1, '1') for fila in filas]
+        triggers.append(_trigger(f"TR_Estadisticas_Postulaciones_{evento.split()[0]}", evento, 'Postulaciones',
+                                 *sentencias))
+    for tabla, metrica in (('Candidatos', 'candidatosRegistrados'), ('Empresa', 'empresasActivas')):
+        usuario_activo = "EXISTS (SELECT 1 FROM Usuario WHERE ID = {f}.ID_Usuario AND eliminado = 0)"
+        perfil = f"EXISTS (SELECT 1 FROM {tabla} WHERE ID_Usuario = {{f}}.ID) AND {{f}}.eliminado = 0"
+        for evento, filas in (('INSERT', ('NEW',)), ('DELETE', ('OLD',)), ('UPDATE OF ID_Usuario', ('OLD', 'NEW'))):
+            sentencias = [_sumar_contador(metrica, -1 if fila == 'OLD' else 1, usuario_activo.format(f=fila))
+                          for fila in filas]
+            triggers.append(_trigger(f"TR_Estadisticas_{tabla}_{evento.split()[0]}", evento, tabla, *sentencias))
+        for evento, filas in (('DELETE', ('OLD',)), ('UPDATE OF eliminado', ('OLD', 'NEW'))):
+            sentencias = [_sumar_contador(metrica, -1 if fila == 'OLD' else 1, perfil.format(f=fila))
+                          for fila in filas]
+            triggers.append(_trigger(f"TR_Estadisticas_Usuario_{tabla}_{evento.split()[0]}", evento, 'Usuario',
+                                     *sentencias))
+    return triggers
+
+
+def _sumar_resumenes(fila, delta):
+    estado = f"COALESCE({fila}.Estado, 'Pendiente')"
+    con_fecha = f"{fila}.ID_Vacante IS NOT NULL AND {fila}.Fecha_Publicacion IS NOT NULL"
+    return f"""
+        INSERT INTO Resumen_Postulaciones_Vacante (ID_Vacante, Fecha, Estado, Cantidad)
+        SELECT {fila}.ID_Vacante, date({fila}.Fecha_Publicacion), {estado}, {delta} WHERE {con_fecha}
+        ON CONFLICT (ID_Vacante, Fecha, Estado) DO UPDATE SET Cantidad = Cantidad + excluded.Cantidad;
+        INSERT INTO Resumen_Estados_Vacante (ID_Vacante, Estado, Cantidad)
+        SELECT {fila}.ID_Vacante, {estado}, {delta} WHERE {fila}.ID_Vacante IS NOT NULL
+        ON CONFLICT (ID_Vacante, Estado) DO UPDATE SET Cantidad = Cantidad + excluded.Cantidad;
+        INSERT INTO Resumen_Postulaciones_Empresa (ID_Empresa, Fecha, Estado, Cantidad)
+        SELECT V.ID_Empresa, date({fila}.Fecha_Publicacion), {estado}, {delta} FROM Vacantes V
+        WHERE V.ID = {fila}.ID_Vacante AND V.ID_Empresa IS NOT NULL AND {con_fecha}
+        ON CONFLICT (ID_Empresa, Fecha, Estado) DO UPDATE SET Cantidad = Cantidad + excluded.Cantidad;
+    """
+
+
+def _borrar_resumenes_vacios(fila):
+    clave = f"Fecha = date({fila}.Fecha_Publicacion) AND Estado = COALESCE({fila}.Estado, 'Pendiente')"
+    return f"""
+        DELETE FROM Resumen_Postulaciones_Vacante WHERE ID_Vacante = {fila}.ID_Vacante AND {clave} AND Cantidad = 0;
+        DELETE FROM Resumen_Estados_Vacante
+        WHERE ID_Vacante = {fila}.ID_Vacante AND Estado = COALESCE({fila}.Estado, 'Pendiente') AND Cantidad = 0;
+        DELETE FROM Resumen_Postulaciones_Empresa
+        WHERE ID_Empresa = (SELECT ID_Empresa FROM Vacantes WHERE ID = {fila}.ID_Vacante) AND {clave} AND Cantidad = 0;
+    """
+
+
+def _triggers_resumen_postulaciones():
+    # TR_Resumen_Postulaciones de SQL/add_resumen_postulaciones.sql, fila por fila
+    triggers = []
+    for evento, sentencias in (
+        ('INSERT', (_sumar_resumenes('NEW', 1),)),
+        ('DELETE', (_sumar_resumenes('OLD', -1), _borrar_resumenes_vacios('OLD'))),
+        ('UPDATE OF Estado, Fecha_Publicacion, ID_Vacante',
+         (_sumar_resumenes('OLD', -1), _sumar_resumenes('NEW', 1), _borrar_resumenes_vacios('OLD')))
+    ):
+        triggers.append(_trigger(f"TR_Resumen_Postulaciones_{evento.split()[0]}", evento, 'Postulaciones',
+                                 *sentencias))
+    return triggers
+
+
+def crear_esquema(conn, carpeta=CARPETA_SQL):
+    """Crear en 'conn' (SQLite) las tablas, índices y triggers de los scripts de SQL/"""
+    columnas_date = []
+    for archivo, con_datos in SCRIPTS_ESQUEMA:
+        with open(os.path.join(carpeta, archivo), encoding='utf-8-sig') as script:
+            for sentencia in _sentencias(script.read(), con_datos):
+                conn.exec_driver_sql(sentencia)
+                tabla = _TABLA.match(sentencia)
+                if tabla:
+                    columnas_date += [(tabla.group(1), columna) for columna in _COLUMNA_DATE.findall(sentencia)]
+    for trigger in _TRIGGERS + tuple(_triggers_estadisticas()) + tuple(_triggers_resumen_postulaciones()):
+        conn.exec_driver_sql(trigger)
+    for tabla, columna in columnas_date:
+        for trigger in _triggers_fecha(tabla, columna):
+            conn.exec_driver_sql(trigger)
+
+
+def argumentos_conexion(config):
+    """connect_args de sqlite3: tipos declarados y espera por el bloqueo de escritura"""
+    return {'detect_types': sqlite3.PARSE_DECLTYPES, 'timeout': config['timeout']}
+
+
+def preparar_engine(engine):
+    """Funciones, traducción y procedimientos en cada conexión; esquema si la base está vacía"""
+    _registrar_tipos()
+    event.listen(engine, 'connect', _al_conectar)
+    event.listen(engine, 'before_execute', _traducir_clausula, retval=True)
+    event.listen(engine, 'do_execute', _ejecutar_procedimiento)
+    with engine.begin() as conn:
+        if not inspect(conn).get_table_names():
+            crear_esquema(conn)
@@ -0,0 +1,220 @@
+import bisect
+import heapq
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+# Peso de cada columna en la frecuencia del término (el título pesa más)
+PESOS_CAMPOS = {"titulo": 3, "descripcion": 1, "requisitos": 2}
+# Parámetros de BM25
+K1 = 1.2
+B = 0.75
+# Las coincidencias por prefijo valen menos que la palabra exacta
+PESO_PREFIJO = 0.6
+LONGITUD_MINIMA_PREFIJO = 3
+
+STOPWORDS = frozenset("""
+a al algo como con de del desde e el en entre es esta este la las lo los mas o para pero
+por que se sin sobre su sus un una unas unos y
+""".split())
+
+_patron_token = re.compile(r'[a-z0-9]+')
+
+
+def normalizar(texto):
+    """Minúsculas y sin acentos: 'Programación' -> 'programacion'"""
+    descompuesto = unicodedata.normalize('NFKD', texto.lower())
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+def tokenizar(texto):
+    if not texto:
+        return []
+    return [t for t in _patron_token.findall(normalizar(texto)) if t not in STOPWORDS]
+
+
+class IndiceInvertido:
+    """Índice invertido en memoria con ranking BM25 y búsqueda por prefijo"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._limpiar()
+
+    def _limpiar(self):
+        self._postings = defaultdict(dict)   # término -> {id: frecuencia ponderada}
+        self._terminos_doc = {}              # id -> términos del documento
+        self._longitudes = {}                # id -> longitud ponderada
+        self._longitud_total = 0
+        self._vocabulario = []               # términos ordenados para buscar prefijos
+        self._vocabulario_sucio = False
+
+    def __len__(self):
+        return len(self._longitudes)
+
+    def _frecuencias(self, campos):
+        frecuencias = defaultdict(int)
+        for campo, peso in PESOS_CAMPOS.items():
+            for token in tokenizar(campos.get(campo)):
+                frecuencias[token] += peso
+        return frecuencias
+
+    def agregar(self, doc_id, campos):
+        """Indexar (o reindexar) un documento con llaves titulo/descripcion/requisitos"""
+        frecuencias = self._frecuencias(campos)
+        with self._lock:
+            self._eliminar(doc_id)
+            for termino, frecuencia in frecuencias.items():
+                if termino not in self._postings:
+                    self._vocabulario_sucio = True
+                self._postings[termino][doc_id] = frecuencia
+            longitud = sum(frecuencias.values())
+            self._terminos_doc[doc_id] = tuple(frecuencias)
+            self._longitudes[doc_id] = longitud
+            self._longitud_total += longitud
+
+    def eliminar(self, doc_id):
+        with self._lock:
+            self._eliminar(doc_id)
+
+    def _eliminar(self, doc_id):
+        terminos = self._terminos_doc.pop(doc_id, None)
+        if terminos is None:
+            return
+        for termino in terminos:
+            documentos = self._postings.get(termino)
+            if documentos is not None:
+                documentos.pop(doc_id, None)
+                if not documentos:
+                    del self._postings[termino]
+                    self._vocabulario_sucio = True
+        self._longitud_total -= self._longitudes.pop(doc_id)
+
+    def reemplazar(self, documentos):
+        """Reconstruir el índice completo a partir de [(id, campos)]"""
+        nuevo = IndiceInvertido()
+        for doc_id, campos in documentos:
+            nuevo.agregar(doc_id, campos)
+        with self._lock:
+            self._postings = nuevo._postings
+            self._terminos_doc = nuevo._terminos_doc
+            self._longitudes = nuevo._longitudes
+            self._longitud_total = nuevo._longitud_total
+            self._vocabulario_sucio = True
+
+    def _expandir(self, token):
+        """Términos del vocabulario que coinciden con el token: [(término, peso)]"""
+        expansion = [(token, 1.0)] if token in self._postings else []
+        if len(token) < LONGITUD_MINIMA_PREFIJO:
+            return expansion
+        if self._vocabulario_sucio:
+            self._vocabulario = sorted(self._postings)
+            self._vocabulario_sucio = False
+        inicio = bisect.bisect_left(self._vocabulario, token)
+        for termino in self._vocabulario[inicio:]:
+            if not termino.startswith(token):
+                break
+            if termino != token:
+                expansion.append((termino, PESO_PREFIJO))
+        return expansion
+
+    def buscar(self, consulta, limite=20):
+        """Devolver ([(id, puntaje)] ordenados por relevancia, total de coincidencias)"""
+        tokens = list(dict.fromkeys(tokenizar(consulta)))
+        if not tokens:
+            return [], 0
+        with self._lock:
+            total_docs = len(self._longitudes)
+            # Sin términos indexados (títulos vacíos o solo palabras vacías) no hay coincidencias
+            if not total_docs or not self._longitud_total:
+                return [], 0
+            longitudes = self._longitudes
+            base = K1 * (1 - B)
+            escala = K1 * B * total_docs / self._longitud_total
+            puntajes = defaultdict(float)
+            for token in tokens:
+                # Para cada palabra de la consulta se toma la mejor variante por documento
+                mejor = {}
+                for termino, peso in self._expandir(token):
+                    documentos = self._postings[termino]
+                    idf = math.log(1 + (total_docs - len(documentos) + 0.5) / (len(documentos) + 0.5))
+                    factor = peso * idf * (K1 + 1)
+                    for doc_id, frecuencia in documentos.items():
+                        puntaje = factor * frecuencia / (frecuencia + base + escala * longitudes[doc_id])
+                        if puntaje > mejor.get(doc_id, 0):
+                            mejor[doc_id] = puntaje
+                for doc_id, puntaje in mejor.items():
+                    puntajes[doc_id] += puntaje
+        ordenados = heapq.nlargest(limite, puntajes.items(), key=lambda item: (item[1], -item[0]))
+        return ordenados, len(puntajes)
+
+
+# Índice de las vacantes abiertas. Se actualiza en cada escritura de este proceso y
+# se reconstruye completo cuando supera la antigüedad máxima, para incorporar los
+# cambios hechos por otros workers.
+MAX_ANTIGUEDAD_INDICE = float(os.environ.get('BUSQUEDA_MAX_ANTIGUEDAD', 300))
+
+_consulta_documentos = text("""
+    SELECT ID, Titulo_puesto, Descripcion, Requisitos
+    FROM Vacantes
+    WHERE Estado = 'Abierta' AND eliminado = 0
+""")
+
+_consulta_documento = text("""
+    SELECT ID, Titulo_puesto, Descripcion, Requisitos
+    FROM Vacantes
+    WHERE ID = :vacante_id AND Estado = 'Abierta' AND eliminado = 0
+""")
+
+
+def _campos(fila):
+    return {"titulo": fila.Titulo_puesto, "descripcion": fila.Descripcion, "requisitos": fila.Requisitos}
+
+
+class IndiceVacantes(IndiceInvertido):
+
+    def __init__(self):
+        super().__init__()
+        self.construido_en = None
+        self._lock_construccion = threading.Lock()
+
+    def asegurar(self, conn):
+        """Construir el índice si no existe o si superó la antigüedad máxima"""
+        vigente = (self.construido_en is not None
+                   and time.monotonic() - self.construido_en < MAX_ANTIGUEDAD_INDICE)
+        if vigente:
+            return
+        with self._lock_construccion:
+            if self.construido_en is not None and time.monotonic() - self.construido_en < MAX_ANTIGUEDAD_INDICE:
+                return
+            filas = conn.execute(_consulta_documentos)
+            self.reemplazar((fila.ID, _campos(fila)) for fila in filas)
+            self.construido_en = time.monotonic()
+
+    def invalidar(self):
+        """Forzar la reconstrucción completa en la siguiente búsqueda (p. ej. tras una importación masiva)"""
+        self.construido_en = None
+
+    def reindexar(self, conn, *vacante_ids):
+        """Actualizar las vacantes indicadas después de una escritura (las cerradas o eliminadas salen del índice)"""
+        if self.construido_en is None:
+            return
+        try:
+            for vacante_id in vacante_ids:
+                fila = conn.execute(_consulta_documento, {"vacante_id": vacante_id}).fetchone()
+                if fila:
+                    self.agregar(vacante_id, _campos(fila))
+                else:
+                    self.eliminar(vacante_id)
+        except SQLAlchemyError:
+            # La escritura ya se confirmó; se reconstruye el índice en la siguiente búsqueda
+            self.invalidar()
+
+
+indice_vacantes = IndiceVacantes()
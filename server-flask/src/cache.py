@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheTTL:
+    """Caché en memoria con tamaño máximo (LRU), expiración por tiempo e invalidación explícita"""
+
+    def __init__(self, max_entradas=128, ttl=60, habilitado=True):
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self.habilitado = habilitado
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+        # La generación cambia con cada invalidación; evita guardar resultados
+        # calculados antes de una escritura que terminó mientras se consultaba
+        self.generacion = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.expirados = 0
+        self.invalidaciones = 0
+
+    def obtener(self, clave):
+        """Devolver (True, valor) si la clave está vigente, (False, None) en caso contrario"""
+        if not self.habilitado:
+            return False, None
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None:
+                expira, valor = entrada
+                if expira > time.monotonic():
+                    self._entradas.move_to_end(clave)
+                    self.aciertos += 1
+                    return True, valor
+                del self._entradas[clave]
+                self.expirados += 1
+            self.fallos += 1
+            return False, None
+
+    def guardar(self, clave, valor, generacion=None):
+        """Guardar un valor; se descarta si hubo una invalidación desde 'generacion'"""
+        if not self.habilitado:
+            return
+        with self._lock:
+            if generacion is not None and generacion != self.generacion:
+                return
+            self._entradas[clave] = (time.monotonic() + self.ttl, valor)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+                self.desalojos += 1
+
+    def invalidar(self):
+        """Vaciar la caché después de una escritura"""
+        with self._lock:
+            self._entradas.clear()
+            self.generacion += 1
+            self.invalidaciones += 1
+
+    def descartar(self, *claves):
+        """Quitar solo las claves indicadas después de una escritura que las afecta"""
+        with self._lock:
+            for clave in claves:
+                self._entradas.pop(clave, None)
+            self.generacion += 1
+            self.invalidaciones += 1
+
+    def estadisticas(self):
+        with self._lock:
+            total = self.aciertos + self.fallos
+            return {
+                "habilitado": self.habilitado,
+                "entradas": len(self._entradas),
+                "maxEntradas": self.max_entradas,
+                "ttl": self.ttl,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasaAciertos": round(self.aciertos / total, 4) if total else 0,
+                "desalojos": self.desalojos,
+                "expirados": self.expirados,
+                "invalidaciones": self.invalidaciones
+            }
+
+
+# Caché del listado público de vacantes y de las vacantes destacadas.
+# Guarda el cuerpo JSON ya serializado de cada combinación de parámetros.
+cache_vacantes = CacheTTL(
+    max_entradas=int(os.environ.get('CACHE_VACANTES_MAX', 256)),
+    ttl=float(os.environ.get('CACHE_VACANTES_TTL', 30)),
+    habilitado=os.environ.get('CACHE_VACANTES_HABILITADO', '1') != '0'
+)
+
+
+def clave_consulta(ruta, args, versiones=()):
+    """Clave de caché independiente del orden de los parámetros de la URL.
+
+    'versiones' son las versiones de los recursos del ETag (versiones_vigentes()).
+    """
+    return (ruta, tuple(versiones), tuple(sorted(args.items(multi=True))))
+
+
+def invalidar_vacantes():
+    """Hook de invalidación para toda escritura que afecte el listado público de vacantes"""
+    cache_vacantes.invalidar()
@@ -0,0 +1,192 @@
+import os
+import threading
+import time
+
+import numpy as np
+from sqlalchemy import text
+
+from src.busqueda import tokenizar
+
+# Longitud máxima (en palabras) de un nombre de habilidad, p. ej. "sql server" = 2
+MAX_PALABRAS_HABILIDAD = 4
+MAX_ANTIGUEDAD_INDICE = float(os.environ.get('COINCIDENCIAS_MAX_ANTIGUEDAD', 300))
+
+
+class CatalogoHabilidades:
+    """Reconoce habilidades del catálogo dentro de un texto libre (p. ej. Requisitos)"""
+
+    def __init__(self, habilidades):
+        # habilidades: [(ID, Nombre)]
+        self.nombres = {}
+        self._frases = {}
+        for habilidad_id, nombre in habilidades:
+            self.nombres[habilidad_id] = nombre
+            frase = tuple(tokenizar(nombre))
+            if frase and len(frase) <= MAX_PALABRAS_HABILIDAD:
+                self._frases[frase] = habilidad_id
+
+    def extraer(self, texto):
+        """IDs de las habilidades mencionadas en el texto, sin distinción de acentos"""
+        tokens = tokenizar(texto)
+        encontradas = set()
+        for inicio in range(len(tokens)):
+            for largo in range(1, MAX_PALABRAS_HABILIDAD + 1):
+                frase = tuple(tokens[inicio:inicio + largo])
+                if len(frase) < largo:
+                    break
+                habilidad_id = self._frases.get(frase)
+                if habilidad_id is not None:
+                    encontradas.add(habilidad_id)
+        return encontradas
+
+
+def _agrupar(filas, columnas, total_habilidades):
+    """Lista por habilidad con las posiciones (np.int32) de las filas que la tienen"""
+    grupos = [np.empty(0, dtype=np.int32)] * total_habilidades
+    if not len(filas):
+        return grupos
+    orden = np.argsort(columnas, kind='stable')
+    columnas_ordenadas = columnas[orden]
+    limites = np.flatnonzero(np.diff(columnas_ordenadas)) + 1
+    for bloque in np.split(orden, limites):
+        grupos[columnas[bloque[0]]] = filas[bloque].astype(np.int32)
+    return grupos
+
+
+class IndiceCoincidencias:
+    """Índice de habilidades precalculado para emparejar candidatos y vacantes.
+
+    Cada candidato y cada vacante es un vector disperso de habilidades. El puntaje es la
+    cobertura ponderada de las habilidades de la vacante:
+        sum(idf de las habilidades en común) / sum(idf de las habilidades de la vacante)
+    donde idf favorece las habilidades poco comunes entre los candidatos.
+    """
+
+    def __init__(self, habilidades, candidato_habilidad, vacantes):
+        # habilidades: [(ID, Nombre)]; candidato_habilidad: [(ID_Candidato, ID_Habilidad)]
+        # vacantes: [(ID, Requisitos)]
+        self.catalogo = CatalogoHabilidades(habilidades)
+        ids_habilidad = np.array(sorted(self.catalogo.nombres), dtype=np.int64)
+        self._habilidad_pos = {int(h): i for i, h in enumerate(ids_habilidad)}
+        self._ids_habilidad = ids_habilidad
+        total_habilidades = len(ids_habilidad)
+
+        # Candidatos: matriz dispersa en formato de listas por habilidad (CSC) y por candidato (CSR)
+        pares = np.array([(c, self._habilidad_pos[h]) for c, h in candidato_habilidad
+                          if h in self._habilidad_pos], dtype=np.int64).reshape(-1, 2)
+        self.ids_candidato, pos_candidato = np.unique(pares[:, 0], return_inverse=True)
+        columnas = pares[:, 1]
+        self._candidatos_por_habilidad = _agrupar(pos_candidato, columnas, total_habilidades)
+        orden = np.argsort(pos_candidato, kind='stable')
+        self._habilidades_candidato = columnas[orden]
+        self._inicio_candidato = np.searchsorted(pos_candidato[orden], np.arange(len(self.ids_candidato) + 1))
+
+        frecuencia = np.array([len(g) for g in self._candidatos_por_habilidad], dtype=np.float64)
+        self.idf = np.log1p(max(len(self.ids_candidato), 1) / (1.0 + frecuencia))
+
+        # Vacantes: habilidades extraídas de Requisitos
+        filas_vacante, columnas_vacante, ids_vacante = [], [], []
+        for vacante_id, requisitos in vacantes:
+            posiciones = [self._habilidad_pos[h] for h in self.catalogo.extraer(requisitos)]
+            if posiciones:
+                fila = len(ids_vacante)
+                ids_vacante.append(vacante_id)
+                filas_vacante.extend([fila] * len(posiciones))
+                columnas_vacante.extend(posiciones)
+        self.ids_vacante = np.array(ids_vacante, dtype=np.int64)
+        columnas_vacante = np.array(columnas_vacante, dtype=np.int64)
+        filas_vacante = np.array(filas_vacante, dtype=np.int64)
+        self._vacantes_por_habilidad = _agrupar(filas_vacante, columnas_vacante, total_habilidades)
+        self._peso_vacante = np.bincount(filas_vacante, weights=self.idf[columnas_vacante],
+                                         minlength=len(ids_vacante))
+
+    def posiciones_habilidad(self, habilidad_ids):
+        return sorted(self._habilidad_pos[h] for h in habilidad_ids if h in self._habilidad_pos)
+
+    def nombres_habilidades(self, posiciones):
+        return [self.catalogo.nombres[int(self._ids_habilidad[p])] for p in posiciones]
+
+    def habilidades_candidato(self, posicion):
+        inicio, fin = self._inicio_candidato[posicion], self._inicio_candidato[posicion + 1]
+        return self._habilidades_candidato[inicio:fin]
+
+    @staticmethod
+    def _mejores(puntajes, limite):
+        """Índices de los 'limite' puntajes más altos (> 0), en orden descendente"""
+        positivos = np.flatnonzero(puntajes > 0)
+        if len(positivos) > limite:
+            positivos = positivos[np.argpartition(-puntajes[positivos], limite - 1)[:limite]]
+        return positivos[np.argsort(-puntajes[positivos], kind='stable')]
+
+    def mejores_candidatos(self, habilidades_vacante, limite=10):
+        """[(ID_Candidato, puntaje, [habilidades en común])] para las habilidades de una vacante"""
+        posiciones = self.posiciones_habilidad(habilidades_vacante)
+        if not posiciones or not len(self.ids_candidato):
+            return []
+        puntajes = np.zeros(len(self.ids_candidato), dtype=np.float64)
+        for p in posiciones:
+            puntajes[self._candidatos_por_habilidad[p]] += self.idf[p]
+        puntajes /= self.idf[posiciones].sum()
+        requeridas = np.array(posiciones)
+        resultado = []
+        for fila in self._mejores(puntajes, limite):
+            comunes = np.intersect1d(self.habilidades_candidato(fila), requeridas, assume_unique=True)
+            resultado.append((int(self.ids_candidato[fila]), float(puntajes[fila]),
+                              self.nombres_habilidades(comunes)))
+        return resultado
+
+    def mejores_vacantes(self, habilidades_candidato, limite=10):
+        """[(ID_Vacante, puntaje)] de las vacantes abiertas que mejor cubre el candidato"""
+        posiciones = self.posiciones_habilidad(habilidades_candidato)
+        if not posiciones or not len(self.ids_vacante):
+            return []
+        puntajes = np.zeros(len(self.ids_vacante), dtype=np.float64)
+        for p in posiciones:
+            puntajes[self._vacantes_por_habilidad[p]] += self.idf[p]
+        puntajes /= np.where(self._peso_vacante > 0, self._peso_vacante, 1)
+        return [(int(self.ids_vacante[fila]), float(puntajes[fila])) for fila in self._mejores(puntajes, limite)]
+
+
+_consulta_habilidades = text("SELECT ID, Nombre FROM Habilidades")
+
+_consulta_candidato_habilidad = text("""
+    SELECT CH.ID_Candidato, CH.ID_Habilidad
+    FROM Candidato_Habilidad CH
+    JOIN Candidatos C ON CH.ID_Candidato = C.ID
+    JOIN Usuario U ON C.ID_Usuario = U.ID
+    WHERE U.eliminado = 0
+""")
+
+_consulta_vacantes = text("""
+    SELECT ID, Requisitos FROM Vacantes WHERE Estado = 'Abierta' AND eliminado = 0
+""")
+
+
+class ServicioCoincidencias:
+    """Mantiene el índice de coincidencias del proceso y lo reconstruye cuando envejece"""
+
+    def __init__(self):
+        self.indice = None
+        self.construido_en = None
+        self._lock = threading.Lock()
+
+    def obtener(self, conn):
+        vigente = (self.construido_en is not None
+                   and time.monotonic() - self.construido_en < MAX_ANTIGUEDAD_INDICE)
+        if vigente:
+            return self.indice
+        with self._lock:
+            if self.construido_en is None or time.monotonic() - self.construido_en >= MAX_ANTIGUEDAD_INDICE:
+                habilidades = [(f.ID, f.Nombre) for f in conn.execute(_consulta_habilidades)]
+                pares = [(f.ID_Candidato, f.ID_Habilidad) for f in conn.execute(_consulta_candidato_habilidad)]
+                vacantes = [(f.ID, f.Requisitos) for f in conn.execute(_consulta_vacantes)]
+                self.indice = IndiceCoincidencias(habilidades, pares, vacantes)
+                self.construido_en = time.monotonic()
+            return self.indice
+
+    def invalidar(self):
+        """Reconstruir en la siguiente consulta (cambios de habilidades, candidatos o vacantes)"""
+        self.construido_en = None
+
+
+servicio_coincidencias = ServicioCoincidencias()
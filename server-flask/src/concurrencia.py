@@ -0,0 +1,99 @@
+import os
+
+from sqlalchemy import event
+
+# Modo de servicio de cada worker de gunicorn (ver gunicorn.conf.py):
+#   'hilos'  -> worker gthread: una petición por hilo, WEB_THREADS peticiones simultáneas
+#   'gevent' -> worker gevent: miles de peticiones por proceso en greenlets; las llamadas
+#               bloqueantes de pyodbc se ejecutan en un pool de hilos nativos para que el
+#               hub siga atendiendo otras peticiones mientras SQL Server responde.
+MODOS_SERVIDOR = ('hilos', 'gevent')
+MODO_SERVIDOR = os.environ.get('WEB_MODO', 'hilos')
+if MODO_SERVIDOR not in MODOS_SERVIDOR:
+    raise ValueError(f"WEB_MODO debe ser uno de: {', '.join(MODOS_SERVIDOR)}")
+
+# Métodos del DBAPI que esperan a la base de datos
+_METODOS_BLOQUEANTES_CURSOR = frozenset((
+    'execute', 'executemany', 'fetchone', 'fetchmany', 'fetchall', 'nextset', 'close'
+))
+_METODOS_BLOQUEANTES_CONEXION = frozenset(('commit', 'rollback', 'close'))
+
+
+def gevent_activo():
+    """True si el proceso corre con gevent y los sockets ya fueron parcheados"""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched('socket')
+
+
+def ejecutar_fuera_del_hub(funcion, *args, **kwargs):
+    """Ejecutar una llamada bloqueante sin detener al resto de greenlets.
+
+    Con gevent la llamada corre en el pool de hilos nativos del hub y solo el greenlet
+    actual espera; sin gevent se llama directamente.
+    """
+    if not gevent_activo():
+        return funcion(*args, **kwargs)
+    import gevent
+    return gevent.get_hub().threadpool.apply(funcion, args, kwargs)
+
+
+class _Envoltura:
+    """Reenvía atributos al objeto del DBAPI y desvía los métodos bloqueantes al pool de hilos"""
+
+    _bloqueantes = frozenset()
+
+    def __init__(self, objeto):
+        object.__setattr__(self, '_objeto', objeto)
+
+    def __getattr__(self, nombre):
+        atributo = getattr(self._objeto, nombre)
+        if nombre in self._bloqueantes:
+            return lambda *args, **kwargs: ejecutar_fuera_del_hub(atributo, *args, **kwargs)
+        return atributo
+
+    def __setattr__(self, nombre, valor):
+        # p. ej. cursor.fast_executemany = True
+        setattr(self._objeto, nombre, valor)
+
+    def __iter__(self):
+        return iter(self._objeto)
+
+
+class CursorCooperativo(_Envoltura):
+    _bloqueantes = _METODOS_BLOQUEANTES_CURSOR
+
+    def execute(self, *args, **kwargs):
+        ejecutar_fuera_del_hub(self._objeto.execute, *args, **kwargs)
+        return self
+
+    def executemany(self, *args, **kwargs):
+        ejecutar_fuera_del_hub(self._objeto.executemany, *args, **kwargs)
+        return self
+
+
+class ConexionCooperativa(_Envoltura):
+    _bloqueantes = _METODOS_BLOQUEANTES_CONEXION
+
+    def cursor(self, *args, **kwargs):
+        return CursorCooperativo(self._objeto.cursor(*args, **kwargs))
+
+
+def hacer_cooperativo(engine, hilos):
+    """Abrir y usar las conexiones del engine desde el pool de hilos del hub de gevent.
+
+    Debe llamarse antes de la primera conexión. 'hilos' limita las consultas simultáneas
+    del proceso (normalmente tamaño + desbordamiento del pool de SQLAlchemy).
+    """
+    @event.listens_for(engine, 'do_connect')
+    def _conectar(dialect, conn_rec, cargs, cparams):
+        if dialect.name == 'sqlite':
+            # La conexión se usa desde distintos hilos del pool (nunca a la vez)
+            cparams.setdefault('check_same_thread', False)
+        if gevent_activo():
+            import gevent
+            gevent.get_hub().threadpool.maxsize = hilos
+        dbapi_conn = ejecutar_fuera_del_hub(dialect.loaded_dbapi.connect, *cargs, **cparams)
+        return ConexionCooperativa(dbapi_conn)
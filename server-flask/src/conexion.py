@@ -1,19 +1,143 @@
-from sqlalchemy import create_engine
-from sqlalchemy.exc import SQLAlchemyError
+import threading
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolAgotado
+
+from src import bd_local
+from src.concurrencia import MODO_SERVIDOR, hacer_cooperativo
+from src.configuracion_bd import leer_configuracion_pool, opciones_engine
+from src.instrumentacion import registrar_espera_pool, registro_metricas
+
+# Límites (segundos) del histograma de espera por una conexión del pool
+LIMITES_ESPERA = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+
+def crear_engine(config):
+    """Engine con el pool descrito por la configuración (ver src/configuracion_bd.py)"""
+    opciones = opciones_engine(config)
+    if config['url'].startswith('mssql+pyodbc'):
+        # Envía los executemany (importación masiva de vacantes) como un solo lote de parámetros
+        opciones['fast_executemany'] = True
+    if config['motor'] == 'sqlite':
+        opciones['connect_args'] = bd_local.argumentos_conexion(config)
+    engine = create_engine(config['url'], echo=False, **opciones)
+    if config['motor'] == 'sqlite':
+        bd_local.preparar_engine(engine)
+    if MODO_SERVIDOR == 'gevent':
+        # Tantas consultas simultáneas como conexiones puede prestar el pool
+        hacer_cooperativo(engine, config['tamano'] + config['desbordamiento'])
+    return engine
+
+
+class EstadisticasPool:
+    """Estado en vivo del pool y tiempos de espera de checkout"""
+
+    def __init__(self, engine, config):
+        self.engine = engine
+        self.config = config
+        self._lock = threading.Lock()
+        self.cubetas = [0] * len(LIMITES_ESPERA)
+        self.checkouts = 0
+        self.espera_total = 0.0
+        self.espera_maxima = 0.0
+        self.agotamientos = 0      # checkouts que superaron DB_POOL_TIMEOUT
+        self.conexiones_abiertas = 0
+        self.invalidaciones = 0    # conexiones descartadas por desconexión
+        event.listen(engine.pool, 'connect', self._al_conectar)
+        event.listen(engine.pool, 'invalidate', self._al_invalidar)
+
+    def _al_conectar(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.conexiones_abiertas += 1
+
+    def _al_invalidar(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidaciones += 1
+
+    def conectar(self):
+        """engine.connect() midiendo la espera por una conexión libre"""
+        inicio = time.perf_counter()
+        try:
+            conn = self.engine.connect()
+        except PoolAgotado:
+            with self._lock:
+                self.agotamientos += 1
+            raise
+        espera = time.perf_counter() - inicio
+        with self._lock:
+            self.checkouts += 1
+            self.espera_total += espera
+            self.espera_maxima = max(self.espera_maxima, espera)
+            for i, limite in enumerate(LIMITES_ESPERA):
+                if espera <= limite:
+                    self.cubetas[i] += 1
+        registrar_espera_pool(espera)
+        return conn
+
+    def estado(self):
+        pool = self.engine.pool
+        with self._lock:
+            return {
+                "tamano": self.config['tamano'],
+                "desbordamientoMaximo": self.config['desbordamiento'],
+                "desconexion": self.config['desconexion'],
+                "enUso": pool.checkedout() if hasattr(pool, 'checkedout') else None,
+                "libres": pool.checkedin() if hasattr(pool, 'checkedin') else None,
+                "desbordamiento": max(pool.overflow(), 0) if hasattr(pool, 'overflow') else None,
+                "checkouts": self.checkouts,
+                "esperaPromedioMs": round(self.espera_total / self.checkouts * 1000, 3) if self.checkouts else 0,
+                "esperaMaximaMs": round(self.espera_maxima * 1000, 3),
+                "agotamientos": self.agotamientos,
+                "conexionesAbiertas": self.conexiones_abiertas,
+                "invalidaciones": self.invalidaciones
+            }
+
+    def metricas(self):
+        """Líneas de /metrics con el estado del pool"""
+        estado = self.estado()
+        with self._lock:
+            cubetas, total, suma = list(self.cubetas), self.checkouts, self.espera_total
+        lineas = []
+        for nombre, ayuda, valor in (
+            ("bolsa_pool_en_uso", "Conexiones prestadas en este momento", estado["enUso"]),
+            ("bolsa_pool_libres", "Conexiones abiertas disponibles", estado["libres"]),
+            ("bolsa_pool_desbordamiento", "Conexiones por encima de DB_POOL_TAMANO", estado["desbordamiento"]),
+            ("bolsa_pool_tamano", "DB_POOL_TAMANO efectivo del worker", estado["tamano"]),
+            ("bolsa_pool_desbordamiento_maximo", "DB_POOL_DESBORDAMIENTO efectivo del worker", estado["desbordamientoMaximo"])
+        ):
+            if valor is not None:
+                lineas += [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} gauge", f"{nombre} {valor}"]
+        for nombre, ayuda, valor in (
+            ("bolsa_pool_agotamientos_total", "Checkouts que superaron DB_POOL_TIMEOUT", estado["agotamientos"]),
+            ("bolsa_pool_conexiones_abiertas_total", "Conexiones nuevas abiertas contra SQL Server", estado["conexionesAbiertas"]),
+            ("bolsa_pool_invalidaciones_total", "Conexiones descartadas por desconexión", estado["invalidaciones"])
+        ):
+            lineas += [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} counter", f"{nombre} {valor}"]
+        lineas += ["# HELP bolsa_pool_espera_segundos Espera por una conexión del pool",
+                   "# TYPE bolsa_pool_espera_segundos histogram"]
+        for limite, cantidad in zip(LIMITES_ESPERA, cubetas):
+            lineas.append(f'bolsa_pool_espera_segundos_bucket{{le="{limite}"}} {cantidad}')
+        lineas += [f'bolsa_pool_espera_segundos_bucket{{le="+Inf"}} {total}',
+                   f"bolsa_pool_espera_segundos_sum {suma:.6f}",
+                   f"bolsa_pool_espera_segundos_count {total}"]
+        return lineas
+
 
 # Configuración de la conexión con pool
-engine = create_engine(
-    "mssql+pyodbc://localhost/Bolsa_de_Trabajo?driver=ODBC+Driver+17+for+SQL+Server&trusted_connection=yes",
-    pool_size=5,
-    max_overflow=10,
-    pool_pre_ping=True,
-    echo=False
-)
+config_pool = leer_configuracion_pool()
+engine = crear_engine(config_pool)
+estadisticas_pool = EstadisticasPool(engine, config_pool)
+registro_metricas.agregar_colector(estadisticas_pool.metricas)
+
+def cerrar_pool():
+    """Cerrar las conexiones del pool al apagar el worker (las prestadas se cierran al devolverse)"""
+    engine.dispose()
 
 def obtener_conexion():
     try:
-        conn = engine.connect()
+        conn = estadisticas_pool.conectar()
         return conn
     except SQLAlchemyError as e:
         print(f"Error al conectar a la base de datos: {e}")
-        raise e
\ No newline at end of file
+        raise e
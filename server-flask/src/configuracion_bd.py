@@ -0,0 +1,102 @@
+import json
+import os
+
+# Configuración de la conexión y del pool. Cada valor se toma de la variable de entorno,
+# si no existe del archivo JSON indicado en DB_CONFIG_ARCHIVO y si no del valor por defecto.
+#
+#   variable de entorno      llave del archivo    por defecto
+#   DB_MOTOR                 motor                sqlserver | sqlite (por defecto según DB_URL)
+#   DB_URL                   url                  SQL Server local con autenticación de Windows
+#                                                 (con DB_MOTOR=sqlite: sqlite:///bolsa_local.db)
+#   DB_POOL_TAMANO           tamano               5     conexiones que se mantienen abiertas
+#   DB_POOL_DESBORDAMIENTO   desbordamiento       10    conexiones extra bajo carga
+#   DB_POOL_TIMEOUT          timeout              30    segundos esperando una conexión libre
+#   DB_POOL_RECICLAR         reciclar             1800  segundos antes de reabrir una conexión (-1 = nunca)
+#   DB_DESCONEXION           desconexion          optimista | pre_ping
+#   DB_MAX_CONEXIONES        max_conexiones       (sin límite) total entre todos los workers
+#   WEB_CONCURRENCY          workers              1     procesos de gunicorn
+#
+# Con DB_MAX_CONEXIONES cada worker recibe max_conexiones // workers conexiones
+# (tamaño + desbordamiento), de modo que N workers no saturen SQL Server.
+#
+# DB_MOTOR=sqlite usa una base SQLite local con el esquema de SQL/ y traducción de T-SQL
+# (ver src/bd_local.py), para ejecutar la API y los benchmarks sin SQL Server.
+
+URL_POR_DEFECTO = "mssql+pyodbc://localhost/Bolsa_de_Trabajo?driver=ODBC+Driver+17+for+SQL+Server&trusted_connection=yes"
+URL_LOCAL_POR_DEFECTO = "sqlite:///bolsa_local.db"
+
+MOTORES = ('sqlserver', 'sqlite')
+
+# 'optimista': no se hace ping al tomar la conexión; si SQL Server la cerró, la petición
+# que la usa falla, SQLAlchemy invalida el pool y las siguientes reconectan.
+# 'pre_ping': un SELECT 1 adicional en cada checkout (un viaje más por petición).
+MODOS_DESCONEXION = ('optimista', 'pre_ping')
+
+_VARIABLES = {
+    'motor': ('DB_MOTOR', str, None),
+    'url': ('DB_URL', str, URL_POR_DEFECTO),
+    'tamano': ('DB_POOL_TAMANO', int, 5),
+    'desbordamiento': ('DB_POOL_DESBORDAMIENTO', int, 10),
+    'timeout': ('DB_POOL_TIMEOUT', float, 30.0),
+    'reciclar': ('DB_POOL_RECICLAR', int, 1800),
+    'desconexion': ('DB_DESCONEXION', str, 'optimista'),
+    'max_conexiones': ('DB_MAX_CONEXIONES', int, None),
+    'workers': ('WEB_CONCURRENCY', int, 1)
+}
+
+
+def _leer_archivo(ruta):
+    if not ruta:
+        return {}
+    with open(ruta, encoding='utf-8') as archivo:
+        datos = json.load(archivo)
+    if not isinstance(datos, dict):
+        raise ValueError(f"{ruta} debe contener un objeto JSON")
+    desconocidas = [llave for llave in datos if llave not in _VARIABLES]
+    if desconocidas:
+        raise ValueError(f"Llaves desconocidas en {ruta}: {', '.join(desconocidas)}")
+    return datos
+
+
+def leer_configuracion_pool(entorno=None):
+    """Configuración efectiva del pool para este worker (ya repartida entre workers)"""
+    entorno = os.environ if entorno is None else entorno
+    archivo = _leer_archivo(entorno.get('DB_CONFIG_ARCHIVO'))
+
+    config = {}
+    for llave, (variable, tipo, defecto) in _VARIABLES.items():
+        valor = entorno.get(variable, archivo.get(llave, defecto))
+        try:
+            config[llave] = tipo(valor) if valor is not None else None
+        except (TypeError, ValueError):
+            raise ValueError(f"{variable} debe ser de tipo {tipo.__name__}: {valor!r}")
+
+    if config['motor'] is None:
+        config['motor'] = 'sqlite' if config['url'].startswith('sqlite') else 'sqlserver'
+    if config['motor'] not in MOTORES:
+        raise ValueError(f"DB_MOTOR debe ser uno de: {', '.join(MOTORES)}")
+    if config['motor'] == 'sqlite' and config['url'] == URL_POR_DEFECTO:
+        config['url'] = URL_LOCAL_POR_DEFECTO
+    if config['url'].startswith('sqlite') != (config['motor'] == 'sqlite'):
+        raise ValueError(f"DB_URL no corresponde a DB_MOTOR={config['motor']}")
+    if config['desconexion'] not in MODOS_DESCONEXION:
+        raise ValueError(f"DB_DESCONEXION debe ser uno de: {', '.join(MODOS_DESCONEXION)}")
+    if config['tamano'] < 1 or config['desbordamiento'] < 0 or config['workers'] < 1:
+        raise ValueError("DB_POOL_TAMANO y WEB_CONCURRENCY deben ser >= 1 y DB_POOL_DESBORDAMIENTO >= 0")
+
+    if config['max_conexiones'] is not None:
+        por_worker = max(1, config['max_conexiones'] // config['workers'])
+        config['tamano'] = min(config['tamano'], por_worker)
+        config['desbordamiento'] = min(config['desbordamiento'], por_worker - config['tamano'])
+    return config
+
+
+def opciones_engine(config):
+    """Argumentos de create_engine correspondientes a la configuración"""
+    return {
+        "pool_size": config['tamano'],
+        "max_overflow": config['desbordamiento'],
+        "pool_timeout": config['timeout'],
+        "pool_recycle": config['reciclar'],
+        "pool_pre_ping": config['desconexion'] == 'pre_ping'
+    }
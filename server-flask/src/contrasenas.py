@@ -0,0 +1,180 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as TiempoAgotado
+
+import bcrypt
+
+# Hashing de contraseñas (bcrypt) fuera de los hilos de las peticiones.
+#
+#   variable de entorno   por defecto
+#   BCRYPT_RONDAS         12    factor de trabajo (log2 de las iteraciones) de los hashes nuevos
+#   HASH_PROCESOS         CPUs / WEB_CONCURRENCY   procesos de hashing por worker
+#   HASH_COLA_MAX         4 × HASH_PROCESOS        hashes esperando proceso libre
+#   HASH_TIMEOUT          10    segundos máximos esperando un resultado
+#
+# Cada ronda duplica el costo: medir con `python -m benchmarks.bench_login`. Los hashes
+# existentes guardan sus propias rondas, así que cambiar BCRYPT_RONDAS no invalida cuentas.
+# Cuando hay HASH_PROCESOS + HASH_COLA_MAX hashes en curso se rechaza el siguiente
+# (ServicioSaturado -> 429) en lugar de acumular peticiones esperando CPU.
+
+# Límites (segundos) del histograma de duración de cada hash, incluida la espera en cola
+LIMITES_HASH = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# bcrypt solo usa los primeros 72 bytes; bcrypt >= 5 rechaza contraseñas más largas
+# en lugar de truncarlas como hacían las versiones con las que se crearon los hashes.
+_MAX_BYTES = 72
+
+
+class ServicioSaturado(Exception):
+    """No hay lugar en la cola de hashing; reintentar más tarde"""
+
+
+def _a_bytes(valor):
+    return valor.encode('utf-8') if isinstance(valor, str) else valor
+
+
+def _generar(contrasena, rondas):
+    return bcrypt.hashpw(_a_bytes(contrasena)[:_MAX_BYTES], bcrypt.gensalt(rondas)).decode('utf-8')
+
+
+def _verificar(hash_guardado, contrasena):
+    try:
+        return bcrypt.checkpw(_a_bytes(contrasena)[:_MAX_BYTES], _a_bytes(hash_guardado))
+    except ValueError:
+        # El valor guardado no es un hash de bcrypt
+        return False
+
+
+def _entero(entorno, variable, defecto, minimo=1):
+    valor = int(entorno.get(variable, defecto))
+    if valor < minimo:
+        raise ValueError(f"{variable} debe ser mayor o igual a {minimo}")
+    return valor
+
+
+def leer_configuracion_hash(entorno=None):
+    entorno = os.environ if entorno is None else entorno
+    workers = _entero(entorno, 'WEB_CONCURRENCY', 1)
+    procesos = _entero(entorno, 'HASH_PROCESOS', max(1, (os.cpu_count() or 1) // workers))
+    rondas = _entero(entorno, 'BCRYPT_RONDAS', 12, minimo=4)
+    if rondas > 31:
+        raise ValueError("BCRYPT_RONDAS debe estar entre 4 y 31")
+    return {
+        'rondas': rondas,
+        'procesos': procesos,
+        'cola': _entero(entorno, 'HASH_COLA_MAX', 4 * procesos, minimo=0),
+        'timeout': float(entorno.get('HASH_TIMEOUT', 10.0))
+    }
+
+
+class ServicioContrasenas:
+    """Pool de procesos para bcrypt con cola acotada y métricas.
+
+    Los procesos se crean al primer hash (después del fork de gunicorn) con el contexto
+    'spawn', que no copia los hilos, conexiones ni locks del worker.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self._cupos = threading.BoundedSemaphore(config['procesos'] + config['cola'])
+        self._lock = threading.Lock()
+        self._executor = None
+        self.cubetas = [0] * len(LIMITES_HASH)
+        self.hashes = 0
+        self.tiempo_total = 0.0
+        self.en_curso = 0
+        self.rechazos = 0
+        self.timeouts = 0
+
+    def _obtener_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    self.config['procesos'], mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def _ejecutar(self, funcion, *args):
+        if not self._cupos.acquire(blocking=False):
+            with self._lock:
+                self.rechazos += 1
+            raise ServicioSaturado("Demasiados inicios de sesión simultáneos")
+        inicio = time.perf_counter()
+        with self._lock:
+            self.en_curso += 1
+        try:
+            futuro = self._obtener_executor().submit(funcion, *args)
+            try:
+                return futuro.result(timeout=self.config['timeout'])
+            except TiempoAgotado:
+                futuro.cancel()
+                with self._lock:
+                    self.timeouts += 1
+                raise ServicioSaturado("El hashing de contraseñas no respondió a tiempo")
+        finally:
+            duracion = time.perf_counter() - inicio
+            self._cupos.release()
+            with self._lock:
+                self.en_curso -= 1
+                self.hashes += 1
+                self.tiempo_total += duracion
+                for i, limite in enumerate(LIMITES_HASH):
+                    if duracion <= limite:
+                        self.cubetas[i] += 1
+
+    def generar(self, contrasena):
+        """Hash de bcrypt (str) con BCRYPT_RONDAS"""
+        return self._ejecutar(_generar, contrasena, self.config['rondas'])
+
+    def verificar(self, hash_guardado, contrasena):
+        return self._ejecutar(_verificar, hash_guardado, contrasena)
+
+    def cerrar(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def estado(self):
+        with self._lock:
+            return {
+                "rondas": self.config['rondas'],
+                "procesos": self.config['procesos'],
+                "colaMaxima": self.config['cola'],
+                "enCurso": self.en_curso,
+                "hashes": self.hashes,
+                "promedioMs": round(self.tiempo_total / self.hashes * 1000, 3) if self.hashes else 0,
+                "rechazos": self.rechazos,
+                "timeouts": self.timeouts
+            }
+
+    def metricas(self):
+        """Líneas de /metrics con el estado del pool de hashing"""
+        estado = self.estado()
+        with self._lock:
+            cubetas, total, suma = list(self.cubetas), self.hashes, self.tiempo_total
+        lineas = []
+        for nombre, ayuda, valor in (
+            ("bolsa_hash_en_curso", "Hashes en proceso o en cola", estado["enCurso"]),
+            ("bolsa_hash_rondas", "BCRYPT_RONDAS de los hashes nuevos", estado["rondas"]),
+            ("bolsa_hash_procesos", "HASH_PROCESOS del worker", estado["procesos"])
+        ):
+            lineas += [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} gauge", f"{nombre} {valor}"]
+        for nombre, ayuda, valor in (
+            ("bolsa_hash_rechazos_total", "Hashes rechazados con la cola llena (429)", estado["rechazos"]),
+            ("bolsa_hash_timeouts_total", "Hashes que superaron HASH_TIMEOUT", estado["timeouts"])
+        ):
+            lineas += [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} counter", f"{nombre} {valor}"]
+        lineas += ["# HELP bolsa_hash_segundos Duración de cada hash incluida la espera en cola",
+                   "# TYPE bolsa_hash_segundos histogram"]
+        for limite, cantidad in zip(LIMITES_HASH, cubetas):
+            lineas.append(f'bolsa_hash_segundos_bucket{{le="{limite}"}} {cantidad}')
+        lineas += [f'bolsa_hash_segundos_bucket{{le="+Inf"}} {total}',
+                   f"bolsa_hash_segundos_sum {suma:.6f}",
+                   f"bolsa_hash_segundos_count {total}"]
+        return lineas
+
+
+servicio_contrasenas = ServicioContrasenas(leer_configuracion_hash())
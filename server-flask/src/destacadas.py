@@ -0,0 +1,123 @@
+import os
+
+from sqlalchemy import text, bindparam
+
+from src.paginacion import ParametroInvalido
+
+# Criterios de selección de vacantes destacadas y su peso en el puntaje.
+# Cada criterio se normaliza entre 0 y 1 respecto a las vacantes abiertas:
+#   recencia      -> Fecha_Publicacion (la más reciente vale 1)
+#   salario       -> Salario / salario máximo
+#   postulaciones -> CantidadPostulaciones / máximo de postulaciones
+# Por defecto se conserva el criterio original: las vacantes más recientes.
+CRITERIOS = ('recencia', 'salario', 'postulaciones')
+CRITERIOS_POR_DEFECTO = {"recencia": 1.0, "salario": 0.0, "postulaciones": 0.0}
+CANTIDAD_POR_DEFECTO = int(os.environ.get('DESTACADAS_CANTIDAD', 3))
+CANTIDAD_MAXIMA = 20
+
+_consulta_ranking = text("""
+    WITH Abiertas AS (
+        SELECT ID, Fecha_Publicacion, Salario, CantidadPostulaciones
+        FROM Vacantes
+        WHERE Estado = 'Abierta' AND eliminado = 0
+    ), Limites AS (
+        SELECT
+            MIN(Fecha_Publicacion) AS FechaMin,
+            MAX(Fecha_Publicacion) AS FechaMax,
+            MAX(Salario) AS SalarioMax,
+            MAX(CantidadPostulaciones) AS PostulacionesMax
+        FROM Abiertas
+    )
+    SELECT TOP (:cantidad)
+        A.ID,
+        :peso_recencia * CASE
+            WHEN A.Fecha_Publicacion IS NULL THEN 0
+            ELSE ISNULL(CAST(DATEDIFF(DAY, L.FechaMin, A.Fecha_Publicacion) AS FLOAT)
+                        / NULLIF(DATEDIFF(DAY, L.FechaMin, L.FechaMax), 0), 1)
+        END
+        + :peso_salario * ISNULL(CAST(A.Salario AS FLOAT) / NULLIF(CAST(L.SalarioMax AS FLOAT), 0), 0)
+        + :peso_postulaciones * ISNULL(CAST(A.CantidadPostulaciones AS FLOAT) / NULLIF(L.PostulacionesMax, 0), 0)
+        AS Puntaje
+    FROM Abiertas A
+    CROSS JOIN Limites L
+    ORDER BY Puntaje DESC, A.Fecha_Publicacion DESC, A.ID DESC
+""")
+
+# Solo se tocan las filas cuyo indicador realmente cambia
+_desmarcar = text("""
+    UPDATE Vacantes SET Destacada = 0
+    WHERE Destacada = 1 AND ID NOT IN :ids
+""").bindparams(bindparam('ids', expanding=True))
+
+_marcar = text("""
+    UPDATE Vacantes SET Destacada = 1
+    WHERE ID IN :ids AND (Destacada = 0 OR Destacada IS NULL)
+""").bindparams(bindparam('ids', expanding=True))
+
+_seleccion_actual = text("SELECT ID_Vacante FROM Vacantes_Destacadas ORDER BY Posicion")
+
+_vaciar_seleccion = text("DELETE FROM Vacantes_Destacadas")
+
+_insertar_seleccion = text("""
+    INSERT INTO Vacantes_Destacadas (Posicion, ID_Vacante, Puntaje, Fecha_Calculo)
+    VALUES (:posicion, :id_vacante, :puntaje, GETDATE())
+""")
+
+
+def leer_configuracion(datos):
+    """Validar cantidad y pesos enviados a POST /api/actualizar-destacadas"""
+    datos = datos or {}
+    try:
+        cantidad = int(datos.get('cantidad', CANTIDAD_POR_DEFECTO))
+    except (TypeError, ValueError):
+        raise ParametroInvalido("'cantidad' debe ser un número entero")
+    if not 1 <= cantidad <= CANTIDAD_MAXIMA:
+        raise ParametroInvalido(f"'cantidad' debe estar entre 1 y {CANTIDAD_MAXIMA}")
+
+    criterios = datos.get('criterios') or CRITERIOS_POR_DEFECTO
+    if not isinstance(criterios, dict):
+        raise ParametroInvalido("'criterios' debe ser un objeto con pesos")
+    desconocidos = [c for c in criterios if c not in CRITERIOS]
+    if desconocidos:
+        raise ParametroInvalido(f"Criterios no válidos: {', '.join(desconocidos)}. Válidos: {', '.join(CRITERIOS)}")
+    try:
+        pesos = {c: float(criterios.get(c, 0)) for c in CRITERIOS}
+    except (TypeError, ValueError):
+        raise ParametroInvalido("Los pesos de los criterios deben ser numéricos")
+    if any(p < 0 for p in pesos.values()) or not any(pesos.values()):
+        raise ParametroInvalido("Los pesos deben ser no negativos y al menos uno mayor que cero")
+    return cantidad, pesos
+
+
+def calcular_destacadas(conn, cantidad, pesos):
+    """Devolver [(ID, puntaje)] de las vacantes abiertas mejor calificadas"""
+    filas = conn.execute(_consulta_ranking, {
+        "cantidad": cantidad,
+        "peso_recencia": pesos['recencia'],
+        "peso_salario": pesos['salario'],
+        "peso_postulaciones": pesos['postulaciones']
+    })
+    return [(fila.ID, fila.Puntaje) for fila in filas]
+
+
+def aplicar_destacadas(conn, seleccion):
+    """Actualizar el indicador Destacada y la tabla Vacantes_Destacadas de forma incremental.
+
+    Devuelve (activadas, desactivadas, cambio) donde 'cambio' indica si el conjunto
+    o su orden es distinto al anterior. No hace commit.
+    """
+    ids = [id_vacante for id_vacante, _ in seleccion]
+    anterior = [fila.ID_Vacante for fila in conn.execute(_seleccion_actual)]
+
+    desactivadas = conn.execute(_desmarcar, {"ids": ids}).rowcount
+    activadas = conn.execute(_marcar, {"ids": ids}).rowcount if ids else 0
+
+    cambio = anterior != ids
+    if cambio:
+        conn.execute(_vaciar_seleccion)
+        if seleccion:
+            conn.execute(_insertar_seleccion, [
+                {"posicion": posicion, "id_vacante": id_vacante, "puntaje": puntaje}
+                for posicion, (id_vacante, puntaje) in enumerate(seleccion, start=1)
+            ])
+    return activadas, desactivadas, cambio or activadas > 0 or desactivadas > 0
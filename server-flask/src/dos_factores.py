@@ -0,0 +1,349 @@
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+# Desafíos de 2FA: el login guarda el código y el perfil del usuario, /api/verify-2fa
+# los compara y responde sin volver a consultar al usuario ni a su perfil.
+#
+#   variable de entorno    por defecto
+#   DOSFA_TTL              300     segundos de vigencia de un código
+#   DOSFA_INTENTOS_MAX     5       códigos incorrectos antes de descartar el desafío
+#   DOSFA_MAX_DESAFIOS     100000  desafíos en memoria (se desalojan los más antiguos)
+#   DOSFA_REDIS_URL        (vacío) redis://... para compartir los desafíos entre workers
+#   DOSFA_MOSTRAR_CODIGO   1       devolver el código en la respuesta del login (desarrollo)
+#
+# Con un solo worker los desafíos se guardan en su memoria. Con WEB_CONCURRENCY > 1 el
+# login y la verificación pueden llegar a workers distintos: se guardan en Redis si hay
+# DOSFA_REDIS_URL y, si no, en la tabla Desafios_Dos_Factores (SQL/add_desafios_dos_factores.sql).
+
+# Resultados de verificar()
+VALIDO = 'valido'
+INVALIDO = 'invalido'
+EXPIRADO = 'expirado'      # no hay desafío vigente (nunca existió, expiró o ya se usó)
+BLOQUEADO = 'bloqueado'    # se agotaron los intentos; hay que iniciar sesión de nuevo
+
+RESULTADOS = (VALIDO, INVALIDO, EXPIRADO, BLOQUEADO)
+
+# Mientras no se envíe el código por correo/SMS el frontend lo muestra desde la respuesta
+MOSTRAR_CODIGO = os.environ.get('DOSFA_MOSTRAR_CODIGO', '1') != '0'
+
+
+def generar_codigo():
+    """Código de 6 dígitos"""
+    return str(secrets.randbelow(900000) + 100000)
+
+
+def _coincide(codigo_guardado, codigo):
+    # Comparación en tiempo constante para no revelar cuántos dígitos coinciden
+    return hmac.compare_digest(codigo_guardado.encode('utf-8'), str(codigo).encode('utf-8'))
+
+
+class _Contadores:
+    """Resultados de verificación por tipo, compartidos por los dos almacenes"""
+
+    def __init__(self):
+        self._lock_contadores = threading.Lock()
+        self.creados = 0
+        self.resultados = dict.fromkeys(RESULTADOS, 0)
+
+    def _contar_creado(self):
+        with self._lock_contadores:
+            self.creados += 1
+
+    def _contar(self, resultado):
+        with self._lock_contadores:
+            self.resultados[resultado] += 1
+        return resultado
+
+    def metricas(self):
+        """Líneas de /metrics de los desafíos de 2FA"""
+        estado = self.estado()
+        lineas = ["# HELP bolsa_2fa_desafios Desafíos vigentes en este worker",
+                  "# TYPE bolsa_2fa_desafios gauge"]
+        if estado["desafios"] is not None:
+            lineas.append(f"bolsa_2fa_desafios {estado['desafios']}")
+        lineas += ["# HELP bolsa_2fa_creados_total Desafíos creados en el login",
+                   "# TYPE bolsa_2fa_creados_total counter",
+                   f"bolsa_2fa_creados_total {estado['creados']}",
+                   "# HELP bolsa_2fa_verificaciones_total Verificaciones por resultado",
+                   "# TYPE bolsa_2fa_verificaciones_total counter"]
+        for resultado, cantidad in estado["verificaciones"].items():
+            lineas.append(f'bolsa_2fa_verificaciones_total{{resultado="{resultado}"}} {cantidad}')
+        return lineas
+
+
+class AlmacenDesafios(_Contadores):
+    """Desafíos en memoria por ID de usuario con expiración, intentos y tamaño máximo.
+
+    Todos los desafíos tienen el mismo TTL, así que el orden de inserción es también el
+    de expiración: cada crear() descarta los vencidos del inicio en O(1) amortizado.
+    """
+
+    def __init__(self, ttl=300, intentos_max=5, max_desafios=100000):
+        super().__init__()
+        self.ttl = ttl
+        self.intentos_max = intentos_max
+        self.max_desafios = max_desafios
+        # usuario -> [expira, código, intentos, perfil]
+        self._desafios = OrderedDict()
+        self._lock = threading.Lock()
+        self.expirados = 0
+        self.desalojos = 0
+
+    def _purgar(self, ahora):
+        while self._desafios:
+            usuario, desafio = next(iter(self._desafios.items()))
+            if desafio[0] > ahora:
+                break
+            del self._desafios[usuario]
+            self.expirados += 1
+
+    def crear(self, usuario_id, perfil, codigo=None):
+        """Guardar un desafío nuevo (reemplaza el anterior del usuario) y devolver el código"""
+        codigo = codigo or generar_codigo()
+        clave = str(usuario_id)
+        ahora = time.monotonic()
+        with self._lock:
+            self._purgar(ahora)
+            self._desafios.pop(clave, None)
+            self._desafios[clave] = [ahora + self.ttl, codigo, 0, perfil]
+            while len(self._desafios) > self.max_desafios:
+                self._desafios.popitem(last=False)
+                self.desalojos += 1
+        self._contar_creado()
+        return codigo
+
+    def verificar(self, usuario_id, codigo):
+        """Devolver (resultado, perfil); el perfil solo se entrega con VALIDO y el desafío se consume"""
+        clave = str(usuario_id)
+        with self._lock:
+            desafio = self._desafios.get(clave)
+            if desafio is None:
+                return self._contar(EXPIRADO), None
+            if desafio[0] <= time.monotonic():
+                del self._desafios[clave]
+                self.expirados += 1
+                return self._contar(EXPIRADO), None
+            if _coincide(desafio[1], codigo):
+                del self._desafios[clave]
+                return self._contar(VALIDO), desafio[3]
+            desafio[2] += 1
+            if desafio[2] >= self.intentos_max:
+                del self._desafios[clave]
+                return self._contar(BLOQUEADO), None
+            return self._contar(INVALIDO), None
+
+    def descartar(self, usuario_id):
+        with self._lock:
+            self._desafios.pop(str(usuario_id), None)
+
+    def estado(self):
+        with self._lock:
+            desafios, expirados, desalojos = len(self._desafios), self.expirados, self.desalojos
+        with self._lock_contadores:
+            return {
+                "almacen": "memoria",
+                "desafios": desafios,
+                "ttl": self.ttl,
+                "intentosMax": self.intentos_max,
+                "maxDesafios": self.max_desafios,
+                "creados": self.creados,
+                "expirados": expirados,
+                "desalojos": desalojos,
+                "verificaciones": dict(self.resultados)
+            }
+
+
+# Incrementa los intentos solo si el desafío existe (HINCRBY crearía una llave sin TTL)
+_SCRIPT_INTENTO = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return nil end
+local intentos = redis.call('HINCRBY', KEYS[1], 'intentos', 1)
+return {intentos, redis.call('HGET', KEYS[1], 'codigo'), redis.call('HGET', KEYS[1], 'perfil')}
+"""
+
+
+class AlmacenDesafiosRedis(_Contadores):
+    """Mismos desafíos en Redis (un hash por usuario con EXPIRE), compartidos entre workers"""
+
+    PREFIJO = 'bolsa:2fa:'
+
+    def __init__(self, url, ttl=300, intentos_max=5):
+        import redis  # solo se necesita con DOSFA_REDIS_URL
+
+        super().__init__()
+        self.cliente = redis.Redis.from_url(url, decode_responses=True)
+        self.ttl = ttl
+        self.intentos_max = intentos_max
+        self._intento = self.cliente.register_script(_SCRIPT_INTENTO)
+
+    def crear(self, usuario_id, perfil, codigo=None):
+        codigo = codigo or generar_codigo()
+        clave = self.PREFIJO + str(usuario_id)
+        with self.cliente.pipeline(transaction=True) as pipe:
+            pipe.delete(clave)
+            pipe.hset(clave, mapping={"codigo": codigo, "intentos": 0, "perfil": json.dumps(perfil)})
+            pipe.expire(clave, int(self.ttl))
+            pipe.execute()
+        self._contar_creado()
+        return codigo
+
+    def verificar(self, usuario_id, codigo):
+        clave = self.PREFIJO + str(usuario_id)
+        datos = self._intento(keys=[clave])
+        if datos is None:
+            return self._contar(EXPIRADO), None
+        intentos, codigo_guardado, perfil = int(datos[0]), datos[1], datos[2]
+        if _coincide(codigo_guardado, codigo):
+            # Solo una de dos verificaciones simultáneas correctas borra la llave
+            if self.cliente.delete(clave):
+                return self._contar(VALIDO), json.loads(perfil)
+            return self._contar(EXPIRADO), None
+        if intentos >= self.intentos_max:
+            self.cliente.delete(clave)
+            return self._contar(BLOQUEADO), None
+        return self._contar(INVALIDO), None
+
+    def descartar(self, usuario_id):
+        self.cliente.delete(self.PREFIJO + str(usuario_id))
+
+    def estado(self):
+        with self._lock_contadores:
+            return {
+                "almacen": "redis",
+                "desafios": None,
+                "ttl": self.ttl,
+                "intentosMax": self.intentos_max,
+                "creados": self.creados,
+                "verificaciones": dict(self.resultados)
+            }
+
+
+_PURGAR_DESAFIOS = text("DELETE FROM Desafios_Dos_Factores WHERE Expira <= GETDATE()")
+
+_REEMPLAZAR_DESAFIO = text("""
+    UPDATE Desafios_Dos_Factores
+    SET Codigo = :codigo, Intentos = 0, Perfil = :perfil, Expira = DATEADD(SECOND, :ttl, GETDATE())
+    WHERE ID_Usuario = :usuario_id
+""")
+
+_INSERTAR_DESAFIO = text("""
+    INSERT INTO Desafios_Dos_Factores (ID_Usuario, Codigo, Intentos, Perfil, Expira)
+    VALUES (:usuario_id, :codigo, 0, :perfil, DATEADD(SECOND, :ttl, GETDATE()))
+""")
+
+# Cuenta el intento y devuelve el desafío en la misma sentencia (la fila queda bloqueada
+# hasta el commit, así dos intentos simultáneos no se pierden)
+_INTENTO_DESAFIO = text("""
+    UPDATE Desafios_Dos_Factores
+    SET Intentos = Intentos + 1
+    OUTPUT INSERTED.Intentos, INSERTED.Codigo, INSERTED.Perfil
+    WHERE ID_Usuario = :usuario_id AND Expira > GETDATE()
+""")
+
+_CONSUMIR_DESAFIO = text("DELETE FROM Desafios_Dos_Factores WHERE ID_Usuario = :usuario_id AND Codigo = :codigo")
+
+_DESCARTAR_DESAFIO = text("DELETE FROM Desafios_Dos_Factores WHERE ID_Usuario = :usuario_id")
+
+
+class AlmacenDesafiosBD(_Contadores):
+    """Mismos desafíos en la tabla Desafios_Dos_Factores, compartidos entre workers sin Redis"""
+
+    def __init__(self, ttl=300, intentos_max=5):
+        super().__init__()
+        self.ttl = ttl
+        self.intentos_max = intentos_max
+
+    @staticmethod
+    def _conectar():
+        # Import diferido: src.conexion crea el engine al importarse
+        from src.conexion import obtener_conexion
+        return obtener_conexion()
+
+    def crear(self, usuario_id, perfil, codigo=None):
+        codigo = codigo or generar_codigo()
+        parametros = {"usuario_id": usuario_id, "codigo": codigo, "perfil": json.dumps(perfil),
+                      "ttl": int(self.ttl)}
+        conn = self._conectar()
+        try:
+            conn.execute(_PURGAR_DESAFIOS)
+            if not conn.execute(_REEMPLAZAR_DESAFIO, parametros).rowcount:
+                try:
+                    conn.execute(_INSERTAR_DESAFIO, parametros)
+                except IntegrityError:
+                    # Otro login del mismo usuario insertó primero: se reemplaza su desafío
+                    conn.rollback()
+                    conn.execute(_REEMPLAZAR_DESAFIO, parametros)
+            conn.commit()
+        finally:
+            conn.close()
+        self._contar_creado()
+        return codigo
+
+    def verificar(self, usuario_id, codigo):
+        conn = self._conectar()
+        try:
+            fila = conn.execute(_INTENTO_DESAFIO, {"usuario_id": usuario_id}).fetchone()
+            if fila is None:
+                conn.commit()
+                return self._contar(EXPIRADO), None
+            intentos, codigo_guardado, perfil = fila
+            if _coincide(codigo_guardado, codigo):
+                # Solo una de dos verificaciones simultáneas correctas borra la fila
+                borrado = conn.execute(_CONSUMIR_DESAFIO, {"usuario_id": usuario_id, "codigo": codigo_guardado})
+                conn.commit()
+                if borrado.rowcount:
+                    return self._contar(VALIDO), json.loads(perfil)
+                return self._contar(EXPIRADO), None
+            if intentos >= self.intentos_max:
+                conn.execute(_DESCARTAR_DESAFIO, {"usuario_id": usuario_id})
+                conn.commit()
+                return self._contar(BLOQUEADO), None
+            conn.commit()
+            return self._contar(INVALIDO), None
+        finally:
+            conn.close()
+
+    def descartar(self, usuario_id):
+        conn = self._conectar()
+        try:
+            conn.execute(_DESCARTAR_DESAFIO, {"usuario_id": usuario_id})
+            conn.commit()
+        finally:
+            conn.close()
+
+    def estado(self):
+        with self._lock_contadores:
+            return {
+                "almacen": "bd",
+                "desafios": None,
+                "ttl": self.ttl,
+                "intentosMax": self.intentos_max,
+                "creados": self.creados,
+                "verificaciones": dict(self.resultados)
+            }
+
+
+def crear_almacen(entorno=None):
+    entorno = os.environ if entorno is None else entorno
+    ttl = float(entorno.get('DOSFA_TTL', 300))
+    intentos_max = int(entorno.get('DOSFA_INTENTOS_MAX', 5))
+    if ttl <= 0 or intentos_max < 1:
+        raise ValueError("DOSFA_TTL y DOSFA_INTENTOS_MAX deben ser positivos")
+    url = entorno.get('DOSFA_REDIS_URL')
+    if url:
+        return AlmacenDesafiosRedis(url, ttl=ttl, intentos_max=intentos_max)
+    if int(entorno.get('WEB_CONCURRENCY', 1)) > 1:
+        # La memoria de un worker no la ven los demás: la verificación fallaría al azar
+        return AlmacenDesafiosBD(ttl=ttl, intentos_max=intentos_max)
+    return AlmacenDesafios(ttl=ttl, intentos_max=intentos_max,
+                           max_desafios=int(entorno.get('DOSFA_MAX_DESAFIOS', 100000)))
+
+
+almacen_desafios = crear_almacen()
@@ -0,0 +1,294 @@
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text, bindparam
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from src.conexion import engine
+
+# Estadísticas del panel de administración (ver SQL/add_estadisticas.sql).
+#
+# Los triggers TR_Estadisticas_* mantienen, en la misma transacción que cada escritura:
+#   - Estadisticas_Contadores: vacantesActivas, candidatosRegistrados y empresasActivas
+#     (sin vacantes ni usuarios eliminados)
+#   - Estadisticas_Periodos: postulaciones y vacantes publicadas por día ('D') y por mes ('M')
+# El panel lee tres contadores y el mes en curso; un rango de fechas suma los meses
+# completos y los días sueltos de los extremos, a lo sumo unas 60 filas de días.
+#
+# reconciliar() recalcula todo desde las tablas y corrige las diferencias sumando el delta
+# (no sobrescribe), para no perder lo que los triggers sumen mientras tanto. Se ejecuta en
+# un hilo cuando el panel encuentra una reconciliación con más de ESTADISTICAS_RECONCILIAR
+# segundos, o con POST /api/admin/estadisticas/reconciliar.
+#
+#   variable de entorno          por defecto
+#   ESTADISTICAS_RECONCILIAR     3600   segundos (0: solo manual)
+
+ESTADISTICAS_RECONCILIAR = float(os.environ.get('ESTADISTICAS_RECONCILIAR', 3600))
+
+CONTADORES = ('vacantesActivas', 'candidatosRegistrados', 'empresasActivas')
+METRICAS_PERIODO = ('postulaciones', 'vacantes')
+AGRUPACIONES = ('dia', 'mes')
+
+_consulta_panel = text("""
+    SELECT Metrica, Valor, Fecha_Reconciliacion FROM Estadisticas_Contadores
+    UNION ALL
+    SELECT 'postulacionesMes', Cantidad, NULL FROM Estadisticas_Periodos
+    WHERE Metrica = 'postulaciones' AND Granularidad = 'M' AND Inicio = :mes
+""")
+
+# Meses completos del rango por su fila 'M' y los días de los extremos por sus filas 'D'
+_consulta_periodos = text("""
+    SELECT Metrica, Granularidad, Inicio, Cantidad FROM Estadisticas_Periodos
+    WHERE Metrica IN :metricas AND (
+        (Granularidad = 'M' AND Inicio >= :primer_mes AND Inicio < :fin_meses)
+        OR (Granularidad = 'D' AND Inicio >= :desde AND Inicio < :primer_mes)
+        OR (Granularidad = 'D' AND Inicio >= :fin_meses AND Inicio <= :hasta)
+    )
+""").bindparams(bindparam('metricas', expanding=True))
+
+_consulta_dias = text("""
+    SELECT Metrica, Granularidad, Inicio, Cantidad FROM Estadisticas_Periodos
+    WHERE Metrica IN :metricas AND Granularidad = 'D' AND Inicio >= :desde AND Inicio <= :hasta
+""").bindparams(bindparam('metricas', expanding=True))
+
+_contadores_reales = text("""
+    SELECT
+        (SELECT COUNT(*) FROM Vacantes WHERE Estado = 'Abierta' AND eliminado = 0) AS vacantesActivas,
+        (SELECT COUNT(*) FROM Candidatos C JOIN Usuario U ON U.ID = C.ID_Usuario
+         WHERE U.eliminado = 0) AS candidatosRegistrados,
+        (SELECT COUNT(*) FROM Empresa E JOIN Usuario U ON U.ID = E.ID_Usuario
+         WHERE U.eliminado = 0) AS empresasActivas
+""")
+
+# Conteos reales por día; los meses se suman en Python
+_dias_reales = {
+    'postulaciones': text("""
+        SELECT Fecha_Publicacion AS Fecha, COUNT(*) AS Cantidad FROM Postulaciones
+        WHERE Fecha_Publicacion IS NOT NULL GROUP BY Fecha_Publicacion
+    """),
+    'vacantes': text("""
+        SELECT Fecha_Publicacion AS Fecha, COUNT(*) AS Cantidad FROM Vacantes
+        WHERE eliminado = 0 AND Fecha_Publicacion IS NOT NULL GROUP BY Fecha_Publicacion
+    """)
+}
+
+_periodos_guardados = text("SELECT Metrica, Granularidad, Inicio, Cantidad FROM Estadisticas_Periodos")
+_sumar_contador = text("""
+    UPDATE Estadisticas_Contadores SET Valor = Valor + :delta, Fecha_Reconciliacion = GETDATE()
+    WHERE Metrica = :metrica
+""")
+_insertar_contador = text("""
+    INSERT INTO Estadisticas_Contadores (Metrica, Valor, Fecha_Reconciliacion) VALUES (:metrica, :valor, GETDATE())
+""")
+_sumar_periodo = text("""
+    UPDATE Estadisticas_Periodos SET Cantidad = Cantidad + :delta
+    WHERE Metrica = :metrica AND Granularidad = :granularidad AND Inicio = :inicio
+""")
+_insertar_periodo = text("""
+    INSERT INTO Estadisticas_Periodos (Metrica, Granularidad, Inicio, Cantidad)
+    VALUES (:metrica, :granularidad, :inicio, :cantidad)
+""")
+_borrar_periodos_vacios = text("DELETE FROM Estadisticas_Periodos WHERE Cantidad = 0")
+
+
+def como_fecha(valor):
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, str):
+        return date.fromisoformat(valor[:10])
+    return valor
+
+
+def _como_fecha_hora(valor):
+    if isinstance(valor, str):
+        return datetime.fromisoformat(valor)
+    return valor
+
+
+def inicio_de_mes(fecha):
+    return fecha.replace(day=1)
+
+
+def mes_siguiente(fecha):
+    return (fecha.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def limites_meses(desde, hasta):
+    """(primer mes completo, primer día tras el último mes completo) del rango [desde, hasta].
+
+    Si el rango no contiene ningún mes completo ambos valen hasta + 1 día: todo se lee por días.
+    """
+    primer_mes = desde if desde.day == 1 else mes_siguiente(desde)
+    siguiente = hasta + timedelta(days=1)
+    fin_meses = siguiente if siguiente.day == 1 else inicio_de_mes(hasta)
+    if primer_mes >= fin_meses:
+        return siguiente, siguiente
+    return primer_mes, fin_meses
+
+
+class EstadisticasAdmin:
+    def __init__(self, intervalo=3600):
+        self.intervalo = intervalo
+        self._lock = threading.Lock()
+        self._lock_inicial = threading.Lock()
+        self._reconciliando = False
+        self.reconciliaciones = 0
+        self.correcciones = 0
+        self.errores = 0
+        self.ultima_reconciliacion = None
+
+    def panel(self, conn, hoy=None):
+        """Contadores del panel y postulaciones del mes en curso"""
+        hoy = hoy or date.today()
+        filas = conn.execute(_consulta_panel, {"mes": inicio_de_mes(hoy)}).fetchall()
+        valores = {fila.Metrica: fila.Valor for fila in filas}
+        if any(contador not in valores for contador in CONTADORES):
+            # Nunca reconciliadas (p. ej. base local recién creada): la primera vez se espera.
+            # Una sola petición por proceso las crea; si otro proceso se adelanta, se vuelve a leer
+            with self._lock_inicial:
+                faltan = conn.execute(text("SELECT COUNT(*) FROM Estadisticas_Contadores")).scalar() < len(CONTADORES)
+                if faltan:
+                    try:
+                        self.reconciliar(conn)
+                        conn.commit()
+                    except IntegrityError:
+                        conn.rollback()
+            return self.panel(conn, hoy)
+
+        reconciliadas = [_como_fecha_hora(fila.Fecha_Reconciliacion) for fila in filas if fila.Metrica in CONTADORES]
+        if self.intervalo and any(fecha is None or (datetime.now() - fecha).total_seconds() > self.intervalo
+                                  for fecha in reconciliadas):
+            self.reconciliar_en_segundo_plano()
+        return {
+            "vacantesActivas": valores['vacantesActivas'],
+            "candidatosRegistrados": valores['candidatosRegistrados'],
+            "empresasActivas": valores['empresasActivas'],
+            "postulacionesMes": valores.get('postulacionesMes', 0)
+        }
+
+    def periodo(self, conn, desde, hasta, agrupar='mes', metricas=METRICAS_PERIODO):
+        """Totales de 'metricas' entre 'desde' y 'hasta' (inclusive) y su serie por día o por mes"""
+        if agrupar == 'dia':
+            filas = conn.execute(_consulta_dias, {"metricas": list(metricas), "desde": desde, "hasta": hasta})
+        else:
+            primer_mes, fin_meses = limites_meses(desde, hasta)
+            filas = conn.execute(_consulta_periodos, {
+                "metricas": list(metricas), "desde": desde, "hasta": hasta,
+                "primer_mes": primer_mes, "fin_meses": fin_meses
+            })
+        totales = dict.fromkeys(metricas, 0)
+        serie = {}
+        for fila in filas:
+            inicio = como_fecha(fila.Inicio)
+            clave = inicio if agrupar == 'dia' else inicio_de_mes(inicio)
+            totales[fila.Metrica] += fila.Cantidad
+            punto = serie.setdefault(clave, dict.fromkeys(metricas, 0))
+            punto[fila.Metrica] += fila.Cantidad
+        return {
+            "desde": desde.isoformat(),
+            "hasta": hasta.isoformat(),
+            "agrupar": agrupar,
+            "totales": totales,
+            "serie": [{"inicio": clave.isoformat(), **serie[clave]} for clave in sorted(serie)]
+        }
+
+    def reconciliar(self, conn):
+        """Recalcular desde las tablas y corregir contadores y periodos. No hace commit"""
+        inicio = time.perf_counter()
+        reales = conn.execute(_contadores_reales).fetchone()._mapping
+        guardados = {fila.Metrica: fila.Valor for fila in conn.execute(text(
+            "SELECT Metrica, Valor FROM Estadisticas_Contadores"))}
+        diferencias = {}
+        for metrica in CONTADORES:
+            if metrica not in guardados:
+                conn.execute(_insertar_contador, {"metrica": metrica, "valor": reales[metrica]})
+                diferencias[metrica] = reales[metrica]
+                continue
+            delta = reales[metrica] - guardados[metrica]
+            conn.execute(_sumar_contador, {"metrica": metrica, "delta": delta})
+            if delta:
+                diferencias[metrica] = delta
+
+        esperados = {}
+        for metrica, consulta in _dias_reales.items():
+            for fila in conn.execute(consulta):
+                dia = como_fecha(fila.Fecha)
+                esperados[(metrica, 'D', dia)] = esperados.get((metrica, 'D', dia), 0) + fila.Cantidad
+                mes = (metrica, 'M', inicio_de_mes(dia))
+                esperados[mes] = esperados.get(mes, 0) + fila.Cantidad
+        actuales = {(fila.Metrica, fila.Granularidad, como_fecha(fila.Inicio)): fila.Cantidad
+                    for fila in conn.execute(_periodos_guardados)}
+        periodos_corregidos = 0
+        for clave in esperados.keys() | actuales.keys():
+            metrica, granularidad, inicio_periodo = clave
+            delta = esperados.get(clave, 0) - actuales.get(clave, 0)
+            if not delta:
+                continue
+            periodos_corregidos += 1
+            parametros = {"metrica": metrica, "granularidad": granularidad, "inicio": inicio_periodo}
+            if clave in actuales:
+                conn.execute(_sumar_periodo, {**parametros, "delta": delta})
+            else:
+                conn.execute(_insertar_periodo, {**parametros, "cantidad": delta})
+        conn.execute(_borrar_periodos_vacios)
+
+        resultado = {
+            "fecha": time.strftime('%Y-%m-%dT%H:%M:%S'),
+            "segundos": round(time.perf_counter() - inicio, 3),
+            "contadores": diferencias,
+            "periodosCorregidos": periodos_corregidos
+        }
+        with self._lock:
+            self.reconciliaciones += 1
+            self.correcciones += len(diferencias) + periodos_corregidos
+            self.ultima_reconciliacion = resultado
+        return resultado
+
+    def reconciliar_en_segundo_plano(self):
+        """Reconciliar en un hilo con su propia conexión; no hace nada si ya hay una en curso"""
+        with self._lock:
+            if self._reconciliando:
+                return
+            self._reconciliando = True
+        threading.Thread(target=self._reconciliar_con_conexion, daemon=True).start()
+
+    def _reconciliar_con_conexion(self):
+        try:
+            with engine.connect() as conn:
+                self.reconciliar(conn)
+                conn.commit()
+        except SQLAlchemyError:
+            # Se reintenta en la siguiente lectura del panel
+            with self._lock:
+                self.errores += 1
+        finally:
+            with self._lock:
+                self._reconciliando = False
+
+    def estado(self):
+        with self._lock:
+            return {
+                "intervaloSegundos": self.intervalo,
+                "reconciliaciones": self.reconciliaciones,
+                "correcciones": self.correcciones,
+                "errores": self.errores,
+                "enCurso": self._reconciliando,
+                "ultimaReconciliacion": self.ultima_reconciliacion
+            }
+
+    def metricas(self):
+        """Líneas de /metrics de la reconciliación de estadísticas"""
+        estado = self.estado()
+        return [
+            "# HELP bolsa_estadisticas_reconciliaciones_total Reconciliaciones de las estadísticas de administración",
+            "# TYPE bolsa_estadisticas_reconciliaciones_total counter",
+            f"bolsa_estadisticas_reconciliaciones_total {estado['reconciliaciones']}",
+            "# HELP bolsa_estadisticas_correcciones_total Contadores y periodos corregidos al reconciliar",
+            "# TYPE bolsa_estadisticas_correcciones_total counter",
+            f"bolsa_estadisticas_correcciones_total {estado['correcciones']}"
+        ]
+
+
+estadisticas_admin = EstadisticasAdmin(intervalo=ESTADISTICAS_RECONCILIAR)
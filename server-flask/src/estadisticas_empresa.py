@@ -0,0 +1,180 @@
+import time
+from datetime import timedelta
+
+from sqlalchemy import text
+
+from src.estadisticas import como_fecha
+
+# Estadísticas de postulaciones de cada empresa (ver SQL/add_resumen_postulaciones.sql).
+#
+# TR_Resumen_Postulaciones mantiene, en la misma transacción que cada postulación creada
+# (crear_postulacion), cambio de estado (actualizar_estado_postulacion y administración) o borrado:
+#   - Resumen_Postulaciones_Empresa y Resumen_Postulaciones_Vacante: postulaciones por día
+#     (Fecha_Publicacion) y estado actual
+#   - Resumen_Estados_Vacante: postulaciones por estado de cada vacante
+# La serie de un rango lee a lo sumo una fila por día y estado (de la empresa o de una
+# vacante) y agrupa las semanas en Python; el desglose lee una fila por estado de las vacantes
+# con más postulaciones. Nada depende del número de postulaciones de la empresa.
+#
+# Cuentan todas las postulaciones recibidas, también las de candidatos o vacantes eliminados
+# después (el listado de GET /api/empresa/<id>/postulaciones las omite); el desglose por
+# vacante solo incluye las vacantes no eliminadas.
+#
+# reconciliar_resumenes() recalcula los resúmenes desde Postulaciones y corrige las diferencias
+# sumando el delta, igual que src/estadisticas.py; lo ejecuta POST /api/admin/estadisticas/reconciliar.
+
+ESTADOS_POSTULACION = ('Pendiente', 'En Revisión', 'Aceptado', 'Rechazado')
+AGRUPACIONES_EMPRESA = ('dia', 'semana')
+
+_serie_empresa = text("""
+    SELECT Fecha, Estado, Cantidad FROM Resumen_Postulaciones_Empresa
+    WHERE ID_Empresa = :empresa_id AND Fecha >= :desde AND Fecha <= :hasta
+""")
+_serie_vacante = text("""
+    SELECT Fecha, Estado, Cantidad FROM Resumen_Postulaciones_Vacante
+    WHERE ID_Vacante = :vacante_id AND Fecha >= :desde AND Fecha <= :hasta
+""")
+
+# Las 'limite' vacantes con más postulaciones (IX_Vacantes_Empresa) o una sola, con una fila por estado
+_estados_vacantes = """
+    SELECT V.ID, V.Titulo_puesto, V.Estado, R.Estado AS EstadoPostulacion, R.Cantidad
+    FROM (
+        SELECT {top} ID, Titulo_puesto, Estado, CantidadPostulaciones FROM Vacantes
+        WHERE ID_Empresa = :empresa_id AND eliminado = 0 {filtro}
+        ORDER BY CantidadPostulaciones DESC, ID DESC
+    ) V
+    LEFT JOIN Resumen_Estados_Vacante R ON R.ID_Vacante = V.ID
+    ORDER BY V.CantidadPostulaciones DESC, V.ID DESC
+"""
+_estados_de_vacantes = text(_estados_vacantes.format(top="TOP (:limite)", filtro=""))
+_estados_de_vacante = text(_estados_vacantes.format(top="TOP (1)", filtro="AND ID = :vacante_id"))
+
+# Conteos reales por vacante, día y estado; el resto de resúmenes se suman en Python
+_resumen_real = text("""
+    SELECT P.ID_Vacante, V.ID_Empresa, P.Fecha_Publicacion AS Fecha,
+           COALESCE(P.Estado, 'Pendiente') AS Estado, COUNT(*) AS Cantidad
+    FROM Postulaciones P
+    LEFT JOIN Vacantes V ON V.ID = P.ID_Vacante
+    WHERE P.ID_Vacante IS NOT NULL
+    GROUP BY P.ID_Vacante, V.ID_Empresa, P.Fecha_Publicacion, COALESCE(P.Estado, 'Pendiente')
+""")
+
+# Tabla -> columnas de la clave
+_RESUMENES = {
+    'Resumen_Postulaciones_Empresa': ('ID_Empresa', 'Fecha', 'Estado'),
+    'Resumen_Postulaciones_Vacante': ('ID_Vacante', 'Fecha', 'Estado'),
+    'Resumen_Estados_Vacante': ('ID_Vacante', 'Estado')
+}
+
+
+def _sentencias_resumen(tabla, columnas):
+    condicion = ' AND '.join(f"{columna} = :{columna}" for columna in columnas)
+    return {
+        "leer": text(f"SELECT {', '.join(columnas)}, Cantidad FROM {tabla}"),
+        "sumar": text(f"UPDATE {tabla} SET Cantidad = Cantidad + :delta WHERE {condicion}"),
+        "insertar": text(f"INSERT INTO {tabla} ({', '.join(columnas)}, Cantidad) "
+                         f"VALUES ({', '.join(':' + columna for columna in columnas)}, :delta)"),
+        "borrar_vacias": text(f"DELETE FROM {tabla} WHERE Cantidad = 0")
+    }
+
+
+_SENTENCIAS = {tabla: _sentencias_resumen(tabla, columnas) for tabla, columnas in _RESUMENES.items()}
+
+
+def _por_estado():
+    return dict.fromkeys(ESTADOS_POSTULACION, 0)
+
+
+def inicio_de_semana(fecha):
+    """Lunes de la semana de 'fecha'"""
+    return fecha - timedelta(days=fecha.weekday())
+
+
+def estadisticas_postulaciones(conn, empresa_id, desde, hasta, agrupar='dia', vacante_id=None, limite=20):
+    """Postulaciones de la empresa (o de una de sus vacantes) entre 'desde' y 'hasta' por día o
+    semana y estado, y el desglose acumulado por estado de sus 'limite' vacantes con más postulaciones.
+
+    Devuelve None si 'vacante_id' no es una vacante no eliminada de la empresa.
+    """
+    if vacante_id is None:
+        vacantes = conn.execute(_estados_de_vacantes, {"empresa_id": empresa_id, "limite": limite})
+        filas = conn.execute(_serie_empresa, {"empresa_id": empresa_id, "desde": desde, "hasta": hasta})
+    else:
+        vacantes = conn.execute(_estados_de_vacante, {"empresa_id": empresa_id, "vacante_id": vacante_id}).fetchall()
+        if not vacantes:
+            return None
+        filas = conn.execute(_serie_vacante, {"vacante_id": vacante_id, "desde": desde, "hasta": hasta})
+
+    desglose = {}
+    for fila in vacantes:
+        vacante = desglose.setdefault(fila.ID, {
+            "id": fila.ID,
+            "titulo": fila.Titulo_puesto,
+            "estado": fila.Estado,
+            "postulaciones": 0,
+            "porEstado": _por_estado()
+        })
+        if fila.EstadoPostulacion is not None:
+            vacante["postulaciones"] += fila.Cantidad
+            vacante["porEstado"][fila.EstadoPostulacion] = vacante["porEstado"].get(fila.EstadoPostulacion, 0) + fila.Cantidad
+
+    totales = {"postulaciones": 0, "porEstado": _por_estado()}
+    serie = {}
+    for fila in filas:
+        fecha = como_fecha(fila.Fecha)
+        clave = fecha if agrupar == 'dia' else inicio_de_semana(fecha)
+        punto = serie.setdefault(clave, {"postulaciones": 0, "porEstado": _por_estado()})
+        for acumulado in (totales, punto):
+            acumulado["postulaciones"] += fila.Cantidad
+            acumulado["porEstado"][fila.Estado] = acumulado["porEstado"].get(fila.Estado, 0) + fila.Cantidad
+    return {
+        "desde": desde.isoformat(),
+        "hasta": hasta.isoformat(),
+        "agrupar": agrupar,
+        "vacanteId": vacante_id,
+        "totales": totales,
+        "serie": [{"inicio": clave.isoformat(), **serie[clave]} for clave in sorted(serie)],
+        "vacantes": list(desglose.values())
+    }
+
+
+def reconciliar_resumenes(conn):
+    """Recalcular los resúmenes de postulaciones desde Postulaciones y corregirlos. No hace commit"""
+    inicio = time.perf_counter()
+    esperados = {tabla: {} for tabla in _RESUMENES}
+    for fila in conn.execute(_resumen_real):
+        fecha = como_fecha(fila.Fecha)
+        claves = {'Resumen_Estados_Vacante': (fila.ID_Vacante, fila.Estado)}
+        if fecha is not None:
+            claves['Resumen_Postulaciones_Vacante'] = (fila.ID_Vacante, fecha, fila.Estado)
+            if fila.ID_Empresa is not None:
+                claves['Resumen_Postulaciones_Empresa'] = (fila.ID_Empresa, fecha, fila.Estado)
+        for tabla, clave in claves.items():
+            esperados[tabla][clave] = esperados[tabla].get(clave, 0) + fila.Cantidad
+
+    corregidas = {}
+    for tabla, columnas in _RESUMENES.items():
+        sentencias = _SENTENCIAS[tabla]
+        actuales = {}
+        for fila in conn.execute(sentencias["leer"]):
+            clave = tuple(como_fecha(valor) if columna == 'Fecha' else valor
+                          for columna, valor in zip(columnas, fila))
+            actuales[clave] = fila.Cantidad
+        sumas, inserciones = [], []
+        for clave in esperados[tabla].keys() | actuales.keys():
+            delta = esperados[tabla].get(clave, 0) - actuales.get(clave, 0)
+            if not delta:
+                continue
+            parametros = dict(zip(columnas, clave), delta=delta)
+            (sumas if clave in actuales else inserciones).append(parametros)
+        if sumas:
+            conn.execute(sentencias["sumar"], sumas)
+        if inserciones:
+            conn.execute(sentencias["insertar"], inserciones)
+        conn.execute(sentencias["borrar_vacias"])
+        if sumas or inserciones:
+            corregidas[tabla] = len(sumas) + len(inserciones)
+    return {
+        "segundos": round(time.perf_counter() - inicio, 3),
+        "filasCorregidas": corregidas
+    }
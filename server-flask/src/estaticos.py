@@ -0,0 +1,86 @@
+import os
+import re
+from urllib.parse import quote
+
+from flask import current_app, jsonify, request
+from werkzeug.security import safe_join
+from werkzeug.utils import send_file
+
+from src.almacen_archivos import nombre_generado
+
+# Entrega de /static (CV, imágenes de perfil y recursos por defecto).
+#
+# - Nombres generados por las subidas (<sha256>.ext y los cv_/user_ con uuid anteriores):
+#   su contenido no cambia, así que se responden con Cache-Control público de un año e
+#   "immutable". En los nombres por contenido el ETag es el propio hash.
+# - El resto (imágenes por defecto, archivos de ejemplo): ESTATICOS_MAX_AGE segundos y
+#   revalidación con ETag/Last-Modified (304 sin cuerpo).
+# - Range (206): los visores de PDF piden el archivo por partes.
+# - ESTATICOS_DESCARGA=x-sendfile (Apache, lighttpd) o x-accel (nginx): el worker solo
+#   responde los encabezados y el servidor web envía el archivo y atiende el Range. Con
+#   x-accel, ESTATICOS_ACCEL_PREFIJO es la location interna de nginx que apunta a src/static.
+#
+#   variable de entorno       por defecto
+#   ESTATICOS_CARPETA         src/static
+#   ESTATICOS_MAX_AGE         300
+#   ESTATICOS_DESCARGA        python
+#   ESTATICOS_ACCEL_PREFIJO   /_estaticos/
+
+CARPETA_ESTATICOS = os.environ.get(
+    'ESTATICOS_CARPETA', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+)
+ESTATICOS_MAX_AGE = int(os.environ.get('ESTATICOS_MAX_AGE', 300))
+MAX_AGE_INMUTABLE = 365 * 24 * 3600
+DESCARGAS = ('python', 'x-sendfile', 'x-accel')
+ESTATICOS_DESCARGA = os.environ.get('ESTATICOS_DESCARGA', 'python')
+if ESTATICOS_DESCARGA not in DESCARGAS:
+    raise ValueError(f"ESTATICOS_DESCARGA debe ser uno de: {', '.join(DESCARGAS)}")
+ESTATICOS_ACCEL_PREFIJO = os.environ.get('ESTATICOS_ACCEL_PREFIJO', '/_estaticos/')
+
+_POR_CONTENIDO = re.compile(r'^([0-9a-f]{64})\.[a-z0-9]+$')
+# Con descarga delegada el Range lo atiende el servidor web sobre el archivo completo
+_ENCABEZADOS_RANGO = ('HTTP_RANGE', 'HTTP_IF_RANGE')
+
+
+def _cache_inmutable(respuesta):
+    respuesta.cache_control.public = True
+    respuesta.cache_control.max_age = MAX_AGE_INMUTABLE
+    respuesta.cache_control.immutable = True
+
+
+def enviar_estatico(ruta_relativa):
+    """Respuesta con el archivo 'ruta_relativa' de CARPETA_ESTATICOS (404 JSON si no existe)"""
+    descarga = ESTATICOS_DESCARGA
+    ruta = safe_join(CARPETA_ESTATICOS, ruta_relativa)
+    if ruta is None or not os.path.isfile(ruta):
+        return jsonify({"error": "Archivo no encontrado"}), 404
+
+    nombre = os.path.basename(ruta)
+    inmutable = nombre_generado(nombre)
+    por_contenido = _POR_CONTENIDO.match(nombre)
+    if por_contenido and request.if_none_match.contains(por_contenido.group(1)):
+        # El ETag es el hash del nombre: se revalida sin abrir el archivo
+        respuesta = current_app.response_class(status=304)
+        respuesta.set_etag(por_contenido.group(1))
+        _cache_inmutable(respuesta)
+        return respuesta
+
+    environ = request.environ
+    if descarga != 'python':
+        environ = {k: v for k, v in environ.items() if k not in _ENCABEZADOS_RANGO}
+
+    respuesta = send_file(
+        ruta, environ,
+        max_age=MAX_AGE_INMUTABLE if inmutable else ESTATICOS_MAX_AGE,
+        etag=por_contenido.group(1) if por_contenido else True,
+        conditional=True,
+        use_x_sendfile=descarga != 'python',
+        response_class=current_app.response_class
+    )
+    if inmutable:
+        _cache_inmutable(respuesta)
+    if descarga == 'x-accel' and 'X-Sendfile' in respuesta.headers:
+        del respuesta.headers['X-Sendfile']
+        relativa = os.path.relpath(ruta, CARPETA_ESTATICOS).replace(os.sep, '/')
+        respuesta.headers['X-Accel-Redirect'] = ESTATICOS_ACCEL_PREFIJO + quote(relativa)
+    return respuesta
@@ -0,0 +1,69 @@
+import os
+from collections import namedtuple
+
+from sqlalchemy import text
+
+from src.cache import CacheTTL
+from src.conexion import obtener_conexion
+
+# Rol, perfil de candidato y empresa de cada usuario para las comprobaciones de autorización
+# de las rutas de candidato y empresa. Cambian solo en el registro, al crear una empresa y
+# desde el panel de administración; esas rutas llaman a invalidar_identidad().
+#
+#   variable de entorno          por defecto
+#   CACHE_IDENTIDADES_MAX        10000
+#   CACHE_IDENTIDADES_TTL        60     segundos; acota lo que tarda otro worker en ver un cambio
+#   CACHE_IDENTIDADES_HABILITADO 1
+
+Identidad = namedtuple('Identidad', 'rol candidato_id empresa_id eliminado')
+
+# MIN(ID) equivale al TOP (1) ... ORDER BY ID de acceso_datos
+_consulta_identidad = text("""
+    SELECT
+        U.ROL,
+        U.eliminado,
+        (SELECT MIN(C.ID) FROM Candidatos C WHERE C.ID_Usuario = U.ID) AS CandidatoID,
+        (SELECT MIN(E.ID) FROM Empresa E WHERE E.ID_Usuario = U.ID) AS EmpresaID
+    FROM Usuario U
+    WHERE U.ID = :user_id
+""")
+
+cache_identidades = CacheTTL(
+    max_entradas=int(os.environ.get('CACHE_IDENTIDADES_MAX', 10000)),
+    ttl=float(os.environ.get('CACHE_IDENTIDADES_TTL', 60)),
+    habilitado=os.environ.get('CACHE_IDENTIDADES_HABILITADO', '1') != '0'
+)
+
+
+def _consultar(conn, user_id):
+    fila = conn.execute(_consulta_identidad, {"user_id": user_id}).fetchone()
+    if fila is None:
+        return None
+    return Identidad(fila.ROL, fila.CandidatoID, fila.EmpresaID, bool(fila.eliminado))
+
+
+def obtener_identidad(user_id, conn=None):
+    """Identidad del usuario o None si no existe (también se guarda en caché).
+
+    Con un acierto no se toma conexión; en un fallo se usa 'conn' si se indica
+    (p. ej. dentro de la transacción de la ruta) o una conexión propia.
+    """
+    encontrado, identidad = cache_identidades.obtener(user_id)
+    if encontrado:
+        return identidad
+    generacion = cache_identidades.generacion
+    if conn is not None:
+        identidad = _consultar(conn, user_id)
+    else:
+        propia = obtener_conexion()
+        try:
+            identidad = _consultar(propia, user_id)
+        finally:
+            propia.close()
+    cache_identidades.guardar(user_id, identidad, generacion)
+    return identidad
+
+
+def invalidar_identidad(*user_ids):
+    """Hook para toda escritura que cambie el rol, el perfil, la empresa o el borrado de usuarios"""
+    cache_identidades.descartar(*user_ids)
@@ -0,0 +1,96 @@
+import csv
+import io
+import json
+import os
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+# Filas por transacción en la importación masiva
+FILAS_POR_LOTE = 500
+# Máximo de errores detallados en la respuesta (el total siempre se informa)
+MAX_ERRORES_REPORTADOS = 1000
+# Tamaño máximo del archivo (se lee en streaming, no se carga en memoria)
+IMPORTACION_MAX_BYTES = int(float(os.environ.get('IMPORTACION_MAX_MB', 200)) * 1024 * 1024)
+
+CAMPOS_REQUERIDOS = ['titulo', 'descripcion', 'requisitos', 'salario', 'tipoContrato', 'ubicacion']
+ESTADOS_VALIDOS = ['Abierta', 'Cerrada']
+
+FORMATOS_IMPORTACION = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson'
+}
+
+
+def detectar_formato(formato, mimetype, nombre_archivo=None):
+    """Resolver el formato a partir del parámetro explícito, el nombre del archivo o el Content-Type"""
+    if formato:
+        return formato if formato in FORMATOS_IMPORTACION else None
+    if nombre_archivo and '.' in nombre_archivo:
+        extension = nombre_archivo.rsplit('.', 1)[1].lower()
+        if extension in ('csv', 'ndjson', 'jsonl'):
+            return 'csv' if extension == 'csv' else 'ndjson'
+    for nombre, tipo in FORMATOS_IMPORTACION.items():
+        if mimetype == tipo:
+            return nombre
+    return None
+
+
+def leer_filas(stream, formato):
+    """Leer el archivo línea por línea. Genera (linea, datos, error) sin cargarlo completo en memoria"""
+    texto = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if formato == 'csv':
+        lector = csv.DictReader(texto)
+        for fila in lector:
+            yield lector.line_num, fila, None
+        return
+    for numero, linea in enumerate(texto, start=1):
+        if not linea.strip():
+            continue
+        try:
+            datos = json.loads(linea)
+        except ValueError:
+            yield numero, None, "JSON inválido"
+            continue
+        if not isinstance(datos, dict):
+            yield numero, None, "Cada línea debe ser un objeto JSON"
+            continue
+        yield numero, datos, None
+
+
+def validar_vacante(datos):
+    """Validar los campos de una vacante como en crear_vacante. Devuelve (parametros, error)"""
+    for campo in CAMPOS_REQUERIDOS:
+        valor = datos.get(campo)
+        if valor is None or (isinstance(valor, str) and not valor.strip()):
+            return None, f"Campo requerido: {campo}"
+
+    try:
+        salario = Decimal(str(datos['salario']).strip())
+    except InvalidOperation:
+        return None, "El salario debe ser numérico"
+    if not salario.is_finite():
+        return None, "El salario debe ser numérico"
+    if salario < 0:
+        return None, "El salario no puede ser negativo"
+
+    fecha_cierre = datos.get('fechaCierre') or None
+    if fecha_cierre is not None:
+        try:
+            fecha_cierre = date.fromisoformat(str(fecha_cierre).strip()[:10])
+        except ValueError:
+            return None, "fechaCierre debe tener formato AAAA-MM-DD"
+
+    estado = datos.get('estado') or 'Abierta'
+    if estado not in ESTADOS_VALIDOS:
+        return None, f"Estado inválido. Estados válidos: {', '.join(ESTADOS_VALIDOS)}"
+
+    return {
+        "Titulo_puesto": str(datos['titulo']).strip(),
+        "Descripcion": datos['descripcion'],
+        "Requisitos": datos['requisitos'],
+        "Salario": salario,
+        "Tipo_Contrato": str(datos['tipoContrato']).strip(),
+        "Ubicacion": str(datos['ubicacion']).strip(),
+        "Fecha_Cierre": fecha_cierre,
+        "Estado": estado
+    }, None
@@ -0,0 +1,294 @@
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import datetime
+
+from flask import g, request, has_app_context
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Consultas que tardan al menos este umbral (ms) se registran en el log de consultas lentas
+UMBRAL_CONSULTA_LENTA = float(os.environ.get('SQL_UMBRAL_LENTA_MS', 500)) / 1000
+MAX_CONSULTAS_LENTAS = int(os.environ.get('SQL_CONSULTAS_LENTAS_MAX', 100))
+# Límites (segundos) del histograma de duración de las peticiones
+LIMITES_DURACION = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+log_consultas_lentas = logging.getLogger('bolsa.sql.lentas')
+
+# Contador activo en el contexto actual (None si nadie está contando)
+_contador_actual = contextvars.ContextVar('contador_consultas', default=None)
+
+
+class ContadorConsultas:
+    """Sentencias enviadas a la base de datos mientras el contador está activo"""
+
+    def __init__(self):
+        self.sentencias = []
+
+    @property
+    def total(self):
+        return len(self.sentencias)
+
+
+@contextmanager
+def contar_consultas():
+    """Contar los viajes a la base de datos dentro del bloque.
+
+        with contar_consultas() as contador:
+            cliente.get('/api/candidato/5/postulaciones')
+        assert contador.total == 1
+    """
+    contador = ContadorConsultas()
+    token = _contador_actual.set(contador)
+    try:
+        yield contador
+    finally:
+        _contador_actual.reset(token)
+
+
+class MetricasPeticion:
+    """Costos acumulados de la petición en curso (se guarda en flask.g)"""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.consultas = 0
+        self.tiempo_sql = 0.0
+        self.espera_pool = 0.0
+        self.serializacion = 0.0
+        self.estado = None
+        self.en_streaming = False
+        self.registrada = False
+
+
+def _metricas_peticion():
+    return g.get('_metricas_peticion') if has_app_context() else None
+
+
+class _MetricasEndpoint:
+
+    def __init__(self):
+        self.peticiones = 0
+        self.duracion = 0.0
+        self.cubetas = [0] * len(LIMITES_DURACION)
+        self.consultas = 0
+        self.tiempo_sql = 0.0
+        self.espera_pool = 0.0
+        self.serializacion = 0.0
+
+
+def _etiquetas(**valores):
+    partes = []
+    for nombre, valor in valores.items():
+        valor = str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        partes.append(f'{nombre}="{valor}"')
+    return '{' + ','.join(partes) + '}'
+
+
+class RegistroMetricas:
+    """Agregados del proceso por endpoint y log de consultas lentas.
+
+    Cada worker de gunicorn tiene su propio registro; Prometheus suma los workers.
+    """
+
+    def __init__(self, umbral_lenta=UMBRAL_CONSULTA_LENTA, max_lentas=MAX_CONSULTAS_LENTAS):
+        self.umbral_lenta = umbral_lenta
+        self._lock = threading.Lock()
+        self._endpoints = defaultdict(_MetricasEndpoint)   # (endpoint, método) -> agregados
+        self._estados = defaultdict(int)                  # (endpoint, método, estado) -> peticiones
+        self._consultas_lentas = deque(maxlen=max_lentas)
+        self.total_consultas_lentas = 0
+        self._colectores = []
+
+    def agregar_colector(self, colector):
+        """Registrar una función que devuelve líneas adicionales para /metrics (p. ej. el pool)"""
+        self._colectores.append(colector)
+
+    def registrar_peticion(self, endpoint, metodo, metricas, duracion):
+        with self._lock:
+            agregados = self._endpoints[(endpoint, metodo)]
+            agregados.peticiones += 1
+            agregados.duracion += duracion
+            for i, limite in enumerate(LIMITES_DURACION):
+                if duracion <= limite:
+                    agregados.cubetas[i] += 1
+            agregados.consultas += metricas.consultas
+            agregados.tiempo_sql += metricas.tiempo_sql
+            agregados.espera_pool += metricas.espera_pool
+            agregados.serializacion += metricas.serializacion
+            self._estados[(endpoint, metodo, metricas.estado)] += 1
+
+    def registrar_consulta_lenta(self, sentencia, duracion, endpoint):
+        entrada = {
+            "fecha": datetime.now().isoformat(timespec='seconds'),
+            "duracionMs": round(duracion * 1000, 1),
+            "endpoint": endpoint,
+            # Solo la sentencia: los parámetros pueden contener datos personales
+            "sentencia": ' '.join(sentencia.split())[:1000]
+        }
+        with self._lock:
+            self._consultas_lentas.append(entrada)
+            self.total_consultas_lentas += 1
+        log_consultas_lentas.warning("Consulta lenta (%.1f ms) en %s: %s",
+                                     entrada["duracionMs"], endpoint or '-', entrada["sentencia"])
+
+    def consultas_lentas(self):
+        """Las consultas lentas más recientes primero"""
+        with self._lock:
+            return list(reversed(self._consultas_lentas))
+
+    def exportar(self):
+        """Agregados en el formato de texto de Prometheus"""
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            estados = sorted(self._estados.items(), key=lambda item: tuple(map(str, item[0])))
+            total_lentas = self.total_consultas_lentas
+
+        lineas = [
+            "# HELP bolsa_http_peticiones_total Peticiones atendidas por endpoint y código de estado",
+            "# TYPE bolsa_http_peticiones_total counter"
+        ]
+        for (endpoint, metodo, estado), cantidad in estados:
+            lineas.append(f"bolsa_http_peticiones_total{_etiquetas(endpoint=endpoint, metodo=metodo, estado=estado)} {cantidad}")
+
+        lineas += [
+            "# HELP bolsa_http_duracion_segundos Duración de las peticiones",
+            "# TYPE bolsa_http_duracion_segundos histogram"
+        ]
+        for (endpoint, metodo), agregados in endpoints:
+            for limite, cantidad in zip(LIMITES_DURACION, agregados.cubetas):
+                lineas.append(f"bolsa_http_duracion_segundos_bucket"
+                              f"{_etiquetas(endpoint=endpoint, metodo=metodo, le=limite)} {cantidad}")
+            lineas.append(f"bolsa_http_duracion_segundos_bucket"
+                          f"{_etiquetas(endpoint=endpoint, metodo=metodo, le='+Inf')} {agregados.peticiones}")
+            etiquetas = _etiquetas(endpoint=endpoint, metodo=metodo)
+            lineas.append(f"bolsa_http_duracion_segundos_sum{etiquetas} {agregados.duracion:.6f}")
+            lineas.append(f"bolsa_http_duracion_segundos_count{etiquetas} {agregados.peticiones}")
+
+        contadores = (
+            ("bolsa_sql_consultas_total", "Consultas SQL ejecutadas", 'consultas', "{}"),
+            ("bolsa_sql_duracion_segundos_total", "Tiempo en consultas SQL", 'tiempo_sql', "{:.6f}"),
+            ("bolsa_pool_espera_segundos_total", "Tiempo esperando una conexión del pool", 'espera_pool', "{:.6f}"),
+            ("bolsa_serializacion_segundos_total", "Tiempo serializando JSON", 'serializacion', "{:.6f}")
+        )
+        for nombre, ayuda, atributo, formato in contadores:
+            lineas += [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} counter"]
+            for (endpoint, metodo), agregados in endpoints:
+                valor = formato.format(getattr(agregados, atributo))
+                lineas.append(f"{nombre}{_etiquetas(endpoint=endpoint, metodo=metodo)} {valor}")
+
+        lineas += [
+            f"# HELP bolsa_sql_consultas_lentas_total Consultas de al menos {self.umbral_lenta * 1000:g} ms",
+            "# TYPE bolsa_sql_consultas_lentas_total counter",
+            f"bolsa_sql_consultas_lentas_total {total_lentas}"
+        ]
+        for colector in self._colectores:
+            lineas += colector()
+        return '\n'.join(lineas) + '\n'
+
+
+registro_metricas = RegistroMetricas()
+
+
+def _endpoint_actual():
+    """Regla de la ruta (p. ej. /api/empresa/<int:user_id>/vacantes) para no crear una serie por ID"""
+    regla = request.url_rule
+    return regla.rule if regla is not None else 'sin_ruta'
+
+
+# ========== EVENTOS DE SQLALCHEMY ==========
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _antes_de_consulta(conn, cursor, statement, parameters, context, executemany):
+    contador = _contador_actual.get()
+    if contador is not None:
+        contador.sentencias.append(statement)
+    if context is not None:
+        context._inicio_consulta = time.perf_counter()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _despues_de_consulta(conn, cursor, statement, parameters, context, executemany):
+    inicio = getattr(context, '_inicio_consulta', None)
+    if inicio is None:
+        return
+    duracion = time.perf_counter() - inicio
+    metricas = _metricas_peticion()
+    if metricas is not None:
+        metricas.consultas += 1
+        metricas.tiempo_sql += duracion
+    if duracion >= registro_metricas.umbral_lenta:
+        endpoint = _endpoint_actual() if metricas is not None else None
+        registro_metricas.registrar_consulta_lenta(statement, duracion, endpoint)
+
+
+def registrar_espera_pool(segundos):
+    """Tiempo que tardó obtener_conexion() en entregar una conexión del pool"""
+    metricas = _metricas_peticion()
+    if metricas is not None:
+        metricas.espera_pool += segundos
+
+
+# ========== SERIALIZACIÓN Y PETICIONES DE FLASK ==========
+
+class ProveedorJSONMedido(DefaultJSONProvider):
+    """Proveedor JSON de Flask que acumula el tiempo de serialización de la petición"""
+
+    def dumps(self, obj, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            metricas = _metricas_peticion()
+            if metricas is not None:
+                metricas.serializacion += time.perf_counter() - inicio
+
+
+def _iniciar_peticion():
+    g._metricas_peticion = MetricasPeticion()
+
+
+def _agregar_server_timing(respuesta):
+    metricas = _metricas_peticion()
+    if metricas is not None:
+        metricas.estado = respuesta.status_code
+        # Visible en las herramientas de desarrollo del navegador (pestaña Timing)
+        respuesta.headers['Server-Timing'] = (
+            f'db;dur={metricas.tiempo_sql * 1000:.1f};desc="{metricas.consultas} consultas", '
+            f'pool;dur={metricas.espera_pool * 1000:.1f}, '
+            f'json;dur={metricas.serializacion * 1000:.1f}'
+        )
+        if respuesta.is_streamed:
+            # El cuerpo (y sus consultas) se genera después de la vista: se registra al cerrar
+            metricas.en_streaming = True
+            endpoint, metodo = _endpoint_actual(), request.method
+            respuesta.call_on_close(lambda: _registrar(metricas, endpoint, metodo))
+    return respuesta
+
+
+def _registrar(metricas, endpoint, metodo):
+    if metricas.registrada:
+        return
+    metricas.registrada = True
+    registro_metricas.registrar_peticion(endpoint, metodo, metricas, time.perf_counter() - metricas.inicio)
+
+
+def _finalizar_peticion(error):
+    metricas = _metricas_peticion()
+    if metricas is None or (metricas.en_streaming and error is None):
+        return
+    if metricas.estado is None:
+        metricas.estado = 500
+    _registrar(metricas, _endpoint_actual(), request.method)
+
+
+def instalar(app):
+    """Registrar la medición de consultas, pool, serialización y duración en la aplicación"""
+    app.json = ProveedorJSONMedido(app)
+    app.before_request(_iniciar_peticion)
+    app.after_request(_agregar_server_timing)
+    app.teardown_request(_finalizar_peticion)
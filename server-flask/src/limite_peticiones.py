@@ -0,0 +1,288 @@
+import math
+import os
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from functools import wraps
+
+from flask import request, current_app, jsonify
+
+# Límites de intentos de login y de 2FA con ventanas deslizantes.
+#
+#   variable de entorno   por defecto
+#   LIMITE_LOGIN_IP       20/60    intentos de login por IP cada 60 s
+#   LIMITE_LOGIN_CUENTA   10/900   logins fallidos (401) por usuario/correo cada 15 min
+#   LIMITE_2FA_IP         20/60    verificaciones de 2FA por IP cada 60 s
+#   LIMITE_2FA_CUENTA     10/900   códigos 2FA incorrectos por usuario_id cada 15 min
+#   LIMITE_BUCKETS        10       divisiones de cada ventana (precisión del deslizamiento)
+#   LIMITE_MAX_CLAVES     100000   IPs/cuentas en memoria por regla (se olvidan las menos usadas)
+#   LIMITE_REDIS_URL      (vacío)  redis://... para compartir los contadores entre workers
+#   LIMITE_HABILITADO     1
+#
+# Un límite '0' desactiva la regla. Por cuenta solo cuentan los fallos, así que un tercero
+# no puede bloquear una cuenta con intentos correctos; por IP cuentan todos los intentos.
+# Detrás de un proxy inverso la IP es la de X-Forwarded-For (PROXY_SALTOS en wsgi.py).
+# El rechazo se decide antes de ejecutar la vista: sin consulta a Usuario ni bcrypt.
+
+REGLAS = {
+    'login_ip': ('LIMITE_LOGIN_IP', '20/60'),
+    'login_cuenta': ('LIMITE_LOGIN_CUENTA', '10/900'),
+    '2fa_ip': ('LIMITE_2FA_IP', '20/60'),
+    '2fa_cuenta': ('LIMITE_2FA_CUENTA', '10/900')
+}
+
+
+def leer_regla(texto):
+    """'20/60' -> (20, 60.0): como máximo 20 eventos en 60 segundos"""
+    try:
+        limite, segundos = texto.split('/')
+        limite, segundos = int(limite), float(segundos)
+    except ValueError:
+        raise ValueError(f"Regla de límite inválida (se espera 'N/segundos'): {texto}")
+    if limite < 0 or segundos <= 0:
+        raise ValueError(f"Regla de límite inválida: {texto}")
+    return limite, segundos
+
+
+class VentanasMemoria:
+    """Contadores por clave en anillos de 'buckets' cubetas de 'ancho' segundos.
+
+    Cada clave ocupa un array de enteros sin signo y el índice de su última cubeta; al
+    avanzar el reloj se ponen en cero solo las cubetas que salieron de la ventana.
+    Las claves se mantienen en orden de uso: las del inicio que ya no tienen eventos
+    en la ventana se descartan al insertar, y nunca hay más de 'max_claves'.
+    """
+
+    def __init__(self, buckets, ancho, max_claves=100000):
+        self.buckets = buckets
+        self.ancho = ancho
+        self.max_claves = max_claves
+        self._claves = OrderedDict()   # clave -> [última cubeta, array('I')]
+        self._lock = threading.Lock()
+
+    def _avanzar(self, entrada, cubeta):
+        ultima, anillo = entrada
+        if cubeta - ultima >= self.buckets:
+            for i in range(self.buckets):
+                anillo[i] = 0
+        else:
+            for c in range(ultima + 1, cubeta + 1):
+                anillo[c % self.buckets] = 0
+        entrada[0] = max(ultima, cubeta)
+
+    def _purgar(self, cubeta):
+        while self._claves:
+            clave, entrada = next(iter(self._claves.items()))
+            if len(self._claves) <= self.max_claves and entrada[0] > cubeta - self.buckets:
+                break
+            del self._claves[clave]
+
+    def sumar(self, clave, limite=None, incremento=1):
+        """Devolver (permitido, total en la ventana).
+
+        Con 'limite' el incremento solo se aplica si el total aún es menor que el límite
+        (comprobación y suma atómicas); con incremento=0 solo se consulta.
+        """
+        cubeta = int(time.monotonic() // self.ancho)
+        with self._lock:
+            entrada = self._claves.get(clave)
+            if entrada is None:
+                if incremento == 0:
+                    return True, 0
+                entrada = self._claves[clave] = [cubeta, array('I', bytes(4 * self.buckets))]
+                self._purgar(cubeta)
+            else:
+                self._avanzar(entrada, cubeta)
+                self._claves.move_to_end(clave)
+            total = sum(entrada[1])
+            if limite is not None and total >= limite:
+                return False, total
+            entrada[1][cubeta % self.buckets] += incremento
+            return True, total + incremento
+
+    def claves(self):
+        with self._lock:
+            return len(self._claves)
+
+
+# Mismo anillo en un hash de Redis: campo = número de cubeta, valor = eventos
+_SCRIPT_VENTANA = """
+local cubeta = tonumber(ARGV[1])
+local buckets = tonumber(ARGV[2])
+local limite = tonumber(ARGV[3])
+local incremento = tonumber(ARGV[4])
+local total = 0
+local datos = redis.call('HGETALL', KEYS[1])
+for i = 1, #datos, 2 do
+    if tonumber(datos[i]) <= cubeta - buckets then
+        redis.call('HDEL', KEYS[1], datos[i])
+    else
+        total = total + tonumber(datos[i + 1])
+    end
+end
+if limite >= 0 and total >= limite then return {0, total} end
+if incremento > 0 then
+    redis.call('HINCRBY', KEYS[1], ARGV[1], incremento)
+    redis.call('EXPIRE', KEYS[1], ARGV[5])
+end
+return {1, total + incremento}
+"""
+
+
+class VentanasRedis:
+    """Contadores de ventana deslizante compartidos entre workers (un hash por clave)"""
+
+    def __init__(self, url, nombre, buckets, ancho):
+        import redis  # solo se necesita con LIMITE_REDIS_URL
+
+        self.cliente = redis.Redis.from_url(url)
+        self.prefijo = f"bolsa:limite:{nombre}:"
+        self.buckets = buckets
+        self.ancho = ancho
+        self._script = self.cliente.register_script(_SCRIPT_VENTANA)
+
+    def sumar(self, clave, limite=None, incremento=1):
+        # Redis y los workers comparten el reloj de pared, no el monotónico
+        cubeta = int(time.time() // self.ancho)
+        ttl = math.ceil(self.buckets * self.ancho)
+        permitido, total = self._script(keys=[self.prefijo + clave], args=[
+            cubeta, self.buckets, -1 if limite is None else limite, incremento, ttl
+        ])
+        return bool(permitido), int(total)
+
+    def claves(self):
+        return None
+
+
+class Limitador:
+    """Una regla: como máximo 'limite' eventos por clave en 'segundos'"""
+
+    def __init__(self, nombre, limite, segundos, ventanas):
+        self.nombre = nombre
+        self.limite = limite
+        self.segundos = segundos
+        self.ventanas = ventanas
+        self._lock = threading.Lock()
+        self.aceptadas = 0
+        self.rechazadas = 0
+
+    @property
+    def activo(self):
+        return self.limite > 0
+
+    @property
+    def reintentar_en(self):
+        """Segundos para Retry-After: lo que tarda en salir de la ventana la cubeta más antigua"""
+        return max(1, math.ceil(self.ventanas.ancho))
+
+    def _contar(self, permitido):
+        with self._lock:
+            if permitido:
+                self.aceptadas += 1
+            else:
+                self.rechazadas += 1
+        return permitido
+
+    def permitir(self, clave):
+        """Registrar un intento si no se superó el límite"""
+        if not self.activo:
+            return True
+        return self._contar(self.ventanas.sumar(clave, self.limite)[0])
+
+    def bloqueado(self, clave):
+        """Consultar sin registrar (la cuenta ya acumuló 'limite' fallos)"""
+        if not self.activo:
+            return False
+        permitido, total = self.ventanas.sumar(clave, incremento=0)
+        return not self._contar(total < self.limite)
+
+    def registrar(self, clave):
+        """Registrar un fallo sin comprobar el límite"""
+        if self.activo:
+            self.ventanas.sumar(clave)
+
+    def estado(self):
+        with self._lock:
+            return {
+                "limite": self.limite,
+                "segundos": self.segundos,
+                "claves": self.ventanas.claves(),
+                "aceptadas": self.aceptadas,
+                "rechazadas": self.rechazadas
+            }
+
+
+def crear_limitadores(entorno=None):
+    entorno = os.environ if entorno is None else entorno
+    buckets = int(entorno.get('LIMITE_BUCKETS', 10))
+    if buckets < 1:
+        raise ValueError("LIMITE_BUCKETS debe ser mayor o igual a 1")
+    max_claves = int(entorno.get('LIMITE_MAX_CLAVES', 100000))
+    url = entorno.get('LIMITE_REDIS_URL')
+    habilitado = entorno.get('LIMITE_HABILITADO', '1') != '0'
+
+    limitadores = {}
+    for nombre, (variable, defecto) in REGLAS.items():
+        limite, segundos = leer_regla(entorno.get(variable, defecto))
+        if not habilitado:
+            limite = 0
+        ancho = segundos / buckets
+        ventanas = VentanasRedis(url, nombre, buckets, ancho) if url else VentanasMemoria(buckets, ancho, max_claves)
+        limitadores[nombre] = Limitador(nombre, limite, segundos, ventanas)
+    return limitadores
+
+
+limitadores = crear_limitadores()
+
+
+def _rechazar(limitador):
+    respuesta = jsonify({"error": "Demasiados intentos, espera antes de reintentar"})
+    respuesta.status_code = 429
+    respuesta.headers['Retry-After'] = str(limitador.reintentar_en)
+    return respuesta
+
+
+def limitar_intentos(regla, campo_cuenta):
+    """Decorador para rutas de autenticación: aplica '<regla>_ip' a cada petición y
+    '<regla>_cuenta' a las respuestas 401 de la cuenta indicada en el campo JSON 'campo_cuenta'.
+    """
+    por_ip = limitadores[f'{regla}_ip']
+    por_cuenta = limitadores[f'{regla}_cuenta']
+
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(*args, **kwargs):
+            datos = request.get_json(silent=True)
+            cuenta = None
+            if isinstance(datos, dict) and datos.get(campo_cuenta) is not None:
+                cuenta = str(datos[campo_cuenta]).strip().lower()
+            if cuenta is not None and por_cuenta.bloqueado(cuenta):
+                return _rechazar(por_cuenta)
+            if not por_ip.permitir(request.remote_addr or '-'):
+                return _rechazar(por_ip)
+
+            respuesta = current_app.make_response(vista(*args, **kwargs))
+            if cuenta is not None and respuesta.status_code == 401:
+                por_cuenta.registrar(cuenta)
+            return respuesta
+        return envoltura
+    return decorador
+
+
+def estado_limites():
+    return {nombre: limitador.estado() for nombre, limitador in limitadores.items()}
+
+
+def metricas_limites():
+    """Líneas de /metrics con las peticiones aceptadas y rechazadas por regla"""
+    lineas = ["# HELP bolsa_limite_peticiones_total Peticiones evaluadas por regla de límite",
+              "# TYPE bolsa_limite_peticiones_total counter"]
+    claves = ["# HELP bolsa_limite_claves IPs o cuentas con contador en este worker",
+              "# TYPE bolsa_limite_claves gauge"]
+    for nombre, estado in estado_limites().items():
+        lineas.append(f'bolsa_limite_peticiones_total{{regla="{nombre}",resultado="aceptada"}} {estado["aceptadas"]}')
+        lineas.append(f'bolsa_limite_peticiones_total{{regla="{nombre}",resultado="rechazada"}} {estado["rechazadas"]}')
+        if estado["claves"] is not None:
+            claves.append(f'bolsa_limite_claves{{regla="{nombre}"}} {estado["claves"]}')
+    return lineas + claves
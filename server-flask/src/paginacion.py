@@ -0,0 +1,119 @@
+import base64
+import json
+from datetime import date, datetime
+
+# Límites de página para los listados paginados
+LIMITE_POR_DEFECTO = 20
+LIMITE_MAXIMO = 100
+
+
+class ParametroInvalido(ValueError):
+    """Parámetro de consulta con formato inválido"""
+
+
+def obtener_limite(args, defecto=LIMITE_POR_DEFECTO, maximo=LIMITE_MAXIMO):
+    """Leer el parámetro 'limite' acotado entre 1 y el máximo permitido"""
+    valor = args.get('limite')
+    if valor is None:
+        return defecto
+    try:
+        limite = int(valor)
+    except ValueError:
+        raise ParametroInvalido("El parámetro 'limite' debe ser un número entero")
+    return max(1, min(limite, maximo))
+
+
+def obtener_numero(args, nombre):
+    """Leer un parámetro numérico opcional (por ejemplo rangos de salario)"""
+    valor = args.get(nombre)
+    if valor is None or valor == '':
+        return None
+    try:
+        return float(valor)
+    except ValueError:
+        raise ParametroInvalido(f"El parámetro '{nombre}' debe ser numérico")
+
+
+def obtener_entero(args, nombre):
+    """Leer un parámetro entero opcional (por ejemplo el ID de una vacante)"""
+    valor = args.get(nombre)
+    if valor is None or valor == '':
+        return None
+    try:
+        return int(valor)
+    except ValueError:
+        raise ParametroInvalido(f"El parámetro '{nombre}' debe ser un número entero")
+
+
+def obtener_lista_enteros(args, nombre, maximo=LIMITE_MAXIMO):
+    """Leer una lista de enteros separados por comas (por ejemplo ids=1,2,3), sin repetidos"""
+    valor = args.get(nombre) or ''
+    try:
+        enteros = list(dict.fromkeys(int(parte) for parte in valor.split(',') if parte.strip()))
+    except ValueError:
+        raise ParametroInvalido(f"El parámetro '{nombre}' debe ser una lista de enteros separados por comas")
+    if not enteros:
+        raise ParametroInvalido(f"El parámetro '{nombre}' es obligatorio")
+    if len(enteros) > maximo:
+        raise ParametroInvalido(f"El parámetro '{nombre}' admite a lo sumo {maximo} valores")
+    return enteros
+
+
+def obtener_fecha(args, nombre):
+    """Leer un parámetro de fecha opcional con formato AAAA-MM-DD"""
+    valor = args.get(nombre)
+    if valor is None or valor == '':
+        return None
+    try:
+        return date.fromisoformat(valor)
+    except ValueError:
+        raise ParametroInvalido(f"El parámetro '{nombre}' debe ser una fecha AAAA-MM-DD")
+
+
+def obtener_campos(args, disponibles, obligatorios=()):
+    """Resolver la proyección 'fields=' contra la lista de campos permitidos"""
+    valor = args.get('fields')
+    if not valor:
+        return list(disponibles)
+    solicitados = [campo.strip() for campo in valor.split(',') if campo.strip()]
+    desconocidos = [campo for campo in solicitados if campo not in disponibles]
+    if desconocidos:
+        raise ParametroInvalido(f"Campos no válidos: {', '.join(desconocidos)}")
+    # Conservar el orden de declaración y agregar los campos que el cursor necesita
+    return [campo for campo in disponibles if campo in solicitados or campo in obligatorios]
+
+
+def codificar_cursor(*valores):
+    """Codificar la última clave vista como un token opaco para el cliente"""
+    serializables = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in valores]
+    contenido = json.dumps(serializables, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(contenido).decode('ascii').rstrip('=')
+
+
+def decodificar_cursor(cursor, cantidad):
+    """Decodificar un cursor generado por codificar_cursor"""
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno).decode('utf-8'))
+    except (ValueError, UnicodeDecodeError):
+        raise ParametroInvalido("Cursor inválido")
+    if not isinstance(valores, list) or len(valores) != cantidad:
+        raise ParametroInvalido("Cursor inválido")
+    return valores
+
+
+def decodificar_cursor_fecha_id(cursor):
+    """Decodificar un cursor (fecha, id) de un listado ordenado por fecha e ID descendentes.
+
+    La fecha es None (filas sin fecha) o texto ISO y el ID un entero de 32 bits; cualquier
+    otro valor llegaría a la consulta y fallaría en SQL Server al convertirlo.
+    """
+    fecha, id_cursor = decodificar_cursor(cursor, 2)
+    if type(id_cursor) is not int or not -2**31 <= id_cursor < 2**31:
+        raise ParametroInvalido("Cursor inválido")
+    if fecha is not None:
+        try:
+            datetime.fromisoformat(fecha)
+        except (TypeError, ValueError):
+            raise ParametroInvalido("Cursor inválido")
+    return fecha, id_cursor
@@ -0,0 +1,53 @@
+from flask import Response, current_app, stream_with_context
+
+from src.conexion import obtener_conexion
+
+# Filas que se leen del cursor y se codifican por bloque
+FILAS_POR_BLOQUE = 500
+
+FORMATOS = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson'
+}
+
+
+def _bloques(conn, result, convertir, formato):
+    """Generar el cuerpo bloque por bloque; cierra la conexión al terminar"""
+    try:
+        dumps = current_app.json.dumps
+        primero = True
+        if formato == 'json':
+            yield '['
+        for particion in result.partitions():
+            codificadas = [dumps(convertir(row)) for row in particion]
+            if formato == 'ndjson':
+                yield '\n'.join(codificadas) + '\n'
+            else:
+                yield ('' if primero else ',') + ','.join(codificadas)
+            primero = False
+        if formato == 'json':
+            yield ']'
+    finally:
+        conn.close()
+
+
+def respuesta_en_streaming(query, params, convertir, formato, filas_por_bloque=FILAS_POR_BLOQUE):
+    """Respuesta chunked (arreglo JSON o NDJSON) con memoria constante respecto al número de filas.
+
+    La consulta se ejecuta antes de devolver la respuesta, de modo que los errores de
+    conexión o de SQL siguen llegando a la vista como SQLAlchemyError. La conexión
+    permanece abierta mientras se envía el cuerpo y se libera al terminar o si el
+    cliente se desconecta.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de streaming no soportado: {formato}")
+    conn = obtener_conexion()
+    try:
+        result = conn.execution_options(
+            stream_results=True, yield_per=filas_por_bloque
+        ).execute(query, params)
+    except Exception:
+        conn.close()
+        raise
+    generador = stream_with_context(_bloques(conn, result, convertir, formato))
+    return Response(generador, mimetype=FORMATOS[formato])
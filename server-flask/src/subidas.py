@@ -0,0 +1,190 @@
+import hashlib
+import os
+import tempfile
+from collections import namedtuple
+
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.formparser import parse_form_data
+from werkzeug.utils import secure_filename
+
+# Subida de archivos (CV e imágenes de perfil) sin cargarlos en memoria.
+#
+# El cuerpo multipart se lee en bloques de 64 KB (MultiPartParser de Werkzeug) y cada
+# bloque se escribe directamente en un archivo temporal dentro de la carpeta de destino
+# mientras se calcula su SHA-256. El tipo de archivo se valida con el nombre antes de
+# escribir el primer byte y el tamaño con el Content-Length antes de leer el cuerpo (y
+# bloque a bloque si no lo hay). Al terminar, el temporal se renombra de forma atómica
+# al nombre definitivo: nunca queda un archivo a medias con el nombre público.
+#
+#   variable de entorno   por defecto
+#   SUBIDA_CV_MAX_MB      10
+#   SUBIDA_IMAGEN_MAX_MB  5
+
+MB = 1024 * 1024
+# Encabezados multipart y campos de texto que acompañan al archivo
+MARGEN_MULTIPART = 64 * 1024
+# Búfer del decodificador multipart (incluye el bloque en curso); el de Flask por defecto
+MAX_MEMORIA_FORMULARIO = 500 * 1024
+
+TipoSubida = namedtuple('TipoSubida', 'campo extensiones max_bytes sin_archivo tipo_no_permitido')
+
+SUBIDA_CV = TipoSubida(
+    campo='cv',
+    extensiones=frozenset({'pdf', 'doc', 'docx'}),
+    max_bytes=int(float(os.environ.get('SUBIDA_CV_MAX_MB', 10)) * MB),
+    sin_archivo="No se encontró archivo CV",
+    tipo_no_permitido="Tipo de archivo no permitido. Solo se permiten PDF, DOC y DOCX"
+)
+
+SUBIDA_IMAGEN = TipoSubida(
+    campo='image',
+    extensiones=frozenset({'jpg', 'jpeg', 'png', 'gif'}),
+    max_bytes=int(float(os.environ.get('SUBIDA_IMAGEN_MAX_MB', 5)) * MB),
+    sin_archivo="No se encontró archivo de imagen",
+    tipo_no_permitido="Tipo de archivo no permitido. Solo se permiten JPG, JPEG, PNG y GIF"
+)
+
+
+class ArchivoRechazado(Exception):
+    """La subida no cumple el tipo o el tamaño; 'codigo' es el estado HTTP de la respuesta"""
+
+    def __init__(self, mensaje, codigo=400):
+        super().__init__(mensaje)
+        self.codigo = codigo
+
+
+def _demasiado_grande(max_bytes):
+    return ArchivoRechazado(f"El archivo supera el tamaño máximo de {max_bytes / MB:g} MB", 413)
+
+
+def _extension(nombre):
+    nombre = secure_filename(nombre or '')
+    return nombre.rsplit('.', 1)[1].lower() if '.' in nombre else ''
+
+
+class _Temporal:
+    """Archivo temporal que cuenta bytes y calcula el SHA-256 de lo que se escribe"""
+
+    def __init__(self, destino, max_bytes, nombre_original):
+        self.archivo = tempfile.NamedTemporaryFile(dir=destino, prefix='.subida-', delete=False)
+        self.ruta = self.archivo.name
+        self.max_bytes = max_bytes
+        self.nombre_original = nombre_original
+        self.tamano = 0
+        self.resumen = hashlib.sha256()
+
+    def write(self, datos):
+        self.tamano += len(datos)
+        if self.tamano > self.max_bytes:
+            raise _demasiado_grande(self.max_bytes)
+        self.resumen.update(datos)
+        return self.archivo.write(datos)
+
+    def seek(self, *args):
+        # MultiPartParser rebobina el archivo al terminar la parte
+        return self.archivo.seek(*args)
+
+    def read(self, *args):
+        return self.archivo.read(*args)
+
+    def close(self):
+        self.archivo.close()
+
+
+class ArchivoRecibido:
+    def __init__(self, temporal, destino):
+        self.destino = destino
+        self.ruta_temporal = temporal.ruta
+        self.nombre_original = temporal.nombre_original
+        self.extension = _extension(temporal.nombre_original)
+        self.tamano = temporal.tamano
+        self.sha256 = temporal.resumen.hexdigest()
+        self.ruta = None
+
+    def publicar(self, nombre, reutilizar=False):
+        """Renombrar el temporal a 'nombre' dentro del destino (atómico en el mismo sistema de archivos).
+
+        Con 'reutilizar' el nombre depende del contenido: si ya existe se conserva ese archivo
+        (se actualiza su fecha para que la recolección no lo borre), se descarta el temporal y
+        se devuelve False. Un archivo así puede estar compartido, por lo que tampoco se borra
+        si la petición falla después; queda para la recolección de huérfanos.
+        """
+        ruta = os.path.join(self.destino, nombre)
+        if reutilizar:
+            try:
+                os.utime(ruta)
+                os.remove(self.ruta_temporal)
+                return False
+            except FileNotFoundError:
+                pass
+        os.replace(self.ruta_temporal, ruta)
+        if not reutilizar:
+            self.ruta = ruta
+        return True
+
+
+class ReceptorArchivo:
+    """Recibe un único archivo de una petición multipart en 'destino'.
+
+        with ReceptorArchivo(SUBIDA_CV, carpeta) as receptor:
+            archivo = receptor.recibir(request)
+            archivo.publicar(nombre)
+            ... UPDATE ...
+
+    Al salir se borra el temporal si no se publicó, y también el archivo publicado si
+    el bloque terminó con una excepción (p. ej. falló el UPDATE).
+    """
+
+    def __init__(self, tipo, destino):
+        self.tipo = tipo
+        self.destino = destino
+        self._temporales = []
+        self.archivo = None
+
+    def _abrir(self, total_content_length, content_type, filename=None, content_length=None):
+        # stream_factory de Werkzeug: se llama al empezar cada parte con archivo
+        if self._temporales:
+            raise ArchivoRechazado("Solo se permite un archivo por petición")
+        if not filename:
+            raise ArchivoRechazado("No se seleccionó archivo")
+        if _extension(filename) not in self.tipo.extensiones:
+            raise ArchivoRechazado(self.tipo.tipo_no_permitido)
+        temporal = _Temporal(self.destino, self.tipo.max_bytes, filename)
+        self._temporales.append(temporal)
+        return temporal
+
+    def recibir(self, peticion):
+        """Leer el cuerpo de la petición y devolver el ArchivoRecibido (o lanzar ArchivoRechazado)"""
+        limite = self.tipo.max_bytes + MARGEN_MULTIPART
+        if peticion.content_length is not None and peticion.content_length > limite:
+            raise _demasiado_grande(self.tipo.max_bytes)
+        if peticion.mimetype != 'multipart/form-data':
+            raise ArchivoRechazado(self.tipo.sin_archivo)
+        os.makedirs(self.destino, exist_ok=True)
+        try:
+            # max_content_length también corta cuerpos sin Content-Length (chunked)
+            _, _, archivos = parse_form_data(
+                peticion.environ, stream_factory=self._abrir, max_content_length=limite,
+                max_form_memory_size=MAX_MEMORIA_FORMULARIO, max_form_parts=16
+            )
+        except RequestEntityTooLarge:
+            raise _demasiado_grande(self.tipo.max_bytes)
+        for temporal in self._temporales:
+            temporal.close()
+        if self.tipo.campo not in archivos:
+            raise ArchivoRechazado(self.tipo.sin_archivo)
+        self.archivo = ArchivoRecibido(self._temporales[0], self.destino)
+        return self.archivo
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_excepcion, excepcion, traza):
+        for temporal in self._temporales:
+            temporal.close()
+            if os.path.exists(temporal.ruta):
+                os.remove(temporal.ruta)
+        if tipo_excepcion is not None and self.archivo is not None and self.archivo.ruta:
+            if os.path.exists(self.archivo.ruta):
+                os.remove(self.archivo.ruta)
+        return False
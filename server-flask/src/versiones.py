@@ -0,0 +1,124 @@
+import hashlib
+import os
+from functools import wraps
+
+from flask import request, current_app, jsonify, g
+from sqlalchemy import text, bindparam
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.cache import CacheTTL
+from src.conexion import obtener_conexion
+
+# Recursos con contador de cambios en la tabla Versiones_Recurso
+# (ver SQL/add_versiones_recurso.sql)
+RECURSOS = ('vacantes', 'empresas', 'usuarios', 'candidatos')
+
+# Versiones leídas recientemente, por combinación de recursos. Con un acierto la petición
+# (incluido un acierto de cache_vacantes) no toma conexión del pool.
+#
+#   variable de entorno   por defecto
+#   VERSIONES_TTL         1       segundos que se reutiliza una lectura (0 = leer siempre)
+#
+# Una escritura de este proceso vacía la caché; una de otro worker tarda hasta VERSIONES_TTL
+# en cambiar el ETag y la clave de las cachés en memoria: ese es el retraso máximo con que
+# un cliente puede recibir un 304 o un cuerpo anterior a la escritura.
+VERSIONES_TTL = float(os.environ.get('VERSIONES_TTL', 1))
+cache_versiones = CacheTTL(max_entradas=32, ttl=VERSIONES_TTL, habilitado=VERSIONES_TTL > 0)
+
+_consulta_versiones = text("""
+    SELECT Recurso, Version FROM Versiones_Recurso WHERE Recurso IN :recursos
+""").bindparams(bindparam('recursos', expanding=True))
+
+_incrementar_versiones = text("""
+    UPDATE Versiones_Recurso
+    SET Version = Version + 1, Fecha_Modificacion = GETDATE()
+    WHERE Recurso IN :recursos
+""").bindparams(bindparam('recursos', expanding=True))
+
+
+def _validar(recursos):
+    desconocidos = [r for r in recursos if r not in RECURSOS]
+    if desconocidos:
+        raise ValueError(f"Recursos sin versión: {', '.join(desconocidos)}")
+
+
+def incrementar_version(conn, *recursos):
+    """Registrar un cambio en los recursos indicados.
+
+    Debe ejecutarse en la misma transacción que la escritura, antes del commit,
+    para que el ETag nunca anuncie una versión anterior a los datos.
+    """
+    _validar(recursos)
+    conn.execute(_incrementar_versiones, {"recursos": list(recursos)})
+    cache_versiones.invalidar()
+
+
+def obtener_versiones(conn, recursos):
+    filas = conn.execute(_consulta_versiones, {"recursos": list(recursos)})
+    versiones = {fila.Recurso: fila.Version for fila in filas}
+    return [versiones.get(recurso, 0) for recurso in recursos]
+
+
+def versiones_actuales(recursos):
+    """Versiones de los recursos desde cache_versiones o, en un fallo, desde la base de datos"""
+    encontrado, versiones = cache_versiones.obtener(recursos)
+    if encontrado:
+        return versiones
+    generacion = cache_versiones.generacion
+    conn = obtener_conexion()
+    try:
+        versiones = obtener_versiones(conn, recursos)
+    finally:
+        conn.close()
+    cache_versiones.guardar(recursos, versiones, generacion)
+    return versiones
+
+
+def calcular_etag(recursos, versiones, consulta):
+    """Valor del ETag (débil): versiones de los recursos más un resumen de los parámetros de la URL"""
+    resumen = hashlib.sha1(consulta).hexdigest()[:12]
+    partes = '.'.join(f"{r}{v}" for r, v in zip(recursos, versiones))
+    return f"{partes}-{resumen}"
+
+
+def versiones_vigentes():
+    """Versiones que leyó respuesta_condicional en esta petición, como ((recurso, versión), ...).
+
+    Forman parte de la clave de las cachés en memoria: cada proceso tiene la suya, y una
+    escritura atendida por otro proceso (o sin invalidación local) cambia la versión
+    aunque no vacíe esta caché, así que un cuerpo guardado nunca acompaña a un ETag más nuevo.
+    Esa escritura se ve a más tardar VERSIONES_TTL segundos después (cache_versiones).
+    """
+    return g.get('versiones_recurso', ())
+
+
+def respuesta_condicional(*recursos):
+    """Decorador para GET de listados: responde 304 si el cliente ya tiene la versión vigente.
+
+    La versión se lee con una búsqueda por clave primaria antes de ejecutar la vista (o se
+    toma de cache_versiones), así que un 304 no ejecuta la consulta completa ni serializa el cuerpo.
+    """
+    _validar(recursos)
+
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(*args, **kwargs):
+            try:
+                versiones = versiones_actuales(recursos)
+            except SQLAlchemyError as e:
+                return jsonify({"error": str(e)}), 500
+
+            g.versiones_recurso = tuple(zip(recursos, versiones))
+            etag = calcular_etag(recursos, versiones, request.query_string)
+            if request.if_none_match.contains_weak(etag):
+                respuesta = current_app.response_class(status=304)
+            else:
+                respuesta = current_app.make_response(vista(*args, **kwargs))
+                if respuesta.status_code != 200:
+                    return respuesta
+            respuesta.set_etag(etag, weak=True)
+            # El navegador debe revalidar siempre; el 304 evita reenviar el cuerpo
+            respuesta.headers['Cache-Control'] = 'no-cache'
+            return respuesta
+        return envoltura
+    return decorador
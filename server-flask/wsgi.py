@@ -0,0 +1,39 @@
+"""Punto de entrada de producción.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+`python main.py` sigue levantando el servidor de desarrollo de Werkzeug con debug.
+"""
+import atexit
+import os
+
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+from src.conexion import cerrar_pool
+from src.contrasenas import servicio_contrasenas
+
+
+def crear_app(config=None):
+    """Aplicación configurada para producción (sin debug) con cierre ordenado del pool.
+
+    Las rutas están registradas en main.app; aquí solo se aplica la configuración
+    del despliegue, así que puede llamarse una vez por proceso.
+    """
+    from main import app
+
+    app.config.update(DEBUG=False, TESTING=False, PROPAGATE_EXCEPTIONS=False)
+    if config:
+        app.config.update(config)
+
+    # Detrás de nginx u otro proxy inverso: respetar X-Forwarded-For/-Proto/-Host
+    saltos = int(os.environ.get('PROXY_SALTOS', 0))
+    if saltos and not isinstance(app.wsgi_app, ProxyFix):
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=saltos, x_proto=saltos, x_host=saltos)
+
+    # Servidores distintos de gunicorn (p. ej. waitress en Windows) no llaman a worker_exit
+    atexit.register(cerrar_pool)
+    atexit.register(servicio_contrasenas.cerrar)
+    return app
+
+
+app = crear_app()